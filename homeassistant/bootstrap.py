@@ -25,6 +25,7 @@ from .const import (
 from .exceptions import HomeAssistantError
 from .helpers import area_registry, device_registry, entity_registry
 from .helpers.dispatcher import async_dispatcher_send
+from .helpers.loop_lag import async_setup_loop_lag_monitor
 from .helpers.typing import ConfigType
 from .setup import (
     DATA_SETUP,
@@ -215,6 +216,8 @@ async def async_from_config_dict(
     """
     start = monotonic()
 
+    async_setup_loop_lag_monitor(hass)
+
     hass.config_entries = config_entries.ConfigEntries(hass, config)
     await hass.config_entries.async_initialize()
 
@@ -173,7 +173,7 @@ class APIStatesView(HomeAssistantView):
         entity_perm = user.permissions.check_entity
         states = [
             state
-            for state in request.app["hass"].states.async_all()
+            for state in request.app["hass"].states.async_snapshot().all()
             if entity_perm(state.entity_id, "read")
         ]
         return self.json(states)
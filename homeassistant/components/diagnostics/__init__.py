@@ -15,6 +15,8 @@ from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import integration_platform
 from homeassistant.helpers.device_registry import DeviceEntry, async_get
 from homeassistant.helpers.json import ExtendedJSONEncoder
+from homeassistant.helpers.loop_lag import async_get_loop_lag_monitor
+from homeassistant.helpers.polling import async_get_polling_scheduler
 from homeassistant.helpers.system_info import async_get_system_info
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.loader import async_get_custom_components, async_get_integration
@@ -145,14 +147,19 @@ async def _async_get_json_file_response(
             "version": cc_obj.version,
             "requirements": cc_obj.requirements,
         }
+    diagnostics = {
+        "home_assistant": hass_sys_info,
+        "custom_components": custom_components,
+        "integration_manifest": integration.manifest,
+        "data": data,
+    }
+    if (loop_lag_monitor := async_get_loop_lag_monitor(hass)) is not None:
+        diagnostics["event_loop"] = loop_lag_monitor.async_as_dict(domain)
+    if polling := async_get_polling_scheduler(hass).async_get_stats(domain, d_id):
+        diagnostics["polling"] = polling
     try:
         json_data = json.dumps(
-            {
-                "home_assistant": hass_sys_info,
-                "custom_components": custom_components,
-                "integration_manifest": integration.manifest,
-                "data": data,
-            },
+            diagnostics,
             indent=2,
             cls=ExtendedJSONEncoder,
         )
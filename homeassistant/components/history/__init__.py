@@ -1,14 +1,16 @@
 """Provide pre-made queries on top of the recorder component."""
 from __future__ import annotations
 
-from collections.abc import Iterable
+import asyncio
+from collections.abc import Coroutine, Iterable
+import concurrent.futures
 from datetime import datetime as dt, timedelta
 from http import HTTPStatus
 import logging
 import time
-from typing import cast
+from typing import Any, cast
 
-from aiohttp import web
+from aiohttp import hdrs, web
 from sqlalchemy import not_, or_
 import voluptuous as vol
 
@@ -20,18 +22,30 @@ from homeassistant.components.recorder import (
     models as history_models,
 )
 from homeassistant.components.recorder.statistics import (
+    STATISTIC_COLUMNS,
     list_statistic_ids,
     statistics_during_period,
+    statistics_during_period_columns,
 )
 from homeassistant.components.recorder.util import session_scope
-from homeassistant.const import CONF_DOMAINS, CONF_ENTITIES, CONF_EXCLUDE, CONF_INCLUDE
+from homeassistant.components.websocket_api import messages
+from homeassistant.components.websocket_api.const import JSON_DUMP, PENDING_MSG_PEAK
+from homeassistant.const import (
+    CONF_DOMAINS,
+    CONF_ENTITIES,
+    CONF_EXCLUDE,
+    CONF_INCLUDE,
+    CONTENT_TYPE_JSON,
+)
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.deprecation import deprecated_class, deprecated_function
 from homeassistant.helpers.entityfilter import (
     CONF_ENTITY_GLOBS,
     INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA,
 )
+from homeassistant.helpers.json import json_bytes
 from homeassistant.helpers.typing import ConfigType
 import homeassistant.util.dt as dt_util
 
@@ -42,6 +56,13 @@ _LOGGER = logging.getLogger(__name__)
 DOMAIN = "history"
 CONF_ORDER = "use_include_order"
 
+# Seconds to wait for a client to accept a chunk of streamed history
+STREAM_WRITE_TIMEOUT = 30
+# Streamed history messages that may be queued for a websocket connection.
+# This stays below the peak at which the connection is closed.
+STREAM_MAX_PENDING_MSG = PENDING_MSG_PEAK // 2
+STREAM_PENDING_POLL_INTERVAL = 0.05
+
 GLOB_TO_SQL_CHARS = {
     42: "%",  # *
     46: "_",  # .
@@ -87,10 +108,13 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
 
     use_include_order = conf.get(CONF_ORDER)
 
+    hass.data[DOMAIN] = filters
     hass.http.register_view(HistoryPeriodView(filters, use_include_order))
     frontend.async_register_built_in_panel(hass, "history", "history", "hass:chart-box")
     websocket_api.async_register_command(hass, ws_get_statistics_during_period)
+    websocket_api.async_register_command(hass, ws_get_statistics_during_period_columns)
     websocket_api.async_register_command(hass, ws_get_list_statistic_ids)
+    websocket_api.async_register_command(hass, ws_stream_history_during_period)
 
     return True
 
@@ -132,7 +156,7 @@ async def ws_get_statistics_during_period(
     else:
         end_time = None
 
-    statistics = await get_instance(hass).async_add_executor_job(
+    statistics = await get_instance(hass).async_add_read_executor_job(
         statistics_during_period,
         hass,
         start_time,
@@ -143,6 +167,53 @@ async def ws_get_statistics_during_period(
     connection.send_result(msg["id"], statistics)
 
 
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "history/statistics_during_period_columns",
+        vol.Required("start_time"): str,
+        vol.Optional("end_time"): str,
+        vol.Required("statistic_ids"): [str],
+        vol.Required("period"): vol.Any("5minute", "hour", "day", "month"),
+        vol.Optional("types", default=list(STATISTIC_COLUMNS)): vol.All(
+            [vol.In(STATISTIC_COLUMNS)], vol.Length(min=1)
+        ),
+    }
+)
+@websocket_api.async_response
+async def ws_get_statistics_during_period_columns(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Handle columnar statistics websocket command."""
+    start_time_str = msg["start_time"]
+    end_time_str = msg.get("end_time")
+
+    if start_time := dt_util.parse_datetime(start_time_str):
+        start_time = dt_util.as_utc(start_time)
+    else:
+        connection.send_error(msg["id"], "invalid_start_time", "Invalid start_time")
+        return
+
+    if end_time_str:
+        if end_time := dt_util.parse_datetime(end_time_str):
+            end_time = dt_util.as_utc(end_time)
+        else:
+            connection.send_error(msg["id"], "invalid_end_time", "Invalid end_time")
+            return
+    else:
+        end_time = None
+
+    statistics = await get_instance(hass).async_add_read_executor_job(
+        statistics_during_period_columns,
+        hass,
+        start_time,
+        end_time,
+        msg["statistic_ids"],
+        msg["period"],
+        msg["types"],
+    )
+    connection.send_result(msg["id"], statistics)
+
+
 @websocket_api.websocket_command(
     {
         vol.Required("type"): "history/list_statistic_ids",
@@ -154,7 +225,7 @@ async def ws_get_list_statistic_ids(
     hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
 ) -> None:
     """Fetch a list of available statistic_id."""
-    statistic_ids = await get_instance(hass).async_add_executor_job(
+    statistic_ids = await get_instance(hass).async_add_read_executor_job(
         list_statistic_ids,
         hass,
         None,
@@ -163,6 +234,149 @@ async def ws_get_list_statistic_ids(
     connection.send_result(msg["id"], statistic_ids)
 
 
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "history/stream_history_during_period",
+        vol.Required("start_time"): str,
+        vol.Optional("end_time"): str,
+        vol.Optional("entity_ids"): [str],
+        vol.Optional("include_start_time_state", default=True): bool,
+        vol.Optional("significant_changes_only", default=True): bool,
+        vol.Optional("minimal_response", default=False): bool,
+        vol.Optional("no_attributes", default=False): bool,
+        vol.Optional("columnar", default=False): bool,
+        vol.Optional("numeric", default=False): bool,
+    }
+)
+@websocket_api.async_response
+async def ws_stream_history_during_period(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Send the history of each entity as an event, followed by the result."""
+    start_time_str = msg["start_time"]
+    end_time_str = msg.get("end_time")
+
+    if start_time := dt_util.parse_datetime(start_time_str):
+        start_time = dt_util.as_utc(start_time)
+    else:
+        connection.send_error(msg["id"], "invalid_start_time", "Invalid start_time")
+        return
+
+    if end_time_str:
+        if end_time := dt_util.parse_datetime(end_time_str):
+            end_time = dt_util.as_utc(end_time)
+        else:
+            connection.send_error(msg["id"], "invalid_end_time", "Invalid end_time")
+            return
+    else:
+        end_time = start_time + timedelta(days=1)
+
+    if entity_ids := msg.get("entity_ids"):
+        entity_ids = [entity_id.lower() for entity_id in entity_ids]
+
+    if start_time <= dt_util.utcnow():
+        await get_instance(hass).async_add_read_executor_job(
+            _stream_history_during_period,
+            hass,
+            connection,
+            msg["id"],
+            start_time,
+            end_time,
+            entity_ids,
+            hass.data[DOMAIN],
+            msg["include_start_time_state"],
+            msg["significant_changes_only"],
+            msg["minimal_response"],
+            msg["no_attributes"],
+            msg["columnar"],
+            msg["numeric"],
+        )
+    connection.send_result(msg["id"])
+
+
+def _stream_history_during_period(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg_id: int,
+    start_time: dt,
+    end_time: dt,
+    entity_ids: list[str] | None,
+    filters: Filters | None,
+    include_start_time_state: bool,
+    significant_changes_only: bool,
+    minimal_response: bool,
+    no_attributes: bool,
+    columnar: bool,
+    numeric: bool,
+) -> None:
+    """Serialize the history of each entity and queue it for the connection."""
+    with session_scope(hass=hass, read_only=True) as session:
+        if columnar:
+            events: Iterable[dict[str, Any]] = (
+                {"entity_id": entity_id, **columns}
+                for entity_id, columns in (
+                    history.stream_significant_states_columns_with_session(
+                        hass,
+                        session,
+                        start_time,
+                        end_time,
+                        entity_ids,
+                        filters,
+                        include_start_time_state,
+                        significant_changes_only,
+                        numeric,
+                    )
+                )
+            )
+        else:
+            events = (
+                {"entity_id": entity_id, "states": states}
+                for entity_id, states in history.stream_significant_states_with_session(
+                    hass,
+                    session,
+                    start_time,
+                    end_time,
+                    entity_ids,
+                    filters,
+                    include_start_time_state,
+                    significant_changes_only,
+                    minimal_response,
+                    no_attributes,
+                )
+            )
+        for event in events:
+            _run_stream_write(
+                hass,
+                _async_send_when_writable(
+                    connection, JSON_DUMP(messages.event_message(msg_id, event))
+                ),
+            )
+
+
+async def _async_send_when_writable(
+    connection: websocket_api.ActiveConnection, message: str
+) -> None:
+    """Queue a message once the client has room for it."""
+    if (pending_messages := connection.pending_messages) is not None:
+        while pending_messages() >= STREAM_MAX_PENDING_MSG:
+            await asyncio.sleep(STREAM_PENDING_POLL_INTERVAL)
+    connection.send_message(message)
+
+
+def _run_stream_write(hass: HomeAssistant, write: Coroutine[Any, Any, None]) -> None:
+    """Run a write of streamed history in the event loop and wait for it.
+
+    Raises HomeAssistantError if the client does not accept the write in
+    time, so the caller stops streaming and releases its session.
+    """
+    future = asyncio.run_coroutine_threadsafe(write, hass.loop)
+    try:
+        future.result(STREAM_WRITE_TIMEOUT)
+    except concurrent.futures.TimeoutError as err:
+        future.cancel()
+        raise HomeAssistantError("Timed out streaming history to the client") from err
+
+
 class HistoryPeriodView(HomeAssistantView):
     """Handle history period requests."""
 
@@ -183,6 +397,10 @@ class HistoryPeriodView(HomeAssistantView):
         if datetime and (datetime_ := dt_util.parse_datetime(datetime)) is None:
             return self.json_message("Invalid datetime", HTTPStatus.BAD_REQUEST)
 
+        # Columnar responses are an object keyed by entity_id
+        columnar = "columnar" in request.query
+        empty_result: dict | list = {} if columnar else []
+
         now = dt_util.utcnow()
 
         one_day = timedelta(days=1)
@@ -192,7 +410,7 @@ class HistoryPeriodView(HomeAssistantView):
             start_time = now - one_day
 
         if start_time > now:
-            return self.json([])
+            return self.json(empty_result)
 
         if end_time_str := request.query.get("end_time"):
             if end_time := dt_util.parse_datetime(end_time_str):
@@ -220,11 +438,52 @@ class HistoryPeriodView(HomeAssistantView):
             and entity_ids
             and not _entities_may_have_state_changes_after(hass, entity_ids, start_time)
         ):
-            return self.json([])
+            return self.json(empty_result)
+
+        if columnar:
+            return cast(
+                web.Response,
+                await get_instance(hass).async_add_read_executor_job(
+                    self._significant_states_columns_json,
+                    hass,
+                    start_time,
+                    end_time,
+                    entity_ids,
+                    include_start_time_state,
+                    significant_changes_only,
+                    "numeric" in request.query,
+                ),
+            )
+
+        if "stream" in request.query:
+            return await self._async_stream_significant_states(
+                request,
+                hass,
+                start_time,
+                end_time,
+                entity_ids,
+                include_start_time_state,
+                significant_changes_only,
+                minimal_response,
+                no_attributes,
+            )
+
+        # History served from statistics copies the attributes of the current states
+        current_states = None
+        if (
+            entity_ids
+            and not no_attributes
+            and get_instance(hass).history_downsample_after is not None
+        ):
+            current_states = {
+                entity_id: state
+                for entity_id in entity_ids
+                if (state := hass.states.get(entity_id))
+            }
 
         return cast(
             web.Response,
-            await get_instance(hass).async_add_executor_job(
+            await get_instance(hass).async_add_read_executor_job(
                 self._sorted_significant_states_json,
                 hass,
                 start_time,
@@ -234,6 +493,7 @@ class HistoryPeriodView(HomeAssistantView):
                 significant_changes_only,
                 minimal_response,
                 no_attributes,
+                current_states,
             ),
         )
 
@@ -247,11 +507,12 @@ class HistoryPeriodView(HomeAssistantView):
         significant_changes_only,
         minimal_response,
         no_attributes,
+        current_states,
     ):
         """Fetch significant stats from the database as json."""
         timer_start = time.perf_counter()
 
-        with session_scope(hass=hass) as session:
+        with session_scope(hass=hass, read_only=True) as session:
             result = history.get_significant_states_with_session(
                 hass,
                 session,
@@ -263,6 +524,7 @@ class HistoryPeriodView(HomeAssistantView):
                 significant_changes_only,
                 minimal_response,
                 no_attributes,
+                current_states,
             )
 
         result = list(result.values())
@@ -285,6 +547,114 @@ class HistoryPeriodView(HomeAssistantView):
 
         return self.json(result)
 
+    def _significant_states_columns_json(
+        self,
+        hass,
+        start_time,
+        end_time,
+        entity_ids,
+        include_start_time_state,
+        significant_changes_only,
+        numeric,
+    ):
+        """Fetch significant states from the database as columnar json."""
+        timer_start = time.perf_counter()
+
+        with session_scope(hass=hass, read_only=True) as session:
+            result = history.get_significant_states_columns_with_session(
+                hass,
+                session,
+                start_time,
+                end_time,
+                entity_ids,
+                self.filters,
+                include_start_time_state,
+                significant_changes_only,
+                numeric,
+            )
+
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            elapsed = time.perf_counter() - timer_start
+            _LOGGER.debug(
+                "Extracted %d columnar states in %fs",
+                sum(len(columns[history.STATE_KEY]) for columns in result.values()),
+                elapsed,
+            )
+
+        return self.json(result)
+
+    async def _async_stream_significant_states(
+        self,
+        request: web.Request,
+        hass: HomeAssistant,
+        *args: Any,
+    ) -> web.StreamResponse:
+        """Stream significant states as a json array, one entity at a time.
+
+        The include order of the configuration is not applied to
+        streamed responses.
+        """
+        response = web.StreamResponse(headers={hdrs.CONTENT_TYPE: CONTENT_TYPE_JSON})
+        response.enable_compression()
+        await response.prepare(request)
+        try:
+            await get_instance(hass).async_add_read_executor_job(
+                self._stream_significant_states_json, hass, response, *args
+            )
+            await response.write_eof()
+        except ConnectionResetError:
+            _LOGGER.debug("Client closed the connection while streaming history")
+        except HomeAssistantError as err:
+            _LOGGER.warning("Aborted streaming history: %s", err)
+            response.force_close()
+        return response
+
+    def _stream_significant_states_json(
+        self,
+        hass,
+        response,
+        start_time,
+        end_time,
+        entity_ids,
+        include_start_time_state,
+        significant_changes_only,
+        minimal_response,
+        no_attributes,
+    ):
+        """Fetch significant states and write them to the response as json.
+
+        Each write waits for the event loop to accept the chunk so a slow
+        client limits how far ahead of it the database cursor gets.
+        """
+        timer_start = time.perf_counter()
+
+        def _write(data: bytes) -> None:
+            _run_stream_write(hass, response.write(data))
+
+        separator = b"["
+        count = 0
+        with session_scope(hass=hass, read_only=True) as session:
+            for _, states in history.stream_significant_states_with_session(
+                hass,
+                session,
+                start_time,
+                end_time,
+                entity_ids,
+                self.filters,
+                include_start_time_state,
+                significant_changes_only,
+                minimal_response,
+                no_attributes,
+            ):
+                _write(separator + json_bytes(states))
+                separator = b","
+                count += len(states)
+        _write(b"[]" if count == 0 else b"]")
+
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            elapsed = time.perf_counter() - timer_start
+            _LOGGER.debug("Streamed %d states in %fs", count, elapsed)
+
 
 def sqlalchemy_filter_from_include_exclude_conf(conf: ConfigType) -> Filters | None:
     """Build a sql filter from config."""
@@ -353,13 +723,15 @@ class Filters:
             includes.append(
                 or_(
                     *[
-                        history_models.States.entity_id.like(f"{domain}.%")
+                        history_models.StatesMeta.entity_id.like(f"{domain}.%")
                         for domain in self.included_domains
                     ]
                 ).self_group()
             )
         if self.included_entities:
-            includes.append(history_models.States.entity_id.in_(self.included_entities))
+            includes.append(
+                history_models.StatesMeta.entity_id.in_(self.included_entities)
+            )
         for glob in self.included_entity_globs:
             includes.append(_glob_to_like(glob))
 
@@ -368,13 +740,15 @@ class Filters:
             excludes.append(
                 or_(
                     *[
-                        history_models.States.entity_id.like(f"{domain}.%")
+                        history_models.StatesMeta.entity_id.like(f"{domain}.%")
                         for domain in self.excluded_domains
                     ]
                 ).self_group()
             )
         if self.excluded_entities:
-            excludes.append(history_models.States.entity_id.in_(self.excluded_entities))
+            excludes.append(
+                history_models.StatesMeta.entity_id.in_(self.excluded_entities)
+            )
         for glob in self.excluded_entity_globs:
             excludes.append(_glob_to_like(glob))
 
@@ -392,7 +766,9 @@ class Filters:
 
 def _glob_to_like(glob_str):
     """Translate glob to sql."""
-    return history_models.States.entity_id.like(glob_str.translate(GLOB_TO_SQL_CHARS))
+    return history_models.StatesMeta.entity_id.like(
+        glob_str.translate(GLOB_TO_SQL_CHARS)
+    )
 
 
 def _entities_may_have_state_changes_after(
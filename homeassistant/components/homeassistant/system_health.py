@@ -2,6 +2,7 @@
 from homeassistant.components import system_health
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import system_info
+from homeassistant.helpers.loop_lag import async_get_loop_lag_monitor
 
 
 @callback
@@ -16,7 +17,7 @@ async def system_health_info(hass):
     """Get info for the info page."""
     info = await system_info.async_get_system_info(hass)
 
-    return {
+    health_info = {
         "version": f"core-{info.get('version')}",
         "installation_type": info.get("installation_type"),
         "dev": info.get("dev"),
@@ -30,3 +31,11 @@ async def system_health_info(hass):
         "arch": info.get("arch"),
         "timezone": info.get("timezone"),
     }
+
+    if (monitor := async_get_loop_lag_monitor(hass)) is not None:
+        lag = monitor.async_as_dict()
+        health_info["loop_lag_mean"] = f"{lag['mean_lag_ms']:.1f} ms"
+        health_info["loop_lag_max"] = f"{lag['max_lag_ms']:.1f} ms"
+        health_info["loop_slow_callbacks"] = sum(lag["integrations"].values())
+
+    return health_info
@@ -31,9 +31,11 @@ from homeassistant.components.recorder import get_instance
 from homeassistant.components.recorder.models import (
     EventData,
     Events,
+    EventTypes,
     StateAttributes,
     States,
-    process_timestamp_to_utc_isoformat,
+    StatesMeta,
+    timestamp_to_utc_isoformat,
 )
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.components.script import EVENT_SCRIPT_STARTED
@@ -115,9 +117,9 @@ ALL_EVENT_TYPES = [
 
 
 EVENT_COLUMNS = [
-    Events.event_type.label("event_type"),
+    EventTypes.event_type.label("event_type"),
     Events.event_data.label("event_data"),
-    Events.time_fired.label("time_fired"),
+    Events.time_fired_ts.label("time_fired_ts"),
     Events.context_id.label("context_id"),
     Events.context_user_id.label("context_user_id"),
     Events.context_parent_id.label("context_parent_id"),
@@ -125,7 +127,7 @@ EVENT_COLUMNS = [
 
 STATE_COLUMNS = [
     States.state.label("state"),
-    States.entity_id.label("entity_id"),
+    StatesMeta.entity_id.label("entity_id"),
     States.attributes.label("attributes"),
     StateAttributes.shared_attrs.label("shared_attrs"),
 ]
@@ -320,7 +322,8 @@ class LogbookView(HomeAssistantView):
             )
 
         return cast(
-            web.Response, await get_instance(hass).async_add_executor_job(json_events)
+            web.Response,
+            await get_instance(hass).async_add_read_executor_job(json_events),
         )
 
 
@@ -518,7 +521,7 @@ def _get_events(
     if entity_ids is not None:
         entities_filter = generate_filter([], entity_ids, [], [])
 
-    with session_scope(hass=hass) as session:
+    with session_scope(hass=hass, read_only=True) as session:
         old_state = aliased(States, name="old_state")
         query: Query
         query = _generate_events_query_without_states(session)
@@ -565,7 +568,7 @@ def _get_events(
             unions.append(states_query)
             query = query.union_all(*unions)
 
-        query = query.order_by(Events.time_fired)
+        query = query.order_by(Events.time_fired_ts)
 
         return list(
             humanify(hass, yield_events(query), entity_attr_cache, context_lookup)
@@ -573,15 +576,21 @@ def _get_events(
 
 
 def _generate_events_query_without_data(session: Session) -> Query:
-    return session.query(
-        literal(value=EVENT_STATE_CHANGED, type_=sqlalchemy.String).label("event_type"),
-        literal(value=None, type_=sqlalchemy.Text).label("event_data"),
-        States.last_changed.label("time_fired"),
-        States.context_id.label("context_id"),
-        States.context_user_id.label("context_user_id"),
-        States.context_parent_id.label("context_parent_id"),
-        literal(value=None, type_=sqlalchemy.Text).label("shared_data"),
-        *STATE_COLUMNS,
+    return (
+        session.query(
+            literal(value=EVENT_STATE_CHANGED, type_=sqlalchemy.String).label(
+                "event_type"
+            ),
+            literal(value=None, type_=sqlalchemy.Text).label("event_data"),
+            States.last_changed_ts.label("time_fired_ts"),
+            States.context_id.label("context_id"),
+            States.context_user_id.label("context_user_id"),
+            States.context_parent_id.label("context_parent_id"),
+            literal(value=None, type_=sqlalchemy.Text).label("shared_data"),
+            *STATE_COLUMNS,
+        )
+        .select_from(States)
+        .join(StatesMeta, (States.metadata_id == StatesMeta.metadata_id))
     )
 
 
@@ -593,13 +602,15 @@ def _generate_legacy_events_context_id_query(
 ) -> Query:
     """Generate a legacy events context id query that also joins states."""
     # This can be removed once we no longer have event_ids in the states table
-    legacy_context_id_query = session.query(
-        *EVENT_COLUMNS,
-        literal(value=None, type_=sqlalchemy.String).label("shared_data"),
-        States.state,
-        States.entity_id,
-        States.attributes,
-        StateAttributes.shared_attrs,
+    legacy_context_id_query = _select_from_events(
+        session.query(
+            *EVENT_COLUMNS,
+            literal(value=None, type_=sqlalchemy.String).label("shared_data"),
+            States.state,
+            StatesMeta.entity_id,
+            States.attributes,
+            StateAttributes.shared_attrs,
+        )
     )
     legacy_context_id_query = _apply_event_time_filter(
         legacy_context_id_query, start_day, end_day
@@ -607,7 +618,8 @@ def _generate_legacy_events_context_id_query(
     return (
         legacy_context_id_query.filter(Events.context_id == context_id)
         .outerjoin(States, (Events.event_id == States.event_id))
-        .filter(States.last_updated == States.last_changed)
+        .outerjoin(StatesMeta, (States.metadata_id == StatesMeta.metadata_id))
+        .filter(States.last_updated_ts == States.last_changed_ts)
         .filter(_not_continuous_entity_matcher())
         .outerjoin(
             StateAttributes, (States.attributes_id == StateAttributes.attributes_id)
@@ -615,9 +627,20 @@ def _generate_legacy_events_context_id_query(
     )
 
 
+def _select_from_events(query: Query) -> Query:
+    """Select from the events table and join event_types for the event_type."""
+    return query.select_from(Events).outerjoin(
+        EventTypes, (Events.event_type_id == EventTypes.event_type_id)
+    )
+
+
 def _generate_events_query_without_states(session: Session) -> Query:
-    return session.query(
-        *EVENT_COLUMNS, EventData.shared_data.label("shared_data"), *EMPTY_STATE_COLUMNS
+    return _select_from_events(
+        session.query(
+            *EVENT_COLUMNS,
+            EventData.shared_data.label("shared_data"),
+            *EMPTY_STATE_COLUMNS,
+        )
     )
 
 
@@ -633,11 +656,20 @@ def _generate_states_query(
         .outerjoin(old_state, (States.old_state_id == old_state.state_id))
         .filter(_missing_state_matcher(old_state))
         .filter(_not_continuous_entity_matcher())
-        .filter((States.last_updated > start_day) & (States.last_updated < end_day))
-        .filter(States.last_updated == States.last_changed)
+        .filter(
+            (States.last_updated_ts > start_day.timestamp())
+            & (States.last_updated_ts < end_day.timestamp())
+        )
+        .filter(States.last_updated_ts == States.last_changed_ts)
     )
     if entity_ids:
-        query = query.filter(States.entity_id.in_(entity_ids))
+        query = query.filter(
+            States.metadata_id.in_(
+                sqlalchemy.select(StatesMeta.metadata_id).where(
+                    StatesMeta.entity_id.in_(entity_ids)
+                )
+            )
+        )
     return query.outerjoin(
         StateAttributes, (States.attributes_id == StateAttributes.attributes_id)
     )
@@ -668,7 +700,7 @@ def _not_continuous_domain_matcher() -> Any:
     """Match not continuous domains."""
     return sqlalchemy.and_(
         *[
-            ~States.entity_id.like(entity_domain)
+            ~StatesMeta.entity_id.like(entity_domain)
             for entity_domain in CONTINUOUS_ENTITY_ID_LIKE
         ],
     ).self_group()
@@ -678,7 +710,7 @@ def _continuous_domain_matcher() -> Any:
     """Match continuous domains."""
     return sqlalchemy.or_(
         *[
-            States.entity_id.like(entity_domain)
+            StatesMeta.entity_id.like(entity_domain)
             for entity_domain in CONTINUOUS_ENTITY_ID_LIKE
         ],
     ).self_group()
@@ -693,7 +725,8 @@ def _not_uom_attributes_matcher() -> Any:
 
 def _apply_event_time_filter(events_query: Query, start_day: dt, end_day: dt) -> Query:
     return events_query.filter(
-        (Events.time_fired > start_day) & (Events.time_fired < end_day)
+        (Events.time_fired_ts > start_day.timestamp())
+        & (Events.time_fired_ts < end_day.timestamp())
     )
 
 
@@ -701,7 +734,11 @@ def _apply_event_types_filter(
     hass: HomeAssistant, query: Query, event_types: list[str]
 ) -> Query:
     return query.filter(
-        Events.event_type.in_(event_types + list(hass.data.get(DOMAIN, {})))
+        Events.event_type_id.in_(
+            sqlalchemy.select(EventTypes.event_type_id).where(
+                EventTypes.event_type.in_(event_types + list(hass.data.get(DOMAIN, {})))
+            )
+        )
     )
 
 
@@ -869,7 +906,9 @@ class LazyEventPartialState:
         self.context_id: str | None = self._row.context_id
         self.context_user_id: str | None = self._row.context_user_id
         self.context_parent_id: str | None = self._row.context_parent_id
-        self.time_fired_minute: int = self._row.time_fired.minute
+        self.time_fired_minute: int = dt_util.utc_from_timestamp(
+            self._row.time_fired_ts
+        ).minute
         self._event_data_cache = event_data_cache
 
     @property
@@ -927,8 +966,7 @@ class LazyEventPartialState:
         """Time event was fired in utc isoformat."""
         if not self._time_fired_isoformat:
             self._time_fired_isoformat = (
-                process_timestamp_to_utc_isoformat(self._row.time_fired)
-                or dt_util.utcnow()
+                timestamp_to_utc_isoformat(self._row.time_fired_ts) or dt_util.utcnow()
             )
 
         return self._time_fired_isoformat
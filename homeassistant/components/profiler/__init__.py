@@ -11,15 +11,19 @@ from typing import Any
 
 import voluptuous as vol
 
-from homeassistant.components import persistent_notification
+from homeassistant.components import persistent_notification, websocket_api
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_SCAN_INTERVAL, CONF_TYPE
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.const import CONF_SCAN_INTERVAL, CONF_TYPE, Platform
+from homeassistant.core import HomeAssistant, ServiceCall, callback
 import homeassistant.helpers.config_validation as cv
-from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.event import (
+    async_scheduled_point_in_time_jobs,
+    async_track_time_interval,
+)
 from homeassistant.helpers.service import async_register_admin_service
 
-from .const import DOMAIN
+from .const import DOMAIN, LISTENER_STATS
+from .listener_stats import ListenerStats
 
 SERVICE_START = "start"
 SERVICE_MEMORY = "memory"
@@ -28,6 +32,8 @@ SERVICE_STOP_LOG_OBJECTS = "stop_log_objects"
 SERVICE_DUMP_LOG_OBJECTS = "dump_log_objects"
 SERVICE_LOG_THREAD_FRAMES = "log_thread_frames"
 SERVICE_LOG_EVENT_LOOP_SCHEDULED = "log_event_loop_scheduled"
+SERVICE_START_LISTENER_STATS = "start_listener_stats"
+SERVICE_STOP_LISTENER_STATS = "stop_listener_stats"
 
 
 SERVICES = (
@@ -38,11 +44,18 @@ SERVICES = (
     SERVICE_DUMP_LOG_OBJECTS,
     SERVICE_LOG_THREAD_FRAMES,
     SERVICE_LOG_EVENT_LOOP_SCHEDULED,
+    SERVICE_START_LISTENER_STATS,
+    SERVICE_STOP_LISTENER_STATS,
 )
 
+PLATFORMS = [Platform.SENSOR]
+
 DEFAULT_SCAN_INTERVAL = timedelta(seconds=30)
 
 CONF_SECONDS = "seconds"
+CONF_SAMPLE_INTERVAL = "sample_interval"
+
+DEFAULT_SAMPLE_INTERVAL = 10
 
 LOG_INTERVAL_SUB = "log_interval_subscription"
 
@@ -129,6 +142,21 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
                 "".join(traceback.format_stack(frames.get(thread.ident))).strip(),
             )
 
+    @callback
+    def _async_start_listener_stats(call: ServiceCall) -> None:
+        """Start timing a sample of the event listeners."""
+        listener_stats = ListenerStats(call.data[CONF_SAMPLE_INTERVAL])
+        domain_data[LISTENER_STATS] = listener_stats
+        hass.bus.async_set_job_timer(
+            listener_stats.async_record, listener_stats.sample_interval
+        )
+
+    @callback
+    def _async_stop_listener_stats(call: ServiceCall) -> None:
+        """Stop timing the event listeners."""
+        if domain_data.pop(LISTENER_STATS, None) is not None:
+            hass.bus.async_set_job_timer(None)
+
     async def _async_dump_scheduled(call: ServiceCall) -> None:
         """Log all scheduled in the event loop."""
         arepr = reprlib.aRepr
@@ -140,6 +168,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             for handle in hass.loop._scheduled:  # pylint: disable=protected-access
                 if not handle.cancelled():
                     _LOGGER.critical("Scheduled: %s", handle)
+            for point_in_time, job in async_scheduled_point_in_time_jobs(hass):
+                _LOGGER.critical("Scheduled at %s: %s", point_in_time, job)
         finally:
             arepr.max_string = original_maxstring
             arepr.max_other = original_maxother
@@ -207,19 +237,65 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         _async_dump_scheduled,
     )
 
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_START_LISTENER_STATS,
+        _async_start_listener_stats,
+        schema=vol.Schema(
+            {
+                vol.Optional(
+                    CONF_SAMPLE_INTERVAL, default=DEFAULT_SAMPLE_INTERVAL
+                ): vol.All(vol.Coerce(int), vol.Range(min=1))
+            }
+        ),
+    )
+
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_STOP_LISTENER_STATS,
+        _async_stop_listener_stats,
+    )
+
+    websocket_api.async_register_command(hass, websocket_listener_stats)
+
+    hass.config_entries.async_setup_platforms(entry, PLATFORMS)
+
     return True
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
+    if not await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
+        return False
     for service in SERVICES:
         hass.services.async_remove(domain=DOMAIN, service=service)
     if LOG_INTERVAL_SUB in hass.data[DOMAIN]:
         hass.data[DOMAIN][LOG_INTERVAL_SUB]()
+    if LISTENER_STATS in hass.data[DOMAIN]:
+        hass.bus.async_set_job_timer(None)
     hass.data.pop(DOMAIN)
     return True
 
 
+@websocket_api.require_admin
+@websocket_api.websocket_command({vol.Required("type"): "profiler/listener_stats"})
+@callback
+def websocket_listener_stats(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Return the timing statistics of the event listeners."""
+    listener_stats: ListenerStats | None = hass.data.get(DOMAIN, {}).get(LISTENER_STATS)
+    if listener_stats is None:
+        connection.send_result(msg["id"], {"running": False})
+        return
+
+    connection.send_result(
+        msg["id"], {"running": True, **listener_stats.async_as_dict()}
+    )
+
+
 async def _async_generate_profile(hass: HomeAssistant, call: ServiceCall):
     # Imports deferred to avoid loading modules
     # in memory since usually only one part of this
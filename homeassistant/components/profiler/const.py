@@ -2,3 +2,5 @@
 
 DOMAIN = "profiler"
 DEFAULT_NAME = "Profiler"
+
+LISTENER_STATS = "listener_stats"
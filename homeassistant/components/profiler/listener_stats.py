@@ -0,0 +1,115 @@
+"""Collect timing statistics of event listeners."""
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, field
+import functools
+from typing import Any
+
+from homeassistant.core import HassJob, callback
+
+MAX_SAMPLES = 1000
+
+
+def _integration_from_module(module: str) -> str:
+    """Return the integration a module belongs to."""
+    parts = module.split(".")
+    if parts[0] == "homeassistant":
+        if len(parts) > 2 and parts[1] == "components":
+            return parts[2]
+        return "homeassistant"
+    if parts[0] == "custom_components" and len(parts) > 1:
+        return parts[1]
+    return parts[0]
+
+
+@dataclass
+class TimingStats:
+    """Call count and durations of listener runs."""
+
+    calls: int = 0
+    total: float = 0.0
+    samples: deque[float] = field(default_factory=lambda: deque(maxlen=MAX_SAMPLES))
+
+    def add(self, duration: float) -> None:
+        """Add the duration of a listener run."""
+        self.calls += 1
+        self.total += duration
+        self.samples.append(duration)
+
+    @property
+    def p99(self) -> float:
+        """Return the 99th percentile of the most recent durations."""
+        if not (ordered := sorted(self.samples)):
+            return 0.0
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a dictionary representation of the statistics."""
+        return {
+            "calls": self.calls,
+            "total_ms": self.total * 1000,
+            "mean_ms": self.total / self.calls * 1000 if self.calls else 0.0,
+            "p99_ms": self.p99 * 1000,
+        }
+
+
+class ListenerStats:
+    """Record the duration of sampled event listener runs.
+
+    Listeners are grouped by the module and qualified name of their
+    target so all instances of an entity class share a single entry
+    and no reference to the listener is kept.
+    """
+
+    def __init__(self, sample_interval: int) -> None:
+        """Initialize the listener statistics."""
+        self.sample_interval = sample_interval
+        self.summary = TimingStats()
+        self.integrations: dict[str, TimingStats] = {}
+        self.listeners: dict[str, tuple[str, TimingStats]] = {}
+
+    @callback
+    def async_record(self, job: HassJob[Any], duration: float) -> None:
+        """Record the duration of a listener run."""
+        target = job.target
+        while isinstance(target, functools.partial):
+            target = target.func
+        module = getattr(target, "__module__", None) or "unknown"
+        name = getattr(target, "__qualname__", None) or type(target).__qualname__
+        listener = f"{module}.{name}"
+        if (listener_stats := self.listeners.get(listener)) is None:
+            integration = _integration_from_module(module)
+            listener_stats = self.listeners[listener] = (integration, TimingStats())
+            self.integrations.setdefault(integration, TimingStats())
+        integration, stats = listener_stats
+        stats.add(duration)
+        self.integrations[integration].add(duration)
+        self.summary.add(duration)
+
+    @callback
+    def async_slowest_integration(self) -> str | None:
+        """Return the integration whose listeners took the most time."""
+        if not self.integrations:
+            return None
+        return max(self.integrations, key=lambda name: self.integrations[name].total)
+
+    @callback
+    def async_as_dict(self) -> dict[str, Any]:
+        """Return the statistics, slowest listeners first."""
+        return {
+            "sample_interval": self.sample_interval,
+            **self.summary.as_dict(),
+            "integrations": {
+                integration: stats.as_dict()
+                for integration, stats in self.integrations.items()
+            },
+            "listeners": [
+                {"listener": listener, "integration": integration, **stats.as_dict()}
+                for listener, (integration, stats) in sorted(
+                    self.listeners.items(),
+                    key=lambda item: item[1][1].total,
+                    reverse=True,
+                )
+            ],
+        }
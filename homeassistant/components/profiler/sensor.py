@@ -0,0 +1,102 @@
+"""Sensors reporting the timing statistics of event listeners."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import timedelta
+
+from homeassistant.components.sensor import (
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import TIME_MILLISECONDS
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity import EntityCategory
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.typing import StateType
+
+from .const import DOMAIN, LISTENER_STATS
+from .listener_stats import ListenerStats
+
+SCAN_INTERVAL = timedelta(seconds=30)
+
+
+@dataclass
+class ProfilerSensorEntityDescriptionMixin:
+    """Mixin for required keys."""
+
+    value_fn: Callable[[ListenerStats], StateType]
+
+
+@dataclass
+class ProfilerSensorEntityDescription(
+    SensorEntityDescription, ProfilerSensorEntityDescriptionMixin
+):
+    """Describes a profiler sensor entity."""
+
+
+SENSOR_TYPES: tuple[ProfilerSensorEntityDescription, ...] = (
+    ProfilerSensorEntityDescription(
+        key="listener_calls",
+        name="Listener calls",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda stats: stats.summary.calls,
+    ),
+    ProfilerSensorEntityDescription(
+        key="listener_time",
+        name="Listener time",
+        native_unit_of_measurement=TIME_MILLISECONDS,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda stats: round(stats.summary.total * 1000, 3),
+    ),
+    ProfilerSensorEntityDescription(
+        key="listener_p99",
+        name="Listener p99",
+        native_unit_of_measurement=TIME_MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda stats: round(stats.summary.p99 * 1000, 3),
+    ),
+    ProfilerSensorEntityDescription(
+        key="slowest_integration",
+        name="Slowest integration",
+        value_fn=lambda stats: stats.async_slowest_integration(),
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the profiler sensors from a config entry."""
+    async_add_entities(
+        ProfilerSensor(entry, description) for description in SENSOR_TYPES
+    )
+
+
+class ProfilerSensor(SensorEntity):
+    """Report a statistic of the sampled event listener runs."""
+
+    entity_description: ProfilerSensorEntityDescription
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(
+        self, entry: ConfigEntry, description: ProfilerSensorEntityDescription
+    ) -> None:
+        """Initialize the profiler sensor."""
+        self.entity_description = description
+        self._attr_name = f"{entry.title} {description.name}"
+        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the statistic, or None when listeners are not being timed."""
+        listener_stats: ListenerStats | None = self.hass.data[DOMAIN].get(
+            LISTENER_STATS
+        )
+        if listener_stats is None:
+            return None
+        return self.entity_description.value_fn(listener_stats)
@@ -45,12 +45,16 @@ DEFAULT_COMMIT_INTERVAL = 1
 CONF_AUTO_PURGE = "auto_purge"
 CONF_AUTO_REPACK = "auto_repack"
 CONF_DB_URL = "db_url"
+CONF_DB_READ_URL = "db_read_url"
 CONF_DB_MAX_RETRIES = "db_max_retries"
 CONF_DB_RETRY_WAIT = "db_retry_wait"
 CONF_PURGE_KEEP_DAYS = "purge_keep_days"
 CONF_PURGE_INTERVAL = "purge_interval"
 CONF_EVENT_TYPES = "event_types"
 CONF_COMMIT_INTERVAL = "commit_interval"
+CONF_BATCHED_WRITES = "batched_writes"
+CONF_HISTORY_DOWNSAMPLE_AFTER = "history_downsample_after"
+CONF_HISTORY_DOWNSAMPLE_NUMERIC_SENSORS = "history_downsample_numeric_sensors"
 
 
 EXCLUDE_SCHEMA = INCLUDE_EXCLUDE_FILTER_SCHEMA_INNER.extend(
@@ -88,9 +92,17 @@ CONFIG_SCHEMA = vol.Schema(
                     ),
                     vol.Optional(CONF_PURGE_INTERVAL, default=1): cv.positive_int,
                     vol.Optional(CONF_DB_URL): vol.All(cv.string, validate_db_url),
+                    vol.Optional(CONF_DB_READ_URL): vol.All(cv.string, validate_db_url),
                     vol.Optional(
                         CONF_COMMIT_INTERVAL, default=DEFAULT_COMMIT_INTERVAL
                     ): cv.positive_int,
+                    vol.Optional(CONF_BATCHED_WRITES, default=False): cv.boolean,
+                    vol.Optional(CONF_HISTORY_DOWNSAMPLE_AFTER): vol.All(
+                        cv.time_period, cv.positive_timedelta
+                    ),
+                    vol.Optional(
+                        CONF_HISTORY_DOWNSAMPLE_NUMERIC_SENSORS, default=False
+                    ): cv.boolean,
                     vol.Optional(
                         CONF_DB_MAX_RETRIES, default=DEFAULT_DB_MAX_RETRIES
                     ): cv.positive_int,
@@ -137,11 +149,15 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     auto_repack = conf[CONF_AUTO_REPACK]
     keep_days = conf[CONF_PURGE_KEEP_DAYS]
     commit_interval = conf[CONF_COMMIT_INTERVAL]
+    batched_writes = conf[CONF_BATCHED_WRITES]
+    history_downsample_after = conf.get(CONF_HISTORY_DOWNSAMPLE_AFTER)
+    history_downsample_numeric_sensors = conf[CONF_HISTORY_DOWNSAMPLE_NUMERIC_SENSORS]
     db_max_retries = conf[CONF_DB_MAX_RETRIES]
     db_retry_wait = conf[CONF_DB_RETRY_WAIT]
     db_url = conf.get(CONF_DB_URL) or DEFAULT_URL.format(
         hass_config_path=hass.config.path(DEFAULT_DB_FILE)
     )
+    db_read_url = conf.get(CONF_DB_READ_URL)
     exclude = conf[CONF_EXCLUDE]
     exclude_t = exclude.get(CONF_EVENT_TYPES, [])
     if EVENT_STATE_CHANGED in exclude_t:
@@ -156,12 +172,18 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         keep_days=keep_days,
         commit_interval=commit_interval,
         uri=db_url,
+        read_uri=db_read_url,
         db_max_retries=db_max_retries,
         db_retry_wait=db_retry_wait,
         entity_filter=entity_filter,
         exclude_t=exclude_t,
         exclude_attributes_by_domain=exclude_attributes_by_domain,
+        batched_writes=batched_writes,
+        history_downsample_after=history_downsample_after,
+        history_downsample_numeric_sensors=history_downsample_numeric_sensors,
     )
+    await instance.async_load_purge_progress()
+    await instance.async_load_numeric_sensor_statistics()
     instance.async_initialize()
     instance.async_register()
     instance.start()
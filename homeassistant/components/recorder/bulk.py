@@ -0,0 +1,177 @@
+"""Bulk insert support for the recorder event session."""
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy import func, select
+from sqlalchemy.orm.session import Session
+
+from homeassistant.core import Event, State
+
+from .const import SupportedDialect
+from .models import (
+    EVENT_ORIGIN_TO_IDX,
+    EventData,
+    Events,
+    EventTypes,
+    StateAttributes,
+    States,
+    StatesMeta,
+)
+
+# Dialects where explicitly inserting a primary key value
+# advances the auto increment counter for the table
+BULK_INSERT_DIALECTS = {SupportedDialect.SQLITE, SupportedDialect.MYSQL}
+
+
+class PendingState:
+    """A state row waiting to be bulk inserted at the next commit.
+
+    The state_id is allocated in memory so later states of the
+    same entity can link to it before it has been written.
+    """
+
+    __slots__ = ("state_id", "row", "state_attributes", "states_meta")
+
+    def __init__(
+        self,
+        state_id: int,
+        row: dict[str, Any],
+        state_attributes: StateAttributes | None,
+        states_meta: StatesMeta | None,
+    ) -> None:
+        """Init the pending state."""
+        self.state_id = state_id
+        self.row = row
+        self.state_attributes = state_attributes
+        self.states_meta = states_meta
+
+
+class BulkInserter:
+    """Buffer states and events as plain rows and insert them per commit.
+
+    This bypasses the ORM unit of work for the two tables that
+    receive almost every write. New StateAttributes and EventData
+    rows, along with new StatesMeta and EventTypes rows, are still
+    added to the session so their ids are known after the session
+    is flushed.
+    """
+
+    def __init__(self, next_state_id: int) -> None:
+        """Init the bulk inserter."""
+        self._next_state_id = next_state_id
+        self._states: list[PendingState] = []
+        self._events: list[
+            tuple[dict[str, Any], EventData | None, EventTypes | None]
+        ] = []
+
+    @property
+    def has_pending_writes(self) -> bool:
+        """Return if there are rows waiting to be inserted."""
+        return bool(self._states or self._events)
+
+    def add_event(
+        self,
+        event: Event,
+        data_id: int | None,
+        event_data: EventData | None,
+        event_type_id: int | None,
+        event_type: EventTypes | None,
+    ) -> None:
+        """Buffer an event row."""
+        context = event.context
+        self._events.append(
+            (
+                {
+                    "event_type": None,
+                    "event_type_id": event_type_id,
+                    "event_data": None,
+                    "origin_idx": EVENT_ORIGIN_TO_IDX.get(event.origin),
+                    "time_fired": event.time_fired,
+                    "time_fired_ts": event.time_fired.timestamp(),
+                    "context_id": context.id,
+                    "context_user_id": context.user_id,
+                    "context_parent_id": context.parent_id,
+                    "data_id": data_id,
+                },
+                event_data,
+                event_type,
+            )
+        )
+
+    def add_state(
+        self,
+        event: Event,
+        attributes_id: int | None,
+        state_attributes: StateAttributes | None,
+        metadata_id: int | None,
+        states_meta: StatesMeta | None,
+        old_state_id: int | None,
+    ) -> PendingState:
+        """Buffer a state row from a state_changed event."""
+        context = event.context
+        state: State | None = event.data.get("new_state")
+        state_id = self._next_state_id
+        self._next_state_id += 1
+        row = {
+            "state_id": state_id,
+            "entity_id": None,
+            "metadata_id": metadata_id,
+            "attributes": None,
+            "attributes_id": attributes_id,
+            "old_state_id": old_state_id,
+            "context_id": context.id,
+            "context_user_id": context.user_id,
+            "context_parent_id": context.parent_id,
+            "origin_idx": EVENT_ORIGIN_TO_IDX.get(event.origin),
+        }
+        # None state means the state was removed from the state machine
+        if state is None:
+            row["state"] = None
+            time_fired_ts = event.time_fired.timestamp()
+            row["last_changed"] = row["last_updated"] = event.time_fired
+            row["last_changed_ts"] = row["last_updated_ts"] = time_fired_ts
+        else:
+            row["state"] = state.state
+            row["last_changed"] = state.last_changed
+            row["last_updated"] = state.last_updated
+            row["last_changed_ts"] = state.last_changed.timestamp()
+            row["last_updated_ts"] = state.last_updated.timestamp()
+        pending = PendingState(state_id, row, state_attributes, states_meta)
+        self._states.append(pending)
+        return pending
+
+    def write(self, session: Session) -> None:
+        """Insert the buffered rows with one executemany per table."""
+        # Flush first so pending StateAttributes, EventData, StatesMeta
+        # and EventTypes have ids
+        session.flush()
+        if self._events:
+            event_rows = []
+            for row, event_data, event_type in self._events:
+                if event_data is not None:
+                    row["data_id"] = event_data.data_id
+                if event_type is not None:
+                    row["event_type_id"] = event_type.event_type_id
+                event_rows.append(row)
+            session.execute(Events.__table__.insert(), event_rows)
+            self._events = []
+        if self._states:
+            state_rows = []
+            for pending in self._states:
+                if pending.state_attributes is not None:
+                    pending.row[
+                        "attributes_id"
+                    ] = pending.state_attributes.attributes_id
+                    pending.state_attributes = None
+                if pending.states_meta is not None:
+                    pending.row["metadata_id"] = pending.states_meta.metadata_id
+                    pending.states_meta = None
+                state_rows.append(pending.row)
+            session.execute(States.__table__.insert(), state_rows)
+            self._states = []
+
+
+def next_state_id(session: Session) -> int:
+    """Return the next free state_id in the database."""
+    return (session.execute(select(func.max(States.state_id))).scalar() or 0) + 1
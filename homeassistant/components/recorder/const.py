@@ -24,7 +24,20 @@ MAX_QUEUE_BACKLOG = 40000
 # have upgraded their sqlite version
 MAX_ROWS_TO_PURGE = 998
 
+# The progress of a running purge is saved here so it
+# can resume after a restart
+PURGE_PROGRESS_STORAGE_KEY = f"{DOMAIN}.purge_progress"
+PURGE_PROGRESS_STORAGE_VERSION = 1
+PURGE_PROGRESS_SAVE_DELAY = 10
+
+# The sensors without state class statistics are compiled for are saved
+# here so their statistics can be cleared when that is turned off
+NUMERIC_SENSOR_STATISTICS_STORAGE_KEY = f"{DOMAIN}.numeric_sensor_statistics"
+NUMERIC_SENSOR_STATISTICS_STORAGE_VERSION = 1
+NUMERIC_SENSOR_STATISTICS_SAVE_DELAY = 10
+
 DB_WORKER_PREFIX = "DbWorker"
+DB_READER_PREFIX = "DbReader"
 
 JSON_DUMP: Final = partial(json.dumps, cls=JSONEncoder, separators=(",", ":"))
 
@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 import asyncio
-from collections.abc import Callable, Iterable
+from collections.abc import Callable, Iterable, Mapping
 import contextlib
 from datetime import datetime, timedelta
 import logging
@@ -18,6 +18,7 @@ from sqlalchemy.engine import Engine
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import scoped_session, sessionmaker
 from sqlalchemy.orm.session import Session
+from sqlalchemy.pool import QueuePool
 
 from homeassistant.components import persistent_notification
 from homeassistant.const import (
@@ -34,13 +35,22 @@ from homeassistant.helpers.event import (
     async_track_time_interval,
     async_track_utc_time_change,
 )
+from homeassistant.helpers.storage import Store
 import homeassistant.util.dt as dt_util
 
 from . import migration, statistics
+from .bulk import BULK_INSERT_DIALECTS, BulkInserter, PendingState, next_state_id
 from .const import (
+    DB_READER_PREFIX,
     DB_WORKER_PREFIX,
     KEEPALIVE_TIME,
     MAX_QUEUE_BACKLOG,
+    NUMERIC_SENSOR_STATISTICS_SAVE_DELAY,
+    NUMERIC_SENSOR_STATISTICS_STORAGE_KEY,
+    NUMERIC_SENSOR_STATISTICS_STORAGE_VERSION,
+    PURGE_PROGRESS_SAVE_DELAY,
+    PURGE_PROGRESS_STORAGE_KEY,
+    PURGE_PROGRESS_STORAGE_VERSION,
     SQLITE_URL_PREFIX,
     SupportedDialect,
 )
@@ -50,15 +60,23 @@ from .models import (
     Base,
     EventData,
     Events,
+    EventTypes,
     StateAttributes,
     States,
+    StatesMeta,
     StatisticData,
     StatisticMetaData,
     StatisticsRuns,
     process_timestamp,
 )
 from .pool import POOL_SIZE, MutexPool, RecorderPool
-from .queries import find_shared_attributes_id, find_shared_data_id
+from .purge import PurgeProgress
+from .queries import (
+    find_event_type_id,
+    find_shared_attributes_id,
+    find_shared_data_id,
+    find_states_metadata_id,
+)
 from .run_history import RunHistory
 from .tasks import (
     AdjustStatisticsTask,
@@ -79,6 +97,7 @@ from .tasks import (
 from .util import (
     dburl_to_path,
     end_incomplete_runs,
+    execute_on_connection,
     is_second_sunday,
     move_away_broken_database,
     session_scope,
@@ -106,6 +125,13 @@ EXPIRE_AFTER_COMMITS = 120
 STATE_ATTRIBUTES_ID_CACHE_SIZE = 2048
 EVENT_DATA_ID_CACHE_SIZE = 2048
 
+# The number of entity_id and event_type ids to cache in memory
+#
+# There is one states_meta row per entity so this is sized
+# to hold every entity on most systems.
+STATES_META_ID_CACHE_SIZE = 8192
+EVENT_TYPE_ID_CACHE_SIZE = 2048
+
 SHUTDOWN_TASK = object()
 
 COMMIT_TASK = CommitTask()
@@ -122,6 +148,11 @@ CONNECTIVITY_ERR = "Error in database connectivity during commit"
 # Pool size must accommodate Recorder thread + All db executors
 MAX_DB_EXECUTOR_WORKERS = POOL_SIZE - 1
 
+# History, logbook and statistics reads run on their own executor
+# with a dedicated connection pool so they do not compete with
+# the writes done by the recorder thread
+MAX_DB_READ_EXECUTOR_WORKERS = 4
+
 
 class Recorder(threading.Thread):
     """A threaded recorder class."""
@@ -141,6 +172,10 @@ class Recorder(threading.Thread):
         entity_filter: Callable[[str], bool],
         exclude_t: list[str],
         exclude_attributes_by_domain: dict[str, set[str]],
+        batched_writes: bool,
+        read_uri: str | None = None,
+        history_downsample_after: timedelta | None = None,
+        history_downsample_numeric_sensors: bool = False,
     ) -> None:
         """Initialize the recorder."""
         threading.Thread.__init__(self, name="Recorder")
@@ -151,14 +186,19 @@ class Recorder(threading.Thread):
         self.keep_days = keep_days
         self._hass_started: asyncio.Future[object] = asyncio.Future()
         self.commit_interval = commit_interval
+        self.batched_writes = batched_writes
+        self.history_downsample_after = history_downsample_after
+        self.history_downsample_numeric_sensors = history_downsample_numeric_sensors
         self._queue: queue.SimpleQueue[RecorderTask] = queue.SimpleQueue()
         self.db_url = uri
+        self.db_read_url = read_uri
         self.db_max_retries = db_max_retries
         self.db_retry_wait = db_retry_wait
         self.async_db_ready: asyncio.Future[bool] = asyncio.Future()
         self.async_recorder_ready = asyncio.Event()
         self._queue_watch = threading.Event()
         self.engine: Engine | None = None
+        self.read_engine: Engine | None = None
         self.run_history = RunHistory()
 
         self.entity_filter = entity_filter
@@ -166,21 +206,39 @@ class Recorder(threading.Thread):
 
         self.schema_version = 0
         self._commits_without_expire = 0
-        self._old_states: dict[str, States] = {}
+        self._old_states: dict[str, States | PendingState] = {}
         self._state_attributes_ids: LRU = LRU(STATE_ATTRIBUTES_ID_CACHE_SIZE)
         self._event_data_ids: LRU = LRU(EVENT_DATA_ID_CACHE_SIZE)
+        self._states_meta_ids: LRU = LRU(STATES_META_ID_CACHE_SIZE)
+        self._event_type_ids: LRU = LRU(EVENT_TYPE_ID_CACHE_SIZE)
         self._pending_state_attributes: dict[str, StateAttributes] = {}
+        self._last_shared_attrs: dict[str, tuple[Mapping[str, Any], str]] = {}
         self._pending_event_data: dict[str, EventData] = {}
+        self._pending_states_meta: dict[str, StatesMeta] = {}
+        self._pending_event_types: dict[str, EventTypes] = {}
         self._pending_expunge: list[States] = []
+        self._bulk_inserter: BulkInserter | None = None
         self.event_session: Session | None = None
         self._get_session: Callable[[], Session] | None = None
+        self._get_read_session: Callable[[], Session] | None = None
         self._completed_first_database_setup: bool | None = None
         self.async_migration_event = asyncio.Event()
         self.migration_in_progress = False
         self._db_supports_row_number = True
         self._database_lock_task: DatabaseLockTask | None = None
         self._db_executor: DBInterruptibleThreadPoolExecutor | None = None
+        self._db_read_executor: DBInterruptibleThreadPoolExecutor | None = None
         self._exclude_attributes_by_domain = exclude_attributes_by_domain
+        self.purge_progress: PurgeProgress | None = None
+        self._purge_progress_store: Store = Store(
+            hass, PURGE_PROGRESS_STORAGE_VERSION, PURGE_PROGRESS_STORAGE_KEY
+        )
+        self.numeric_sensor_statistic_ids: set[str] = set()
+        self._numeric_sensor_statistics_store: Store = Store(
+            hass,
+            NUMERIC_SENSOR_STATISTICS_STORAGE_VERSION,
+            NUMERIC_SENSOR_STATISTICS_STORAGE_KEY,
+        )
 
         self._event_listener: CALLBACK_TYPE | None = None
         self._queue_watcher: CALLBACK_TYPE | None = None
@@ -220,6 +278,15 @@ class Recorder(threading.Thread):
             raise RuntimeError("The database connection has not been established")
         return self._get_session()
 
+    def get_read_session(self) -> Session:
+        """Get a new sqlalchemy session for read only queries.
+
+        Falls back to the recorder session if there is no read engine.
+        """
+        if self._get_read_session is None:
+            return self.get_session()
+        return self._get_read_session()
+
     def queue_task(self, task: RecorderTask) -> None:
         """Add a task to the recorder queue."""
         self._queue.put(task)
@@ -236,12 +303,22 @@ class Recorder(threading.Thread):
             max_workers=MAX_DB_EXECUTOR_WORKERS,
             shutdown_hook=self._shutdown_pool,
         )
+        self._db_read_executor = DBInterruptibleThreadPoolExecutor(
+            thread_name_prefix=DB_READER_PREFIX,
+            max_workers=MAX_DB_READ_EXECUTOR_WORKERS,
+            shutdown_hook=self._shutdown_read_pool,
+        )
 
     def _shutdown_pool(self) -> None:
         """Close the dbpool connections in the current thread."""
         if self.engine and hasattr(self.engine.pool, "shutdown"):
             self.engine.pool.shutdown()
 
+    def _shutdown_read_pool(self) -> None:
+        """Remove the read session bound to the current thread."""
+        if isinstance(self._get_read_session, scoped_session):
+            self._get_read_session.remove()
+
     @callback
     def async_initialize(self) -> None:
         """Initialize the recorder."""
@@ -277,11 +354,26 @@ class Recorder(threading.Thread):
         """Add an executor job from within the event loop."""
         return self.hass.loop.run_in_executor(self._db_executor, target, *args)
 
+    @callback
+    def async_add_read_executor_job(
+        self, target: Callable[..., T], *args: Any
+    ) -> asyncio.Future[T]:
+        """Add a read only executor job from within the event loop.
+
+        The job runs on the read executor when a read engine is available,
+        otherwise it runs on the database executor.
+        """
+        executor = self._db_read_executor if self.read_engine else self._db_executor
+        return self.hass.loop.run_in_executor(executor, target, *args)
+
     def _stop_executor(self) -> None:
         """Stop the executor."""
         assert self._db_executor is not None
         self._db_executor.shutdown()
         self._db_executor = None
+        if self._db_read_executor is not None:
+            self._db_read_executor.shutdown()
+            self._db_read_executor = None
 
     @callback
     def _async_check_queue(self, *_: Any) -> None:
@@ -417,9 +509,82 @@ class Recorder(threading.Thread):
     @callback
     def _async_recorder_ready(self) -> None:
         """Finish start and mark recorder ready."""
+        self._async_clear_numeric_sensor_statistics()
         self._async_setup_periodic_tasks()
+        self._async_resume_purge()
         self.async_recorder_ready.set()
 
+    @property
+    def compile_numeric_sensor_statistics(self) -> bool:
+        """Return True if statistics are compiled for sensors without state class."""
+        return (
+            self.history_downsample_after is not None
+            and self.history_downsample_numeric_sensors
+        )
+
+    async def async_load_numeric_sensor_statistics(self) -> None:
+        """Load the sensors without state class statistics were compiled for."""
+        if data := await self._numeric_sensor_statistics_store.async_load():
+            self.numeric_sensor_statistic_ids = set(cast(dict, data)["statistic_ids"])
+
+    @callback
+    def async_save_numeric_sensor_statistics(self) -> None:
+        """Save the sensors without state class statistics are compiled for."""
+        self._numeric_sensor_statistics_store.async_delay_save(
+            self._numeric_sensor_statistics_data, NUMERIC_SENSOR_STATISTICS_SAVE_DELAY
+        )
+
+    def _numeric_sensor_statistics_data(self) -> dict[str, Any]:
+        """Return the sensors without state class to save."""
+        return {"statistic_ids": sorted(self.numeric_sensor_statistic_ids)}
+
+    @callback
+    def _async_clear_numeric_sensor_statistics(self) -> None:
+        """Clear the statistics of sensors without state class.
+
+        This is done when compiling them has been turned off.
+        """
+        if (
+            self.compile_numeric_sensor_statistics
+            or not self.numeric_sensor_statistic_ids
+        ):
+            return
+        self.async_clear_statistics(sorted(self.numeric_sensor_statistic_ids))
+        self.numeric_sensor_statistic_ids = set()
+        self.async_save_numeric_sensor_statistics()
+
+    async def async_load_purge_progress(self) -> None:
+        """Load the progress of a purge that was running at shutdown."""
+        if data := await self._purge_progress_store.async_load():
+            self.purge_progress = PurgeProgress.from_dict(cast(dict, data))
+
+    @callback
+    def async_save_purge_progress(self) -> None:
+        """Save the progress of the current purge."""
+        self._purge_progress_store.async_delay_save(
+            self._purge_progress_data, PURGE_PROGRESS_SAVE_DELAY
+        )
+
+    def _purge_progress_data(self) -> dict[str, Any] | None:
+        """Return the purge progress to save."""
+        if (progress := self.purge_progress) is None or progress.finished:
+            return None
+        return progress.as_dict()
+
+    @callback
+    def _async_resume_purge(self) -> None:
+        """Continue a purge that did not finish before the last shutdown."""
+        if (progress := self.purge_progress) is None or progress.finished:
+            return
+        _LOGGER.debug(
+            "Resuming purge before %s after %s batches",
+            progress.purge_before,
+            progress.batches,
+        )
+        self.queue_task(
+            PurgeTask(progress.purge_before, progress.repack, progress.apply_filter)
+        )
+
     @callback
     def async_nightly_tasks(self, now: datetime) -> None:
         """Trigger the purge."""
@@ -719,49 +884,127 @@ class Recorder(threading.Thread):
                 return cast(int, data_id[0])
         return None
 
+    def _find_event_type_in_db(self, event_type: str) -> int | None:
+        """Find an event_type_id in the db from the event_type."""
+        # See _find_shared_data_in_db for why this does not flush
+        assert self.event_session is not None
+        with self.event_session.no_autoflush:
+            if event_type_id := self.event_session.execute(
+                find_event_type_id(event_type)
+            ).first():
+                return cast(int, event_type_id[0])
+        return None
+
+    def _find_states_metadata_in_db(self, entity_id: str) -> int | None:
+        """Find a states metadata_id in the db from the entity_id."""
+        # See _find_shared_data_in_db for why this does not flush
+        assert self.event_session is not None
+        with self.event_session.no_autoflush:
+            if metadata_id := self.event_session.execute(
+                find_states_metadata_id(entity_id)
+            ).first():
+                return cast(int, metadata_id[0])
+        return None
+
+    def _get_event_type_id(
+        self, event_type: str
+    ) -> tuple[int | None, EventTypes | None]:
+        """Return the event_type_id or the pending EventTypes for an event type."""
+        assert self.event_session is not None
+        # Matching event type found in the pending commit
+        if pending_event_type := self._pending_event_types.get(event_type):
+            return None, pending_event_type
+        # Matching event type id found in the cache
+        if event_type_id := self._event_type_ids.get(event_type):
+            return event_type_id, None
+        # Matching event type found in the database
+        if event_type_id := self._find_event_type_in_db(event_type):
+            self._event_type_ids[event_type] = event_type_id
+            return event_type_id, None
+        # No matching event type found, save it in the DB
+        pending_event_type = EventTypes(event_type=event_type)
+        self._pending_event_types[event_type] = pending_event_type
+        self.event_session.add(pending_event_type)
+        return None, pending_event_type
+
+    def _get_states_metadata_id(
+        self, entity_id: str
+    ) -> tuple[int | None, StatesMeta | None]:
+        """Return the metadata_id or the pending StatesMeta for an entity_id."""
+        assert self.event_session is not None
+        # Matching entity_id found in the pending commit
+        if pending_states_meta := self._pending_states_meta.get(entity_id):
+            return None, pending_states_meta
+        # Matching metadata_id found in the cache
+        if metadata_id := self._states_meta_ids.get(entity_id):
+            return metadata_id, None
+        # Matching entity_id found in the database
+        if metadata_id := self._find_states_metadata_in_db(entity_id):
+            self._states_meta_ids[entity_id] = metadata_id
+            return metadata_id, None
+        # No matching entity_id found, save it in the DB
+        pending_states_meta = StatesMeta(entity_id=entity_id)
+        self._pending_states_meta[entity_id] = pending_states_meta
+        self.event_session.add(pending_states_meta)
+        return None, pending_states_meta
+
     def _process_non_state_changed_event_into_session(self, event: Event) -> None:
         """Process any event into the session except state changed."""
         assert self.event_session is not None
-        dbevent = Events.from_event(event)
-        if not event.data:
-            self.event_session.add(dbevent)
-            return
+        data_id: int | None = None
+        pending_event_data: EventData | None = None
+        if event.data:
+            try:
+                shared_data = EventData.shared_data_from_event(event)
+            except (TypeError, ValueError) as ex:
+                _LOGGER.warning("Event is not JSON serializable: %s: %s", event, ex)
+                return
 
-        try:
-            shared_data = EventData.shared_data_from_event(event)
-        except (TypeError, ValueError) as ex:
-            _LOGGER.warning("Event is not JSON serializable: %s: %s", event, ex)
+            # Matching attributes found in the pending commit
+            pending_event_data = self._pending_event_data.get(shared_data)
+            # Matching attributes id found in the cache
+            if not pending_event_data and not (
+                data_id := self._event_data_ids.get(shared_data)
+            ):
+                data_hash = EventData.hash_shared_data(shared_data)
+                # Matching attributes found in the database
+                if data_id := self._find_shared_data_in_db(data_hash, shared_data):
+                    self._event_data_ids[shared_data] = data_id
+                # No matching attributes found, save them in the DB
+                else:
+                    pending_event_data = EventData(
+                        shared_data=shared_data, hash=data_hash
+                    )
+                    self._pending_event_data[shared_data] = pending_event_data
+                    self.event_session.add(pending_event_data)
+
+        event_type_id, pending_event_type = self._get_event_type_id(event.event_type)
+
+        if self._bulk_inserter is not None:
+            self._bulk_inserter.add_event(
+                event, data_id, pending_event_data, event_type_id, pending_event_type
+            )
             return
 
-        # Matching attributes found in the pending commit
-        if pending_event_data := self._pending_event_data.get(shared_data):
+        dbevent = Events.from_event(event)
+        if pending_event_data:
             dbevent.event_data_rel = pending_event_data
-        # Matching attributes id found in the cache
-        elif data_id := self._event_data_ids.get(shared_data):
+        elif data_id:
             dbevent.data_id = data_id
+        if pending_event_type:
+            dbevent.event_type_rel = pending_event_type
         else:
-            data_hash = EventData.hash_shared_data(shared_data)
-            # Matching attributes found in the database
-            if data_id := self._find_shared_data_in_db(data_hash, shared_data):
-                self._event_data_ids[shared_data] = dbevent.data_id = data_id
-            # No matching attributes found, save them in the DB
-            else:
-                dbevent_data = EventData(shared_data=shared_data, hash=data_hash)
-                dbevent.event_data_rel = self._pending_event_data[
-                    shared_data
-                ] = dbevent_data
-                self.event_session.add(dbevent_data)
-
+            dbevent.event_type_id = event_type_id
         self.event_session.add(dbevent)
 
     def _process_state_changed_event_into_session(self, event: Event) -> None:
         """Process a state_changed event into the session."""
         assert self.event_session is not None
         try:
-            dbstate = States.from_event(event)
-            shared_attrs = StateAttributes.shared_attrs_from_event(
-                event, self._exclude_attributes_by_domain
+            dbstate = (
+                None if self._bulk_inserter is not None else States.from_event(event)
             )
+            shared_attrs = self._shared_attrs_from_event(event)
         except (TypeError, ValueError) as ex:
             _LOGGER.warning(
                 "State is not JSON serializable: %s: %s",
@@ -770,40 +1013,86 @@ class Recorder(threading.Thread):
             )
             return
 
-        dbstate.attributes = None
+        attributes_id: int | None = None
         # Matching attributes found in the pending commit
-        if pending_attributes := self._pending_state_attributes.get(shared_attrs):
-            dbstate.state_attributes = pending_attributes
+        pending_attributes = self._pending_state_attributes.get(shared_attrs)
         # Matching attributes id found in the cache
-        elif attributes_id := self._state_attributes_ids.get(shared_attrs):
-            dbstate.attributes_id = attributes_id
-        else:
+        if not pending_attributes and not (
+            attributes_id := self._state_attributes_ids.get(shared_attrs)
+        ):
             attr_hash = StateAttributes.hash_shared_attrs(shared_attrs)
             # Matching attributes found in the database
             if attributes_id := self._find_shared_attr_in_db(attr_hash, shared_attrs):
-                dbstate.attributes_id = attributes_id
                 self._state_attributes_ids[shared_attrs] = attributes_id
             # No matching attributes found, save them in the DB
             else:
-                dbstate_attributes = StateAttributes(
+                pending_attributes = StateAttributes(
                     shared_attrs=shared_attrs, hash=attr_hash
                 )
-                dbstate.state_attributes = dbstate_attributes
-                self._pending_state_attributes[shared_attrs] = dbstate_attributes
-                self.event_session.add(dbstate_attributes)
+                self._pending_state_attributes[shared_attrs] = pending_attributes
+                self.event_session.add(pending_attributes)
+
+        entity_id: str = event.data["entity_id"]
+        metadata_id, pending_states_meta = self._get_states_metadata_id(entity_id)
+        old_state = self._old_states.pop(entity_id, None)
+
+        if dbstate is None:
+            assert self._bulk_inserter is not None
+            pending_state = self._bulk_inserter.add_state(
+                event,
+                attributes_id,
+                pending_attributes,
+                metadata_id,
+                pending_states_meta,
+                old_state.state_id if old_state else None,
+            )
+            if event.data.get("new_state"):
+                self._old_states[entity_id] = pending_state
+            return
 
-        if old_state := self._old_states.pop(dbstate.entity_id, None):
+        dbstate.attributes = None
+        if pending_attributes:
+            dbstate.state_attributes = pending_attributes
+        else:
+            dbstate.attributes_id = attributes_id
+        if pending_states_meta:
+            dbstate.states_meta_rel = pending_states_meta
+        else:
+            dbstate.metadata_id = metadata_id
+        if old_state:
             if old_state.state_id:
                 dbstate.old_state_id = old_state.state_id
             else:
                 dbstate.old_state = old_state
         if event.data.get("new_state"):
-            self._old_states[dbstate.entity_id] = dbstate
+            self._old_states[entity_id] = dbstate
             self._pending_expunge.append(dbstate)
         else:
             dbstate.state = None
         self.event_session.add(dbstate)
 
+    def _shared_attrs_from_event(self, event: Event) -> str:
+        """Return the shared attributes of a state_changed event.
+
+        The state machine reuses the attributes of the previous state
+        when they did not change, so the JSON of the previous state is
+        reused when the attributes are the same object.
+        """
+        entity_id: str = event.data["entity_id"]
+        if (new_state := event.data.get("new_state")) is None:
+            self._last_shared_attrs.pop(entity_id, None)
+        elif (last := self._last_shared_attrs.get(entity_id)) is not None and last[
+            0
+        ] is new_state.attributes:
+            return last[1]
+
+        shared_attrs = StateAttributes.shared_attrs_from_event(
+            event, self._exclude_attributes_by_domain
+        )
+        if new_state is not None:
+            self._last_shared_attrs[entity_id] = (new_state.attributes, shared_attrs)
+        return shared_attrs
+
     def _handle_database_error(self, err: Exception) -> bool:
         """Handle a database error that may result in moving away the corrupt db."""
         if isinstance(err.__cause__, sqlite3.DatabaseError):
@@ -816,7 +1105,12 @@ class Recorder(threading.Thread):
 
     def _event_session_has_pending_writes(self) -> bool:
         return bool(
-            self.event_session and (self.event_session.new or self.event_session.dirty)
+            self.event_session
+            and (
+                self.event_session.new
+                or self.event_session.dirty
+                or (self._bulk_inserter and self._bulk_inserter.has_pending_writes)
+            )
         )
 
     def _commit_event_session_or_retry(self) -> None:
@@ -853,6 +1147,8 @@ class Recorder(threading.Thread):
                 if dbstate in self.event_session:
                     self.event_session.expunge(dbstate)
             self._pending_expunge = []
+        if self._bulk_inserter is not None:
+            self._bulk_inserter.write(self.event_session)
         self.event_session.commit()
 
         # We just committed the state attributes to the database
@@ -867,6 +1163,12 @@ class Recorder(threading.Thread):
         for event_data in self._pending_event_data.values():
             self._event_data_ids[event_data.shared_data] = event_data.data_id
         self._pending_event_data = {}
+        for states_meta in self._pending_states_meta.values():
+            self._states_meta_ids[states_meta.entity_id] = states_meta.metadata_id
+        self._pending_states_meta = {}
+        for event_type in self._pending_event_types.values():
+            self._event_type_ids[event_type.event_type] = event_type.event_type_id
+        self._pending_event_types = {}
 
         # Expire is an expensive operation (frequently more expensive
         # than the flush and commit itself) so we only
@@ -889,8 +1191,13 @@ class Recorder(threading.Thread):
         self._old_states = {}
         self._state_attributes_ids = {}
         self._event_data_ids = {}
+        self._states_meta_ids = {}
+        self._event_type_ids = {}
         self._pending_state_attributes = {}
         self._pending_event_data = {}
+        self._pending_states_meta = {}
+        self._pending_event_types = {}
+        self._bulk_inserter = None
 
         if not self.event_session:
             return
@@ -912,6 +1219,21 @@ class Recorder(threading.Thread):
         """Open the event session."""
         self.event_session = self.get_session()
         self.event_session.expire_on_commit = False
+        if self.batched_writes:
+            self._open_bulk_inserter()
+
+    def _open_bulk_inserter(self) -> None:
+        """Switch the event session to bulk inserts if the database supports it."""
+        assert self.event_session is not None
+        if self.dialect_name not in BULK_INSERT_DIALECTS:
+            _LOGGER.warning(
+                "Batched writes are not supported with %s, using the default write path",
+                self.dialect_name,
+            )
+            return
+        self._bulk_inserter = BulkInserter(next_state_id(self.event_session))
+        # Release the connection until the first commit
+        self.event_session.rollback()
 
     def _send_keep_alive(self) -> None:
         """Send a keep alive to keep the db connection open."""
@@ -1028,12 +1350,56 @@ class Recorder(threading.Thread):
         self._get_session = scoped_session(sessionmaker(bind=self.engine, future=True))
         _LOGGER.debug("Connected to recorder database")
 
+        if self.db_read_url:
+            self._setup_read_connection(self.db_read_url)
+        elif self._using_file_sqlite:
+            # SQLite runs in WAL mode which allows readers to
+            # run concurrently with the writer
+            self._setup_read_connection(self.db_url)
+
+    def _setup_read_connection(self, url: str) -> None:
+        """Set up the engine used for read only queries."""
+        kwargs: dict[str, Any] = {
+            "pool_size": MAX_DB_READ_EXECUTOR_WORKERS,
+            "max_overflow": 0,
+        }
+        is_sqlite = url.startswith(SQLITE_URL_PREFIX)
+        if is_sqlite:
+            kwargs["connect_args"] = {"check_same_thread": False}
+            kwargs["poolclass"] = QueuePool
+        else:
+            kwargs["echo"] = False
+            kwargs["pool_pre_ping"] = True
+
+        self.read_engine = create_engine(url, **kwargs, future=True)
+
+        def setup_read_connection(
+            dbapi_connection: Any, connection_record: Any
+        ) -> None:
+            """Dbapi specific connection settings for readers."""
+            assert self.read_engine is not None
+            setup_connection_for_dialect(
+                self, self.read_engine.dialect.name, dbapi_connection, False
+            )
+            if is_sqlite:
+                execute_on_connection(dbapi_connection, "PRAGMA query_only = ON")
+
+        sqlalchemy_event.listen(self.read_engine, "connect", setup_read_connection)
+        self._get_read_session = scoped_session(
+            sessionmaker(bind=self.read_engine, future=True)
+        )
+        _LOGGER.debug("Connected to recorder read database")
+
     def _close_connection(self) -> None:
         """Close the connection."""
         assert self.engine is not None
         self.engine.dispose()
         self.engine = None
         self._get_session = None
+        if self.read_engine is not None:
+            self.read_engine.dispose()
+            self.read_engine = None
+        self._get_read_session = None
 
     def _setup_run(self) -> None:
         """Log the start of the current run and schedule any needed jobs."""
@@ -2,29 +2,43 @@
 from __future__ import annotations
 
 from collections import defaultdict
-from collections.abc import Iterable, Iterator, MutableMapping
+from collections.abc import Iterable, Iterator, Mapping, MutableMapping
 from datetime import datetime
 from itertools import groupby
 import logging
+import math
 import time
-from typing import Any, cast
+from typing import Any, Literal, cast
 
 from sqlalchemy import Column, Text, and_, bindparam, func, or_
+from sqlalchemy.engine.row import Row
 from sqlalchemy.ext import baked
+from sqlalchemy.orm.query import Query
 from sqlalchemy.orm.session import Session
 from sqlalchemy.sql.expression import literal
 
 from homeassistant.components import recorder
+from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT
 from homeassistant.core import HomeAssistant, State, split_entity_id
 import homeassistant.util.dt as dt_util
 
 from .models import (
+    TIMESTAMP_TYPE,
     LazyState,
     RecorderRuns,
     StateAttributes,
     States,
+    StatesMeta,
+    Statistics,
+    StatisticsShortTerm,
+    process_datetime_to_timestamp,
     process_timestamp,
-    process_timestamp_to_utc_isoformat,
+    timestamp_to_utc_isoformat,
+)
+from .statistics import (
+    get_display_unit,
+    get_metadata_with_session,
+    statistics_during_period_with_session,
 )
 from .util import execute, session_scope
 
@@ -54,16 +68,16 @@ NEED_ATTRIBUTE_DOMAINS = {
 }
 
 BASE_STATES = [
-    States.entity_id,
+    StatesMeta.entity_id,
     States.state,
-    States.last_changed,
-    States.last_updated,
+    States.last_changed_ts,
+    States.last_updated_ts,
 ]
 BASE_STATES_NO_LAST_UPDATED = [
-    States.entity_id,
+    StatesMeta.entity_id,
     States.state,
-    States.last_changed,
-    literal(value=None, type_=Text).label("last_updated"),
+    States.last_changed_ts,
+    literal(value=None, type_=TIMESTAMP_TYPE).label("last_updated_ts"),
 ]
 QUERY_STATE_NO_ATTR = [
     *BASE_STATES,
@@ -103,6 +117,18 @@ QUERY_STATES_NO_LAST_UPDATED = [
 
 HISTORY_BAKERY = "recorder_history_bakery"
 
+# Number of rows fetched from the cursor at a time when streaming history
+STREAM_BATCH_SIZE = 1000
+
+# When downsampled history is enabled, ranges longer than the configured
+# threshold are served from the 5 minute statistics and ranges longer
+# than this many times the threshold are served from the hourly statistics
+HOURLY_DOWNSAMPLE_FACTOR = 12
+DOWNSAMPLE_PERIOD_DURATION = {
+    "5minute": StatisticsShortTerm.duration,
+    "hour": Statistics.duration,
+}
+
 
 def query_and_join_attributes(
     hass: HomeAssistant, no_attributes: bool
@@ -124,6 +150,23 @@ def query_and_join_attributes(
     return QUERY_STATES, True
 
 
+def _select_from_states(query: Query) -> Query:
+    """Select from the states table and join states_meta for the entity_id."""
+    return query.select_from(States).join(
+        StatesMeta, States.metadata_id == StatesMeta.metadata_id
+    )
+
+
+def _metadata_ids_for_entity_ids(session: Session, entity_ids: list[str]) -> list[int]:
+    """Return the states_meta ids for a list of entity_ids."""
+    return [
+        metadata_id
+        for (metadata_id,) in session.query(StatesMeta.metadata_id).filter(
+            StatesMeta.entity_id.in_(entity_ids)
+        )
+    ]
+
+
 def bake_query_and_join_attributes(
     hass: HomeAssistant, no_attributes: bool, include_last_updated: bool = True
 ) -> tuple[Any, bool]:
@@ -132,6 +175,17 @@ def bake_query_and_join_attributes(
     Because these are baked queries the values inside the lambdas need
     to be explicitly written out to avoid caching the wrong values.
     """
+    baked_query, join_attributes = _bake_query_and_join_attributes(
+        hass, no_attributes, include_last_updated
+    )
+    baked_query += lambda q: _select_from_states(q)
+    return baked_query, join_attributes
+
+
+def _bake_query_and_join_attributes(
+    hass: HomeAssistant, no_attributes: bool, include_last_updated: bool
+) -> tuple[Any, bool]:
+    """Return the initial backed query without the states_meta join."""
     bakery: baked.bakery = hass.data[HISTORY_BAKERY]
     # If no_attributes was requested we do the query
     # without the attributes fields and do not join the
@@ -183,9 +237,10 @@ def get_significant_states(
     significant_changes_only: bool = True,
     minimal_response: bool = False,
     no_attributes: bool = False,
+    current_states: Mapping[str, State] | None = None,
 ) -> MutableMapping[str, list[State | dict[str, Any]]]:
     """Wrap get_significant_states_with_session with an sql session."""
-    with session_scope(hass=hass) as session:
+    with session_scope(hass=hass, read_only=True) as session:
         return get_significant_states_with_session(
             hass,
             session,
@@ -197,10 +252,11 @@ def get_significant_states(
             significant_changes_only,
             minimal_response,
             no_attributes,
+            current_states,
         )
 
 
-def _query_significant_states_with_session(
+def _significant_states_query(
     hass: HomeAssistant,
     session: Session,
     start_time: datetime,
@@ -209,11 +265,11 @@ def _query_significant_states_with_session(
     filters: Any = None,
     significant_changes_only: bool = True,
     no_attributes: bool = False,
-) -> list[States]:
-    """Query the database for significant state changes."""
-    if _LOGGER.isEnabledFor(logging.DEBUG):
-        timer_start = time.perf_counter()
+) -> baked.Result:
+    """Build the query for significant state changes.
 
+    Rows are ordered by entity_id and then by last_updated.
+    """
     baked_query, join_attributes = bake_query_and_join_attributes(hass, no_attributes)
 
     if entity_ids is not None and len(entity_ids) == 1:
@@ -225,28 +281,30 @@ def _query_significant_states_with_session(
                 hass, no_attributes, include_last_updated=False
             )
             baked_query += lambda q: q.filter(
-                States.last_changed == States.last_updated
+                States.last_changed_ts == States.last_updated_ts
             )
     elif significant_changes_only:
         baked_query += lambda q: q.filter(
             or_(
                 *[
-                    States.entity_id.like(entity_domain)
+                    StatesMeta.entity_id.like(entity_domain)
                     for entity_domain in SIGNIFICANT_DOMAINS_ENTITY_ID_LIKE
                 ],
-                (States.last_changed == States.last_updated),
+                (States.last_changed_ts == States.last_updated_ts),
             )
         )
 
+    metadata_ids: list[int] | None = None
     if entity_ids is not None:
+        metadata_ids = _metadata_ids_for_entity_ids(session, entity_ids)
         baked_query += lambda q: q.filter(
-            States.entity_id.in_(bindparam("entity_ids", expanding=True))
+            States.metadata_id.in_(bindparam("metadata_ids", expanding=True))
         )
     else:
         baked_query += lambda q: q.filter(
             and_(
                 *[
-                    ~States.entity_id.like(entity_domain)
+                    ~StatesMeta.entity_id.like(entity_domain)
                     for entity_domain in IGNORE_DOMAINS_ENTITY_ID_LIKE
                 ]
             )
@@ -254,19 +312,51 @@ def _query_significant_states_with_session(
         if filters:
             filters.bake(baked_query)
 
-    baked_query += lambda q: q.filter(States.last_updated > bindparam("start_time"))
+    baked_query += lambda q: q.filter(
+        States.last_updated_ts > bindparam("start_time_ts")
+    )
     if end_time is not None:
-        baked_query += lambda q: q.filter(States.last_updated < bindparam("end_time"))
+        baked_query += lambda q: q.filter(
+            States.last_updated_ts < bindparam("end_time_ts")
+        )
 
     if join_attributes:
         baked_query += lambda q: q.outerjoin(
             StateAttributes, States.attributes_id == StateAttributes.attributes_id
         )
-    baked_query += lambda q: q.order_by(States.entity_id, States.last_updated)
+    baked_query += lambda q: q.order_by(StatesMeta.entity_id, States.last_updated_ts)
+
+    return baked_query(session).params(
+        start_time_ts=start_time.timestamp(),
+        end_time_ts=end_time.timestamp() if end_time else None,
+        metadata_ids=metadata_ids,
+    )
+
+
+def _query_significant_states_with_session(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None = None,
+    entity_ids: list[str] | None = None,
+    filters: Any = None,
+    significant_changes_only: bool = True,
+    no_attributes: bool = False,
+) -> list[States]:
+    """Query the database for significant state changes."""
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        timer_start = time.perf_counter()
 
     states = execute(
-        baked_query(session).params(
-            start_time=start_time, end_time=end_time, entity_ids=entity_ids
+        _significant_states_query(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            filters,
+            significant_changes_only,
+            no_attributes,
         )
     )
 
@@ -288,6 +378,7 @@ def get_significant_states_with_session(
     significant_changes_only: bool = True,
     minimal_response: bool = False,
     no_attributes: bool = False,
+    current_states: Mapping[str, State] | None = None,
 ) -> MutableMapping[str, list[State | dict[str, Any]]]:
     """
     Return states changes during UTC period start_time - end_time.
@@ -300,7 +391,53 @@ def get_significant_states_with_session(
     Significant states are all states where there is a state change,
     as well as all states from certain domains (for instance
     thermostat so that we get current temperature in our graphs).
+
+    If downsampled history is enabled and the period is long enough, the
+    history of entities with mean statistics is served from the statistics.
+    The attributes of those states are copied from current_states, which
+    maps entity ids to their current state.
     """
+    if entity_ids and (period := _downsample_period(hass, start_time, end_time)):
+        return _get_downsampled_states_with_session(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+            no_attributes,
+            period,
+            current_states,
+        )
+    return _get_significant_states_with_session(
+        hass,
+        session,
+        start_time,
+        end_time,
+        entity_ids,
+        filters,
+        include_start_time_state,
+        significant_changes_only,
+        minimal_response,
+        no_attributes,
+    )
+
+
+def _get_significant_states_with_session(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None = None,
+    entity_ids: list[str] | None = None,
+    filters: Any = None,
+    include_start_time_state: bool = True,
+    significant_changes_only: bool = True,
+    minimal_response: bool = False,
+    no_attributes: bool = False,
+) -> MutableMapping[str, list[State | dict[str, Any]]]:
+    """Return states changes during UTC period start_time - end_time from the states table."""
     states = _query_significant_states_with_session(
         hass,
         session,
@@ -324,6 +461,319 @@ def get_significant_states_with_session(
     )
 
 
+def _downsample_period(
+    hass: HomeAssistant, start_time: datetime, end_time: datetime | None
+) -> Literal["5minute", "hour"] | None:
+    """Return the statistics period to serve the history from, if any."""
+    downsample_after = recorder.get_instance(hass).history_downsample_after
+    if downsample_after is None:
+        return None
+    duration = (end_time or dt_util.utcnow()) - start_time
+    if duration > downsample_after * HOURLY_DOWNSAMPLE_FACTOR:
+        return "hour"
+    if duration > downsample_after:
+        return "5minute"
+    return None
+
+
+def _get_downsampled_states_with_session(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None,
+    entity_ids: list[str],
+    include_start_time_state: bool,
+    significant_changes_only: bool,
+    minimal_response: bool,
+    no_attributes: bool,
+    period: Literal["5minute", "hour"],
+    current_states: Mapping[str, State] | None,
+) -> MutableMapping[str, list[State | dict[str, Any]]]:
+    """Return history served from statistics where they are available.
+
+    Entities without mean statistics are served from the states table, as
+    is the time after the last compiled statistics of each entity.
+    """
+    metadata = get_metadata_with_session(
+        hass, session, statistic_ids=entity_ids, statistic_type="mean"
+    )
+    stats: dict[str, list[dict[str, Any]]] = {}
+    if metadata:
+        stats = statistics_during_period_with_session(
+            hass,
+            session,
+            start_time,
+            end_time,
+            list(metadata),
+            period,
+            start_time_as_datetime=True,
+        )
+
+    downsampled: dict[str, list[State | dict[str, Any]]] = {}
+    # Entities grouped by the time their compiled statistics end
+    tail_entity_ids: dict[datetime, list[str]] = defaultdict(list)
+    for entity_id, entity_stats in stats.items():
+        if not include_start_time_state:
+            entity_stats = [
+                stat for stat in entity_stats if stat["start"] >= start_time
+            ]
+        if not entity_stats:
+            continue
+        downsampled[entity_id] = _statistics_to_states(
+            entity_id,
+            current_states.get(entity_id) if current_states else None,
+            entity_stats,
+            get_display_unit(hass, metadata[entity_id][1]["unit_of_measurement"]),
+            start_time,
+            minimal_response,
+            no_attributes,
+        )
+        tail_start = entity_stats[-1]["start"] + DOWNSAMPLE_PERIOD_DURATION[period]
+        tail_entity_ids[tail_start].append(entity_id)
+
+    results: list[MutableMapping[str, list[State | dict[str, Any]]]] = []
+    if raw_entity_ids := [
+        entity_id for entity_id in entity_ids if entity_id not in downsampled
+    ]:
+        results.append(
+            _get_significant_states_with_session(
+                hass,
+                session,
+                start_time,
+                end_time,
+                raw_entity_ids,
+                None,
+                include_start_time_state,
+                significant_changes_only,
+                minimal_response,
+                no_attributes,
+            )
+        )
+    for tail_start, tail_ids in tail_entity_ids.items():
+        if end_time is not None and tail_start >= end_time:
+            continue
+        results.append(
+            _get_significant_states_with_session(
+                hass,
+                session,
+                tail_start,
+                end_time,
+                tail_ids,
+                None,
+                False,
+                significant_changes_only,
+                minimal_response,
+                no_attributes,
+            )
+        )
+
+    result: dict[str, list[State | dict[str, Any]]] = {}
+    for entity_id in entity_ids:
+        entity_states = downsampled.get(entity_id, [])
+        for raw_result in results:
+            entity_states.extend(raw_result.get(entity_id, ()))
+        if entity_states:
+            result[entity_id] = entity_states
+    return result
+
+
+def _statistics_to_states(
+    entity_id: str,
+    current_state: State | None,
+    entity_stats: list[dict[str, Any]],
+    unit: str | None,
+    start_time: datetime,
+    minimal_response: bool,
+    no_attributes: bool,
+) -> list[State | dict[str, Any]]:
+    """Convert the statistics of an entity to states holding the mean.
+
+    The attributes are copied from the current state of the entity, if given,
+    and the min and max of each period are added to them.
+    """
+    attributes: dict[str, Any] = {}
+    if not no_attributes:
+        if current_state:
+            attributes.update(current_state.attributes)
+        attributes[ATTR_UNIT_OF_MEASUREMENT] = unit
+
+    stats = [stat for stat in entity_stats if stat["mean"] is not None]
+    states: list[State | dict[str, Any]] = []
+    for idx, stat in enumerate(stats):
+        # The statistics at the start time may start before it
+        last_changed = max(stat["start"], start_time)
+        if minimal_response and 0 < idx < len(stats) - 1:
+            states.append(
+                {
+                    STATE_KEY: str(stat["mean"]),
+                    LAST_CHANGED_KEY: last_changed.isoformat(),
+                }
+            )
+            continue
+        stat_attributes = attributes
+        if not no_attributes:
+            stat_attributes = {**attributes, "min": stat["min"], "max": stat["max"]}
+        states.append(
+            State(
+                entity_id,
+                str(stat["mean"]),
+                stat_attributes,
+                last_changed=last_changed,
+                last_updated=last_changed,
+            )
+        )
+    return states
+
+
+def stream_significant_states_with_session(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None = None,
+    entity_ids: list[str] | None = None,
+    filters: Any = None,
+    include_start_time_state: bool = True,
+    significant_changes_only: bool = True,
+    minimal_response: bool = False,
+    no_attributes: bool = False,
+) -> Iterator[tuple[str, list[State | dict[str, Any]]]]:
+    """
+    Yield the states changes during UTC period start_time - end_time per entity.
+
+    This returns the same states as get_significant_states_with_session, but
+    the rows are fetched from the cursor in batches and only the states of
+    the entity currently being yielded are kept in memory.
+
+    Entities with state changes are yielded in entity_id order, followed by
+    the entities that only have a state at start_time.
+    """
+    start_time_states: dict[str, State] = {}
+    if include_start_time_state:
+        for state in _get_states_with_session(
+            hass,
+            session,
+            start_time,
+            entity_ids,
+            filters=filters,
+            no_attributes=no_attributes,
+        ):
+            state.last_changed = start_time
+            state.last_updated = start_time
+            start_time_states[state.entity_id] = state
+
+    states = _significant_states_query(
+        hass,
+        session,
+        start_time,
+        end_time,
+        entity_ids,
+        filters,
+        significant_changes_only,
+        no_attributes,
+    ).with_post_criteria(lambda q: q.yield_per(STREAM_BATCH_SIZE))
+
+    for ent_id, group in _group_states_by_entity_id(states, entity_ids):
+        ent_results: list[State | dict[str, Any]] = []
+        if (start_time_state := start_time_states.pop(ent_id, None)) is not None:
+            ent_results.append(start_time_state)
+        _append_entity_states(ent_results, ent_id, group, minimal_response)
+        if ent_results:
+            yield ent_id, ent_results
+
+    for ent_id in entity_ids or sorted(start_time_states):
+        if (start_time_state := start_time_states.pop(ent_id, None)) is not None:
+            yield ent_id, [start_time_state]
+
+
+def stream_significant_states_columns_with_session(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None = None,
+    entity_ids: list[str] | None = None,
+    filters: Any = None,
+    include_start_time_state: bool = True,
+    significant_changes_only: bool = True,
+    numeric: bool = False,
+) -> Iterator[tuple[str, dict[str, list[Any]]]]:
+    """
+    Yield the states changes during UTC period start_time - end_time as columns.
+
+    Each entity gets a list of last_changed timestamps, in seconds since the
+    epoch, and a list of the matching states. The rows are converted straight
+    from the cursor without creating State objects or loading attributes, and
+    repeated states are skipped. When numeric is set the states are parsed
+    as floats and states that are not numbers become None.
+
+    Entities are yielded in the same order as stream_significant_states_with_session.
+    """
+    start_time_ts = start_time.timestamp()
+    start_time_rows: dict[str, Row] = {}
+    if include_start_time_state:
+        start_time_rows = {
+            row.entity_id: row
+            for row in _get_rows_with_session(
+                hass,
+                session,
+                start_time,
+                entity_ids,
+                filters=filters,
+                no_attributes=True,
+            )
+        }
+
+    rows = _significant_states_query(
+        hass,
+        session,
+        start_time,
+        end_time,
+        entity_ids,
+        filters,
+        significant_changes_only,
+        no_attributes=True,
+    ).with_post_criteria(lambda q: q.yield_per(STREAM_BATCH_SIZE))
+
+    for ent_id, group in _group_states_by_entity_id(rows, entity_ids):
+        columns = _rows_to_columns(
+            group, start_time_rows.pop(ent_id, None), start_time_ts, numeric
+        )
+        if columns[LAST_CHANGED_KEY]:
+            yield ent_id, columns
+
+    for ent_id in entity_ids or sorted(start_time_rows):
+        if (start_time_row := start_time_rows.pop(ent_id, None)) is not None:
+            yield ent_id, _rows_to_columns(
+                iter(()), start_time_row, start_time_ts, numeric
+            )
+
+
+def get_significant_states_columns_with_session(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None = None,
+    entity_ids: list[str] | None = None,
+    filters: Any = None,
+    include_start_time_state: bool = True,
+    significant_changes_only: bool = True,
+    numeric: bool = False,
+) -> dict[str, dict[str, list[Any]]]:
+    """Return the states changes during UTC period start_time - end_time as columns."""
+    return dict(
+        stream_significant_states_columns_with_session(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            filters,
+            include_start_time_state,
+            significant_changes_only,
+            numeric,
+        )
+    )
+
+
 def get_full_significant_states_with_session(
     hass: HomeAssistant,
     session: Session,
@@ -335,10 +785,13 @@ def get_full_significant_states_with_session(
     significant_changes_only: bool = True,
     no_attributes: bool = False,
 ) -> MutableMapping[str, list[State]]:
-    """Variant of get_significant_states_with_session that does not return minimal responses."""
+    """Variant of get_significant_states_with_session that does not return minimal responses.
+
+    The states are always read from the states table.
+    """
     return cast(
         MutableMapping[str, list[State]],
-        get_significant_states_with_session(
+        _get_significant_states_with_session(
             hass=hass,
             session=session,
             start_time=start_time,
@@ -364,24 +817,28 @@ def state_changes_during_period(
     include_start_time_state: bool = True,
 ) -> MutableMapping[str, list[State]]:
     """Return states changes during UTC period start_time - end_time."""
-    with session_scope(hass=hass) as session:
+    with session_scope(hass=hass, read_only=True) as session:
         baked_query, join_attributes = bake_query_and_join_attributes(
             hass, no_attributes, include_last_updated=False
         )
 
         baked_query += lambda q: q.filter(
-            (States.last_changed == States.last_updated)
-            & (States.last_updated > bindparam("start_time"))
+            (States.last_changed_ts == States.last_updated_ts)
+            & (States.last_updated_ts > bindparam("start_time_ts"))
         )
 
         if end_time is not None:
             baked_query += lambda q: q.filter(
-                States.last_updated < bindparam("end_time")
+                States.last_updated_ts < bindparam("end_time_ts")
             )
 
+        metadata_ids: list[int] | None = None
         if entity_id is not None:
-            baked_query += lambda q: q.filter_by(entity_id=bindparam("entity_id"))
             entity_id = entity_id.lower()
+            metadata_ids = _metadata_ids_for_entity_ids(session, [entity_id])
+            baked_query += lambda q: q.filter(
+                States.metadata_id.in_(bindparam("metadata_ids", expanding=True))
+            )
 
         if join_attributes:
             baked_query += lambda q: q.outerjoin(
@@ -390,19 +847,21 @@ def state_changes_during_period(
 
         if descending:
             baked_query += lambda q: q.order_by(
-                States.entity_id, States.last_updated.desc()
+                States.metadata_id, States.last_updated_ts.desc()
             )
         else:
-            baked_query += lambda q: q.order_by(States.entity_id, States.last_updated)
+            baked_query += lambda q: q.order_by(
+                States.metadata_id, States.last_updated_ts
+            )
 
         if limit:
             baked_query += lambda q: q.limit(bindparam("limit"))
 
         states = execute(
             baked_query(session).params(
-                start_time=start_time,
-                end_time=end_time,
-                entity_id=entity_id,
+                start_time_ts=start_time.timestamp(),
+                end_time_ts=end_time.timestamp() if end_time else None,
+                metadata_ids=metadata_ids,
                 limit=limit,
             )
         )
@@ -428,30 +887,36 @@ def get_last_state_changes(
     """Return the last number_of_states."""
     start_time = dt_util.utcnow()
 
-    with session_scope(hass=hass) as session:
+    with session_scope(hass=hass, read_only=True) as session:
         baked_query, join_attributes = bake_query_and_join_attributes(
             hass, False, include_last_updated=False
         )
 
-        baked_query += lambda q: q.filter(States.last_changed == States.last_updated)
+        baked_query += lambda q: q.filter(
+            States.last_changed_ts == States.last_updated_ts
+        )
 
+        metadata_ids: list[int] | None = None
         if entity_id is not None:
-            baked_query += lambda q: q.filter_by(entity_id=bindparam("entity_id"))
             entity_id = entity_id.lower()
+            metadata_ids = _metadata_ids_for_entity_ids(session, [entity_id])
+            baked_query += lambda q: q.filter(
+                States.metadata_id.in_(bindparam("metadata_ids", expanding=True))
+            )
 
         if join_attributes:
             baked_query += lambda q: q.outerjoin(
                 StateAttributes, States.attributes_id == StateAttributes.attributes_id
             )
         baked_query += lambda q: q.order_by(
-            States.entity_id, States.last_updated.desc()
+            States.metadata_id, States.last_updated_ts.desc()
         )
 
         baked_query += lambda q: q.limit(bindparam("number_of_states"))
 
         states = execute(
             baked_query(session).params(
-                number_of_states=number_of_states, entity_id=entity_id
+                number_of_states=number_of_states, metadata_ids=metadata_ids
             )
         )
 
@@ -480,8 +945,27 @@ def _get_states_with_session(
     no_attributes: bool = False,
 ) -> list[State]:
     """Return the states at a specific point in time."""
+    attr_cache: dict[str, dict[str, Any]] = {}
+    return [
+        LazyState(row, attr_cache)
+        for row in _get_rows_with_session(
+            hass, session, utc_point_in_time, entity_ids, run, filters, no_attributes
+        )
+    ]
+
+
+def _get_rows_with_session(
+    hass: HomeAssistant,
+    session: Session,
+    utc_point_in_time: datetime,
+    entity_ids: list[str] | None = None,
+    run: RecorderRuns | None = None,
+    filters: Any | None = None,
+    no_attributes: bool = False,
+) -> list[Row]:
+    """Return the state rows at a specific point in time."""
     if entity_ids and len(entity_ids) == 1:
-        return _get_single_entity_states_with_session(
+        return _get_single_entity_rows_with_session(
             hass, session, utc_point_in_time, entity_ids[0], no_attributes
         )
 
@@ -492,10 +976,13 @@ def _get_states_with_session(
         # History did not run before utc_point_in_time
         return []
 
+    run_start_ts = process_datetime_to_timestamp(run.start)
+    utc_point_in_time_ts = utc_point_in_time.timestamp()
+
     # We have more than one entity to look at so we need to do a query on states
     # since the last recorder run started.
     query_keys, join_attributes = query_and_join_attributes(hass, no_attributes)
-    query = session.query(*query_keys)
+    query = _select_from_states(session.query(*query_keys))
 
     if entity_ids:
         # We got an include-list of entities, accelerate the query by filtering already
@@ -505,12 +992,16 @@ def _get_states_with_session(
                 func.max(States.state_id).label("max_state_id"),
             )
             .filter(
-                (States.last_updated >= run.start)
-                & (States.last_updated < utc_point_in_time)
+                (States.last_updated_ts >= run_start_ts)
+                & (States.last_updated_ts < utc_point_in_time_ts)
+            )
+            .filter(
+                States.metadata_id.in_(
+                    _metadata_ids_for_entity_ids(session, entity_ids)
+                )
             )
-            .filter(States.entity_id.in_(entity_ids))
         )
-        most_recent_state_ids = most_recent_state_ids.group_by(States.entity_id)
+        most_recent_state_ids = most_recent_state_ids.group_by(States.metadata_id)
         most_recent_state_ids = most_recent_state_ids.subquery()
         query = query.join(
             most_recent_state_ids,
@@ -527,14 +1018,14 @@ def _get_states_with_session(
         # not indexed and we can't control what's in the custom filter.
         most_recent_states_by_date = (
             session.query(
-                States.entity_id.label("max_entity_id"),
-                func.max(States.last_updated).label("max_last_updated"),
+                States.metadata_id.label("max_metadata_id"),
+                func.max(States.last_updated_ts).label("max_last_updated"),
             )
             .filter(
-                (States.last_updated >= run.start)
-                & (States.last_updated < utc_point_in_time)
+                (States.last_updated_ts >= run_start_ts)
+                & (States.last_updated_ts < utc_point_in_time_ts)
             )
-            .group_by(States.entity_id)
+            .group_by(States.metadata_id)
             .subquery()
         )
         most_recent_state_ids = (
@@ -542,12 +1033,12 @@ def _get_states_with_session(
             .join(
                 most_recent_states_by_date,
                 and_(
-                    States.entity_id == most_recent_states_by_date.c.max_entity_id,
-                    States.last_updated
+                    States.metadata_id == most_recent_states_by_date.c.max_metadata_id,
+                    States.last_updated_ts
                     == most_recent_states_by_date.c.max_last_updated,
                 ),
             )
-            .group_by(States.entity_id)
+            .group_by(States.metadata_id)
             .subquery()
         )
         query = query.join(
@@ -555,7 +1046,7 @@ def _get_states_with_session(
             States.state_id == most_recent_state_ids.c.max_state_id,
         )
         for entity_domain in IGNORE_DOMAINS_ENTITY_ID_LIKE:
-            query = query.filter(~States.entity_id.like(entity_domain))
+            query = query.filter(~StatesMeta.entity_id.like(entity_domain))
         if filters:
             query = filters.apply(query)
         if join_attributes:
@@ -563,36 +1054,37 @@ def _get_states_with_session(
                 StateAttributes, (States.attributes_id == StateAttributes.attributes_id)
             )
 
-    attr_cache: dict[str, dict[str, Any]] = {}
-    return [LazyState(row, attr_cache) for row in execute(query)]
+    # Keep the entity_id ordering the string keyed index used to provide
+    return sorted(execute(query), key=lambda row: row.entity_id)
 
 
-def _get_single_entity_states_with_session(
+def _get_single_entity_rows_with_session(
     hass: HomeAssistant,
     session: Session,
     utc_point_in_time: datetime,
     entity_id: str,
     no_attributes: bool = False,
-) -> list[State]:
+) -> list[Row]:
     # Use an entirely different (and extremely fast) query if we only
     # have a single entity id
     baked_query, join_attributes = bake_query_and_join_attributes(hass, no_attributes)
     baked_query += lambda q: q.filter(
-        States.last_updated < bindparam("utc_point_in_time"),
-        States.entity_id == bindparam("entity_id"),
+        States.last_updated_ts < bindparam("utc_point_in_time_ts"),
+        States.metadata_id.in_(bindparam("metadata_ids", expanding=True)),
     )
     if join_attributes:
         baked_query += lambda q: q.outerjoin(
             StateAttributes, States.attributes_id == StateAttributes.attributes_id
         )
-    baked_query += lambda q: q.order_by(States.last_updated.desc())
+    baked_query += lambda q: q.order_by(States.last_updated_ts.desc())
     baked_query += lambda q: q.limit(1)
 
     query = baked_query(session).params(
-        utc_point_in_time=utc_point_in_time, entity_id=entity_id
+        utc_point_in_time_ts=utc_point_in_time.timestamp(),
+        metadata_ids=_metadata_ids_for_entity_ids(session, [entity_id]),
     )
 
-    return [LazyState(row) for row in execute(query)]
+    return execute(query)
 
 
 def _sorted_states_to_dict(
@@ -611,7 +1103,7 @@ def _sorted_states_to_dict(
     This takes our state list and turns it into a JSON friendly data
     structure {'entity_id': [list of states], 'entity_id2': [list of states]}
 
-    States must be sorted by entity_id and last_updated
+    States must be grouped by entity and sorted by last_updated
 
     We also need to go back and create a synthetic zero data point for
     each list of states, otherwise our graphs won't start on the Y
@@ -642,60 +1134,111 @@ def _sorted_states_to_dict(
         elapsed = time.perf_counter() - timer_start
         _LOGGER.debug("getting %d first datapoints took %fs", len(result), elapsed)
 
-    # Called in a tight loop so cache the function
-    # here
-    _process_timestamp_to_utc_isoformat = process_timestamp_to_utc_isoformat
+    # Append all changes to it
+    for ent_id, group in _group_states_by_entity_id(states, entity_ids):
+        _append_entity_states(result[ent_id], ent_id, group, minimal_response)
+
+    # Filter out the empty lists if some states had 0 results.
+    return {key: val for key, val in result.items() if val}
+
 
+def _group_states_by_entity_id(
+    states: Iterable[States], entity_ids: list[str] | None
+) -> Iterable[tuple[str | Column, Iterator[States]]]:
+    """Group states that are sorted by entity_id."""
     if entity_ids and len(entity_ids) == 1:
-        states_iter: Iterable[tuple[str | Column, Iterator[States]]] = (
-            (entity_ids[0], iter(states)),
-        )
-    else:
-        states_iter = groupby(states, lambda state: state.entity_id)
+        return ((entity_ids[0], iter(states)),)
+    return groupby(states, lambda state: state.entity_id)
 
-    # Append all changes to it
-    for ent_id, group in states_iter:
-        ent_results = result[ent_id]
-        attr_cache: dict[str, dict[str, Any]] = {}
 
-        if not minimal_response or split_entity_id(ent_id)[0] in NEED_ATTRIBUTE_DOMAINS:
-            ent_results.extend(LazyState(db_state, attr_cache) for db_state in group)
-            continue
+def _append_entity_states(
+    ent_results: list[State | dict[str, Any]],
+    ent_id: str | Column,
+    group: Iterator[States],
+    minimal_response: bool,
+) -> None:
+    """Append the states of a single entity to its results."""
+    attr_cache: dict[str, dict[str, Any]] = {}
 
-        # With minimal response we only provide a native
-        # State for the first and last response. All the states
-        # in-between only provide the "state" and the
-        # "last_changed".
-        if not ent_results:
-            if (first_state := next(group, None)) is None:
-                continue
-            ent_results.append(LazyState(first_state, attr_cache))
-
-        prev_state = ent_results[-1]
-        assert isinstance(prev_state, LazyState)
-        initial_state_count = len(ent_results)
-
-        for db_state in group:
-            # With minimal response we do not care about attribute
-            # changes so we can filter out duplicate states
-            if db_state.state == prev_state.state:
-                continue
-
-            ent_results.append(
-                {
-                    STATE_KEY: db_state.state,
-                    LAST_CHANGED_KEY: _process_timestamp_to_utc_isoformat(
-                        db_state.last_changed
-                    ),
-                }
-            )
-            prev_state = db_state
+    if not minimal_response or split_entity_id(ent_id)[0] in NEED_ATTRIBUTE_DOMAINS:
+        ent_results.extend(LazyState(db_state, attr_cache) for db_state in group)
+        return
 
-        if prev_state and len(ent_results) != initial_state_count:
-            # There was at least one state change
-            # replace the last minimal state with
-            # a full state
-            ent_results[-1] = LazyState(prev_state, attr_cache)
+    # With minimal response we only provide a native
+    # State for the first and last response. All the states
+    # in-between only provide the "state" and the
+    # "last_changed".
+    if not ent_results:
+        if (first_state := next(group, None)) is None:
+            return
+        ent_results.append(LazyState(first_state, attr_cache))
 
-    # Filter out the empty lists if some states had 0 results.
-    return {key: val for key, val in result.items() if val}
+    prev_state = ent_results[-1]
+    assert isinstance(prev_state, LazyState)
+    initial_state_count = len(ent_results)
+
+    # Called in a tight loop so cache the function
+    # here
+    _timestamp_to_utc_isoformat = timestamp_to_utc_isoformat
+
+    for db_state in group:
+        # With minimal response we do not care about attribute
+        # changes so we can filter out duplicate states
+        if db_state.state == prev_state.state:
+            continue
+
+        ent_results.append(
+            {
+                STATE_KEY: db_state.state,
+                LAST_CHANGED_KEY: _timestamp_to_utc_isoformat(db_state.last_changed_ts),
+            }
+        )
+        prev_state = db_state
+
+    if prev_state and len(ent_results) != initial_state_count:
+        # There was at least one state change
+        # replace the last minimal state with
+        # a full state
+        ent_results[-1] = LazyState(prev_state, attr_cache)
+
+
+def _state_to_float(state: str | None) -> float | None:
+    """Return the state as a float or None if it is not a finite number."""
+    try:
+        value = float(state)  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        return None
+    return value if math.isfinite(value) else None
+
+
+def _rows_to_columns(
+    rows: Iterator[Row],
+    start_time_row: Row | None,
+    start_time_ts: float,
+    numeric: bool,
+) -> dict[str, list[Any]]:
+    """Convert the rows of a single entity to a timestamp and a state column."""
+    timestamps: list[float] = []
+    states: list[Any] = []
+    prev_state: str | None = None
+    if start_time_row is not None:
+        prev_state = start_time_row.state
+        timestamps.append(start_time_ts)
+        states.append(prev_state)
+    elif (first_row := next(rows, None)) is not None:
+        prev_state = first_row.state
+        timestamps.append(first_row.last_changed_ts)
+        states.append(prev_state)
+
+    for row in rows:
+        # Only the state is returned so rows where just the
+        # attributes changed do not add anything
+        if (state := row.state) == prev_state:
+            continue
+        timestamps.append(row.last_changed_ts)
+        states.append(state)
+        prev_state = state
+
+    if numeric:
+        states = [_state_to_float(state) for state in states]
+    return {LAST_CHANGED_KEY: timestamps, STATE_KEY: states}
@@ -38,6 +38,10 @@ from .util import session_scope
 
 _LOGGER = logging.getLogger(__name__)
 
+# The number of rows converted per transaction when
+# rewriting existing rows during a migration
+MIGRATION_CHUNK_SIZE = 100000
+
 
 def raise_if_exception_missing_str(ex: Exception, match_substrs: Iterable[str]) -> None:
     """Raise an exception if the exception and cause do not contain the match substrs."""
@@ -705,10 +709,146 @@ def _apply_update(  # noqa: C901
         _create_index(session_maker, "states", "ix_states_context_id")
         # Once there are no longer any state_changed events
         # in the events table we can drop the index on states.event_id
+    elif new_version == 29:
+        _add_columns(session_maker, "events", ["time_fired_ts DOUBLE PRECISION"])
+        _add_columns(
+            session_maker,
+            "states",
+            ["last_changed_ts DOUBLE PRECISION", "last_updated_ts DOUBLE PRECISION"],
+        )
+        _migrate_columns_to_timestamp(session_maker, engine)
+        _create_index(session_maker, "events", "ix_events_time_fired_ts")
+        _create_index(session_maker, "events", "ix_events_event_type_time_fired_ts")
+        _create_index(session_maker, "states", "ix_states_last_updated_ts")
+        _create_index(session_maker, "states", "ix_states_entity_id_last_updated_ts")
+    elif new_version == 30:
+        _add_columns(session_maker, "events", [f"event_type_id {big_int}"])
+        _add_columns(session_maker, "states", [f"metadata_id {big_int}"])
+        # The event_type and entity_id strings are no longer written or queried
+        _drop_index(session_maker, "events", "ix_events_event_type_time_fired")
+        _drop_index(session_maker, "events", "ix_events_event_type_time_fired_ts")
+        _drop_index(session_maker, "states", "ix_states_entity_id_last_updated")
+        _drop_index(session_maker, "states", "ix_states_entity_id_last_updated_ts")
+        _migrate_event_types(session_maker)
+        _migrate_entity_ids(session_maker)
+        _create_index(session_maker, "events", "ix_events_event_type_id_time_fired_ts")
+        _create_index(session_maker, "states", "ix_states_metadata_id_last_updated_ts")
     else:
         raise ValueError(f"No schema migration defined for version {new_version}")
 
 
+def _datetime_to_timestamp_sql(dialect: str, column: str) -> str:
+    """Return the SQL expression that converts a datetime column to epoch seconds."""
+    if dialect == SupportedDialect.SQLITE:
+        # Datetimes are stored as text in the form YYYY-MM-DD HH:MM:SS.ffffff
+        return f"strftime('%s', {column}) + CAST(substr({column}, 20, 7) AS REAL)"
+    if dialect == SupportedDialect.MYSQL:
+        # UNIX_TIMESTAMP would apply the session time zone
+        return f"TIMESTAMPDIFF(MICROSECOND, '1970-01-01 00:00:00', {column}) / 1000000"
+    return f"EXTRACT(EPOCH FROM {column})"
+
+
+def _update_in_chunks(
+    session_maker: Callable[[], Session], table: str, id_column: str, assignments: str
+) -> None:
+    """Update every row of a table in chunks of primary keys.
+
+    Each chunk is committed on its own so the transactions stay
+    small on large databases.
+    """
+    with session_scope(session=session_maker()) as session:
+        min_id, max_id = session.execute(
+            text(f"SELECT MIN({id_column}), MAX({id_column}) FROM {table}")
+        ).one()
+    if max_id is None:
+        return
+    update = text(
+        f"UPDATE {table} SET {assignments} "
+        f"WHERE {id_column} >= :start_id AND {id_column} < :end_id"
+    )
+    for start_id in range(min_id, max_id + 1, MIGRATION_CHUNK_SIZE):
+        with session_scope(session=session_maker()) as session:
+            session.connection().execute(
+                update,
+                {"start_id": start_id, "end_id": start_id + MIGRATION_CHUNK_SIZE},
+            )
+
+
+def _migrate_columns_to_timestamp(
+    session_maker: Callable[[], Session], engine: Engine
+) -> None:
+    """Backfill the epoch timestamp columns from the datetime columns."""
+    dialect = engine.dialect.name
+    for table, id_column, columns in (
+        ("events", "event_id", ("time_fired",)),
+        ("states", "state_id", ("last_changed", "last_updated")),
+    ):
+        _LOGGER.warning(
+            "Converting %s timestamps in table %s. Note: this can take several "
+            "minutes on large databases and slow computers. Please "
+            "be patient!",
+            ", ".join(columns),
+            table,
+        )
+        _update_in_chunks(
+            session_maker,
+            table,
+            id_column,
+            ", ".join(
+                f"{column}_ts={_datetime_to_timestamp_sql(dialect, column)}"
+                for column in columns
+            ),
+        )
+
+
+def _migrate_event_types(session_maker: Callable[[], Session]) -> None:
+    """Move the event_type strings from the events table to event_types."""
+    _LOGGER.warning(
+        "Moving event types to the event_types table. Note: this can take several "
+        "minutes on large databases and slow computers. Please be patient!"
+    )
+    with session_scope(session=session_maker()) as session:
+        session.connection().execute(
+            text(
+                "INSERT INTO event_types (event_type) SELECT DISTINCT event_type "
+                "FROM events WHERE event_type IS NOT NULL"
+            )
+        )
+    # event_type_id must be assigned first since MySQL
+    # evaluates the assignments from left to right
+    _update_in_chunks(
+        session_maker,
+        "events",
+        "event_id",
+        "event_type_id=(SELECT event_type_id FROM event_types "
+        "WHERE event_types.event_type=events.event_type), event_type=NULL",
+    )
+
+
+def _migrate_entity_ids(session_maker: Callable[[], Session]) -> None:
+    """Move the entity_id strings from the states table to states_meta."""
+    _LOGGER.warning(
+        "Moving entity ids to the states_meta table. Note: this can take several "
+        "minutes on large databases and slow computers. Please be patient!"
+    )
+    with session_scope(session=session_maker()) as session:
+        session.connection().execute(
+            text(
+                "INSERT INTO states_meta (entity_id) SELECT DISTINCT entity_id "
+                "FROM states WHERE entity_id IS NOT NULL"
+            )
+        )
+    # metadata_id must be assigned first since MySQL
+    # evaluates the assignments from left to right
+    _update_in_chunks(
+        session_maker,
+        "states",
+        "state_id",
+        "metadata_id=(SELECT metadata_id FROM states_meta "
+        "WHERE states_meta.entity_id=states.entity_id), entity_id=NULL",
+    )
+
+
 def _inspect_schema_version(session: Session) -> int:
     """Determine the schema version by inspecting the db structure.
 
@@ -44,7 +44,7 @@ from .const import ALL_DOMAIN_EXCLUDE_ATTRS, JSON_DUMP
 # pylint: disable=invalid-name
 Base = declarative_base()
 
-SCHEMA_VERSION = 28
+SCHEMA_VERSION = 30
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -52,8 +52,10 @@ DB_TIMEZONE = "+00:00"
 
 TABLE_EVENTS = "events"
 TABLE_EVENT_DATA = "event_data"
+TABLE_EVENT_TYPES = "event_types"
 TABLE_STATES = "states"
 TABLE_STATE_ATTRIBUTES = "state_attributes"
+TABLE_STATES_META = "states_meta"
 TABLE_RECORDER_RUNS = "recorder_runs"
 TABLE_SCHEMA_CHANGES = "schema_changes"
 TABLE_STATISTICS = "statistics"
@@ -64,8 +66,10 @@ TABLE_STATISTICS_SHORT_TERM = "statistics_short_term"
 ALL_TABLES = [
     TABLE_STATES,
     TABLE_STATE_ATTRIBUTES,
+    TABLE_STATES_META,
     TABLE_EVENTS,
     TABLE_EVENT_DATA,
+    TABLE_EVENT_TYPES,
     TABLE_RECORDER_RUNS,
     TABLE_SCHEMA_CHANGES,
     TABLE_STATISTICS,
@@ -94,6 +98,8 @@ DOUBLE_TYPE = (
     .with_variant(oracle.DOUBLE_PRECISION(), "oracle")
     .with_variant(postgresql.DOUBLE_PRECISION(), "postgresql")
 )
+# Seconds since the epoch in UTC, avoids building a datetime for every row read
+TIMESTAMP_TYPE = DOUBLE_TYPE
 EVENT_ORIGIN_ORDER = [EventOrigin.local, EventOrigin.remote]
 EVENT_ORIGIN_TO_IDX = {origin: idx for idx, origin in enumerate(EVENT_ORIGIN_ORDER)}
 
@@ -104,7 +110,9 @@ class Events(Base):  # type: ignore[misc,valid-type]
     __table_args__ = (
         # Used for fetching events at a specific time
         # see logbook
-        Index("ix_events_event_type_time_fired", "event_type", "time_fired"),
+        Index(
+            "ix_events_event_type_id_time_fired_ts", "event_type_id", "time_fired_ts"
+        ),
         {"mysql_default_charset": "utf8mb4", "mysql_collate": "utf8mb4_unicode_ci"},
     )
     __tablename__ = TABLE_EVENTS
@@ -114,17 +122,20 @@ class Events(Base):  # type: ignore[misc,valid-type]
     origin = Column(String(MAX_LENGTH_EVENT_ORIGIN))  # no longer used
     origin_idx = Column(SmallInteger)
     time_fired = Column(DATETIME_TYPE, index=True)
+    time_fired_ts = Column(TIMESTAMP_TYPE, index=True)
     context_id = Column(String(MAX_LENGTH_EVENT_CONTEXT_ID), index=True)
     context_user_id = Column(String(MAX_LENGTH_EVENT_CONTEXT_ID))
     context_parent_id = Column(String(MAX_LENGTH_EVENT_CONTEXT_ID))
     data_id = Column(Integer, ForeignKey("event_data.data_id"), index=True)
+    event_type_id = Column(Integer, ForeignKey("event_types.event_type_id"))
     event_data_rel = relationship("EventData")
+    event_type_rel = relationship("EventTypes")
 
     def __repr__(self) -> str:
         """Return string representation of instance for debugging."""
         return (
             f"<recorder.Events("
-            f"id={self.event_id}, type='{self.event_type}', "
+            f"id={self.event_id}, type_id={self.event_type_id}, "
             f"origin_idx='{self.origin_idx}', time_fired='{self.time_fired}'"
             f", data_id={self.data_id})>"
         )
@@ -133,10 +144,11 @@ class Events(Base):  # type: ignore[misc,valid-type]
     def from_event(event: Event) -> Events:
         """Create an event database object from a native event."""
         return Events(
-            event_type=event.event_type,
+            event_type=None,
             event_data=None,
             origin_idx=EVENT_ORIGIN_TO_IDX.get(event.origin),
             time_fired=event.time_fired,
+            time_fired_ts=event.time_fired.timestamp(),
             context_id=event.context.id,
             context_user_id=event.context.user_id,
             context_parent_id=event.context.parent_id,
@@ -151,7 +163,9 @@ class Events(Base):  # type: ignore[misc,valid-type]
         )
         try:
             return Event(
-                self.event_type,
+                self.event_type_rel.event_type
+                if self.event_type_rel
+                else self.event_type,
                 json.loads(self.event_data) if self.event_data else {},
                 EventOrigin(self.origin)
                 if self.origin
@@ -212,13 +226,34 @@ class EventData(Base):  # type: ignore[misc,valid-type]
             return {}
 
 
+class EventTypes(Base):  # type: ignore[misc,valid-type]
+    """Event type lookup table."""
+
+    __table_args__ = (
+        {"mysql_default_charset": "utf8mb4", "mysql_collate": "utf8mb4_unicode_ci"},
+    )
+    __tablename__ = TABLE_EVENT_TYPES
+    event_type_id = Column(Integer, Identity(), primary_key=True)
+    event_type = Column(String(MAX_LENGTH_EVENT_EVENT_TYPE), index=True, unique=True)
+
+    def __repr__(self) -> str:
+        """Return string representation of instance for debugging."""
+        return (
+            f"<recorder.EventTypes("
+            f"id={self.event_type_id}, event_type='{self.event_type}'"
+            f")>"
+        )
+
+
 class States(Base):  # type: ignore[misc,valid-type]
     """State change history."""
 
     __table_args__ = (
         # Used for fetching the state of entities at a specific time
         # (get_states in history.py)
-        Index("ix_states_entity_id_last_updated", "entity_id", "last_updated"),
+        Index(
+            "ix_states_metadata_id_last_updated_ts", "metadata_id", "last_updated_ts"
+        ),
         {"mysql_default_charset": "utf8mb4", "mysql_collate": "utf8mb4_unicode_ci"},
     )
     __tablename__ = TABLE_STATES
@@ -231,6 +266,8 @@ class States(Base):  # type: ignore[misc,valid-type]
     )
     last_changed = Column(DATETIME_TYPE, default=dt_util.utcnow)
     last_updated = Column(DATETIME_TYPE, default=dt_util.utcnow, index=True)
+    last_changed_ts = Column(TIMESTAMP_TYPE)
+    last_updated_ts = Column(TIMESTAMP_TYPE, index=True)
     old_state_id = Column(Integer, ForeignKey("states.state_id"), index=True)
     attributes_id = Column(
         Integer, ForeignKey("state_attributes.attributes_id"), index=True
@@ -239,14 +276,16 @@ class States(Base):  # type: ignore[misc,valid-type]
     context_user_id = Column(String(MAX_LENGTH_EVENT_CONTEXT_ID))
     context_parent_id = Column(String(MAX_LENGTH_EVENT_CONTEXT_ID))
     origin_idx = Column(SmallInteger)  # 0 is local, 1 is remote
+    metadata_id = Column(Integer, ForeignKey("states_meta.metadata_id"))
     old_state = relationship("States", remote_side=[state_id])
     state_attributes = relationship("StateAttributes")
+    states_meta_rel = relationship("StatesMeta")
 
     def __repr__(self) -> str:
         """Return string representation of instance for debugging."""
         return (
             f"<recorder.States("
-            f"id={self.state_id}, entity_id='{self.entity_id}', "
+            f"id={self.state_id}, metadata_id={self.metadata_id}, "
             f"state='{self.state}', event_id='{self.event_id}', "
             f"last_updated='{self.last_updated.isoformat(sep=' ', timespec='seconds')}', "
             f"old_state_id={self.old_state_id}, attributes_id={self.attributes_id}"
@@ -256,10 +295,9 @@ class States(Base):  # type: ignore[misc,valid-type]
     @staticmethod
     def from_event(event: Event) -> States:
         """Create object from a state_changed event."""
-        entity_id = event.data["entity_id"]
         state: State | None = event.data.get("new_state")
         dbstate = States(
-            entity_id=entity_id,
+            entity_id=None,
             attributes=None,
             context_id=event.context.id,
             context_user_id=event.context.user_id,
@@ -272,10 +310,15 @@ class States(Base):  # type: ignore[misc,valid-type]
             dbstate.state = ""
             dbstate.last_changed = event.time_fired
             dbstate.last_updated = event.time_fired
+            dbstate.last_changed_ts = (
+                dbstate.last_updated_ts
+            ) = event.time_fired.timestamp()
         else:
             dbstate.state = state.state
             dbstate.last_changed = state.last_changed
             dbstate.last_updated = state.last_updated
+            dbstate.last_changed_ts = state.last_changed.timestamp()
+            dbstate.last_updated_ts = state.last_updated.timestamp()
 
         return dbstate
 
@@ -288,7 +331,9 @@ class States(Base):  # type: ignore[misc,valid-type]
         )
         try:
             return State(
-                self.entity_id,
+                self.states_meta_rel.entity_id
+                if self.states_meta_rel
+                else self.entity_id,
                 self.state,
                 # Join the state_attributes table on attributes_id to get the attributes
                 # for newer states
@@ -367,6 +412,25 @@ class StateAttributes(Base):  # type: ignore[misc,valid-type]
             return {}
 
 
+class StatesMeta(Base):  # type: ignore[misc,valid-type]
+    """Entity id lookup table for states."""
+
+    __table_args__ = (
+        {"mysql_default_charset": "utf8mb4", "mysql_collate": "utf8mb4_unicode_ci"},
+    )
+    __tablename__ = TABLE_STATES_META
+    metadata_id = Column(Integer, Identity(), primary_key=True)
+    entity_id = Column(String(MAX_LENGTH_STATE_ENTITY_ID), index=True, unique=True)
+
+    def __repr__(self) -> str:
+        """Return string representation of instance for debugging."""
+        return (
+            f"<recorder.StatesMeta("
+            f"id={self.metadata_id}, entity_id='{self.entity_id}'"
+            f")>"
+        )
+
+
 class StatisticResult(TypedDict):
     """Statistic result data class.
 
@@ -521,14 +585,20 @@ class RecorderRuns(Base):  # type: ignore[misc,valid-type]
 
         assert session is not None, "RecorderRuns need to be persisted"
 
-        query = session.query(distinct(States.entity_id)).filter(
-            States.last_updated >= self.start
+        query = (
+            session.query(distinct(StatesMeta.entity_id))
+            .join(States, States.metadata_id == StatesMeta.metadata_id)
+            .filter(States.last_updated_ts >= process_datetime_to_timestamp(self.start))
         )
 
         if point_in_time is not None:
-            query = query.filter(States.last_updated < point_in_time)
+            query = query.filter(
+                States.last_updated_ts < process_datetime_to_timestamp(point_in_time)
+            )
         elif self.end is not None:
-            query = query.filter(States.last_updated < self.end)
+            query = query.filter(
+                States.last_updated_ts < process_datetime_to_timestamp(self.end)
+            )
 
         return [row[0] for row in query]
 
@@ -612,6 +682,18 @@ def process_timestamp_to_utc_isoformat(ts: datetime | None) -> str | None:
     return ts.astimezone(dt_util.UTC).isoformat()
 
 
+def process_datetime_to_timestamp(ts: datetime) -> float:
+    """Process a database datetime to epoch seconds."""
+    if ts.tzinfo is None:
+        return ts.replace(tzinfo=dt_util.UTC).timestamp()
+    return ts.timestamp()
+
+
+def timestamp_to_utc_isoformat(ts: float) -> str:
+    """Convert epoch seconds to UTC isotime."""
+    return dt_util.utc_from_timestamp(ts).isoformat()
+
+
 class LazyState(State):
     """A lazy version of core State."""
 
@@ -683,7 +765,7 @@ class LazyState(State):
     def last_changed(self) -> datetime:  # type: ignore[override]
         """Last changed datetime."""
         if self._last_changed is None:
-            self._last_changed = process_timestamp(self._row.last_changed)
+            self._last_changed = dt_util.utc_from_timestamp(self._row.last_changed_ts)
         return self._last_changed
 
     @last_changed.setter
@@ -695,8 +777,8 @@ class LazyState(State):
     def last_updated(self) -> datetime:  # type: ignore[override]
         """Last updated datetime."""
         if self._last_updated is None:
-            if (last_updated := self._row.last_updated) is not None:
-                self._last_updated = process_timestamp(last_updated)
+            if (last_updated_ts := self._row.last_updated_ts) is not None:
+                self._last_updated = dt_util.utc_from_timestamp(last_updated_ts)
             else:
                 self._last_updated = self.last_changed
         return self._last_updated
@@ -706,6 +788,17 @@ class LazyState(State):
         """Set last updated datetime."""
         self._last_updated = value
 
+    @property
+    def last_updated_timestamp(self) -> float:
+        """Last updated as a timestamp, without creating a datetime."""
+        if self._last_updated is not None:
+            return self._last_updated.timestamp()
+        if (last_updated_ts := self._row.last_updated_ts) is not None:
+            return last_updated_ts  # type: ignore[no-any-return]
+        if self._last_changed is not None:
+            return self._last_changed.timestamp()
+        return self._row.last_changed_ts  # type: ignore[no-any-return]
+
     def as_dict(self) -> dict[str, Any]:  # type: ignore[override]
         """Return a dict representation of the LazyState.
 
@@ -714,18 +807,14 @@ class LazyState(State):
         To be used for JSON serialization.
         """
         if self._last_changed is None and self._last_updated is None:
-            last_changed_isoformat = process_timestamp_to_utc_isoformat(
-                self._row.last_changed
-            )
+            last_changed_ts: float = self._row.last_changed_ts
+            last_changed_isoformat = timestamp_to_utc_isoformat(last_changed_ts)
             if (
-                self._row.last_updated is None
-                or self._row.last_changed == self._row.last_updated
-            ):
+                last_updated_ts := self._row.last_updated_ts
+            ) is None or last_changed_ts == last_updated_ts:
                 last_updated_isoformat = last_changed_isoformat
             else:
-                last_updated_isoformat = process_timestamp_to_utc_isoformat(
-                    self._row.last_updated
-                )
+                last_updated_isoformat = timestamp_to_utc_isoformat(last_updated_ts)
         else:
             last_changed_isoformat = self.last_changed.isoformat()
             if self.last_changed == self.last_updated:
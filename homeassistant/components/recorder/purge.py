@@ -1,19 +1,34 @@
 """Purge old data helper."""
 from __future__ import annotations
 
+from collections import Counter
 from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field, replace
 from datetime import datetime
 from itertools import zip_longest
 import logging
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from sqlalchemy.orm.session import Session
 from sqlalchemy.sql.expression import distinct
 
 from homeassistant.const import EVENT_STATE_CHANGED
+import homeassistant.util.dt as dt_util
 
 from .const import MAX_ROWS_TO_PURGE, SupportedDialect
-from .models import Events, StateAttributes, States
+from .models import (
+    TABLE_EVENT_DATA,
+    TABLE_EVENTS,
+    TABLE_STATE_ATTRIBUTES,
+    TABLE_STATES,
+    TABLE_STATISTICS_RUNS,
+    TABLE_STATISTICS_SHORT_TERM,
+    Events,
+    EventTypes,
+    StateAttributes,
+    States,
+    StatesMeta,
+)
 from .queries import (
     attributes_ids_exist_in_states,
     attributes_ids_exist_in_states_sqlite,
@@ -42,14 +57,79 @@ if TYPE_CHECKING:
 _LOGGER = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class PurgeProgress:
+    """Progress of a purge that runs as a series of small batches.
+
+    The progress is saved after every batch so a purge that was
+    interrupted by a restart continues where it stopped. The recorder
+    thread replaces the progress after every batch instead of changing
+    it, so the event loop can read it at any time.
+    """
+
+    purge_before: datetime
+    repack: bool
+    apply_filter: bool
+    started: datetime = field(default_factory=dt_util.utcnow)
+    finished: datetime | None = None
+    batches: int = 0
+    rows_deleted: Counter[str] = field(default_factory=Counter)
+
+    def with_batch(self, rows_deleted: Counter[str], finished: bool) -> PurgeProgress:
+        """Return the progress after another batch."""
+        total_rows_deleted = Counter(self.rows_deleted)
+        total_rows_deleted.update(rows_deleted)
+        return replace(
+            self,
+            batches=self.batches + 1,
+            rows_deleted=total_rows_deleted,
+            finished=dt_util.utcnow() if finished else None,
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a dict that can be stored and sent as json."""
+        return {
+            "purge_before": self.purge_before.isoformat(),
+            "repack": self.repack,
+            "apply_filter": self.apply_filter,
+            "started": self.started.isoformat(),
+            "finished": self.finished.isoformat() if self.finished else None,
+            "batches": self.batches,
+            "rows_deleted": dict(self.rows_deleted),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> PurgeProgress:
+        """Restore the progress from a dict created by as_dict."""
+        finished = data["finished"]
+        return cls(
+            purge_before=dt_util.parse_datetime(data["purge_before"]),
+            repack=data["repack"],
+            apply_filter=data["apply_filter"],
+            started=dt_util.parse_datetime(data["started"]),
+            finished=dt_util.parse_datetime(finished) if finished else None,
+            batches=data["batches"],
+            rows_deleted=Counter(data["rows_deleted"]),
+        )
+
+
 @retryable_database_job("purge")
 def purge_old_data(
-    instance: Recorder, purge_before: datetime, repack: bool, apply_filter: bool = False
+    instance: Recorder,
+    purge_before: datetime,
+    repack: bool,
+    apply_filter: bool = False,
+    rows_deleted: Counter[str] | None = None,
 ) -> bool:
     """Purge events and states older than purge_before.
 
     Cleans up an timeframe of an hour, based on the oldest record.
+    Each call deletes at most one batch of rows and commits it, the
+    caller reschedules the purge until this returns True. The rows
+    deleted are added to rows_deleted if it is given, once they are
+    committed.
     """
+    deleted: Counter[str] = Counter()
     _LOGGER.debug(
         "Purging states and events before target %s",
         purge_before.isoformat(sep=" ", timespec="seconds"),
@@ -70,40 +150,51 @@ def purge_old_data(
         )
 
         if state_ids:
-            _purge_state_ids(instance, session, state_ids)
+            deleted[TABLE_STATES] += _purge_state_ids(instance, session, state_ids)
 
         if unused_attribute_ids_set := _select_unused_attributes_ids(
             session, attributes_ids, using_sqlite
         ):
-            _purge_attributes_ids(instance, session, unused_attribute_ids_set)
+            deleted[TABLE_STATE_ATTRIBUTES] += _purge_attributes_ids(
+                instance, session, unused_attribute_ids_set
+            )
 
         if event_ids:
-            _purge_event_ids(session, event_ids)
+            deleted[TABLE_EVENTS] += _purge_event_ids(session, event_ids)
 
         if unused_data_ids_set := _select_unused_event_data_ids(
             session, data_ids, using_sqlite
         ):
-            _purge_event_data_ids(instance, session, unused_data_ids_set)
+            deleted[TABLE_EVENT_DATA] += _purge_event_data_ids(
+                instance, session, unused_data_ids_set
+            )
 
         if statistics_runs:
-            _purge_statistics_runs(session, statistics_runs)
+            deleted[TABLE_STATISTICS_RUNS] += _purge_statistics_runs(
+                session, statistics_runs
+            )
 
         if short_term_statistics:
-            _purge_short_term_statistics(session, short_term_statistics)
+            deleted[TABLE_STATISTICS_SHORT_TERM] += _purge_short_term_statistics(
+                session, short_term_statistics
+            )
 
         if state_ids or event_ids or statistics_runs or short_term_statistics:
             # Return false, as we might not be done yet.
             _LOGGER.debug("Purging hasn't fully completed yet")
-            return False
-
-        if apply_filter and _purge_filtered_data(instance, session) is False:
+            finished = False
+        elif apply_filter and _purge_filtered_data(instance, session, deleted) is False:
             _LOGGER.debug("Cleanup filtered data hasn't fully completed yet")
-            return False
-
-        _purge_old_recorder_runs(instance, session, purge_before)
-    if repack:
+            finished = False
+        else:
+            _purge_old_recorder_runs(instance, session, purge_before)
+            finished = True
+
+    if rows_deleted is not None:
+        rows_deleted.update(deleted)
+    if finished and repack:
         repack_database(instance)
-    return True
+    return finished
 
 
 def _select_event_state_attributes_ids_data_ids_to_purge(
@@ -256,7 +347,7 @@ def _select_short_term_statistics_to_purge(
     return [statistic.id for statistic in statistics]
 
 
-def _purge_state_ids(instance: Recorder, session: Session, state_ids: set[int]) -> None:
+def _purge_state_ids(instance: Recorder, session: Session, state_ids: set[int]) -> int:
     """Disconnect states and delete by state id."""
 
     # Update old_state_id to NULL before deleting to ensure
@@ -266,11 +357,12 @@ def _purge_state_ids(instance: Recorder, session: Session, state_ids: set[int])
     disconnected_rows = session.execute(disconnect_states_rows(state_ids))
     _LOGGER.debug("Updated %s states to remove old_state_id", disconnected_rows)
 
-    deleted_rows = session.execute(delete_states_rows(state_ids))
+    deleted_rows = session.execute(delete_states_rows(state_ids)).rowcount
     _LOGGER.debug("Deleted %s states", deleted_rows)
 
     # Evict eny entries in the old_states cache referring to a purged state
     _evict_purged_states_from_old_states_cache(instance, state_ids)
+    return deleted_rows
 
 
 def _evict_purged_states_from_old_states_cache(
@@ -329,47 +421,56 @@ def _evict_purged_attributes_from_attributes_cache(
 
 def _purge_attributes_ids(
     instance: Recorder, session: Session, attributes_ids: set[int]
-) -> None:
+) -> int:
     """Delete old attributes ids."""
-    deleted_rows = session.execute(delete_states_attributes_rows(attributes_ids))
+    deleted_rows = session.execute(
+        delete_states_attributes_rows(attributes_ids)
+    ).rowcount
     _LOGGER.debug("Deleted %s attribute states", deleted_rows)
 
     # Evict any entries in the state_attributes_ids cache referring to a purged state
     _evict_purged_attributes_from_attributes_cache(instance, attributes_ids)
+    return deleted_rows
 
 
 def _purge_event_data_ids(
     instance: Recorder, session: Session, data_ids: set[int]
-) -> None:
+) -> int:
     """Delete old event data ids."""
 
-    deleted_rows = session.execute(delete_event_data_rows(data_ids))
+    deleted_rows = session.execute(delete_event_data_rows(data_ids)).rowcount
     _LOGGER.debug("Deleted %s data events", deleted_rows)
 
     # Evict any entries in the event_data_ids cache referring to a purged state
     _evict_purged_data_from_data_cache(instance, data_ids)
+    return deleted_rows
 
 
-def _purge_statistics_runs(session: Session, statistics_runs: list[int]) -> None:
+def _purge_statistics_runs(session: Session, statistics_runs: list[int]) -> int:
     """Delete by run_id."""
-    deleted_rows = session.execute(delete_statistics_runs_rows(statistics_runs))
+    deleted_rows = session.execute(
+        delete_statistics_runs_rows(statistics_runs)
+    ).rowcount
     _LOGGER.debug("Deleted %s statistic runs", deleted_rows)
+    return deleted_rows
 
 
 def _purge_short_term_statistics(
     session: Session, short_term_statistics: list[int]
-) -> None:
+) -> int:
     """Delete by id."""
     deleted_rows = session.execute(
         delete_statistics_short_term_rows(short_term_statistics)
-    )
+    ).rowcount
     _LOGGER.debug("Deleted %s short term statistics", deleted_rows)
+    return deleted_rows
 
 
-def _purge_event_ids(session: Session, event_ids: Iterable[int]) -> None:
+def _purge_event_ids(session: Session, event_ids: Iterable[int]) -> int:
     """Delete by event id."""
-    deleted_rows = session.execute(delete_event_rows(event_ids))
+    deleted_rows = session.execute(delete_event_rows(event_ids)).rowcount
     _LOGGER.debug("Deleted %s events", deleted_rows)
+    return deleted_rows
 
 
 def _purge_old_recorder_runs(
@@ -383,39 +484,70 @@ def _purge_old_recorder_runs(
     _LOGGER.debug("Deleted %s recorder_runs", deleted_rows)
 
 
-def _purge_filtered_data(instance: Recorder, session: Session) -> bool:
+def _purge_filtered_data(
+    instance: Recorder, session: Session, rows_deleted: Counter[str]
+) -> bool:
     """Remove filtered states and events that shouldn't be in the database."""
     _LOGGER.debug("Cleanup filtered data")
     using_sqlite = instance.dialect_name == SupportedDialect.SQLITE
 
     # Check if excluded entity_ids are in database
-    excluded_entity_ids: list[str] = [
-        entity_id
-        for (entity_id,) in session.query(distinct(States.entity_id)).all()
-        if not instance.entity_filter(entity_id)
-    ]
-    if len(excluded_entity_ids) > 0:
-        _purge_filtered_states(instance, session, excluded_entity_ids, using_sqlite)
+    excluded_metadata_ids = _select_ids_in_use(
+        session,
+        States.metadata_id,
+        [
+            metadata_id
+            for metadata_id, entity_id in session.query(
+                StatesMeta.metadata_id, StatesMeta.entity_id
+            ).all()
+            if not instance.entity_filter(entity_id)
+        ],
+    )
+    if len(excluded_metadata_ids) > 0:
+        _purge_filtered_states(
+            instance, session, excluded_metadata_ids, using_sqlite, rows_deleted
+        )
         return False
 
     # Check if excluded event_types are in database
-    excluded_event_types: list[str] = [
-        event_type
-        for (event_type,) in session.query(distinct(Events.event_type)).all()
+    excluded_event_types: dict[int, str] = {
+        event_type_id: event_type
+        for event_type_id, event_type in session.query(
+            EventTypes.event_type_id, EventTypes.event_type
+        ).all()
         if event_type in instance.exclude_t
-    ]
-    if len(excluded_event_types) > 0:
-        _purge_filtered_events(instance, session, excluded_event_types)
+    }
+    if excluded_event_type_ids := _select_ids_in_use(
+        session, Events.event_type_id, list(excluded_event_types)
+    ):
+        _purge_filtered_events(
+            instance,
+            session,
+            excluded_event_type_ids,
+            [
+                excluded_event_types[event_type_id]
+                for event_type_id in excluded_event_type_ids
+            ],
+            rows_deleted,
+        )
         return False
 
     return True
 
 
+def _select_ids_in_use(session: Session, column: Any, ids: list[int]) -> list[int]:
+    """Return the ids that are still referenced by rows in the column's table."""
+    if not ids:
+        return []
+    return [id_ for (id_,) in session.query(distinct(column)).filter(column.in_(ids))]
+
+
 def _purge_filtered_states(
     instance: Recorder,
     session: Session,
-    excluded_entity_ids: list[str],
+    excluded_metadata_ids: list[int],
     using_sqlite: bool,
+    rows_deleted: Counter[str],
 ) -> None:
     """Remove filtered states and linked events."""
     state_ids: list[int]
@@ -424,7 +556,7 @@ def _purge_filtered_states(
     state_ids, attributes_ids, event_ids = zip(
         *(
             session.query(States.state_id, States.attributes_id, States.event_id)
-            .filter(States.entity_id.in_(excluded_entity_ids))
+            .filter(States.metadata_id.in_(excluded_metadata_ids))
             .limit(MAX_ROWS_TO_PURGE)
             .all()
         )
@@ -433,23 +565,29 @@ def _purge_filtered_states(
     _LOGGER.debug(
         "Selected %s state_ids to remove that should be filtered", len(state_ids)
     )
-    _purge_state_ids(instance, session, set(state_ids))
-    _purge_event_ids(session, event_ids)
+    rows_deleted[TABLE_STATES] += _purge_state_ids(instance, session, set(state_ids))
+    rows_deleted[TABLE_EVENTS] += _purge_event_ids(session, event_ids)
     unused_attribute_ids_set = _select_unused_attributes_ids(
         session, {id_ for id_ in attributes_ids if id_ is not None}, using_sqlite
     )
-    _purge_attributes_ids(instance, session, unused_attribute_ids_set)
+    rows_deleted[TABLE_STATE_ATTRIBUTES] += _purge_attributes_ids(
+        instance, session, unused_attribute_ids_set
+    )
 
 
 def _purge_filtered_events(
-    instance: Recorder, session: Session, excluded_event_types: list[str]
+    instance: Recorder,
+    session: Session,
+    excluded_event_type_ids: list[int],
+    excluded_event_types: list[str],
+    rows_deleted: Counter[str],
 ) -> None:
     """Remove filtered events and linked states."""
     using_sqlite = instance.dialect_name == SupportedDialect.SQLITE
     event_ids, data_ids = zip(
         *(
             session.query(Events.event_id, Events.data_id)
-            .filter(Events.event_type.in_(excluded_event_types))
+            .filter(Events.event_type_id.in_(excluded_event_type_ids))
             .limit(MAX_ROWS_TO_PURGE)
             .all()
         )
@@ -461,14 +599,18 @@ def _purge_filtered_events(
         session.query(States.state_id).filter(States.event_id.in_(event_ids)).all()
     )
     state_ids: set[int] = {state.state_id for state in states}
-    _purge_state_ids(instance, session, state_ids)
-    _purge_event_ids(session, event_ids)
+    rows_deleted[TABLE_STATES] += _purge_state_ids(instance, session, state_ids)
+    rows_deleted[TABLE_EVENTS] += _purge_event_ids(session, event_ids)
     if unused_data_ids_set := _select_unused_event_data_ids(
         session, set(data_ids), using_sqlite
     ):
-        _purge_event_data_ids(instance, session, unused_data_ids_set)
+        rows_deleted[TABLE_EVENT_DATA] += _purge_event_data_ids(
+            instance, session, unused_data_ids_set
+        )
     if EVENT_STATE_CHANGED in excluded_event_types:
-        session.query(StateAttributes).delete(synchronize_session=False)
+        rows_deleted[TABLE_STATE_ATTRIBUTES] += session.query(StateAttributes).delete(
+            synchronize_session=False
+        )
         instance._state_attributes_ids = {}  # pylint: disable=protected-access
 
 
@@ -477,15 +619,25 @@ def purge_entity_data(instance: Recorder, entity_filter: Callable[[str], bool])
     """Purge states and events of specified entities."""
     using_sqlite = instance.dialect_name == SupportedDialect.SQLITE
     with session_scope(session=instance.get_session()) as session:
-        selected_entity_ids: list[str] = [
-            entity_id
-            for (entity_id,) in session.query(distinct(States.entity_id)).all()
+        selected_entity_ids: dict[int, str] = {
+            metadata_id: entity_id
+            for metadata_id, entity_id in session.query(
+                StatesMeta.metadata_id, StatesMeta.entity_id
+            ).all()
             if entity_filter(entity_id)
-        ]
-        _LOGGER.debug("Purging entity data for %s", selected_entity_ids)
-        if len(selected_entity_ids) > 0:
+        }
+        selected_metadata_ids = _select_ids_in_use(
+            session, States.metadata_id, list(selected_entity_ids)
+        )
+        _LOGGER.debug(
+            "Purging entity data for %s",
+            [selected_entity_ids[metadata_id] for metadata_id in selected_metadata_ids],
+        )
+        if len(selected_metadata_ids) > 0:
             # Purge a max of MAX_ROWS_TO_PURGE, based on the oldest states or events record
-            _purge_filtered_states(instance, session, selected_entity_ids, using_sqlite)
+            _purge_filtered_states(
+                instance, session, selected_metadata_ids, using_sqlite, Counter()
+            )
             _LOGGER.debug("Purging entity data hasn't fully completed yet")
             return False
 
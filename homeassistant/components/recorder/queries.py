@@ -12,9 +12,11 @@ from .const import MAX_ROWS_TO_PURGE
 from .models import (
     EventData,
     Events,
+    EventTypes,
     RecorderRuns,
     StateAttributes,
     States,
+    StatesMeta,
     StatisticsRuns,
     StatisticsShortTerm,
 )
@@ -40,6 +42,22 @@ def find_shared_data_id(attr_hash: int, shared_data: str) -> StatementLambdaElem
     )
 
 
+def find_event_type_id(event_type: str) -> StatementLambdaElement:
+    """Find an event_type_id by event_type."""
+    return lambda_stmt(
+        lambda: select(EventTypes.event_type_id).filter(
+            EventTypes.event_type == event_type
+        )
+    )
+
+
+def find_states_metadata_id(entity_id: str) -> StatementLambdaElement:
+    """Find a metadata_id by entity_id."""
+    return lambda_stmt(
+        lambda: select(StatesMeta.metadata_id).filter(StatesMeta.entity_id == entity_id)
+    )
+
+
 def _state_attrs_exist(attr: int | None) -> Select:
     """Check if a state attributes id exists in the states table."""
     return select(func.min(States.attributes_id)).where(States.attributes_id == attr)
@@ -14,11 +14,11 @@ import re
 from statistics import mean
 from typing import TYPE_CHECKING, Any, Literal, overload
 
-from sqlalchemy import bindparam, func
+from sqlalchemy import and_, bindparam, case, func
 from sqlalchemy.exc import SQLAlchemyError, StatementError
 from sqlalchemy.ext import baked
 from sqlalchemy.orm.session import Session
-from sqlalchemy.sql.expression import literal_column, true
+from sqlalchemy.sql.expression import literal, literal_column, true
 import voluptuous as vol
 
 from homeassistant.const import (
@@ -66,6 +66,12 @@ QUERY_STATISTICS = [
     Statistics.sum,
 ]
 
+STATISTIC_COLUMNS = ("mean", "min", "max", "last_reset", "state", "sum")
+
+# The number of day or month periods grouped by a single query, this keeps
+# the number of bound parameters below the SQLite limit
+MAX_PERIODS_PER_QUERY = 250
+
 QUERY_STATISTICS_SHORT_TERM = [
     StatisticsShortTerm.metadata_id,
     StatisticsShortTerm.start,
@@ -766,6 +772,11 @@ def _configured_unit(unit: str | None, units: UnitSystem) -> str | None:
     return unit
 
 
+def get_display_unit(hass: HomeAssistant, statistic_unit: str | None) -> str | None:
+    """Return the unit statistics in statistic_unit are returned in."""
+    return _configured_unit(statistic_unit, hass.config.units)
+
+
 def clear_statistics(instance: Recorder, statistic_ids: list[str]) -> None:
     """Clear statistics for a list of statistic_ids."""
     with session_scope(session=instance.get_session()) as session:
@@ -799,7 +810,7 @@ def list_statistic_ids(
     result = {}
 
     # Query the database
-    with session_scope(hass=hass) as session:
+    with session_scope(hass=hass, read_only=True) as session:
         metadata = get_metadata_with_session(
             hass, session, statistic_type=statistic_type, statistic_ids=statistic_ids
         )
@@ -988,60 +999,277 @@ def statistics_during_period(
     If end_time is omitted, returns statistics newer than or equal to start_time.
     If statistic_ids is omitted, returns statistics for all statistics ids.
     """
-    metadata = None
-    with session_scope(hass=hass) as session:
-        # Fetch metadata for the given (or all) statistic_ids
-        metadata = get_metadata_with_session(hass, session, statistic_ids=statistic_ids)
-        if not metadata:
-            return {}
+    with session_scope(hass=hass, read_only=True) as session:
+        return statistics_during_period_with_session(
+            hass,
+            session,
+            start_time,
+            end_time,
+            statistic_ids,
+            period,
+            start_time_as_datetime,
+        )
 
-        metadata_ids = None
-        if statistic_ids is not None:
-            metadata_ids = [metadata_id for metadata_id, _ in metadata.values()]
 
-        bakery = hass.data[STATISTICS_BAKERY]
-        if period == "5minute":
-            baked_query = bakery(
-                lambda session: session.query(*QUERY_STATISTICS_SHORT_TERM)
-            )
-            table = StatisticsShortTerm
-        else:
-            baked_query = bakery(lambda session: session.query(*QUERY_STATISTICS))
-            table = Statistics
+def statistics_during_period_with_session(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None = None,
+    statistic_ids: list[str] | None = None,
+    period: Literal["5minute", "day", "hour", "month"] = "hour",
+    start_time_as_datetime: bool = False,
+) -> dict[str, list[dict[str, Any]]]:
+    """Return statistics during UTC period start_time - end_time for the statistic_ids."""
+    # Fetch metadata for the given (or all) statistic_ids
+    metadata = get_metadata_with_session(hass, session, statistic_ids=statistic_ids)
+    if not metadata:
+        return {}
 
-        baked_query = _statistics_during_period_query(
-            hass, end_time, statistic_ids, baked_query, table
+    metadata_ids = None
+    if statistic_ids is not None:
+        metadata_ids = [metadata_id for metadata_id, _ in metadata.values()]
+
+    bakery = hass.data[STATISTICS_BAKERY]
+    if period == "5minute":
+        baked_query = bakery(
+            lambda session: session.query(*QUERY_STATISTICS_SHORT_TERM)
         )
+        table = StatisticsShortTerm
+    else:
+        baked_query = bakery(lambda session: session.query(*QUERY_STATISTICS))
+        table = Statistics
 
-        stats = execute(
-            baked_query(session).params(
-                start_time=start_time, end_time=end_time, metadata_ids=metadata_ids
-            )
+    baked_query = _statistics_during_period_query(
+        hass, end_time, statistic_ids, baked_query, table
+    )
+
+    stats = execute(
+        baked_query(session).params(
+            start_time=start_time, end_time=end_time, metadata_ids=metadata_ids
         )
-        if not stats:
+    )
+    if not stats:
+        return {}
+    # Return statistics combined with metadata
+    if period not in ("day", "month"):
+        return _sorted_statistics_to_dict(
+            hass,
+            session,
+            stats,
+            statistic_ids,
+            metadata,
+            True,
+            table,
+            start_time,
+            start_time_as_datetime,
+        )
+
+    result = _sorted_statistics_to_dict(
+        hass, session, stats, statistic_ids, metadata, True, table, start_time, True
+    )
+
+    if period == "day":
+        return _reduce_statistics_per_day(result)
+
+    return _reduce_statistics_per_month(result)
+
+
+def statistics_during_period_columns(
+    hass: HomeAssistant,
+    start_time: datetime,
+    end_time: datetime | None,
+    statistic_ids: list[str],
+    period: Literal["5minute", "day", "hour", "month"],
+    types: Iterable[str] = STATISTIC_COLUMNS,
+) -> dict[str, dict[str, list[Any]]]:
+    """Return statistics during UTC period start_time - end_time in columns.
+
+    Day and month periods are reduced by the database instead of in Python.
+    The result holds a list per requested type and lists with the start and
+    end timestamps of each period for each statistic_id.
+    """
+    with session_scope(hass=hass, read_only=True) as session:
+        metadata = get_metadata_with_session(hass, session, statistic_ids=statistic_ids)
+        if not metadata:
             return {}
-        # Return statistics combined with metadata
-        if period not in ("day", "month"):
-            return _sorted_statistics_to_dict(
-                hass,
+        metadata_ids = [metadata_id for metadata_id, _ in metadata.values()]
+        if period in ("day", "month"):
+            rows = _reduced_statistics_rows(
                 session,
-                stats,
-                statistic_ids,
-                metadata,
-                True,
-                table,
                 start_time,
-                start_time_as_datetime,
+                end_time or dt_util.utcnow(),
+                metadata_ids,
+                period,
             )
+        else:
+            table = StatisticsShortTerm if period == "5minute" else Statistics
+            rows = _statistics_rows(session, start_time, end_time, metadata_ids, table)
+        return _statistics_rows_to_columns(hass, rows, metadata, types)
 
-        result = _sorted_statistics_to_dict(
-            hass, session, stats, statistic_ids, metadata, True, table, start_time, True
-        )
 
+def _statistics_rows(
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None,
+    metadata_ids: list[int],
+    table: type[Statistics | StatisticsShortTerm],
+) -> list[tuple[int, float, float, Any, Any, Any, Any, Any, Any]]:
+    """Return the statistics rows with the start and end of each period."""
+    query = session.query(
+        table.metadata_id,
+        table.start,
+        table.mean,
+        table.min,
+        table.max,
+        table.last_reset,
+        table.state,
+        table.sum,
+    ).filter(table.metadata_id.in_(metadata_ids), table.start >= start_time)
+    if end_time is not None:
+        query = query.filter(table.start < end_time)
+    query = query.order_by(table.metadata_id, table.start)
+    duration = table.duration.total_seconds()
+    rows = []
+    for row in execute(query):
+        start = process_timestamp(row.start).timestamp()
+        rows.append((row.metadata_id, start, start + duration, *row[2:]))
+    return rows
+
+
+def _local_period_starts(
+    start_time: datetime, end_time: datetime, period: Literal["day", "month"]
+) -> list[datetime]:
+    """Return the UTC start of each local day or month from start_time to end_time.
+
+    The list ends with the first period start at or after end_time.
+    """
+    local = dt_util.as_local(start_time).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+    if period == "month":
+        local = local.replace(day=1)
+    period_starts = [dt_util.as_utc(local)]
+    while period_starts[-1] < end_time:
         if period == "day":
-            return _reduce_statistics_per_day(result)
+            local = local + timedelta(days=1)
+        else:
+            local = (local + timedelta(days=31)).replace(day=1)
+        period_starts.append(dt_util.as_utc(local))
+    return period_starts
+
 
-        return _reduce_statistics_per_month(result)
+def _reduced_statistics_rows(
+    session: Session,
+    start_time: datetime,
+    end_time: datetime,
+    metadata_ids: list[int],
+    period: Literal["day", "month"],
+) -> list[tuple[int, float, float, Any, Any, Any, Any, Any, Any]]:
+    """Return hourly statistics reduced to days or months by the database.
+
+    The mean is averaged and the min and max are the lowest and highest of the
+    period. The last_reset, state and sum are those of the last hour.
+    """
+    period_starts = _local_period_starts(start_time, end_time, period)
+    rows = []
+    for offset in range(0, len(period_starts) - 1, MAX_PERIODS_PER_QUERY):
+        chunk = period_starts[offset : offset + MAX_PERIODS_PER_QUERY + 1]
+        chunk_start = max(chunk[0], start_time)
+        chunk_end = min(chunk[-1], end_time)
+        # Map the start of each hour to the index of the period it is in
+        period_index = (
+            case(
+                *(
+                    (Statistics.start < period_end, index)
+                    for index, period_end in enumerate(chunk[1:-1])
+                ),
+                else_=len(chunk) - 2,
+            )
+            if len(chunk) > 2
+            else literal(0)
+        ).label("period_index")
+        reduced = (
+            session.query(
+                Statistics.metadata_id.label("metadata_id"),
+                period_index,
+                func.avg(Statistics.mean).label("mean"),
+                func.min(Statistics.min).label("min"),
+                func.max(Statistics.max).label("max"),
+                func.max(Statistics.start).label("last_start"),
+            )
+            .filter(
+                Statistics.metadata_id.in_(metadata_ids),
+                Statistics.start >= chunk_start,
+                Statistics.start < chunk_end,
+            )
+            .group_by(Statistics.metadata_id, period_index)
+            .subquery()
+        )
+        query = (
+            session.query(
+                reduced.c.metadata_id,
+                reduced.c.period_index,
+                reduced.c.mean,
+                reduced.c.min,
+                reduced.c.max,
+                Statistics.last_reset,
+                Statistics.state,
+                Statistics.sum,
+            )
+            .join(
+                Statistics,
+                and_(
+                    Statistics.metadata_id == reduced.c.metadata_id,
+                    Statistics.start == reduced.c.last_start,
+                ),
+            )
+            .order_by(reduced.c.metadata_id, reduced.c.period_index)
+        )
+        rows.extend(
+            (
+                row.metadata_id,
+                chunk[row.period_index].timestamp(),
+                chunk[row.period_index + 1].timestamp(),
+                *row[2:],
+            )
+            for row in execute(query)
+        )
+    rows.sort(key=lambda row: (row[0], row[1]))
+    return rows
+
+
+def _statistics_rows_to_columns(
+    hass: HomeAssistant,
+    rows: list[tuple[int, float, float, Any, Any, Any, Any, Any, Any]],
+    _metadata: dict[str, tuple[int, StatisticMetaData]],
+    types: Iterable[str],
+) -> dict[str, dict[str, list[Any]]]:
+    """Convert statistics rows to columns, converting to the display unit."""
+    units = hass.config.units
+    metadata = dict(_metadata.values())
+    indexes = [(column, STATISTIC_COLUMNS.index(column) + 3) for column in types]
+    result: dict[str, dict[str, list[Any]]] = {}
+    for meta_id, group in groupby(rows, lambda row: row[0]):
+        unit = metadata[meta_id]["unit_of_measurement"]
+        convert = STATISTIC_UNIT_TO_DISPLAY_UNIT_CONVERSIONS.get(unit)
+        group_rows = list(group)
+        columns: dict[str, list[Any]] = {
+            "start": [row[1] for row in group_rows],
+            "end": [row[2] for row in group_rows],
+        }
+        for column, index in indexes:
+            if column == "last_reset":
+                columns[column] = [
+                    process_timestamp(row[index]).timestamp() if row[index] else None
+                    for row in group_rows
+                ]
+            elif convert is not None:
+                columns[column] = [convert(row[index], units) for row in group_rows]
+            else:
+                columns[column] = [row[index] for row in group_rows]
+        result[metadata[meta_id]["statistic_id"]] = columns
+    return result
 
 
 def _get_last_statistics(
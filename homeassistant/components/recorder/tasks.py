@@ -3,6 +3,7 @@ from __future__ import annotations
 
 import abc
 import asyncio
+from collections import Counter
 from collections.abc import Callable, Iterable
 from dataclasses import dataclass
 from datetime import datetime
@@ -65,9 +66,23 @@ class PurgeTask(RecorderTask):
 
     def run(self, instance: Recorder) -> None:
         """Purge the database."""
-        if purge.purge_old_data(
-            instance, self.purge_before, self.repack, self.apply_filter
+        progress = instance.purge_progress
+        if (
+            progress is None
+            or progress.finished
+            or progress.purge_before != self.purge_before
         ):
+            progress = instance.purge_progress = purge.PurgeProgress(
+                self.purge_before, self.repack, self.apply_filter
+            )
+        rows_deleted: Counter[str] = Counter()
+        finished = purge.purge_old_data(
+            instance, self.purge_before, self.repack, self.apply_filter, rows_deleted
+        )
+        # Replace the progress as the event loop may be reading it
+        instance.purge_progress = progress.with_batch(rows_deleted, finished)
+        instance.hass.add_job(instance.async_save_purge_progress)
+        if finished:
             with instance.get_session() as session:
                 instance.run_history.load_from_db(session)
             # We always need to do the db cleanups after a purge
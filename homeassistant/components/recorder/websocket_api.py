@@ -28,6 +28,7 @@ def async_setup(hass: HomeAssistant) -> None:
     websocket_api.async_register_command(hass, ws_get_statistics_metadata)
     websocket_api.async_register_command(hass, ws_update_statistics_metadata)
     websocket_api.async_register_command(hass, ws_info)
+    websocket_api.async_register_command(hass, ws_purge_progress)
     websocket_api.async_register_command(hass, ws_backup_start)
     websocket_api.async_register_command(hass, ws_backup_end)
     websocket_api.async_register_command(hass, ws_adjust_sum_statistics)
@@ -83,7 +84,7 @@ async def ws_get_statistics_metadata(
 ) -> None:
     """Get metadata for a list of statistic_ids."""
     instance: Recorder = hass.data[DATA_INSTANCE]
-    statistic_ids = await instance.async_add_executor_job(
+    statistic_ids = await instance.async_add_read_executor_job(
         list_statistic_ids, hass, msg.get("statistic_ids")
     )
     connection.send_result(msg["id"], statistic_ids)
@@ -163,6 +164,21 @@ def ws_info(
     connection.send_result(msg["id"], recorder_info)
 
 
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "recorder/purge_progress",
+    }
+)
+@callback
+def ws_purge_progress(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Return the progress of the running or last finished purge."""
+    instance: Recorder = hass.data[DATA_INSTANCE]
+    progress = instance.purge_progress
+    connection.send_result(msg["id"], progress.as_dict() if progress else None)
+
+
 @websocket_api.ws_require_user(only_supervisor=True)
 @websocket_api.websocket_command({vol.Required("type"): "backup/start"})
 @websocket_api.async_response
@@ -4,14 +4,17 @@ from __future__ import annotations
 from collections import defaultdict
 from collections.abc import Callable, Iterable, MutableMapping
 import datetime
+from functools import lru_cache
 import itertools
 import logging
 import math
-from typing import Any
+from types import ModuleType
+from typing import TYPE_CHECKING, Any
 
 from sqlalchemy.orm.session import Session
 
 from homeassistant.components.recorder import (
+    get_instance,
     history,
     is_entity_recorded,
     statistics,
@@ -19,6 +22,7 @@ from homeassistant.components.recorder import (
 )
 from homeassistant.components.recorder.const import DOMAIN as RECORDER_DOMAIN
 from homeassistant.components.recorder.models import (
+    LazyState,
     StatisticData,
     StatisticMetaData,
     StatisticResult,
@@ -63,6 +67,9 @@ from . import (
     SensorDeviceClass,
 )
 
+if TYPE_CHECKING:
+    import numpy as np
+
 _LOGGER = logging.getLogger(__name__)
 
 DEFAULT_STATISTICS = {
@@ -129,23 +136,104 @@ WARN_UNSTABLE_UNIT = "sensor_warn_unstable_unit"
 LINK_DEV_STATISTICS = "https://my.home-assistant.io/redirect/developer_statistics"
 
 
+def _compile_numeric_sensors(hass: HomeAssistant) -> bool:
+    """Return True if statistics are compiled for numeric sensors without state class.
+
+    This is opted in to for downsampled history.
+    """
+    return get_instance(hass).compile_numeric_sensor_statistics
+
+
+def _track_numeric_sensors(hass: HomeAssistant, sensor_states: list[State]) -> None:
+    """Save which of the sensors are compiled without state class.
+
+    The recorder clears their statistics when compiling them is turned off.
+    """
+    instance = get_instance(hass)
+    tracked = instance.numeric_sensor_statistic_ids
+    numeric_sensors = {
+        state.entity_id
+        for state in sensor_states
+        if state.attributes.get(ATTR_STATE_CLASS) is None
+    }
+    # Sensors which got a state class keep their statistics
+    tracked = (tracked - {state.entity_id for state in sensor_states}) | numeric_sensors
+    if tracked != instance.numeric_sensor_statistic_ids:
+        instance.numeric_sensor_statistic_ids = tracked
+        hass.add_job(instance.async_save_numeric_sensor_statistics)
+
+
+def _is_numeric(state: State) -> bool:
+    """Return True if the state of a sensor looks numeric."""
+    if ATTR_UNIT_OF_MEASUREMENT in state.attributes:
+        return True
+    try:
+        _parse_float(state.state)
+    except ValueError:
+        return False
+    return True
+
+
+def _state_class(state: State) -> str:
+    """Return the state class statistics are compiled for.
+
+    Sensors without state class are compiled as measurements.
+    """
+    return state.attributes.get(ATTR_STATE_CLASS) or STATE_CLASS_MEASUREMENT
+
+
 def _get_sensor_states(hass: HomeAssistant) -> list[State]:
     """Get the current state of all sensors for which to compile statistics."""
-    all_sensors = hass.states.all(DOMAIN)
+    all_sensors = hass.states.snapshot().all(DOMAIN)
     statistics_sensors = []
+    compile_numeric = _compile_numeric_sensors(hass)
 
     for state in all_sensors:
         if not is_entity_recorded(hass, state.entity_id):
             continue
-        if (state.attributes.get(ATTR_STATE_CLASS)) not in STATE_CLASSES:
-            continue
+        if (state_class := state.attributes.get(ATTR_STATE_CLASS)) not in STATE_CLASSES:
+            if state_class is not None or not compile_numeric:
+                continue
+            if not _is_numeric(state):
+                continue
         statistics_sensors.append(state)
 
     return statistics_sensors
 
 
+@lru_cache(maxsize=1)
+def _numpy() -> ModuleType | None:
+    """Return numpy if it's installed.
+
+    numpy is not a requirement, if it's installed the statistics are compiled
+    for all states of a sensor at once instead of state by state.
+    """
+    try:
+        import numpy  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return None
+    return numpy
+
+
+def _last_updated_timestamps(numpy: ModuleType, states: list[State]) -> np.ndarray:
+    """Return the last_updated of the states as an array of timestamps."""
+    return numpy.fromiter(
+        (
+            state.last_updated_timestamp
+            if isinstance(state, LazyState)
+            else state.last_updated.timestamp()
+            for state in states
+        ),
+        dtype=numpy.float64,
+        count=len(states),
+    )
+
+
 def _time_weighted_average(
-    fstates: list[tuple[float, State]], start: datetime.datetime, end: datetime.datetime
+    fvalues: list[float] | np.ndarray,
+    fstates: list[State],
+    start: datetime.datetime,
+    end: datetime.datetime,
 ) -> float:
     """Calculate a time weighted average.
 
@@ -153,11 +241,24 @@ def _time_weighted_average(
     state changes.
     Note: there's no interpolation of values between state changes.
     """
+    if (numpy := _numpy()) is not None:
+        # The recorder will give us the last known state, which may be well
+        # before the requested start time for the statistics
+        start_times = numpy.maximum(
+            _last_updated_timestamps(numpy, fstates), start.timestamp()
+        )
+        end_ts = end.timestamp()
+        # Each value is weighted by the duration until the next state change,
+        # the last value by the duration until the end of the period
+        durations = numpy.diff(start_times, append=end_ts)
+        # If there was no last known state, the period starts at the first state
+        return float(numpy.dot(fvalues, durations)) / (end_ts - float(start_times[0]))
+
     old_fstate: float | None = None
     old_start_time: datetime.datetime | None = None
     accumulated = 0.0
 
-    for fstate, state in fstates:
+    for fstate, state in zip(fvalues, fstates):
         # The recorder will give us the last known state, which may be well
         # before the requested start time for the statistics
         start_time = start if state.last_updated < start else state.last_updated
@@ -182,9 +283,9 @@ def _time_weighted_average(
     return accumulated / (end - start).total_seconds()
 
 
-def _get_units(fstates: list[tuple[float, State]]) -> set[str | None]:
+def _get_units(fstates: list[State]) -> set[str | None]:
     """Return True if all states have the same unit."""
-    return {item[1].attributes.get(ATTR_UNIT_OF_MEASUREMENT) for item in fstates}
+    return {state.attributes.get(ATTR_UNIT_OF_MEASUREMENT) for state in fstates}
 
 
 def _parse_float(state: str) -> float:
@@ -195,6 +296,36 @@ def _parse_float(state: str) -> float:
     return fstate
 
 
+def _parse_floats(
+    states: list[State],
+) -> tuple[list[float] | np.ndarray, list[State]]:
+    """Parse the states as floats, states which are not finite numbers are dropped."""
+    if (numpy := _numpy()) is not None:
+        try:
+            fvalues = numpy.array(
+                [state.state for state in states], dtype=numpy.float64
+            )
+        except (ValueError, TypeError):
+            pass
+        else:
+            if numpy.isfinite(fvalues).all():
+                return fvalues, states
+
+    # Some states are not numeric, parse them one by one
+    parsed: list[float] = []
+    fstates: list[State] = []
+    for state in states:
+        try:
+            fstate = _parse_float(state.state)
+        except (ValueError, TypeError):  # TypeError to guard for NULL state in DB
+            continue
+        parsed.append(fstate)
+        fstates.append(state)
+    if numpy is not None:
+        return numpy.array(parsed, dtype=numpy.float64), fstates
+    return parsed, fstates
+
+
 def _normalize_states(
     hass: HomeAssistant,
     session: Session,
@@ -202,20 +333,16 @@ def _normalize_states(
     entity_history: Iterable[State],
     device_class: str | None,
     entity_id: str,
-) -> tuple[str | None, list[tuple[float, State]]]:
-    """Normalize units."""
+) -> tuple[str | None, list[float] | np.ndarray, list[State]]:
+    """Normalize units.
+
+    Returns the unit, the values in that unit and the states they were parsed from.
+    """
     unit = None
+    fvalues, fstates = _parse_floats(list(entity_history))
 
     if device_class not in UNIT_CONVERSIONS:
         # We're not normalizing this device class, return the state as they are
-        fstates = []
-        for state in entity_history:
-            try:
-                fstate = _parse_float(state.state)
-            except (ValueError, TypeError):  # TypeError to guard for NULL state in DB
-                continue
-            fstates.append((fstate, state))
-
         if fstates:
             all_units = _get_units(fstates)
             if len(all_units) > 1:
@@ -238,35 +365,62 @@ def _normalize_states(
                         extra,
                         LINK_DEV_STATISTICS,
                     )
-                return None, []
-            unit = fstates[0][1].attributes.get(ATTR_UNIT_OF_MEASUREMENT)
-        return unit, fstates
-
-    fstates = []
+                return None, fvalues[:0], []
+            unit = fstates[0].attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+        return unit, fvalues, fstates
+
+    units = [state.attributes.get(ATTR_UNIT_OF_MEASUREMENT) for state in fstates]
+    if (numpy := _numpy()) is None:
+        supported_units = UNIT_CONVERSIONS[device_class]
+        converted: list[tuple[float, State]] = []
+        for fstate, state, unit in zip(fvalues, fstates, units):
+            # Exclude unsupported units from statistics
+            if unit not in supported_units:
+                _warn_unsupported_unit(hass, entity_id, unit, device_class)
+                continue
+            converted.append((supported_units[unit](fstate), state))
+        return (
+            DEVICE_CLASS_UNITS[device_class],
+            [fstate for fstate, _ in converted],
+            [state for _, state in converted],
+        )
 
-    for state in entity_history:
-        try:
-            fstate = _parse_float(state.state)
-        except ValueError:
-            continue
-        unit = state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+    supported = numpy.ones(len(fstates), dtype=bool)
+    # The conversions are plain arithmetic, convert all values in a unit at once
+    for unit in dict.fromkeys(units):
+        in_unit = numpy.fromiter(
+            (state_unit == unit for state_unit in units),
+            dtype=bool,
+            count=len(units),
+        )
         # Exclude unsupported units from statistics
         if unit not in UNIT_CONVERSIONS[device_class]:
-            if WARN_UNSUPPORTED_UNIT not in hass.data:
-                hass.data[WARN_UNSUPPORTED_UNIT] = set()
-            if entity_id not in hass.data[WARN_UNSUPPORTED_UNIT]:
-                hass.data[WARN_UNSUPPORTED_UNIT].add(entity_id)
-                _LOGGER.warning(
-                    "%s has unit %s which is unsupported for device_class %s",
-                    entity_id,
-                    unit,
-                    device_class,
-                )
+            _warn_unsupported_unit(hass, entity_id, unit, device_class)
+            supported &= ~in_unit
             continue
+        fvalues[in_unit] = UNIT_CONVERSIONS[device_class][unit](fvalues[in_unit])
 
-        fstates.append((UNIT_CONVERSIONS[device_class][unit](fstate), state))
+    if not supported.all():
+        fvalues = fvalues[supported]
+        fstates = list(itertools.compress(fstates, supported))
 
-    return DEVICE_CLASS_UNITS[device_class], fstates
+    return DEVICE_CLASS_UNITS[device_class], fvalues, fstates
+
+
+def _warn_unsupported_unit(
+    hass: HomeAssistant, entity_id: str, unit: str | None, device_class: str
+) -> None:
+    """Log a warning once if a sensor has an unsupported unit."""
+    if WARN_UNSUPPORTED_UNIT not in hass.data:
+        hass.data[WARN_UNSUPPORTED_UNIT] = set()
+    if entity_id not in hass.data[WARN_UNSUPPORTED_UNIT]:
+        hass.data[WARN_UNSUPPORTED_UNIT].add(entity_id)
+        _LOGGER.warning(
+            "%s has unit %s which is unsupported for device_class %s",
+            entity_id,
+            unit,
+            device_class,
+        )
 
 
 def _suggest_report_issue(hass: HomeAssistant, entity_id: str) -> str:
@@ -364,11 +518,59 @@ def _wanted_statistics(sensor_states: list[State]) -> dict[str, set[str]]:
     """Prepare a dict with wanted statistics for entities."""
     wanted_statistics = {}
     for state in sensor_states:
-        state_class = state.attributes[ATTR_STATE_CLASS]
-        wanted_statistics[state.entity_id] = DEFAULT_STATISTICS[state_class]
+        wanted_statistics[state.entity_id] = DEFAULT_STATISTICS[_state_class(state)]
     return wanted_statistics
 
 
+def _total_increasing_sum(
+    numpy: ModuleType,
+    hass: HomeAssistant,
+    entity_id: str,
+    fvalues: np.ndarray,
+    fstates: list[State],
+    old_state: float | None,
+    _sum: float,
+) -> tuple[float, float]:
+    """Update the sum of a total_increasing sensor without negative states.
+
+    This is equivalent to calling reset_detected for each state, but the
+    resets are detected for all states at once.
+    Returns the last state and the updated sum.
+    """
+    if old_state is None:
+        _LOGGER.info(
+            "Compiling initial sum statistics for %s, zero point set to %s",
+            entity_id,
+            float(fvalues[0]),
+        )
+        old_state = float(fvalues[0])
+        fvalues = fvalues[1:]
+        fstates = fstates[1:]
+    new_state = old_state
+
+    previous = numpy.concatenate(([old_state], fvalues[:-1]))
+    for idx in numpy.flatnonzero((0.9 * previous <= fvalues) & (fvalues < previous)):
+        warn_dip(hass, entity_id, fstates[idx], float(previous[idx]))
+
+    resets = fvalues < 0.9 * previous
+    for idx in numpy.flatnonzero(resets):
+        _LOGGER.info(
+            "Detected new cycle for %s, value dropped from %s to %s, "
+            "triggered by state with last_updated set to %s",
+            entity_id,
+            float(previous[idx]),
+            fstates[idx].last_updated.isoformat(),
+            float(fvalues[idx]),
+        )
+
+    if fvalues.size:
+        new_state = float(fvalues[-1])
+    # Each reset closes a cycle at the previous value and
+    # starts a new cycle at 0
+    _sum += float(previous[resets].sum()) + new_state - old_state
+    return new_state, _sum
+
+
 def _last_reset_as_utc_isoformat(last_reset_s: Any, entity_id: str) -> str | None:
     """Parse last_reset and convert it to UTC."""
     if last_reset_s is None:
@@ -407,6 +609,8 @@ def _compile_statistics(  # noqa: C901
     result: list[StatisticResult] = []
 
     sensor_states = _get_sensor_states(hass)
+    if _compile_numeric_sensors(hass):
+        _track_numeric_sensors(hass, sensor_states)
     wanted_statistics = _wanted_statistics(sensor_states)
     old_metadatas = statistics.get_metadata_with_session(
         hass, session, statistic_ids=[i.entity_id for i in sensor_states]
@@ -455,7 +659,7 @@ def _compile_statistics(  # noqa: C901
 
         device_class = _state.attributes.get(ATTR_DEVICE_CLASS)
         entity_history = history_list[entity_id]
-        unit, fstates = _normalize_states(
+        unit, fvalues, fstates = _normalize_states(
             hass,
             session,
             old_metadatas,
@@ -467,19 +671,21 @@ def _compile_statistics(  # noqa: C901
         if not fstates:
             continue
 
-        state_class = _state.attributes[ATTR_STATE_CLASS]
+        state_class = _state_class(_state)
 
-        to_process.append((entity_id, unit, state_class, fstates))
+        to_process.append((entity_id, unit, state_class, fvalues, fstates))
         if "sum" in wanted_statistics[entity_id]:
             to_query.append(entity_id)
 
     last_stats = statistics.get_latest_short_term_statistics(
         hass, to_query, metadata=old_metadatas
     )
+    numpy = _numpy()
     for (  # pylint: disable=too-many-nested-blocks
         entity_id,
         unit,
         state_class,
+        fvalues,
         fstates,
     ) in to_process:
         # Check metadata
@@ -516,12 +722,12 @@ def _compile_statistics(  # noqa: C901
         # Make calculations
         stat: StatisticData = {"start": start}
         if "max" in wanted_statistics[entity_id]:
-            stat["max"] = max(*itertools.islice(zip(*fstates), 1))  # type: ignore[typeddict-item]
+            stat["max"] = float(max(fvalues) if numpy is None else fvalues.max())
         if "min" in wanted_statistics[entity_id]:
-            stat["min"] = min(*itertools.islice(zip(*fstates), 1))  # type: ignore[typeddict-item]
+            stat["min"] = float(min(fvalues) if numpy is None else fvalues.min())
 
         if "mean" in wanted_statistics[entity_id]:
-            stat["mean"] = _time_weighted_average(fstates, start, end)
+            stat["mean"] = _time_weighted_average(fvalues, fstates, start, end)
 
         if "sum" in wanted_statistics[entity_id]:
             last_reset = old_last_reset = None
@@ -533,7 +739,26 @@ def _compile_statistics(  # noqa: C901
                 new_state = old_state = last_stats[entity_id][0]["state"]
                 _sum = last_stats[entity_id][0]["sum"] or 0.0
 
-            for fstate, state in fstates:
+            if (
+                numpy is not None
+                and state_class == STATE_CLASS_TOTAL_INCREASING
+                and (old_state is not None or last_reset is None)
+                and not (fvalues < 0).any()
+            ):
+                new_state, _sum = _total_increasing_sum(
+                    numpy, hass, entity_id, fvalues, fstates, old_state, _sum
+                )
+                if last_reset is not None:
+                    stat["last_reset"] = dt_util.parse_datetime(last_reset)
+                stat["sum"] = _sum
+                stat["state"] = new_state
+                result.append({"meta": meta, "stat": stat})
+                continue
+
+            # Sensors with a last_reset or negative states are handled one by one
+            if numpy is not None:
+                fvalues = fvalues.tolist()
+            for fstate, state in zip(fvalues, fstates):
                 reset = False
                 if (
                     state_class != STATE_CLASS_TOTAL_INCREASING
@@ -625,7 +850,7 @@ def list_statistic_ids(
     result = {}
 
     for state in entities:
-        state_class = state.attributes[ATTR_STATE_CLASS]
+        state_class = _state_class(state)
         device_class = state.attributes.get(ATTR_DEVICE_CLASS)
         native_unit = state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
 
@@ -639,7 +864,7 @@ def list_statistic_ids(
         if (
             "sum" in provided_statistics
             and ATTR_LAST_RESET not in state.attributes
-            and state.attributes.get(ATTR_STATE_CLASS) == STATE_CLASS_MEASUREMENT
+            and state_class == STATE_CLASS_MEASUREMENT
         ):
             continue
 
@@ -672,10 +897,12 @@ def validate_statistics(
     """Validate statistics."""
     validation_result = defaultdict(list)
 
-    sensor_states = hass.states.all(DOMAIN)
+    sensor_states = hass.states.snapshot().all(DOMAIN)
     metadatas = statistics.get_metadata(hass, statistic_source=RECORDER_DOMAIN)
     sensor_entity_ids = {i.entity_id for i in sensor_states}
     sensor_statistic_ids = set(metadatas)
+    compile_numeric = _compile_numeric_sensors(hass)
+    numeric_sensors = get_instance(hass).numeric_sensor_statistic_ids
 
     for state in sensor_states:
         entity_id = state.entity_id
@@ -693,7 +920,10 @@ def validate_statistics(
                     )
                 )
 
-            if state_class not in STATE_CLASSES:
+            if state_class not in STATE_CLASSES and not (
+                state_class is None
+                and (compile_numeric or entity_id in numeric_sensors)
+            ):
                 # Sensor no longer has a valid state class
                 validation_result[entity_id].append(
                     statistics.ValidationIssue(
@@ -41,6 +41,7 @@ from homeassistant.util.json import (
 from . import const, decorators, messages
 from .connection import ActiveConnection
 from .const import ERR_NOT_FOUND
+from .entity_subscriptions import async_get_entity_subscriptions
 
 
 @callback
@@ -64,6 +65,7 @@ def async_register_commands(
     async_reg(hass, handle_subscribe_bootstrap_integrations)
     async_reg(hass, handle_subscribe_events)
     async_reg(hass, handle_subscribe_trigger)
+    async_reg(hass, handle_supported_features)
     async_reg(hass, handle_test_condition)
     async_reg(hass, handle_unsubscribe_events)
     async_reg(hass, handle_validate_config)
@@ -272,36 +274,46 @@ def handle_get_states(
     {
         vol.Required("type"): "subscribe_entities",
         vol.Optional("entity_ids"): cv.entity_ids,
+        vol.Optional("resume"): {
+            vol.Required("journal_id"): str,
+            vol.Required("sequence"): cv.positive_int,
+        },
     }
 )
 def handle_subscribe_entities(
     hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
 ) -> None:
-    """Handle subscribe entities command."""
-    entity_ids = set(msg.get("entity_ids", []))
+    """Handle subscribe entities command.
 
-    @callback
-    def forward_entity_changes(event: Event) -> None:
-        """Forward entity state changed events to websocket."""
-        if not connection.user.permissions.check_entity(
-            event.data["entity_id"], POLICY_READ
-        ):
-            return
-        if entity_ids and event.data["entity_id"] not in entity_ids:
-            return
-
-        connection.send_message(
-            lambda: messages.cached_state_diff_message(msg["id"], event)
-        )
+    The result contains the journal id and sequence number of the
+    subscription. When resuming with the journal id and last sequence
+    number of a previous subscription, only the missed changes are sent
+    if they are still journaled, otherwise all states are sent.
+    """
+    entity_ids = set(msg.get("entity_ids", []))
+    entity_subscriptions = async_get_entity_subscriptions(hass)
 
     # We must never await between sending the states and listening for
     # state changed events or we will introduce a race condition
     # where some states are missed
-    states = _async_get_allowed_states(hass, connection)
-    connection.subscriptions[msg["id"]] = hass.bus.async_listen(
-        EVENT_STATE_CHANGED, forward_entity_changes, run_immediately=True
+    connection.subscriptions[msg["id"]] = entity_subscriptions.async_subscribe(
+        connection, msg["id"], entity_ids
     )
-    connection.send_result(msg["id"])
+    result = {
+        "journal_id": entity_subscriptions.journal_id,
+        "sequence": entity_subscriptions.sequence,
+    }
+    if (resume := msg.get("resume")) is not None and (
+        entity_subscriptions.async_can_resume(resume["journal_id"], resume["sequence"])
+    ):
+        connection.send_result(msg["id"], {**result, "resumed": True})
+        entity_subscriptions.async_replay(
+            connection, msg["id"], entity_ids, resume["sequence"]
+        )
+        return
+
+    states = _async_get_allowed_states(hass, connection)
+    connection.send_result(msg["id"], {**result, "resumed": False})
     data: dict[str, dict[str, dict]] = {
         messages.ENTITY_EVENT_ADD: {
             state.entity_id: messages.compressed_state_dict_add(state)
@@ -415,6 +427,21 @@ def handle_ping(
     connection.send_message(pong_message(msg["id"]))
 
 
+@callback
+@decorators.websocket_command(
+    {
+        vol.Required("type"): "supported_features",
+        vol.Required("features"): {str: vol.Coerce(float)},
+    }
+)
+def handle_supported_features(
+    hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Handle setting the features supported by the client."""
+    connection.supported_features = msg["features"]
+    connection.send_result(msg["id"])
+
+
 @decorators.websocket_command(
     {
         vol.Required("type"): "render_template",
@@ -0,0 +1,120 @@
+"""Tune and measure the permessage-deflate compression of websockets."""
+from __future__ import annotations
+
+import time
+from typing import Any
+import zlib
+
+from aiohttp import web
+
+from .const import (
+    COMPRESS_LEVEL,
+    COMPRESS_MEM_LEVEL,
+    COMPRESS_THRESHOLD,
+    COMPRESS_WINDOW_BITS,
+)
+
+_DEFLATE_TRAILING = b"\x00\x00\xff\xff"
+
+
+def can_tune_compression(wsock: web.WebSocketResponse) -> bool:
+    """Return True if the compression of a prepared websocket can be tuned.
+
+    The tuning relies on private attributes of aiohttp's websocket writer.
+    If they change, the websocket keeps aiohttp's default compression.
+    """
+    writer = getattr(wsock, "_writer", None)
+    return (
+        writer is not None
+        and getattr(writer, "_compressobj", False) is None
+        and isinstance(getattr(writer, "compress", None), int)
+    )
+
+
+class WebSocketCompression:
+    """Compress the outgoing messages of a websocket.
+
+    aiohttp negotiates permessage-deflate with the client and compresses
+    every frame at the fastest level with the full negotiated window.
+    This replaces its compressor with a tuned one that measures the bytes
+    and time it spends, and sends messages below the threshold without
+    compressing them. RFC 7692 allows the server to use a smaller window
+    than negotiated, as the client decompresses with the larger one.
+    """
+
+    def __init__(
+        self,
+        wsock: web.WebSocketResponse,
+        level: int = COMPRESS_LEVEL,
+        window_bits: int = COMPRESS_WINDOW_BITS,
+        mem_level: int = COMPRESS_MEM_LEVEL,
+        threshold: int = COMPRESS_THRESHOLD,
+    ) -> None:
+        """Initialize the compression of a prepared websocket."""
+        self._wsock = wsock
+        self._writer = wsock._writer  # pylint: disable=protected-access
+        self._negotiated_bits = int(wsock.compress)
+        self.window_bits = min(self._negotiated_bits, window_bits)
+        self.threshold = threshold
+        self._compressobj = zlib.compressobj(
+            level=level, wbits=-self.window_bits, memLevel=mem_level
+        )
+        # The writer only calls compress and flush on its compressor
+        self._writer._compressobj = self  # pylint: disable=protected-access
+        self.messages = 0
+        self.compressed_messages = 0
+        self.raw_bytes = 0
+        self.compressed_bytes = 0
+        self.compress_time = 0.0
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress data for the writer."""
+        start = time.perf_counter()
+        result = self._compressobj.compress(data)
+        self.compress_time += time.perf_counter() - start
+        self.raw_bytes += len(data)
+        self.compressed_bytes += len(result)
+        return result
+
+    def flush(self, mode: int) -> bytes:
+        """Flush the compressed data for the writer."""
+        start = time.perf_counter()
+        result = self._compressobj.flush(mode)
+        self.compress_time += time.perf_counter() - start
+        self.compressed_bytes += len(result)
+        # The writer strips the trailing empty block from every message
+        if result.endswith(_DEFLATE_TRAILING):
+            self.compressed_bytes -= len(_DEFLATE_TRAILING)
+        return result
+
+    async def send_str(self, message: str) -> None:
+        """Send a message, compressing it if it is not below the threshold."""
+        self.messages += 1
+        if len(message) >= self.threshold:
+            self.compressed_messages += 1
+            await self._wsock.send_str(message)
+            return
+
+        writer = self._writer
+        writer.compress = 0
+        try:
+            await self._wsock.send_str(message)
+        finally:
+            writer.compress = self._negotiated_bits
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the compression statistics."""
+        return {
+            "window_bits": self.window_bits,
+            "threshold": self.threshold,
+            "messages": self.messages,
+            "compressed_messages": self.compressed_messages,
+            "raw_bytes": self.raw_bytes,
+            "compressed_bytes": self.compressed_bytes,
+            "ratio": (
+                self.raw_bytes / self.compressed_bytes
+                if self.compressed_bytes
+                else None
+            ),
+            "compress_time_ms": self.compress_time * 1000,
+        }
@@ -41,6 +41,10 @@ class ActiveConnection:
         self.user = user
         self.refresh_token_id = refresh_token.id
         self.subscriptions: dict[Hashable, Callable[[], Any]] = {}
+        self.supported_features: dict[str, float] = {}
+        # Returns the number of messages queued for the client, set by the
+        # websocket handler
+        self.pending_messages: Callable[[], int] | None = None
         self.last_id = 0
         current_connection.set(self)
 
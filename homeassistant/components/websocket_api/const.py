@@ -4,12 +4,10 @@ from __future__ import annotations
 import asyncio
 from collections.abc import Awaitable, Callable
 from concurrent import futures
-from functools import partial
-import json
 from typing import TYPE_CHECKING, Any, Final
 
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.json import JSONEncoder
+from homeassistant.helpers.json import json_dumps
 
 if TYPE_CHECKING:
     from .connection import ActiveConnection  # noqa: F401
@@ -28,6 +26,20 @@ PENDING_MSG_PEAK: Final = 512
 PENDING_MSG_PEAK_TIME: Final = 5
 MAX_PENDING_MSG: Final = 2048
 
+# Tuning of permessage-deflate. A 4 KiB window with memLevel 5 compresses
+# state messages nearly as well as the default 32 KiB window with
+# memLevel 8, using about 32 KiB instead of 256 KiB per connection.
+COMPRESS_LEVEL: Final = 1
+COMPRESS_WINDOW_BITS: Final = 12
+COMPRESS_MEM_LEVEL: Final = 5
+# Messages shorter than this are sent uncompressed
+COMPRESS_THRESHOLD: Final = 32
+
+# Number of state changes kept to resume entity subscriptions
+ENTITY_JOURNAL_SIZE: Final = 4096
+# Seconds to keep journaling state changes after the last entity subscription
+ENTITY_JOURNAL_RETENTION: Final = 300
+
 ERR_ID_REUSE: Final = "id_reuse"
 ERR_INVALID_FORMAT: Final = "invalid_format"
 ERR_NOT_FOUND: Final = "not_found"
@@ -52,7 +64,9 @@ SIGNAL_WEBSOCKET_DISCONNECTED: Final = "websocket_disconnected"
 
 # Data used to store the current connection list
 DATA_CONNECTIONS: Final = f"{DOMAIN}.connections"
+DATA_ENTITY_SUBSCRIPTIONS: Final = f"{DOMAIN}.entity_subscriptions"
+
+JSON_DUMP: Final = json_dumps
 
-JSON_DUMP: Final = partial(
-    json.dumps, cls=JSONEncoder, allow_nan=False, separators=(",", ":")
-)
+# Features a client can enable with the supported_features command
+FEATURE_COALESCE_MESSAGES: Final = "coalesce_messages"
@@ -0,0 +1,210 @@
+"""Forward state changes to subscribe_entities subscriptions."""
+from __future__ import annotations
+
+from collections import deque
+from datetime import datetime
+from itertools import chain, islice
+
+from homeassistant.auth.permissions.const import POLICY_READ
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import CALLBACK_TYPE, Event, HassJob, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util.uuid import random_uuid_hex
+
+from . import messages
+from .connection import ActiveConnection
+from .const import (
+    DATA_ENTITY_SUBSCRIPTIONS,
+    ENTITY_JOURNAL_RETENTION,
+    ENTITY_JOURNAL_SIZE,
+)
+
+
+class _EntitySubscription:
+    """A subscribe_entities subscription of a connection."""
+
+    __slots__ = ("connection", "msg_id", "entity_ids")
+
+    def __init__(
+        self, connection: ActiveConnection, msg_id: int, entity_ids: frozenset[str]
+    ) -> None:
+        """Initialize the subscription."""
+        self.connection = connection
+        self.msg_id = msg_id
+        self.entity_ids = entity_ids
+
+
+class _JournalEntry:
+    """A journaled state change, serialized when it is first sent."""
+
+    __slots__ = ("sequence", "entity_id", "_event", "_template")
+
+    def __init__(self, sequence: int, entity_id: str, event: Event) -> None:
+        """Initialize the journal entry."""
+        self.sequence = sequence
+        self.entity_id = entity_id
+        self._event: Event | None = event
+        self._template: str | None = None
+
+    @property
+    def template(self) -> str:
+        """Return the state diff message of the change."""
+        if self._template is None:
+            assert self._event is not None
+            self._template = messages.state_diff_message_template(
+                self._event, self.sequence
+            )
+            self._event = None
+        return self._template
+
+
+class EntitySubscriptions:
+    """Fan out state changes to all subscribe_entities subscriptions.
+
+    A single state_changed listener serializes the diff of a change once,
+    when it is first sent, and sends it to every subscription that may
+    read the entity.
+    Subscriptions that filter on entity ids are indexed by entity id, so
+    changes of other entities do not cost them anything. The read
+    permission is checked once per permissions object and change.
+
+    Every diff carries a sequence number and the last ENTITY_JOURNAL_SIZE
+    diffs are kept in a journal. A client that reconnects with the journal
+    id and the last sequence number it received only needs the diffs it
+    missed instead of all states. The journal is kept for
+    ENTITY_JOURNAL_RETENTION seconds after the last subscription ended,
+    after which a new journal with a new id is started.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the entity subscriptions."""
+        self.hass = hass
+        self.journal_id = random_uuid_hex()
+        self.sequence = 0
+        self._journal: deque[_JournalEntry] = deque(maxlen=ENTITY_JOURNAL_SIZE)
+        self._all: dict[_EntitySubscription, None] = {}
+        self._by_entity_id: dict[str, dict[_EntitySubscription, None]] = {}
+        self._unsub_state_changed: CALLBACK_TYPE | None = None
+        self._unsub_stop: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_subscribe(
+        self, connection: ActiveConnection, msg_id: int, entity_ids: set[str]
+    ) -> CALLBACK_TYPE:
+        """Forward the changes of entity_ids, or all entities if empty."""
+        subscription = _EntitySubscription(connection, msg_id, frozenset(entity_ids))
+        if entity_ids:
+            for entity_id in entity_ids:
+                self._by_entity_id.setdefault(entity_id, {})[subscription] = None
+        else:
+            self._all[subscription] = None
+
+        if self._unsub_stop is not None:
+            self._unsub_stop()
+            self._unsub_stop = None
+        if self._unsub_state_changed is None:
+            self.journal_id = random_uuid_hex()
+            self.sequence = 0
+            self._unsub_state_changed = self.hass.bus.async_listen(
+                EVENT_STATE_CHANGED, self._async_forward, run_immediately=True
+            )
+
+        @callback
+        def unsubscribe() -> None:
+            """Stop forwarding changes to the subscription."""
+            self._async_unsubscribe(subscription)
+
+        return unsubscribe
+
+    @callback
+    def async_can_resume(self, journal_id: str, sequence: int) -> bool:
+        """Return if the journal has all changes after sequence."""
+        if journal_id != self.journal_id or sequence > self.sequence:
+            return False
+        if sequence == self.sequence:
+            return True
+        return bool(self._journal) and self._journal[0].sequence <= sequence + 1
+
+    @callback
+    def async_replay(
+        self,
+        connection: ActiveConnection,
+        msg_id: int,
+        entity_ids: set[str],
+        sequence: int,
+    ) -> None:
+        """Send the journaled changes after sequence to a subscription."""
+        if not self._journal:
+            return
+        permissions = connection.user.permissions
+        iden = str(msg_id)
+        start = max(0, sequence + 1 - self._journal[0].sequence)
+        for entry in islice(self._journal, start, None):
+            if entity_ids and entry.entity_id not in entity_ids:
+                continue
+            if not permissions.check_entity(entry.entity_id, POLICY_READ):
+                continue
+            connection.send_message(
+                entry.template.replace(messages.IDEN_JSON_TEMPLATE, iden, 1)
+            )
+
+    @callback
+    def _async_unsubscribe(self, subscription: _EntitySubscription) -> None:
+        """Remove a subscription."""
+        self._all.pop(subscription, None)
+        for entity_id in subscription.entity_ids:
+            if (subscriptions := self._by_entity_id.get(entity_id)) is None:
+                continue
+            subscriptions.pop(subscription, None)
+            if not subscriptions:
+                del self._by_entity_id[entity_id]
+
+        if self._all or self._by_entity_id or self._unsub_state_changed is None:
+            return
+        if self._unsub_stop is None:
+            self._unsub_stop = async_call_later(
+                self.hass, ENTITY_JOURNAL_RETENTION, HassJob(self._async_stop)
+            )
+
+    @callback
+    def _async_stop(self, _now: datetime) -> None:
+        """Stop journaling after the last subscription ended."""
+        self._unsub_stop = None
+        if self._unsub_state_changed is not None:
+            self._unsub_state_changed()
+            self._unsub_state_changed = None
+        self._journal.clear()
+
+    @callback
+    def _async_forward(self, event: Event) -> None:
+        """Journal a state change and send it to the subscriptions that may read it."""
+        entity_id: str = event.data["entity_id"]
+        self.sequence += 1
+        entry = _JournalEntry(self.sequence, entity_id, event)
+        self._journal.append(entry)
+
+        can_read: dict[int, bool] = {}
+        for subscription in chain(
+            self._all, self._by_entity_id.get(entity_id, {}).keys()
+        ):
+            connection = subscription.connection
+            permissions = connection.user.permissions
+            if (allowed := can_read.get(id(permissions))) is None:
+                allowed = can_read[id(permissions)] = permissions.check_entity(
+                    entity_id, POLICY_READ
+                )
+            if not allowed:
+                continue
+            connection.send_message(
+                entry.template.replace(
+                    messages.IDEN_JSON_TEMPLATE, str(subscription.msg_id), 1
+                )
+            )
+
+
+@callback
+def async_get_entity_subscriptions(hass: HomeAssistant) -> EntitySubscriptions:
+    """Return the entity subscriptions of the instance."""
+    if (subscriptions := hass.data.get(DATA_ENTITY_SUBSCRIPTIONS)) is None:
+        subscriptions = hass.data[DATA_ENTITY_SUBSCRIPTIONS] = EntitySubscriptions(hass)
+    return subscriptions  # type: ignore[no-any-return]
@@ -17,9 +17,12 @@ from homeassistant.core import Event, HomeAssistant, callback
 from homeassistant.helpers.event import async_call_later
 
 from .auth import AuthPhase, auth_required_message
+from .compression import WebSocketCompression, can_tune_compression
+from .connection import ActiveConnection
 from .const import (
     CANCELLATION_ERRORS,
     DATA_CONNECTIONS,
+    FEATURE_COALESCE_MESSAGES,
     MAX_PENDING_MSG,
     PENDING_MSG_PEAK,
     PENDING_MSG_PEAK_TIME,
@@ -66,21 +69,46 @@ class WebSocketHandler:
         self._writer_task: asyncio.Task | None = None
         self._logger = WebSocketAdapter(_WS_LOGGER, {"connid": id(self)})
         self._peak_checker_unsub: Callable[[], None] | None = None
+        self._connection: ActiveConnection | None = None
+        self._compression: WebSocketCompression | None = None
 
     async def _writer(self) -> None:
         """Write outgoing messages."""
+        to_write = self._to_write
+        if (compression := self._compression) is not None:
+            send_str = compression.send_str
+        else:
+            send_str = self.wsock.send_str
         # Exceptions if Socket disconnected or cancelled by connection handler
         with suppress(RuntimeError, ConnectionResetError, *CANCELLATION_ERRORS):
             while not self.wsock.closed:
-                if (process := await self._to_write.get()) is None:
+                if (process := await to_write.get()) is None:
                     break
 
-                if not isinstance(process, str):
-                    message: str = process()
+                messages = [process if isinstance(process, str) else process()]
+                closing = False
+                if (
+                    not to_write.empty()
+                    and (connection := self._connection) is not None
+                    and FEATURE_COALESCE_MESSAGES in connection.supported_features
+                ):
+                    # Send everything that is queued up as a single frame
+                    while not to_write.empty():
+                        if (process := to_write.get_nowait()) is None:
+                            closing = True
+                            break
+                        messages.append(
+                            process if isinstance(process, str) else process()
+                        )
+
+                if len(messages) == 1:
+                    message = messages[0]
                 else:
-                    message = process
+                    message = f'[{",".join(messages)}]'
                 self._logger.debug("Sending %s", message)
-                await self.wsock.send_str(message)
+                await send_str(message)
+                if closing:
+                    break
 
         # Clean up the peaker checker when we shut down the writer
         if self._peak_checker_unsub is not None:
@@ -153,6 +181,8 @@ class WebSocketHandler:
             return wsock
 
         self._logger.debug("Connected from %s", request.remote)
+        if wsock.compress and can_tune_compression(wsock):
+            self._compression = WebSocketCompression(wsock)
         self._handle_task = asyncio.current_task()
 
         @callback
@@ -199,7 +229,8 @@ class WebSocketHandler:
                 raise Disconnect from err
 
             self._logger.debug("Received %s", msg_data)
-            connection = await auth.async_handle(msg_data)
+            connection = self._connection = await auth.async_handle(msg_data)
+            connection.pending_messages = self._to_write.qsize
             self.hass.data[DATA_CONNECTIONS] = (
                 self.hass.data.get(DATA_CONNECTIONS, 0) + 1
             )
@@ -251,6 +282,10 @@ class WebSocketHandler:
                 self._writer_task.cancel()
 
             finally:
+                if self._compression is not None:
+                    self._logger.debug(
+                        "Compression statistics: %s", self._compression.as_dict()
+                    )
                 if disconnect_warn is None:
                     self._logger.debug("Disconnected")
                 else:
@@ -87,26 +87,15 @@ def _cached_event_message(event: Event) -> str:
     return message_to_json(event_message(IDEN_TEMPLATE, event))
 
 
-def cached_state_diff_message(iden: int, event: Event) -> str:
-    """Return an event message.
-
-    Serialize to json once per message.
-
-    Since we can have many clients connected that are
-    all getting many of the same events (mostly state changed)
-    we can avoid serializing the same data for each connection.
-    """
-    return _cached_state_diff_message(event).replace(IDEN_JSON_TEMPLATE, str(iden), 1)
-
+def state_diff_message_template(event: Event, sequence: int) -> str:
+    """Serialize a state_changed event to a state diff message.
 
-@lru_cache(maxsize=128)
-def _cached_state_diff_message(event: Event) -> str:
-    """Cache and serialize the event to json.
-
-    The IDEN_TEMPLATE is used which will be replaced
-    with the actual iden in cached_event_message
+    The IDEN_TEMPLATE is used as id. Replace IDEN_JSON_TEMPLATE with
+    the actual iden of each subscription.
     """
-    return message_to_json(event_message(IDEN_TEMPLATE, _state_diff_event(event)))
+    message = event_message(IDEN_TEMPLATE, _state_diff_event(event))
+    message["sequence"] = sequence
+    return message_to_json(message)
 
 
 def _state_diff_event(event: Event) -> dict:
@@ -158,7 +147,9 @@ def _state_diff(
             additions[COMPRESSED_STATE_CONTEXT]["id"] = new_state.context.id
         else:
             additions[COMPRESSED_STATE_CONTEXT] = new_state.context.id
-    old_attributes = old_state.attributes
+    # The state machine shares unchanged attributes between states
+    if (old_attributes := old_state.attributes) is new_state.attributes:
+        return {ENTITY_EVENT_CHANGE: {new_state.entity_id: diff}}
     for key, value in new_state.attributes.items():
         if old_attributes.get(key) != value:
             additions.setdefault(COMPRESSED_STATE_ATTRIBUTES, {})[key] = value
@@ -13,6 +13,7 @@ from collections.abc import (
     Collection,
     Coroutine,
     Iterable,
+    Iterator,
     Mapping,
 )
 import datetime
@@ -22,6 +23,7 @@ import logging
 import os
 import pathlib
 import re
+import sys
 import threading
 from time import monotonic
 from typing import (
@@ -75,6 +77,7 @@ from .exceptions import (
 )
 from .util import dt as dt_util, location, ulid as ulid_util
 from .util.async_ import (
+    eager_start_coroutine,
     fire_coroutine_threadsafe,
     run_callback_threadsafe,
     shutdown_run_callback_threadsafe,
@@ -412,32 +415,47 @@ class HomeAssistant:
     @overload
     @callback
     def async_add_hass_job(
-        self, hassjob: HassJob[Coroutine[Any, Any, _R]], *args: Any
+        self,
+        hassjob: HassJob[Coroutine[Any, Any, _R]],
+        *args: Any,
+        eager_start: bool = False,
     ) -> asyncio.Future[_R] | None:
         ...
 
     @overload
     @callback
     def async_add_hass_job(
-        self, hassjob: HassJob[Coroutine[Any, Any, _R] | _R], *args: Any
+        self,
+        hassjob: HassJob[Coroutine[Any, Any, _R] | _R],
+        *args: Any,
+        eager_start: bool = False,
     ) -> asyncio.Future[_R] | None:
         ...
 
     @callback
     def async_add_hass_job(
-        self, hassjob: HassJob[Coroutine[Any, Any, _R] | _R], *args: Any
+        self,
+        hassjob: HassJob[Coroutine[Any, Any, _R] | _R],
+        *args: Any,
+        eager_start: bool = False,
     ) -> asyncio.Future[_R] | None:
         """Add a HassJob from within the event loop.
 
         This method must be run in the event loop.
         hassjob: HassJob to call.
         args: parameters for method to call.
+        eager_start: run a coroutine function until it first suspends
+        and only create a task if it does. See eager_start_coroutine.
         """
         task: asyncio.Future[_R]
         if hassjob.job_type == HassJobType.Coroutinefunction:
-            task = self.loop.create_task(
-                cast(Callable[..., Coroutine[Any, Any, _R]], hassjob.target)(*args)
-            )
+            coro = cast(Callable[..., Coroutine[Any, Any, _R]], hassjob.target)(*args)
+            if eager_start:
+                task = eager_start_coroutine(coro, self.loop)
+                if task.done():
+                    return task
+            else:
+                task = self.loop.create_task(coro)
         elif hassjob.job_type == HassJobType.Callback:
             self.loop.call_soon(cast(Callable[..., _R], hassjob.target), *args)
             return None
@@ -500,20 +518,29 @@ class HomeAssistant:
     @overload
     @callback
     def async_run_hass_job(
-        self, hassjob: HassJob[Coroutine[Any, Any, _R]], *args: Any
+        self,
+        hassjob: HassJob[Coroutine[Any, Any, _R]],
+        *args: Any,
+        eager_start: bool = False,
     ) -> asyncio.Future[_R] | None:
         ...
 
     @overload
     @callback
     def async_run_hass_job(
-        self, hassjob: HassJob[Coroutine[Any, Any, _R] | _R], *args: Any
+        self,
+        hassjob: HassJob[Coroutine[Any, Any, _R] | _R],
+        *args: Any,
+        eager_start: bool = False,
     ) -> asyncio.Future[_R] | None:
         ...
 
     @callback
     def async_run_hass_job(
-        self, hassjob: HassJob[Coroutine[Any, Any, _R] | _R], *args: Any
+        self,
+        hassjob: HassJob[Coroutine[Any, Any, _R] | _R],
+        *args: Any,
+        eager_start: bool = False,
     ) -> asyncio.Future[_R] | None:
         """Run a HassJob from within the event loop.
 
@@ -521,12 +548,14 @@ class HomeAssistant:
 
         hassjob: HassJob
         args: parameters for method to call.
+        eager_start: start a coroutine function right away, see
+        async_add_hass_job.
         """
         if hassjob.job_type == HassJobType.Callback:
             cast(Callable[..., _R], hassjob.target)(*args)
             return None
 
-        return self.async_add_hass_job(hassjob, *args)
+        return self.async_add_hass_job(hassjob, *args, eager_start=eager_start)
 
     @overload
     @callback
@@ -787,7 +816,13 @@ class EventBus:
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize a new event bus."""
         self._listeners: dict[str, list[_FilterableJob]] = {}
+        self._keyed_listeners: dict[
+            str, dict[Callable[[Event], str | None], dict[str, list[_FilterableJob]]]
+        ] = {}
         self._hass = hass
+        self._job_timer: Callable[[HassJob[Any], float], None] | None = None
+        self._job_timer_sample_interval = 1
+        self._job_timer_fire_count = 0
 
     @callback
     def async_listeners(self) -> dict[str, int]:
@@ -795,7 +830,23 @@ class EventBus:
 
         This method must be run in the event loop.
         """
-        return {key: len(listeners) for key, listeners in self._listeners.items()}
+        listeners = {key: len(listeners) for key, listeners in self._listeners.items()}
+        # Each index of keyed listeners is dispatched as a single listener
+        for event_type, indexes in self._keyed_listeners.items():
+            listeners[event_type] = listeners.get(event_type, 0) + len(indexes)
+        return listeners
+
+    @callback
+    def async_keyed_listeners(self, event_type: str) -> dict[str, int]:
+        """Return dictionary with keys and the number of keyed listeners.
+
+        This method must be run in the event loop.
+        """
+        listeners: dict[str, int] = {}
+        for key_listeners in self._keyed_listeners.get(event_type, {}).values():
+            for key, jobs in key_listeners.items():
+                listeners[key] = listeners.get(key, 0) + len(jobs)
+        return listeners
 
     @property
     def listeners(self) -> dict[str, int]:
@@ -843,6 +894,11 @@ class EventBus:
 
         _LOGGER.debug("Bus:Handling %s", event)
 
+        timed = self._job_timer is not None and self._async_sample_fire()
+
+        if (indexes := self._keyed_listeners.get(event_type)) is not None:
+            self._async_fire_keyed(event, indexes, timed)
+
         if not listeners:
             return
 
@@ -854,13 +910,182 @@ class EventBus:
                 except Exception:  # pylint: disable=broad-except
                     _LOGGER.exception("Error in event filter")
                     continue
-            if run_immediately:
+            if timed and job.job_type != HassJobType.Executor:
+                if run_immediately:
+                    self._async_run_timed_job(job, event, True)
+                else:
+                    self._hass.loop.call_soon(
+                        self._async_run_timed_job, job, event, False
+                    )
+            elif run_immediately:
+                self._async_run_immediately(job, event)
+            else:
+                self._hass.async_add_hass_job(job, event)
+
+    @callback
+    def _async_fire_keyed(
+        self,
+        event: Event,
+        indexes: dict[Callable[[Event], str | None], dict[str, list[_FilterableJob]]],
+        timed: bool,
+    ) -> None:
+        """Dispatch an event to the keyed listeners that match it.
+
+        Each index is looked up with the key its key function extracts
+        from the event, so the cost does not grow with the number of
+        keyed listeners.
+        """
+        matched_keys: list[tuple[Callable[[Event], str | None], str]] = []
+        for key_func, key_listeners in indexes.items():
+            try:
+                key = key_func(event)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error in event key function")
+                continue
+            if key is None or (
+                key not in key_listeners and MATCH_ALL not in key_listeners
+            ):
+                continue
+            matched_keys.append((key_func, key))
+            for filterable_job in self._async_keyed_jobs(key_listeners, key):
+                if not filterable_job.run_immediately:
+                    continue
+                if timed:
+                    self._async_run_timed_job(filterable_job.job, event, True)
+                else:
+                    self._async_run_immediately(filterable_job.job, event)
+
+        if matched_keys:
+            self._hass.loop.call_soon(
+                self._async_run_keyed_jobs, event, matched_keys, timed
+            )
+
+    @callback
+    def _async_run_immediately(
+        self, job: HassJob[None | Awaitable[None]], event: Event
+    ) -> asyncio.Future[None] | None:
+        """Run a listener job before async_fire returns.
+
+        Coroutine functions are started eagerly and only get a task
+        if they suspend. Returns the future of a coroutine function.
+        """
+        if job.job_type == HassJobType.Coroutinefunction:
+            task = self._hass.async_add_hass_job(job, event, eager_start=True)
+            if (
+                task is not None
+                and task.done()
+                and not task.cancelled()
+                and (err := task.exception()) is not None
+            ):
+                _LOGGER.exception("Error running job: %s", job, exc_info=err)
+            return task
+        try:
+            job.target(event)
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Error running job: %s", job)
+        return None
+
+    @callback
+    def _async_run_keyed_jobs(
+        self,
+        event: Event,
+        matched_keys: list[tuple[Callable[[Event], str | None], str]],
+        timed: bool,
+    ) -> None:
+        """Run the keyed listener jobs for an event.
+
+        Listeners are looked up when the event is dispatched so
+        listeners added or removed by an earlier job are respected.
+        """
+        if (indexes := self._keyed_listeners.get(event.event_type)) is None:
+            return
+        for key_func, key in matched_keys:
+            if (key_listeners := indexes.get(key_func)) is None:
+                continue
+            for filterable_job in self._async_keyed_jobs(key_listeners, key):
+                if filterable_job.run_immediately:
+                    continue
+                job = filterable_job.job
+                if timed and job.job_type != HassJobType.Executor:
+                    self._async_run_timed_job(job, event, False)
+                    continue
                 try:
-                    job.target(event)
+                    self._hass.async_run_hass_job(job, event)
                 except Exception:  # pylint: disable=broad-except
                     _LOGGER.exception("Error running job: %s", job)
-            else:
-                self._hass.async_add_hass_job(job, event)
+
+    @callback
+    def async_set_job_timer(
+        self,
+        job_timer: Callable[[HassJob[Any], float], None] | None,
+        sample_interval: int = 1,
+    ) -> None:
+        """Time the listeners of every sample_interval-th fired event.
+
+        The job_timer is called with the job and its duration in seconds
+        for each sampled listener that runs in the event loop. The
+        duration of a coroutine function listener lasts until its task
+        is done, including the time it is suspended. Pass None to stop
+        timing listeners.
+
+        This method must be run in the event loop.
+        """
+        self._job_timer = job_timer
+        self._job_timer_sample_interval = max(sample_interval, 1)
+        self._job_timer_fire_count = 0
+
+    @callback
+    def _async_sample_fire(self) -> bool:
+        """Return if the listeners of the event being fired should be timed."""
+        self._job_timer_fire_count += 1
+        return self._job_timer_fire_count % self._job_timer_sample_interval == 0
+
+    @callback
+    def _async_run_timed_job(
+        self, job: HassJob[None | Awaitable[None]], event: Event, eager_start: bool
+    ) -> None:
+        """Run a listener and report its duration to the job timer."""
+        start = monotonic()
+        if job.job_type == HassJobType.Coroutinefunction:
+            task = (
+                self._async_run_immediately(job, event)
+                if eager_start
+                else self._hass.async_add_hass_job(job, event)
+            )
+            if task is not None and not task.done():
+                task.add_done_callback(
+                    functools.partial(self._async_report_job_time, job, start)
+                )
+                return
+        else:
+            self._async_run_immediately(job, event)
+        self._async_report_job_time(job, start)
+
+    @callback
+    def _async_report_job_time(
+        self,
+        job: HassJob[None | Awaitable[None]],
+        start: float,
+        _task: asyncio.Future[None] | None = None,
+    ) -> None:
+        """Report the duration of a job started at start to the job timer."""
+        if (job_timer := self._job_timer) is not None:
+            job_timer(job, monotonic() - start)
+
+    @staticmethod
+    @callback
+    def _async_keyed_jobs(
+        key_listeners: dict[str, list[_FilterableJob]], key: str
+    ) -> list[_FilterableJob]:
+        """Return a copy of the listeners of a key and the match all listeners.
+
+        A listener registered for the key and MATCH_ALL is returned once.
+        """
+        if (match_all_jobs := key_listeners.get(MATCH_ALL)) is None:
+            return [*key_listeners.get(key, ())]
+        if key == MATCH_ALL or (jobs := key_listeners.get(key)) is None:
+            return [*match_all_jobs]
+        return list(dict.fromkeys([*jobs, *match_all_jobs]))
 
     def listen(
         self,
@@ -901,16 +1126,19 @@ class EventBus:
 
         If run_immediately is passed, the callback will be run
         right away instead of using call_soon. Only use this if
-        the callback results in scheduling another task.
+        the callback results in scheduling another task. A coroutine
+        function listener is instead started right away and only gets
+        a task if it suspends, which suits listeners that rarely await.
 
         This method must be run in the event loop.
         """
         if event_filter is not None and not is_callback(event_filter):
             raise HomeAssistantError(f"Event filter {event_filter} is not a callback")
-        if run_immediately and not is_callback(listener):
+        job = HassJob(listener)
+        if run_immediately and job.job_type == HassJobType.Executor:
             raise HomeAssistantError(f"Event listener {listener} is not a callback")
         return self._async_listen_filterable_job(
-            event_type, _FilterableJob(HassJob(listener), event_filter, run_immediately)
+            event_type, _FilterableJob(job, event_filter, run_immediately)
         )
 
     @callback
@@ -925,6 +1153,90 @@ class EventBus:
 
         return remove_listener
 
+    @callback
+    def async_listen_keyed(
+        self,
+        event_type: str,
+        key_func: Callable[[Event], str | None],
+        keys: Iterable[str],
+        listener: Callable[[Event], None | Awaitable[None]],
+        run_immediately: bool = False,
+    ) -> CALLBACK_TYPE:
+        """Listen for events of a specific type that match one of the keys.
+
+        The key_func, which must be a callable decorated with @callback,
+        extracts the key from an event, for example the entity_id of a
+        state_changed event. Returning None means no keyed listener of
+        that key_func will run. Listeners registered for the key
+        ``MATCH_ALL`` run for every event the key_func returns a key for.
+        Keyed listeners must listen for a specific event_type.
+
+        Listeners sharing the same key_func are stored in a single index,
+        which makes dispatching a dict lookup instead of calling an
+        event_filter for each listener.
+
+        If run_immediately is passed, the callback will be run
+        right away instead of using call_soon. A coroutine function
+        listener is started eagerly, as with async_listen.
+
+        This method must be run in the event loop.
+        """
+        if event_type == MATCH_ALL:
+            raise HomeAssistantError("Keyed listeners require a specific event type")
+        if not is_callback(key_func):
+            raise HomeAssistantError(f"Event key function {key_func} is not a callback")
+        job = HassJob(listener)
+        if run_immediately and job.job_type == HassJobType.Executor:
+            raise HomeAssistantError(f"Event listener {listener} is not a callback")
+
+        keys = list(dict.fromkeys(keys))
+        if MATCH_ALL in keys:
+            keys = [MATCH_ALL]
+        filterable_job = _FilterableJob(job, None, run_immediately)
+        key_listeners = self._keyed_listeners.setdefault(event_type, {}).setdefault(
+            key_func, {}
+        )
+        for key in keys:
+            key_listeners.setdefault(key, []).append(filterable_job)
+
+        def remove_listener() -> None:
+            """Remove the listener."""
+            self._async_remove_keyed_listener(
+                event_type, key_func, keys, filterable_job
+            )
+
+        return remove_listener
+
+    @callback
+    def _async_remove_keyed_listener(
+        self,
+        event_type: str,
+        key_func: Callable[[Event], str | None],
+        keys: list[str],
+        filterable_job: _FilterableJob,
+    ) -> None:
+        """Remove a keyed listener of a specific event_type.
+
+        This method must be run in the event loop.
+        """
+        try:
+            indexes = self._keyed_listeners[event_type]
+            key_listeners = indexes[key_func]
+            for key in keys:
+                key_listeners[key].remove(filterable_job)
+                if not key_listeners[key]:
+                    del key_listeners[key]
+        except (KeyError, ValueError):
+            _LOGGER.exception(
+                "Unable to remove unknown keyed job listener %s", filterable_job
+            )
+            return
+
+        if not key_listeners:
+            del indexes[key_func]
+        if not indexes:
+            del self._keyed_listeners[event_type]
+
     def listen_once(
         self, event_type: str, listener: Callable[[Event], None | Awaitable[None]]
     ) -> CALLBACK_TYPE:
@@ -1059,9 +1371,15 @@ class State:
                 "State max length is 255 characters."
             )
 
-        self.entity_id = entity_id.lower()
-        self.state = state
-        self.attributes = ReadOnlyDict(attributes or {})
+        # Interned so the many State objects of an entity share their strings
+        self.entity_id = sys.intern(entity_id.lower())
+        self.state = sys.intern(state)
+        # A ReadOnlyDict can not change, so it is shared instead of copied
+        self.attributes = (
+            attributes
+            if isinstance(attributes, ReadOnlyDict)
+            else ReadOnlyDict(attributes or {})
+        )
         self.last_updated = last_updated or dt_util.utcnow()
         self.last_changed = last_changed or self.last_updated
         self.context = context or Context()
@@ -1154,6 +1472,90 @@ class State:
         )
 
 
+class StatesSnapshot:
+    """Immutable view of the state machine at one point in time.
+
+    A snapshot is shared by all readers until the state machine changes
+    and can be read from any thread. States are returned sorted by
+    entity_id. The states of a domain are collected when the domain is
+    first requested, without sorting the other states. They are reused
+    from the previous snapshot if no state of the domain changed since.
+    """
+
+    __slots__ = ("version", "_states", "_all", "_domains")
+
+    def __init__(
+        self,
+        version: int,
+        states: dict[str, State],
+        previous: StatesSnapshot | None = None,
+        changed_domains: Iterable[str] = (),
+    ) -> None:
+        """Initialize the snapshot, states must not be changed afterwards."""
+        self.version = version
+        self._states = states
+        self._all: tuple[State, ...] | None = None
+        self._domains: dict[str, tuple[State, ...]] = {}
+        if previous is not None:
+            # Copy first, other threads may be collecting domains of previous
+            self._domains = previous._domains.copy()
+            for domain in changed_domains:
+                self._domains.pop(domain, None)
+
+    def __len__(self) -> int:
+        """Return the number of states."""
+        return len(self._states)
+
+    def __contains__(self, entity_id: object) -> bool:
+        """Return if the snapshot contains the state of an entity."""
+        return entity_id in self._states
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the entity ids."""
+        return iter(self._states)
+
+    def get(self, entity_id: str) -> State | None:
+        """Return the state of an entity or None if not found."""
+        return self._states.get(entity_id.lower())
+
+    def _domain(self, domain: str) -> tuple[State, ...]:
+        """Return the states of a domain, collecting them on first use."""
+        if (domain_states := self._domains.get(domain)) is None:
+            domain_states = self._domains[domain] = tuple(
+                sorted(
+                    (
+                        state
+                        for state in self._states.values()
+                        if state.domain == domain
+                    ),
+                    key=lambda state: state.entity_id,
+                )
+            )
+        return domain_states
+
+    def all(
+        self, domain_filter: str | Iterable[str] | None = None
+    ) -> tuple[State, ...]:
+        """Return the states matching the filter without copying them."""
+        if domain_filter is None:
+            if (states := self._all) is None:
+                states = self._all = tuple(
+                    sorted(self._states.values(), key=lambda state: state.entity_id)
+                )
+            return states
+        if isinstance(domain_filter, str):
+            return self._domain(domain_filter.lower())
+        return tuple(
+            state for domain in domain_filter for state in self._domain(domain.lower())
+        )
+
+    def entity_ids(self, domain_filter: str | Iterable[str] | None = None) -> list[str]:
+        """Return the entity ids matching the filter."""
+        if domain_filter is None:
+            return list(self._states)
+        return [state.entity_id for state in self.all(domain_filter)]
+
+
 class StateMachine:
     """Helper class that tracks the state of different entities."""
 
@@ -1163,6 +1565,10 @@ class StateMachine:
         self._reservations: set[str] = set()
         self._bus = bus
         self._loop = loop
+        self._version = 0
+        self._snapshot: StatesSnapshot | None = None
+        self._previous_snapshot: StatesSnapshot | None = None
+        self._changed_domains: set[str] = set()
 
     def entity_ids(self, domain_filter: str | None = None) -> list[str]:
         """List of entity ids that are being tracked."""
@@ -1233,6 +1639,51 @@ class StateMachine:
             state for state in self._states.values() if state.domain in domain_filter
         ]
 
+    def snapshot(self) -> StatesSnapshot:
+        """Return an immutable snapshot of the current states.
+
+        Does not wait for the event loop while the states are unchanged
+        since the last snapshot.
+        """
+        if (snapshot := self._snapshot) is not None:
+            return snapshot
+        return run_callback_threadsafe(self._loop, self.async_snapshot).result()
+
+    @callback
+    def async_snapshot(self) -> StatesSnapshot:
+        """Return an immutable snapshot of the current states.
+
+        All snapshots taken between changes of the state machine are the
+        same object. The snapshot shares the states with the state machine,
+        they are copied on the first change after it was taken.
+
+        This method must be run in the event loop.
+        """
+        if (snapshot := self._snapshot) is None:
+            snapshot = self._snapshot = StatesSnapshot(
+                self._version,
+                self._states,
+                self._previous_snapshot,
+                self._changed_domains,
+            )
+            self._previous_snapshot = None
+            self._changed_domains = set()
+        return snapshot
+
+    @callback
+    def _async_changing(self, domain: str) -> None:
+        """Prepare to change a state of domain.
+
+        This method must be run in the event loop.
+        """
+        if (snapshot := self._snapshot) is not None:
+            # The current snapshot owns the states
+            self._states = dict(self._states)
+            self._previous_snapshot = snapshot
+            self._snapshot = None
+        self._changed_domains.add(domain)
+        self._version += 1
+
     def get(self, entity_id: str) -> State | None:
         """Retrieve state of entity_id or None if not found.
 
@@ -1266,14 +1717,15 @@ class StateMachine:
         This method must be run in the event loop.
         """
         entity_id = entity_id.lower()
-        old_state = self._states.pop(entity_id, None)
 
         if entity_id in self._reservations:
             self._reservations.remove(entity_id)
 
-        if old_state is None:
+        if (old_state := self._states.get(entity_id)) is None:
             return False
 
+        self._async_changing(old_state.domain)
+        del self._states[entity_id]
         self._bus.async_fire(
             EVENT_STATE_CHANGED,
             {"entity_id": entity_id, "old_state": old_state, "new_state": None},
@@ -1351,16 +1803,53 @@ class StateMachine:
         entity_id = entity_id.lower()
         new_state = str(new_state)
         attributes = attributes or {}
-        if (old_state := self._states.get(entity_id)) is None:
-            same_state = False
-            same_attr = False
-            last_changed = None
-        else:
-            same_state = old_state.state == new_state and not force_update
-            same_attr = old_state.attributes == attributes
-            last_changed = old_state.last_changed if same_state else None
+        old_state = self._states.get(entity_id)
+        if self._async_is_unchanged(old_state, new_state, attributes, force_update):
+            return
 
-        if same_state and same_attr:
+        if context is None:
+            context = Context()
+
+        now = dt_util.utcnow()
+
+        state = self._async_build_state(
+            entity_id, old_state, new_state, attributes, force_update, context, now
+        )
+        self._async_store_state(state)
+        self._async_fire_state_changed(old_state, state, context, now)
+
+    @callback
+    def async_set_many(
+        self,
+        states: Iterable[tuple[str, str, Mapping[str, Any] | None]],
+        force_update: bool = False,
+        context: Context | None = None,
+    ) -> None:
+        """Set the state of multiple entities, add entities if they do not exist.
+
+        States is an iterable of (entity_id, state, attributes) tuples. All
+        states are stored before any state_changed event is fired, so
+        listeners see the whole batch in the state machine. The changes share
+        a single context and timestamp. If an entity_id is passed more than
+        once, the last state wins.
+
+        This method must be run in the event loop.
+        """
+        batch = {
+            entity_id.lower(): (new_state, attributes)
+            for entity_id, new_state, attributes in states
+        }
+        changes: list[tuple[str, State | None, str, Mapping[str, Any]]] = []
+        for entity_id, (new_state, attributes) in batch.items():
+            new_state = str(new_state)
+            attributes = attributes or {}
+            old_state = self._states.get(entity_id)
+            if not self._async_is_unchanged(
+                old_state, new_state, attributes, force_update
+            ):
+                changes.append((entity_id, old_state, new_state, attributes))
+
+        if not changes:
             return
 
         if context is None:
@@ -1368,7 +1857,67 @@ class StateMachine:
 
         now = dt_util.utcnow()
 
-        state = State(
+        # Build all states first so an invalid state leaves the state
+        # machine untouched
+        built = [
+            (
+                old_state,
+                self._async_build_state(
+                    entity_id,
+                    old_state,
+                    new_state,
+                    attributes,
+                    force_update,
+                    context,
+                    now,
+                ),
+            )
+            for entity_id, old_state, new_state, attributes in changes
+        ]
+        for _, state in built:
+            self._async_store_state(state)
+        for old_state, state in built:
+            self._async_fire_state_changed(old_state, state, context, now)
+
+    @staticmethod
+    @callback
+    def _async_is_unchanged(
+        old_state: State | None,
+        new_state: str,
+        attributes: Mapping[str, Any],
+        force_update: bool,
+    ) -> bool:
+        """Return if setting a state would not change anything."""
+        return (
+            old_state is not None
+            and not force_update
+            and old_state.state == new_state
+            and (
+                old_state.attributes is attributes or old_state.attributes == attributes
+            )
+        )
+
+    @staticmethod
+    @callback
+    def _async_build_state(
+        entity_id: str,
+        old_state: State | None,
+        new_state: str,
+        attributes: Mapping[str, Any],
+        force_update: bool,
+        context: Context,
+        now: datetime.datetime,
+    ) -> State:
+        """Return the new state of an entity."""
+        last_changed = None
+        if old_state is not None:
+            if old_state.state == new_state and not force_update:
+                last_changed = old_state.last_changed
+            # Share unchanged attributes so consumers can compare by identity
+            if old_state.attributes is attributes or old_state.attributes == attributes:
+                attributes = old_state.attributes
+
+        return State(
             entity_id,
             new_state,
             attributes,
@@ -1377,10 +1926,25 @@ class StateMachine:
             context,
             old_state is None,
         )
-        self._states[entity_id] = state
+
+    @callback
+    def _async_store_state(self, state: State) -> None:
+        """Store the new state of an entity."""
+        self._async_changing(state.domain)
+        self._states[state.entity_id] = state
+
+    @callback
+    def _async_fire_state_changed(
+        self,
+        old_state: State | None,
+        state: State,
+        context: Context,
+        now: datetime.datetime,
+    ) -> None:
+        """Fire the state changed event for a new state."""
         self._bus.async_fire(
             EVENT_STATE_CHANGED,
-            {"entity_id": entity_id, "old_state": old_state, "new_state": state},
+            {"entity_id": state.entity_id, "old_state": old_state, "new_state": state},
             EventOrigin.local,
             context,
             time_fired=now,
@@ -43,7 +43,8 @@ from . import (
 )
 from .device_registry import DeviceRegistry
 from .entity_registry import EntityRegistry, RegistryEntryDisabler, RegistryEntryHider
-from .event import async_call_later, async_track_time_interval
+from .event import async_call_later
+from .polling import async_get_polling_scheduler
 from .typing import ConfigType, DiscoveryInfoType
 
 if TYPE_CHECKING:
@@ -402,10 +403,14 @@ class EntityPlatform:
         ):
             return
 
-        self._async_unsub_polling = async_track_time_interval(
-            self.hass,
-            self._update_entity_states,
+        self._async_unsub_polling = async_get_polling_scheduler(
+            self.hass
+        ).async_add_poller(
+            self.platform_name,
+            f"{self.platform_name} {self.domain}",
             self.scan_interval,
+            self._update_entity_states,
+            self.config_entry.entry_id if self.config_entry else None,
         )
 
     async def _async_add_entity(  # noqa: C901
@@ -7,6 +7,7 @@ import copy
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 import functools as ft
+from heapq import heapify, heappop, heappush
 import logging
 import time
 from typing import Any, Union, cast
@@ -42,22 +43,12 @@ from .sun import get_astral_event_next
 from .template import RenderInfo, Template, result_as_boolean
 from .typing import TemplateVarsType
 
-TRACK_STATE_CHANGE_CALLBACKS = "track_state_change_callbacks"
-TRACK_STATE_CHANGE_LISTENER = "track_state_change_listener"
-
-TRACK_STATE_ADDED_DOMAIN_CALLBACKS = "track_state_added_domain_callbacks"
-TRACK_STATE_ADDED_DOMAIN_LISTENER = "track_state_added_domain_listener"
-
-TRACK_STATE_REMOVED_DOMAIN_CALLBACKS = "track_state_removed_domain_callbacks"
-TRACK_STATE_REMOVED_DOMAIN_LISTENER = "track_state_removed_domain_listener"
-
-TRACK_ENTITY_REGISTRY_UPDATED_CALLBACKS = "track_entity_registry_updated_callbacks"
-TRACK_ENTITY_REGISTRY_UPDATED_LISTENER = "track_entity_registry_updated_listener"
-
 _ALL_LISTENER = "all"
 _DOMAINS_LISTENER = "domains"
 _ENTITIES_LISTENER = "entities"
 
+_COALESCING_TIMER = "coalescing_timer"
+
 _LOGGER = logging.getLogger(__name__)
 
 _P = ParamSpec("_P")
@@ -229,6 +220,12 @@ def async_track_state_change(
 track_state_change = threaded_listener_factory(async_track_state_change)
 
 
+@callback
+def _async_entity_id_key(event: Event) -> str | None:
+    """Return the entity_id of a state changed event."""
+    return cast(Union[str, None], event.data.get("entity_id"))
+
+
 @bind_hass
 def async_track_state_change_event(
     hass: HomeAssistant,
@@ -242,61 +239,16 @@ def async_track_state_change_event(
 
     In order to avoid having to iterate a long list
     of EVENT_STATE_CHANGED and fire and create a job
-    for each one, we keep a dict of entity ids that
-    care about the state change events so we can
-    do a fast dict lookup to route events.
+    for each one, the listener is keyed by entity id
+    on the event bus so events are routed with a fast
+    dict lookup.
     """
     if not (entity_ids := _async_string_to_lower_list(entity_ids)):
         return _remove_empty_listener
 
-    entity_callbacks = hass.data.setdefault(TRACK_STATE_CHANGE_CALLBACKS, {})
-
-    if TRACK_STATE_CHANGE_LISTENER not in hass.data:
-
-        @callback
-        def _async_state_change_filter(event: Event) -> bool:
-            """Filter state changes by entity_id."""
-            return event.data.get("entity_id") in entity_callbacks
-
-        @callback
-        def _async_state_change_dispatcher(event: Event) -> None:
-            """Dispatch state changes by entity_id."""
-            entity_id = event.data.get("entity_id")
-
-            if entity_id not in entity_callbacks:
-                return
-
-            for job in entity_callbacks[entity_id][:]:
-                try:
-                    hass.async_run_hass_job(job, event)
-                except Exception:  # pylint: disable=broad-except
-                    _LOGGER.exception(
-                        "Error while processing state change for %s", entity_id
-                    )
-
-        hass.data[TRACK_STATE_CHANGE_LISTENER] = hass.bus.async_listen(
-            EVENT_STATE_CHANGED,
-            _async_state_change_dispatcher,
-            event_filter=_async_state_change_filter,
-        )
-
-    job = HassJob(action)
-
-    for entity_id in entity_ids:
-        entity_callbacks.setdefault(entity_id, []).append(job)
-
-    @callback
-    def remove_listener() -> None:
-        """Remove state change listener."""
-        _async_remove_indexed_listeners(
-            hass,
-            TRACK_STATE_CHANGE_CALLBACKS,
-            TRACK_STATE_CHANGE_LISTENER,
-            entity_ids,
-            job,
-        )
-
-    return remove_listener
+    return hass.bus.async_listen_keyed(
+        EVENT_STATE_CHANGED, _async_entity_id_key, entity_ids, action
+    )
 
 
 @callback
@@ -305,24 +257,9 @@ def _remove_empty_listener() -> None:
 
 
 @callback
-def _async_remove_indexed_listeners(
-    hass: HomeAssistant,
-    data_key: str,
-    listener_key: str,
-    storage_keys: Iterable[str],
-    job: HassJob[Any],
-) -> None:
-    """Remove a listener."""
-    callbacks = hass.data[data_key]
-
-    for storage_key in storage_keys:
-        callbacks[storage_key].remove(job)
-        if len(callbacks[storage_key]) == 0:
-            del callbacks[storage_key]
-
-    if not callbacks:
-        hass.data[listener_key]()
-        del hass.data[listener_key]
+def _async_entity_registry_updated_key(event: Event) -> str:
+    """Return the entity_id an entity registry updated event was fired for."""
+    return cast(str, event.data.get("old_entity_id", event.data["entity_id"]))
 
 
 @bind_hass
@@ -338,76 +275,20 @@ def async_track_entity_registry_updated_event(
     if not (entity_ids := _async_string_to_lower_list(entity_ids)):
         return _remove_empty_listener
 
-    entity_callbacks = hass.data.setdefault(TRACK_ENTITY_REGISTRY_UPDATED_CALLBACKS, {})
-
-    if TRACK_ENTITY_REGISTRY_UPDATED_LISTENER not in hass.data:
-
-        @callback
-        def _async_entity_registry_updated_filter(event: Event) -> bool:
-            """Filter entity registry updates by entity_id."""
-            entity_id = event.data.get("old_entity_id", event.data["entity_id"])
-            return entity_id in entity_callbacks
-
-        @callback
-        def _async_entity_registry_updated_dispatcher(event: Event) -> None:
-            """Dispatch entity registry updates by entity_id."""
-            entity_id = event.data.get("old_entity_id", event.data["entity_id"])
-
-            if entity_id not in entity_callbacks:
-                return
-
-            for job in entity_callbacks[entity_id][:]:
-                try:
-                    hass.async_run_hass_job(job, event)
-                except Exception:  # pylint: disable=broad-except
-                    _LOGGER.exception(
-                        "Error while processing entity registry update for %s",
-                        entity_id,
-                    )
-
-        hass.data[TRACK_ENTITY_REGISTRY_UPDATED_LISTENER] = hass.bus.async_listen(
-            EVENT_ENTITY_REGISTRY_UPDATED,
-            _async_entity_registry_updated_dispatcher,
-            event_filter=_async_entity_registry_updated_filter,
-        )
-
-    job = HassJob(action)
-
-    for entity_id in entity_ids:
-        entity_callbacks.setdefault(entity_id, []).append(job)
-
-    @callback
-    def remove_listener() -> None:
-        """Remove state change listener."""
-        _async_remove_indexed_listeners(
-            hass,
-            TRACK_ENTITY_REGISTRY_UPDATED_CALLBACKS,
-            TRACK_ENTITY_REGISTRY_UPDATED_LISTENER,
-            entity_ids,
-            job,
-        )
-
-    return remove_listener
+    return hass.bus.async_listen_keyed(
+        EVENT_ENTITY_REGISTRY_UPDATED,
+        _async_entity_registry_updated_key,
+        entity_ids,
+        action,
+    )
 
 
 @callback
-def _async_dispatch_domain_event(
-    hass: HomeAssistant, event: Event, callbacks: dict[str, list[HassJob[Any]]]
-) -> None:
-    domain = split_entity_id(event.data["entity_id"])[0]
-
-    if domain not in callbacks and MATCH_ALL not in callbacks:
-        return
-
-    listeners = callbacks.get(domain, []) + callbacks.get(MATCH_ALL, [])
-
-    for job in listeners:
-        try:
-            hass.async_run_hass_job(job, event)
-        except Exception:  # pylint: disable=broad-except
-            _LOGGER.exception(
-                "Error while processing event %s for domain %s", event, domain
-            )
+def _async_state_added_domain_key(event: Event) -> str | None:
+    """Return the domain of an entity added to the state machine."""
+    if event.data.get("old_state") is not None:
+        return None
+    return split_entity_id(event.data["entity_id"])[0]
 
 
 @bind_hass
@@ -420,46 +301,17 @@ def async_track_state_added_domain(
     if not (domains := _async_string_to_lower_list(domains)):
         return _remove_empty_listener
 
-    domain_callbacks = hass.data.setdefault(TRACK_STATE_ADDED_DOMAIN_CALLBACKS, {})
-
-    if TRACK_STATE_ADDED_DOMAIN_LISTENER not in hass.data:
-
-        @callback
-        def _async_state_change_filter(event: Event) -> bool:
-            """Filter state changes by entity_id."""
-            return event.data.get("old_state") is None
-
-        @callback
-        def _async_state_change_dispatcher(event: Event) -> None:
-            """Dispatch state changes by entity_id."""
-            if event.data.get("old_state") is not None:
-                return
-
-            _async_dispatch_domain_event(hass, event, domain_callbacks)
-
-        hass.data[TRACK_STATE_ADDED_DOMAIN_LISTENER] = hass.bus.async_listen(
-            EVENT_STATE_CHANGED,
-            _async_state_change_dispatcher,
-            event_filter=_async_state_change_filter,
-        )
-
-    job = HassJob(action)
-
-    for domain in domains:
-        domain_callbacks.setdefault(domain, []).append(job)
+    return hass.bus.async_listen_keyed(
+        EVENT_STATE_CHANGED, _async_state_added_domain_key, domains, action
+    )
 
-    @callback
-    def remove_listener() -> None:
-        """Remove state change listener."""
-        _async_remove_indexed_listeners(
-            hass,
-            TRACK_STATE_ADDED_DOMAIN_CALLBACKS,
-            TRACK_STATE_ADDED_DOMAIN_LISTENER,
-            domains,
-            job,
-        )
 
-    return remove_listener
+@callback
+def _async_state_removed_domain_key(event: Event) -> str | None:
+    """Return the domain of an entity removed from the state machine."""
+    if event.data.get("new_state") is not None:
+        return None
+    return split_entity_id(event.data["entity_id"])[0]
 
 
 @bind_hass
@@ -472,46 +324,9 @@ def async_track_state_removed_domain(
     if not (domains := _async_string_to_lower_list(domains)):
         return _remove_empty_listener
 
-    domain_callbacks = hass.data.setdefault(TRACK_STATE_REMOVED_DOMAIN_CALLBACKS, {})
-
-    if TRACK_STATE_REMOVED_DOMAIN_LISTENER not in hass.data:
-
-        @callback
-        def _async_state_change_filter(event: Event) -> bool:
-            """Filter state changes by entity_id."""
-            return event.data.get("new_state") is None
-
-        @callback
-        def _async_state_change_dispatcher(event: Event) -> None:
-            """Dispatch state changes by entity_id."""
-            if event.data.get("new_state") is not None:
-                return
-
-            _async_dispatch_domain_event(hass, event, domain_callbacks)
-
-        hass.data[TRACK_STATE_REMOVED_DOMAIN_LISTENER] = hass.bus.async_listen(
-            EVENT_STATE_CHANGED,
-            _async_state_change_dispatcher,
-            event_filter=_async_state_change_filter,
-        )
-
-    job = HassJob(action)
-
-    for domain in domains:
-        domain_callbacks.setdefault(domain, []).append(job)
-
-    @callback
-    def remove_listener() -> None:
-        """Remove state change listener."""
-        _async_remove_indexed_listeners(
-            hass,
-            TRACK_STATE_REMOVED_DOMAIN_CALLBACKS,
-            TRACK_STATE_REMOVED_DOMAIN_LISTENER,
-            domains,
-            job,
-        )
-
-    return remove_listener
+    return hass.bus.async_listen_keyed(
+        EVENT_STATE_CHANGED, _async_state_removed_domain_key, domains, action
+    )
 
 
 @callback
@@ -1249,56 +1064,167 @@ def async_track_point_in_time(
 track_point_in_time = threaded_listener_factory(async_track_point_in_time)
 
 
-@callback
-@bind_hass
-def async_track_point_in_utc_time(
-    hass: HomeAssistant,
-    action: HassJob[Awaitable[None] | None]
-    | Callable[[datetime], Awaitable[None] | None],
-    point_in_time: datetime,
-) -> CALLBACK_TYPE:
-    """Add a listener that fires once after a specific point in UTC time."""
-    # Ensure point_in_time is UTC
-    utc_point_in_time = dt_util.as_utc(point_in_time)
+class _ScheduledJob:
+    """A job scheduled to run at a point in time."""
 
-    # Since this is called once, we accept a HassJob so we can avoid
-    # having to figure out how to call the action every time its called.
-    cancel_callback: asyncio.TimerHandle | None = None
+    __slots__ = ("job", "point_in_time", "cancelled")
+
+    def __init__(
+        self, job: HassJob[Awaitable[None] | None], point_in_time: datetime
+    ) -> None:
+        """Initialize the scheduled job."""
+        self.job = job
+        self.point_in_time = point_in_time
+        self.cancelled = False
+
+
+class _CoalescingTimer:
+    """Run point in time listeners from a single event loop timer.
+
+    Jobs due at the same point in time share a slot, the slots are
+    kept in a heap of due times and only the earliest slot has an
+    event loop timer. All slots that are due when the timer fires are
+    run in one batch. Cancelling a job removes it from its slot and
+    marks it cancelled, so it is also skipped when it is cancelled by
+    another job of the batch it is part of.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the coalescing timer."""
+        self.hass = hass
+        self._slots: dict[float, dict[_ScheduledJob, None]] = {}
+        self._due_times: list[float] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._timer_due: float | None = None
 
     @callback
-    def run_action(job: HassJob[Awaitable[None] | None]) -> None:
-        """Call the action."""
-        nonlocal cancel_callback
+    def async_schedule(
+        self, job: HassJob[Awaitable[None] | None], point_in_time: datetime
+    ) -> CALLBACK_TYPE:
+        """Schedule a job to run at a point in time in UTC."""
+        due = point_in_time.timestamp()
+        scheduled = _ScheduledJob(job, point_in_time)
+        if (slot := self._slots.get(due)) is None:
+            slot = self._slots[due] = {}
+            heappush(self._due_times, due)
+        slot[scheduled] = None
+        if self._timer_due is None or due < self._timer_due:
+            self._async_arm()
 
-        now = time_tracker_utcnow()
+        @callback
+        def cancel() -> None:
+            """Remove the job from its slot."""
+            scheduled.cancelled = True
+            if (slot := self._slots.get(due)) is None or scheduled not in slot:
+                return
+            del slot[scheduled]
+            if slot:
+                return
+            del self._slots[due]
+            # Drop the due times of cancelled slots once they dominate the heap
+            if len(self._due_times) > 2 * len(self._slots) + 64:
+                self._due_times = list(self._slots)
+                heapify(self._due_times)
+            if due == self._timer_due:
+                self._async_arm()
+
+        return cancel
+
+    @callback
+    def async_scheduled(self) -> list[tuple[datetime, HassJob[Awaitable[None] | None]]]:
+        """Return the scheduled jobs, earliest first."""
+        return [
+            (scheduled.point_in_time, scheduled.job)
+            for due in sorted(self._slots)
+            for scheduled in self._slots[due]
+        ]
 
+    @callback
+    def _async_arm(self, now: float | None = None) -> None:
+        """Set the event loop timer for the earliest slot."""
+        due_times = self._due_times
+        while due_times and due_times[0] not in self._slots:
+            heappop(due_times)
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not due_times:
+            self._timer_due = None
+            return
+        self._timer_due = due_times[0]
+        self._timer = self.hass.loop.call_later(
+            self._timer_due - (time.time() if now is None else now),
+            self._async_run_due,
+        )
+
+    @callback
+    def _async_run_due(self) -> None:
+        """Run the jobs of all slots that are due."""
+        self._timer = None
+        self._timer_due = None
         # Depending on the available clock support (including timer hardware
         # and the OS kernel) it can happen that we fire a little bit too early
         # as measured by utcnow(). That is bad when callbacks have assumptions
-        # about the current time. Thus, we rearm the timer for the remaining
-        # time.
-        if (delta := (utc_point_in_time - now).total_seconds()) > 0:
-            _LOGGER.debug("Called %f seconds too early, rearming", delta)
+        # about the current time. Thus, slots that are not due yet are kept
+        # and the timer is rearmed for the remaining time.
+        now = time_tracker_utcnow().timestamp()
+        due_times = self._due_times
+        due_jobs: list[_ScheduledJob] = []
+        while due_times and due_times[0] <= now:
+            if slot := self._slots.pop(heappop(due_times), None):
+                due_jobs.extend(slot)
+        if not due_jobs and due_times:
+            _LOGGER.debug("Called %f seconds too early, rearming", due_times[0] - now)
+        # Jobs scheduled by the jobs run below wait for the next timer
+        self._async_arm(now)
+
+        for scheduled in due_jobs:
+            if scheduled.cancelled:
+                continue
+            try:
+                self.hass.async_run_hass_job(scheduled.job, scheduled.point_in_time)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error running job: %s", scheduled.job)
 
-            cancel_callback = hass.loop.call_later(delta, run_action, job)
-            return
 
-        hass.async_run_hass_job(job, utc_point_in_time)
+@callback
+def _async_get_coalescing_timer(hass: HomeAssistant) -> _CoalescingTimer:
+    """Return the coalescing timer of the instance."""
+    if (timer := hass.data.get(_COALESCING_TIMER)) is None:
+        timer = hass.data[_COALESCING_TIMER] = _CoalescingTimer(hass)
+    return cast(_CoalescingTimer, timer)
+
 
+@callback
+@bind_hass
+def async_track_point_in_utc_time(
+    hass: HomeAssistant,
+    action: HassJob[Awaitable[None] | None]
+    | Callable[[datetime], Awaitable[None] | None],
+    point_in_time: datetime,
+) -> CALLBACK_TYPE:
+    """Add a listener that fires once after a specific point in UTC time."""
+    # Since this is called once, we accept a HassJob so we can avoid
+    # having to figure out how to call the action every time its called.
     job = action if isinstance(action, HassJob) else HassJob(action)
-    delta = utc_point_in_time.timestamp() - time.time()
-    cancel_callback = hass.loop.call_later(delta, run_action, job)
+    return _async_get_coalescing_timer(hass).async_schedule(
+        job, dt_util.as_utc(point_in_time)
+    )
 
-    @callback
-    def unsub_point_in_time_listener() -> None:
-        """Cancel the call_later."""
-        assert cancel_callback is not None
-        cancel_callback.cancel()
 
-    return unsub_point_in_time_listener
+track_point_in_utc_time = threaded_listener_factory(async_track_point_in_utc_time)
 
 
-track_point_in_utc_time = threaded_listener_factory(async_track_point_in_utc_time)
+@callback
+def async_scheduled_point_in_time_jobs(
+    hass: HomeAssistant,
+) -> list[tuple[datetime, HassJob[Awaitable[None] | None]]]:
+    """Return the jobs waiting for a point in UTC time, earliest first.
+
+    The jobs share a single event loop timer, so they do not show up
+    individually in the scheduled handles of the event loop.
+    """
+    return _async_get_coalescing_timer(hass).async_scheduled()
 
 
 @callback
@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 import asyncio
-from collections.abc import Callable
+from collections.abc import Callable, Sequence
 import functools
 import logging
 from traceback import FrameSummary, extract_stack
@@ -22,11 +22,22 @@ def get_integration_frame(
     exclude_integrations: set | None = None,
 ) -> tuple[FrameSummary, str, str]:
     """Return the frame, integration and integration path of the current stack frame."""
+    return get_integration_frame_from_stack(extract_stack(), exclude_integrations)
+
+
+def get_integration_frame_from_stack(
+    stack: Sequence[FrameSummary],
+    exclude_integrations: set | None = None,
+) -> tuple[FrameSummary, str, str]:
+    """Return the frame, integration and integration path of a stack.
+
+    The innermost frame belonging to an integration is returned.
+    """
     found_frame = None
     if not exclude_integrations:
         exclude_integrations = set()
 
-    for frame in reversed(extract_stack()):
+    for frame in reversed(stack):
         for path in ("custom_components/", "homeassistant/components/"):
             try:
                 index = frame.filename.index(path)
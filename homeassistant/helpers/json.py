@@ -1,8 +1,14 @@
 """Helpers to help with encoding Home Assistant objects in JSON."""
 import datetime
+from functools import partial
 import json
+from json.encoder import encode_basestring_ascii
+import math
+import re
 from typing import Any
 
+import orjson
+
 
 class JSONEncoder(json.JSONEncoder):
     """JSONEncoder that supports Home Assistant objects."""
@@ -40,3 +46,117 @@ class ExtendedJSONEncoder(JSONEncoder):
             return super().default(o)
         except TypeError:
             return {"__type": str(type(o)), "repr": repr(o)}
+
+
+def json_encoder_default(obj: Any) -> Any:
+    """Convert Home Assistant objects for orjson.
+
+    orjson handles datetimes, dicts including ReadOnlyDict and the
+    builtin types natively, so this is only called for other objects.
+    """
+    if isinstance(obj, set):
+        return list(obj)
+    if hasattr(obj, "as_dict"):
+        return obj.as_dict()
+    # orjson only serializes subclasses of str, int, dict and list natively
+    if isinstance(obj, tuple):
+        return list(obj)
+    if isinstance(obj, float):
+        return float(obj)
+    raise TypeError
+
+
+_orjson_bytes = partial(
+    orjson.dumps, option=orjson.OPT_NON_STR_KEYS, default=json_encoder_default
+)
+_orjson_indent_bytes = partial(
+    orjson.dumps,
+    option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+    default=json_encoder_default,
+)
+
+# orjson only serializes integers of up to 64 bits
+ORJSON_BIG_INTEGER_ERROR = "Integer exceeds 64-bit range"
+
+_NON_ASCII = re.compile(rb"[\x80-\xff]+")
+_INDENT = re.compile(rb"^ +", re.MULTILINE)
+
+
+def _escape_non_ascii(output: bytes) -> bytes:
+    """Escape the non-ASCII characters of JSON output as json.dumps does."""
+    if output.isascii():
+        return output
+    return _NON_ASCII.sub(
+        lambda match: encode_basestring_ascii(match[0].decode("utf-8"))[1:-1].encode(
+            "ascii"
+        ),
+        output,
+    )
+
+
+def _has_non_finite_floats(data: Any) -> bool:
+    """Return if data contains NaN or Infinity, which orjson writes as null."""
+    to_process = [data]
+    while to_process:
+        obj = to_process.pop()
+        if isinstance(obj, float):
+            if not math.isfinite(obj):
+                return True
+        elif isinstance(obj, (str, int)) or obj is None:
+            continue
+        elif isinstance(obj, dict):
+            to_process.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            to_process.extend(obj)
+        elif hasattr(obj, "as_dict"):
+            to_process.append(obj.as_dict())
+    return False
+
+
+def json_bytes(data: Any) -> bytes:
+    """Serialize data to compact JSON bytes.
+
+    The output matches json.dumps with JSONEncoder, allow_nan=False and
+    compact separators, except that floats in exponent notation are
+    written without a plus sign or leading zeros, like 1e16 and 1e-7.
+
+    orjson writes NaN and Infinity as null, so data whose output contains
+    null is checked for them. Data with integers beyond 64 bits, which
+    orjson does not serialize, is serialized with the JSONEncoder.
+    """
+    try:
+        output = _orjson_bytes(data)
+    except TypeError as err:
+        if str(err) != ORJSON_BIG_INTEGER_ERROR:
+            raise
+        return json.dumps(
+            data, cls=JSONEncoder, allow_nan=False, separators=(",", ":")
+        ).encode("ascii")
+    if b"null" in output and _has_non_finite_floats(data):
+        raise ValueError("Out of range float values are not JSON compliant")
+    return _escape_non_ascii(output)
+
+
+def json_bytes_indented(data: Any) -> bytes:
+    """Serialize data to JSON bytes indented with four spaces.
+
+    The output matches json.dumps with JSONEncoder and indent=4, which is
+    the format of the storage files, with the same exception for floats in
+    exponent notation as json_bytes. Data with NaN, Infinity or integers
+    beyond 64 bits is serialized with the JSONEncoder, which writes NaN and
+    Infinity as NaN and Infinity.
+    """
+    try:
+        output = _orjson_indent_bytes(data)
+    except TypeError as err:
+        if str(err) != ORJSON_BIG_INTEGER_ERROR:
+            raise
+    else:
+        if b"null" not in output or not _has_non_finite_floats(data):
+            return _escape_non_ascii(_INDENT.sub(lambda match: match[0] * 2, output))
+    return json.dumps(data, cls=JSONEncoder, indent=4).encode("ascii")
+
+
+def json_dumps(data: Any) -> str:
+    """Serialize data to a compact JSON string."""
+    return json_bytes(data).decode("utf-8")
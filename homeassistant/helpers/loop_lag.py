@@ -0,0 +1,217 @@
+"""Monitor the scheduling delay of the event loop."""
+from __future__ import annotations
+
+import asyncio
+from bisect import bisect_left
+from collections import Counter, deque
+import logging
+import sys
+import threading
+import time
+from traceback import StackSummary, extract_stack
+from typing import Any
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, HomeAssistant, callback
+import homeassistant.util.dt as dt_util
+
+from .frame import MissingIntegrationFrame, get_integration_frame_from_stack
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_LOOP_LAG_MONITOR = "loop_lag_monitor"
+
+# Seconds between two measurements of the scheduling delay
+CHECK_INTERVAL = 0.5
+# Delay in seconds after which the running callback is sampled
+SLOW_CALLBACK_THRESHOLD = 0.2
+
+# Upper bounds in seconds of the lag histogram buckets
+LAG_BUCKETS = (0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+
+MAX_SLOW_CALLBACKS = 20
+MAX_STACK_DEPTH = 20
+
+
+@callback
+def async_setup_loop_lag_monitor(hass: HomeAssistant) -> LoopLagMonitor:
+    """Start monitoring the event loop lag until Home Assistant stops."""
+    if (monitor := async_get_loop_lag_monitor(hass)) is not None:
+        return monitor
+
+    monitor = hass.data[DATA_LOOP_LAG_MONITOR] = LoopLagMonitor(hass)
+    monitor.async_start()
+
+    async def _async_stop_monitor(event: Event) -> None:
+        """Stop the monitor."""
+        await monitor.async_stop()
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_stop_monitor)
+    return monitor
+
+
+@callback
+def async_get_loop_lag_monitor(hass: HomeAssistant) -> LoopLagMonitor | None:
+    """Return the running loop lag monitor."""
+    monitor: LoopLagMonitor | None = hass.data.get(DATA_LOOP_LAG_MONITOR)
+    return monitor
+
+
+class LoopLagMonitor:
+    """Measure how late the event loop runs a scheduled callback.
+
+    A check is scheduled every interval and the difference between
+    the time it was due and the time it ran is the lag. A watchdog
+    thread samples the stack of the event loop thread when a check
+    is overdue by more than the threshold, which is the callback
+    blocking the event loop.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        interval: float = CHECK_INTERVAL,
+        threshold: float = SLOW_CALLBACK_THRESHOLD,
+    ) -> None:
+        """Initialize the loop lag monitor."""
+        self.hass = hass
+        self.interval = interval
+        self.threshold = threshold
+        self.checks = 0
+        self.total_lag = 0.0
+        self.max_lag = 0.0
+        self.histogram = [0] * (len(LAG_BUCKETS) + 1)
+        self.integrations: Counter[str] = Counter()
+        self.slow_callbacks: deque[dict[str, Any]] = deque(maxlen=MAX_SLOW_CALLBACKS)
+        self._reported: set[str] = set()
+        self._due = 0.0
+        self._timer: asyncio.TimerHandle | None = None
+        self._loop_thread_id: int | None = None
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Start measuring the lag and watching for slow callbacks."""
+        self._loop_thread_id = threading.get_ident()
+        self._async_schedule_check()
+        self._thread = threading.Thread(
+            target=self._watch, name="LoopLagMonitor", daemon=True
+        )
+        self._thread.start()
+
+    async def async_stop(self) -> None:
+        """Stop the monitor."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._stop_event.set()
+        if (thread := self._thread) is not None:
+            self._thread = None
+            await self.hass.async_add_executor_job(thread.join)
+
+    @callback
+    def _async_schedule_check(self) -> None:
+        """Schedule the next lag measurement."""
+        self._due = time.monotonic() + self.interval
+        self._timer = self.hass.loop.call_later(self.interval, self._async_check)
+
+    @callback
+    def _async_check(self) -> None:
+        """Record how late this check runs."""
+        self.async_record_lag(max(time.monotonic() - self._due, 0.0))
+        self._async_schedule_check()
+
+    @callback
+    def async_record_lag(self, lag: float) -> None:
+        """Record a measured lag."""
+        self.checks += 1
+        self.total_lag += lag
+        self.max_lag = max(self.max_lag, lag)
+        self.histogram[bisect_left(LAG_BUCKETS, lag)] += 1
+
+    def _watch(self) -> None:
+        """Sample the event loop stack when a check is overdue.
+
+        Runs in the watchdog thread.
+        """
+        sampled_due = None
+        while not self._stop_event.wait(self.threshold / 2):
+            due = self._due
+            if due == sampled_due or (lag := time.monotonic() - due) < self.threshold:
+                continue
+            sampled_due = due
+            # pylint: disable-next=protected-access
+            if (frame := sys._current_frames().get(self._loop_thread_id)) is None:
+                continue
+            stack = extract_stack(frame)
+            self.hass.loop.call_soon_threadsafe(
+                self.async_record_slow_callback, stack, lag
+            )
+
+    @callback
+    def async_record_slow_callback(self, stack: StackSummary, lag: float) -> None:
+        """Record the stack of a callback that blocked the event loop."""
+        try:
+            found_frame, integration, _ = get_integration_frame_from_stack(stack)
+        except MissingIntegrationFrame:
+            found_frame, integration = stack[-1], "homeassistant"
+
+        self.integrations[integration] += 1
+        self.slow_callbacks.append(
+            {
+                "time": dt_util.utcnow().isoformat(),
+                "lag_ms": round(lag * 1000, 1),
+                "integration": integration,
+                "frame": f"{found_frame.filename}:{found_frame.lineno}",
+                "stack": [
+                    f"{frame.filename}:{frame.lineno} in {frame.name}"
+                    for frame in stack[-MAX_STACK_DEPTH:]
+                ],
+            }
+        )
+
+        # Only log the first stall of every line to prevent flooding
+        key = f"{found_frame.filename}:{found_frame.lineno}"
+        if key in self._reported:
+            return
+        self._reported.add(key)
+        _LOGGER.warning(
+            "Detected %s blocking the event loop for more than %.3f seconds at %s, line %s: %s",
+            integration,
+            lag,
+            found_frame.filename,
+            found_frame.lineno,
+            (found_frame.line or "?").strip(),
+        )
+
+    @callback
+    def async_as_dict(self, integration: str | None = None) -> dict[str, Any]:
+        """Return the lag histogram and the sampled slow callbacks.
+
+        If an integration is passed, only the slow callbacks attributed to
+        that integration are included.
+        """
+        if integration is None:
+            integrations = dict(self.integrations)
+            slow_callbacks = list(self.slow_callbacks)
+        else:
+            count = self.integrations[integration]
+            integrations = {integration: count} if count else {}
+            slow_callbacks = [
+                slow_callback
+                for slow_callback in self.slow_callbacks
+                if slow_callback["integration"] == integration
+            ]
+        labels = [f"<={bound * 1000:g}ms" for bound in LAG_BUCKETS]
+        labels.append(f">{LAG_BUCKETS[-1] * 1000:g}ms")
+        return {
+            "interval": self.interval,
+            "threshold": self.threshold,
+            "checks": self.checks,
+            "mean_lag_ms": self.total_lag / self.checks * 1000 if self.checks else 0.0,
+            "max_lag_ms": self.max_lag * 1000,
+            "histogram": dict(zip(labels, self.histogram)),
+            "integrations": integrations,
+            "slow_callbacks": slow_callbacks,
+        }
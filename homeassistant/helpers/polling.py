@@ -0,0 +1,260 @@
+"""Coalesce the polling of entity platforms."""
+from __future__ import annotations
+
+from collections.abc import Callable, Coroutine
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import functools as ft
+import logging
+import math
+import time
+from typing import Any
+import zlib
+
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .event import async_track_point_in_utc_time
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_POLLING_SCHEDULER = "polling_scheduler"
+
+# Pollers sharing an interval are spread over this many one second offsets
+JITTER_SLOTS = 5
+# Maximum factor the interval of a slow poller is multiplied with
+MAX_BACKOFF = 8
+
+
+@dataclass
+class PollingStats:
+    """Statistics of a poller."""
+
+    integration: str
+    name: str
+    config_entry_id: str | None
+    interval: timedelta
+    offset: int
+    backoff: int = 1
+    polls: int = 0
+    skipped: int = 0
+    total_duration: float = 0.0
+    max_duration: float = 0.0
+    last_duration: float | None = None
+
+    @property
+    def effective_interval(self) -> float:
+        """Return the interval in seconds after backing off."""
+        return self.interval.total_seconds() * self.backoff
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a dictionary representation of the statistics."""
+        return {
+            "name": self.name,
+            "config_entry_id": self.config_entry_id,
+            "interval": self.interval.total_seconds(),
+            "effective_interval": self.effective_interval,
+            "offset": self.offset,
+            "polls": self.polls,
+            "skipped": self.skipped,
+            "mean_duration": self.total_duration / self.polls if self.polls else None,
+            "max_duration": self.max_duration,
+            "last_duration": self.last_duration,
+        }
+
+
+class _Poller:
+    """A registered poll action."""
+
+    __slots__ = ("action", "stats", "running")
+
+    def __init__(
+        self,
+        action: Callable[[datetime], Coroutine[Any, Any, None]],
+        stats: PollingStats,
+    ) -> None:
+        """Initialize the poller."""
+        self.action = action
+        self.stats = stats
+        self.running = False
+
+
+class _PollGroup:
+    """Pollers that are polled together."""
+
+    __slots__ = ("pollers", "unsub")
+
+    def __init__(self) -> None:
+        """Initialize the poll group."""
+        self.pollers: dict[_Poller, None] = {}
+        self.unsub: CALLBACK_TYPE | None = None
+
+
+def _next_poll(interval: float, offset: int) -> datetime:
+    """Return the first aligned poll time after now.
+
+    Polls are aligned to multiples of the interval since the epoch
+    shifted by the offset, so the next poll is never further away
+    than the interval.
+    """
+    now = dt_util.utcnow().timestamp()
+    return dt_util.utc_from_timestamp(
+        (math.floor((now - offset) / interval) + 1) * interval + offset
+    )
+
+
+class PollingScheduler:
+    """Poll all entity platforms of an instance from shared timers.
+
+    Pollers with the same interval and offset form a group with a
+    single timer. The offset is derived from the name of the poller
+    and spreads pollers of the same interval over a few seconds.
+
+    A poller that is still running when it is due again, or whose
+    poll took longer than its interval, has its interval doubled up
+    to MAX_BACKOFF times. The interval is halved again once a poll
+    takes less than a quarter of it.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the polling scheduler."""
+        self.hass = hass
+        self._groups: dict[tuple[float, int], _PollGroup] = {}
+        self._pollers: dict[_Poller, None] = {}
+
+    @callback
+    def async_add_poller(
+        self,
+        integration: str,
+        name: str,
+        interval: timedelta,
+        action: Callable[[datetime], Coroutine[Any, Any, None]],
+        config_entry_id: str | None = None,
+    ) -> CALLBACK_TYPE:
+        """Poll an action every interval until the returned callback is called."""
+        seconds = interval.total_seconds()
+        offset = 0
+        if (slots := min(JITTER_SLOTS, int(seconds))) > 1:
+            offset = zlib.crc32(f"{name} {config_entry_id}".encode()) % slots
+        poller = _Poller(
+            action, PollingStats(integration, name, config_entry_id, interval, offset)
+        )
+        self._pollers[poller] = None
+        self._async_add_to_group(poller)
+
+        @callback
+        def remove_poller() -> None:
+            """Stop polling."""
+            if self._pollers.pop(poller, False) is not False:
+                self._async_remove_from_group(poller)
+
+        return remove_poller
+
+    @callback
+    def async_get_stats(
+        self, integration: str | None = None, config_entry_id: str | None = None
+    ) -> list[dict[str, Any]]:
+        """Return the statistics of the pollers.
+
+        Optionally only of one integration or config entry.
+        """
+        return [
+            poller.stats.as_dict()
+            for poller in self._pollers
+            if (integration is None or poller.stats.integration == integration)
+            and (
+                config_entry_id is None
+                or poller.stats.config_entry_id == config_entry_id
+            )
+        ]
+
+    @callback
+    def _async_add_to_group(self, poller: _Poller) -> None:
+        """Add a poller to the group of its current interval."""
+        key = (poller.stats.effective_interval, poller.stats.offset)
+        if (group := self._groups.get(key)) is None:
+            group = self._groups[key] = _PollGroup()
+            group.unsub = async_track_point_in_utc_time(
+                self.hass,
+                HassJob(ft.partial(self._async_poll_group, key)),
+                _next_poll(*key),
+            )
+        group.pollers[poller] = None
+
+    @callback
+    def _async_remove_from_group(self, poller: _Poller) -> None:
+        """Remove a poller from its group."""
+        key = (poller.stats.effective_interval, poller.stats.offset)
+        group = self._groups[key]
+        del group.pollers[poller]
+        if group.pollers:
+            return
+        del self._groups[key]
+        if group.unsub is not None:
+            group.unsub()
+
+    @callback
+    def _async_set_backoff(self, poller: _Poller, backoff: int) -> None:
+        """Move a poller to the group of its new interval."""
+        backoff = max(1, min(backoff, MAX_BACKOFF))
+        if backoff == poller.stats.backoff:
+            return
+        self._async_remove_from_group(poller)
+        poller.stats.backoff = backoff
+        self._async_add_to_group(poller)
+
+    @callback
+    def _async_poll_group(self, key: tuple[float, int], now: datetime) -> None:
+        """Poll all pollers of a group."""
+        if (group := self._groups.get(key)) is None:
+            # The last poller of the group was removed while it was due
+            return
+        group.unsub = async_track_point_in_utc_time(
+            self.hass,
+            HassJob(ft.partial(self._async_poll_group, key)),
+            _next_poll(*key),
+        )
+        for poller in list(group.pollers):
+            if not poller.running:
+                self.hass.async_create_task(self._async_poll(poller, now))
+                continue
+            stats = poller.stats
+            stats.skipped += 1
+            _LOGGER.warning(
+                "Updating %s took longer than the scheduled update interval %s",
+                stats.name,
+                timedelta(seconds=stats.effective_interval),
+            )
+            self._async_set_backoff(poller, stats.backoff * 2)
+
+    async def _async_poll(self, poller: _Poller, now: datetime) -> None:
+        """Poll and adapt the interval to the duration of the poll."""
+        poller.running = True
+        start = time.monotonic()
+        try:
+            await poller.action(now)
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Error polling %s", poller.stats.name)
+        finally:
+            poller.running = False
+        duration = time.monotonic() - start
+
+        stats = poller.stats
+        stats.polls += 1
+        stats.total_duration += duration
+        stats.max_duration = max(stats.max_duration, duration)
+        stats.last_duration = duration
+        if poller not in self._pollers:
+            return
+        if duration > stats.effective_interval:
+            self._async_set_backoff(poller, stats.backoff * 2)
+        elif stats.backoff > 1 and duration < stats.effective_interval / 4:
+            self._async_set_backoff(poller, stats.backoff // 2)
+
+
+@callback
+def async_get_polling_scheduler(hass: HomeAssistant) -> PollingScheduler:
+    """Return the polling scheduler of the instance."""
+    if (scheduler := hass.data.get(DATA_POLLING_SCHEDULER)) is None:
+        scheduler = hass.data[DATA_POLLING_SCHEDULER] = PollingScheduler(hass)
+    return scheduler  # type: ignore[no-any-return]
@@ -13,7 +13,6 @@ from functools import partial, wraps
 import json
 import logging
 import math
-from operator import attrgetter
 import random
 import re
 import statistics
@@ -866,7 +865,7 @@ def _collect_state(hass: HomeAssistant, entity_id: str) -> None:
 
 def _state_generator(hass: HomeAssistant, domain: str | None) -> Generator:
     """State generator for a domain or all states."""
-    for state in sorted(hass.states.async_all(domain), key=attrgetter("entity_id")):
+    for state in hass.states.async_snapshot().all(domain):
         yield TemplateState(hass, state, collect=False)
 
 
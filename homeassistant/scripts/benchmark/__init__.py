@@ -9,6 +9,7 @@ from contextlib import suppress
 import json
 import logging
 from timeit import default_timer as timer
+import tracemalloc
 from typing import TypeVar
 
 from homeassistant import core
@@ -86,6 +87,42 @@ async def fire_events(hass):
     return timer() - start
 
 
+@benchmark
+async def fire_events_async_listener(hass):
+    """Fire a million events to a coroutine function listener."""
+    return await _fire_events_async_listener(hass, False)
+
+
+@benchmark
+async def fire_events_async_listener_eager(hass):
+    """Fire a million events to an eagerly started coroutine function listener."""
+    return await _fire_events_async_listener(hass, True)
+
+
+async def _fire_events_async_listener(hass, run_immediately):
+    count = 0
+    event_name = "benchmark_event"
+    events_to_fire = 10**6
+
+    async def listener(_):
+        """Handle event."""
+        nonlocal count
+        count += 1
+
+    hass.bus.async_listen(event_name, listener, run_immediately=run_immediately)
+
+    start = timer()
+
+    for _ in range(events_to_fire):
+        hass.bus.async_fire(event_name)
+
+    await hass.async_block_till_done()
+
+    assert count == events_to_fire
+
+    return timer() - start
+
+
 @benchmark
 async def fire_events_with_filter(hass):
     """Fire a million events with a filter that rejects them."""
@@ -362,6 +399,38 @@ async def json_serialize_states(hass):
     return timer() - start
 
 
+@benchmark
+async def state_memory(hass):
+    """Measure the memory held by 100k states of 5000 entities."""
+    entities = 5000
+    updates = 20
+    history = []
+
+    @core.callback
+    def listener(event):
+        """Keep the new state like a history cache would."""
+        history.append(event.data["new_state"])
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, listener, run_immediately=True)
+
+    tracemalloc.start()
+    start = timer()
+    for update in range(updates):
+        for idx in range(entities):
+            hass.states.async_set(
+                f"sensor.benchmark_{idx}",
+                str(update % 2),
+                {"friendly_name": f"Benchmark {idx}", "unit_of_measurement": "W"},
+            )
+    await hass.async_block_till_done()
+    runtime = timer() - start
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{allocated / len(history):.0f} bytes per state")
+    return runtime
+
+
 def _create_state_changed_event_from_old_new(
     entity_id, event_time_fired, old_state, new_state
 ):
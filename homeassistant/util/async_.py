@@ -1,9 +1,17 @@
 """Asyncio utilities."""
 from __future__ import annotations
 
-from asyncio import Semaphore, coroutines, ensure_future, gather, get_running_loop
+from asyncio import (
+    CancelledError,
+    Future,
+    Semaphore,
+    coroutines,
+    ensure_future,
+    gather,
+    get_running_loop,
+)
 from asyncio.events import AbstractEventLoop
-from collections.abc import Awaitable, Callable, Coroutine
+from collections.abc import Awaitable, Callable, Coroutine, Generator
 import concurrent.futures
 import functools
 import logging
@@ -94,6 +102,71 @@ def run_callback_threadsafe(
     return future
 
 
+class _SuspendedCoroutine:
+    """Awaitable continuing a coroutine that was started outside of a task."""
+
+    __slots__ = ("_coro", "_yielded")
+
+    def __init__(self, coro: Coroutine[Any, Any, _T], yielded: Any) -> None:
+        """Initialize with the coroutine and the value it suspended with."""
+        self._coro = coro
+        self._yielded = yielded
+
+    def __await__(self) -> Generator[Any, None, _T]:
+        """Hand the pending value to the task, then delegate to the coroutine."""
+        coro = self._coro
+        yielded = self._yielded
+        while True:
+            try:
+                yield yielded
+            except BaseException as err:  # pylint: disable=broad-except
+                # The task throws cancellation into the awaitable, pass it on
+                try:
+                    yielded = coro.throw(err)
+                except StopIteration as stop:
+                    return stop.value  # type: ignore[no-any-return]
+                continue
+            return (yield from coro.__await__())
+
+
+async def _async_resume(coro: Coroutine[Any, Any, _T], yielded: Any) -> _T:
+    """Finish a suspended coroutine."""
+    return await _SuspendedCoroutine(coro, yielded)
+
+
+def eager_start_coroutine(
+    coro: Coroutine[Any, Any, _T], loop: AbstractEventLoop
+) -> Future[_T]:
+    """Run a coroutine until it first suspends.
+
+    A task to finish the coroutine is only created when it suspends,
+    otherwise a future holding its result is returned. This saves
+    creating and scheduling a task for coroutines that rarely await.
+
+    The coroutine starts in the context of the caller, so it must not
+    rely on asyncio.current_task() before its first suspension.
+
+    This method must be run in the event loop.
+    """
+    try:
+        yielded = coro.send(None)
+    except StopIteration as stop:
+        future: Future[_T] = loop.create_future()
+        future.set_result(stop.value)
+        return future
+    except (KeyboardInterrupt, SystemExit):
+        raise
+    except CancelledError:
+        future = loop.create_future()
+        future.cancel()
+        return future
+    except BaseException as err:  # pylint: disable=broad-except
+        future = loop.create_future()
+        future.set_exception(err)
+        return future
+    return loop.create_task(_async_resume(coro, yielded))
+
+
 def check_loop(func: Callable[..., Any], strict: bool = True) -> None:
     """Warn if called inside the event loop. Raise if `strict` is True."""
     try:
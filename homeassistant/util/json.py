@@ -3,18 +3,30 @@ from __future__ import annotations
 
 from collections import deque
 from collections.abc import Callable
+from functools import partial
 import json
 import logging
 from typing import Any
 
+import orjson
+
 from homeassistant.core import Event, State
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.json import (
+    JSONEncoder as DefaultHASSJSONEncoder,
+    json_bytes_indented,
+)
 
 from .file import write_utf8_file, write_utf8_file_atomic
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _orjson_default_encoder(data: Any) -> str:
+    """Serialize data to JSON indented like the storage files."""
+    return json_bytes_indented(data).decode("ascii")
+
+
 class SerializationError(HomeAssistantError):
     """Error serializing the data to JSON."""
 
@@ -30,7 +42,12 @@ def load_json(filename: str, default: list | dict | None = None) -> list | dict:
     """
     try:
         with open(filename, encoding="utf-8") as fdesc:
-            return json.loads(fdesc.read())  # type: ignore[no-any-return]
+            content = fdesc.read()
+        try:
+            return orjson.loads(content)  # type: ignore[no-any-return]
+        except orjson.JSONDecodeError:
+            # Files written by json.dumps may contain NaN and Infinity
+            return json.loads(content)  # type: ignore[no-any-return]
     except FileNotFoundError:
         # This is not a fatal error
         _LOGGER.debug("JSON file not found: %s", filename)
@@ -55,10 +72,17 @@ def save_json(
 
     Returns True on success.
     """
+    dump: Callable[[Any], Any]
     try:
-        json_data = json.dumps(data, indent=4, cls=encoder)
+        if encoder is not None and encoder is not DefaultHASSJSONEncoder:
+            # Custom encoders need the slow path of json.dumps
+            dump = partial(json.dumps, cls=encoder)
+            json_data = json.dumps(data, indent=4, cls=encoder)
+        else:
+            dump = _orjson_default_encoder
+            json_data = _orjson_default_encoder(data)
     except TypeError as error:
-        msg = f"Failed to serialize to JSON: {filename}. Bad data at {format_unserializable_data(find_paths_unserializable_data(data))}"
+        msg = f"Failed to serialize to JSON: {filename}. Bad data at {format_unserializable_data(find_paths_unserializable_data(data, dump=dump))}"
         _LOGGER.error(msg)
         raise SerializationError(msg) from error
 
@@ -77,7 +101,7 @@ def format_unserializable_data(data: dict[str, Any]) -> str:
 
 
 def find_paths_unserializable_data(
-    bad_data: Any, *, dump: Callable[[Any], str] = json.dumps
+    bad_data: Any, *, dump: Callable[[Any], Any] = json.dumps
 ) -> dict[str, Any]:
     """Find the paths to unserializable data.
 
@@ -1,11 +1,15 @@
 """Test the Diagnostics integration."""
+from datetime import timedelta
 from http import HTTPStatus
-from unittest.mock import AsyncMock, Mock
+from traceback import FrameSummary, StackSummary
+from unittest.mock import ANY, AsyncMock, Mock
 
 import pytest
 
 from homeassistant.components.websocket_api.const import TYPE_RESULT
 from homeassistant.helpers.device_registry import async_get
+from homeassistant.helpers.loop_lag import async_setup_loop_lag_monitor
+from homeassistant.helpers.polling import async_get_polling_scheduler
 from homeassistant.helpers.system_info import async_get_system_info
 from homeassistant.setup import async_setup_component
 
@@ -117,6 +121,74 @@ async def test_download_diagnostics(hass, hass_client):
         "data": {"device": "info"},
     }
 
+    monitor = async_setup_loop_lag_monitor(hass)
+    monitor.async_record_lag(0.02)
+    for integration in ("fake_integration", "hue"):
+        monitor.async_record_slow_callback(
+            StackSummary.from_list(
+                [
+                    FrameSummary(
+                        f"/home/dev/homeassistant/components/{integration}/sensor.py",
+                        23,
+                        "update",
+                        line="update()",
+                    )
+                ]
+            ),
+            0.5,
+        )
+    diagnostics = await _get_diagnostics_for_config_entry(
+        hass, hass_client, config_entry
+    )
+    assert diagnostics["event_loop"]["checks"] == 1
+    assert diagnostics["event_loop"]["histogram"]["<=50ms"] == 1
+    assert diagnostics["event_loop"]["integrations"] == {"fake_integration": 1}
+    assert [
+        slow_callback["frame"]
+        for slow_callback in diagnostics["event_loop"]["slow_callbacks"]
+    ] == ["/home/dev/homeassistant/components/fake_integration/sensor.py:23"]
+    await monitor.async_stop()
+
+    async def poll(now):
+        """Poll nothing."""
+
+    scheduler = async_get_polling_scheduler(hass)
+    unsubs = [
+        scheduler.async_add_poller(
+            "fake_integration",
+            "fake_integration sensor",
+            timedelta(seconds=30),
+            poll,
+            config_entry.entry_id,
+        ),
+        scheduler.async_add_poller(
+            "fake_integration",
+            "fake_integration other sensor",
+            timedelta(seconds=30),
+            poll,
+            "other_entry_id",
+        ),
+    ]
+    diagnostics = await _get_diagnostics_for_config_entry(
+        hass, hass_client, config_entry
+    )
+    assert diagnostics["polling"] == [
+        {
+            "name": "fake_integration sensor",
+            "config_entry_id": config_entry.entry_id,
+            "interval": 30.0,
+            "effective_interval": 30.0,
+            "offset": ANY,
+            "polls": 0,
+            "skipped": 0,
+            "mean_duration": None,
+            "max_duration": 0.0,
+            "last_duration": None,
+        }
+    ]
+    for unsub in unsubs:
+        unsub()
+
 
 async def test_failure_scenarios(hass, hass_client):
     """Test failure scenarios."""
@@ -1,9 +1,10 @@
 """The tests the History component."""
 # pylint: disable=protected-access,invalid-name
+import asyncio
 from datetime import timedelta
 from http import HTTPStatus
 import json
-from unittest.mock import patch, sentinel
+from unittest.mock import Mock, patch, sentinel
 
 import pytest
 from pytest import approx
@@ -12,6 +13,7 @@ from homeassistant.components import history
 from homeassistant.components.recorder.history import get_significant_states
 from homeassistant.components.recorder.models import process_timestamp
 import homeassistant.core as ha
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.json import JSONEncoder
 from homeassistant.setup import async_setup_component
 import homeassistant.util.dt as dt_util
@@ -648,6 +650,250 @@ async def test_fetch_period_api_with_minimal_response(hass, recorder_mock, hass_
     assert state_list[2]["state"] == "23"
 
 
+async def test_fetch_period_api_stream(hass, recorder_mock, hass_client):
+    """Test the fetch period view streams the same history."""
+    now = dt_util.utcnow()
+    await async_setup_component(hass, "history", {})
+
+    for state in ("0", "50", "23"):
+        hass.states.async_set("sensor.power", state, {"attr": "any"})
+        hass.states.async_set("sensor.other", state)
+        await async_wait_recording_done(hass)
+    client = await hass_client()
+    url = f"/api/history/period/{now.isoformat()}?minimal_response"
+
+    response = await client.get(url)
+    assert response.status == HTTPStatus.OK
+    expected = await response.json()
+
+    response = await client.get(f"{url}&stream")
+    assert response.status == HTTPStatus.OK
+    assert response.content_type == "application/json"
+    assert await response.json() == expected
+    assert [state_list[0]["entity_id"] for state_list in expected] == [
+        "sensor.other",
+        "sensor.power",
+    ]
+
+
+async def test_fetch_period_api_stream_no_states(hass, recorder_mock, hass_client):
+    """Test streaming an empty history returns an empty list."""
+    await async_setup_component(hass, "history", {})
+    await async_wait_recording_done(hass)
+    client = await hass_client()
+
+    response = await client.get(
+        f"/api/history/period/{dt_util.utcnow().isoformat()}?filter_entity_id=sensor.missing&stream"
+    )
+    assert response.status == HTTPStatus.OK
+    assert await response.json() == []
+
+
+async def test_stream_history_during_period(hass, hass_ws_client, recorder_mock):
+    """Test the history of each entity is sent as an event."""
+    now = dt_util.utcnow()
+    await async_setup_component(hass, "history", {})
+
+    for state in ("on", "off"):
+        hass.states.async_set("light.kitchen", state)
+        hass.states.async_set("light.cow", state)
+        await async_wait_recording_done(hass)
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "history/stream_history_during_period",
+            "start_time": now.isoformat(),
+            "entity_ids": ["light.kitchen", "light.cow"],
+        }
+    )
+    chunks = []
+    for _ in range(2):
+        response = await client.receive_json()
+        assert response["id"] == 1
+        assert response["type"] == "event"
+        chunks.append(response["event"])
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["result"] is None
+
+    assert [chunk["entity_id"] for chunk in chunks] == ["light.cow", "light.kitchen"]
+    for chunk in chunks:
+        assert [state["state"] for state in chunk["states"]] == ["on", "off"]
+        assert chunk["states"][0]["entity_id"] == chunk["entity_id"]
+
+
+async def test_stream_history_waits_for_the_client(hass):
+    """Test streamed history is only queued when the client has room for it."""
+    connection = Mock()
+    connection.pending_messages.side_effect = [
+        history.STREAM_MAX_PENDING_MSG,
+        history.STREAM_MAX_PENDING_MSG,
+        0,
+    ]
+    with patch.object(history, "STREAM_PENDING_POLL_INTERVAL", 0):
+        await history._async_send_when_writable(connection, "message")
+    assert connection.pending_messages.call_count == 3
+    connection.send_message.assert_called_once_with("message")
+
+
+async def test_stream_history_during_period_timeout(
+    hass, hass_ws_client, recorder_mock
+):
+    """Test the websocket history stream is aborted if the client stalls."""
+    now = dt_util.utcnow()
+    await async_setup_component(hass, "history", {})
+    hass.states.async_set("light.kitchen", "on")
+    await async_wait_recording_done(hass)
+
+    async def _stalled_client(connection, message):
+        await asyncio.Event().wait()
+
+    client = await hass_ws_client()
+    with patch.object(history, "STREAM_WRITE_TIMEOUT", 0.1), patch.object(
+        history, "_async_send_when_writable", _stalled_client
+    ):
+        await client.send_json(
+            {
+                "id": 1,
+                "type": "history/stream_history_during_period",
+                "start_time": now.isoformat(),
+                "entity_ids": ["light.kitchen"],
+            }
+        )
+        response = await client.receive_json()
+    assert not response["success"]
+    assert response["error"]["message"] == "Timed out streaming history to the client"
+
+
+async def test_fetch_period_api_stream_timeout(
+    hass, recorder_mock, hass_client, caplog
+):
+    """Test the streamed history response is aborted if the client stalls."""
+    now = dt_util.utcnow()
+    await async_setup_component(hass, "history", {})
+    hass.states.async_set("light.kitchen", "on")
+    await async_wait_recording_done(hass)
+    client = await hass_client()
+
+    with patch.object(
+        history,
+        "_run_stream_write",
+        side_effect=HomeAssistantError("Timed out streaming history to the client"),
+    ):
+        response = await client.get(
+            f"/api/history/period/{now.isoformat()}?filter_entity_id=light.kitchen&stream"
+        )
+        assert response.status == HTTPStatus.OK
+        assert await response.read() == b""
+    assert "Aborted streaming history" in caplog.text
+
+
+async def test_fetch_period_api_stream_client_disconnected(
+    hass, recorder_mock, hass_client, caplog
+):
+    """Test the streamed history response stops quietly if the client disconnects."""
+    now = dt_util.utcnow()
+    await async_setup_component(hass, "history", {})
+    hass.states.async_set("light.kitchen", "on")
+    await async_wait_recording_done(hass)
+    client = await hass_client()
+
+    with patch.object(
+        history,
+        "_run_stream_write",
+        side_effect=ConnectionResetError("Cannot write to closing transport"),
+    ):
+        response = await client.get(
+            f"/api/history/period/{now.isoformat()}?filter_entity_id=light.kitchen&stream"
+        )
+        assert response.status == HTTPStatus.OK
+        assert await response.read() == b""
+    assert "Aborted streaming history" not in caplog.text
+    assert "Error handling request" not in caplog.text
+
+
+async def test_fetch_period_api_columnar(hass, recorder_mock, hass_client):
+    """Test the fetch period view with columnar output."""
+    now = dt_util.utcnow()
+    await async_setup_component(hass, "history", {})
+
+    for state in ("0", "50", "unknown"):
+        hass.states.async_set("sensor.power", state, {"attr": "any"})
+        await async_wait_recording_done(hass)
+    last_changed = hass.states.get("sensor.power").last_changed.timestamp()
+    client = await hass_client()
+    url = f"/api/history/period/{now.isoformat()}?filter_entity_id=sensor.power"
+
+    response = await client.get(f"{url}&columnar")
+    assert response.status == HTTPStatus.OK
+    response_json = await response.json()
+    assert list(response_json) == ["sensor.power"]
+    assert response_json["sensor.power"]["state"] == ["0", "50", "unknown"]
+    assert response_json["sensor.power"]["last_changed"][-1] == last_changed
+
+    response = await client.get(f"{url}&columnar&numeric")
+    assert response.status == HTTPStatus.OK
+    response_json = await response.json()
+    assert response_json["sensor.power"]["state"] == [0.0, 50.0, None]
+
+    future = (now + timedelta(days=1)).isoformat()
+    response = await client.get(f"/api/history/period/{future}?columnar")
+    assert response.status == HTTPStatus.OK
+    assert await response.json() == {}
+
+
+async def test_stream_history_during_period_columnar(
+    hass, hass_ws_client, recorder_mock
+):
+    """Test the websocket history stream with columnar output."""
+    now = dt_util.utcnow()
+    await async_setup_component(hass, "history", {})
+
+    for state in ("1", "2"):
+        hass.states.async_set("sensor.power", state)
+        await async_wait_recording_done(hass)
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "history/stream_history_during_period",
+            "start_time": now.isoformat(),
+            "entity_ids": ["sensor.power"],
+            "columnar": True,
+            "numeric": True,
+        }
+    )
+    response = await client.receive_json()
+    assert response["type"] == "event"
+    assert response["event"]["entity_id"] == "sensor.power"
+    assert response["event"]["state"] == [1.0, 2.0]
+    assert len(response["event"]["last_changed"]) == 2
+    response = await client.receive_json()
+    assert response["success"]
+
+
+async def test_stream_history_during_period_bad_start_time(
+    hass, hass_ws_client, recorder_mock
+):
+    """Test stream_history_during_period with an invalid start_time."""
+    await async_setup_component(hass, "history", {})
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "history/stream_history_during_period",
+            "start_time": "cats",
+        }
+    )
+    response = await client.receive_json()
+    assert not response["success"]
+    assert response["error"]["code"] == "invalid_start_time"
+
+
 async def test_fetch_period_api_with_no_timestamp(hass, hass_client, recorder_mock):
     """Test the fetch period view for history with no timestamp."""
     await async_setup_component(hass, "history", {})
@@ -926,6 +1172,80 @@ async def test_statistics_during_period(
     }
 
 
+@pytest.mark.parametrize(
+    "units, attributes, state, value",
+    [
+        (IMPERIAL_SYSTEM, POWER_SENSOR_ATTRIBUTES, 10, 10000),
+        (IMPERIAL_SYSTEM, TEMPERATURE_SENSOR_ATTRIBUTES, 10, 50),
+        (METRIC_SYSTEM, PRESSURE_SENSOR_ATTRIBUTES, 1000, 100000),
+    ],
+)
+async def test_statistics_during_period_columns(
+    hass, hass_ws_client, recorder_mock, units, attributes, state, value
+):
+    """Test statistics_during_period_columns."""
+    now = dt_util.utcnow()
+
+    hass.config.units = units
+    await async_setup_component(hass, "history", {})
+    await async_setup_component(hass, "sensor", {})
+    await async_recorder_block_till_done(hass)
+    hass.states.async_set("sensor.test", state, attributes=attributes)
+    await async_wait_recording_done(hass)
+
+    do_adhoc_statistics(hass, start=now)
+    await async_wait_recording_done(hass)
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "history/statistics_during_period_columns",
+            "start_time": now.isoformat(),
+            "end_time": now.isoformat(),
+            "statistic_ids": ["sensor.test"],
+            "period": "hour",
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["result"] == {}
+
+    await client.send_json(
+        {
+            "id": 2,
+            "type": "history/statistics_during_period_columns",
+            "start_time": now.isoformat(),
+            "statistic_ids": ["sensor.test"],
+            "period": "5minute",
+            "types": ["mean", "max"],
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["result"] == {
+        "sensor.test": {
+            "start": [approx(now.timestamp())],
+            "end": [approx((now + timedelta(minutes=5)).timestamp())],
+            "mean": [approx(value)],
+            "max": [approx(value)],
+        }
+    }
+
+    await client.send_json(
+        {
+            "id": 3,
+            "type": "history/statistics_during_period_columns",
+            "start_time": "cats",
+            "statistic_ids": ["sensor.test"],
+            "period": "day",
+        }
+    )
+    response = await client.receive_json()
+    assert not response["success"]
+    assert response["error"]["code"] == "invalid_start_time"
+
+
 async def test_statistics_during_period_bad_start_time(
     hass, hass_ws_client, recorder_mock
 ):
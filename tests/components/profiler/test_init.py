@@ -4,17 +4,22 @@ import os
 from unittest.mock import patch
 
 from homeassistant.components.profiler import (
+    CONF_SAMPLE_INTERVAL,
     CONF_SECONDS,
     SERVICE_DUMP_LOG_OBJECTS,
     SERVICE_LOG_EVENT_LOOP_SCHEDULED,
     SERVICE_LOG_THREAD_FRAMES,
     SERVICE_MEMORY,
     SERVICE_START,
+    SERVICE_START_LISTENER_STATS,
     SERVICE_START_LOG_OBJECTS,
+    SERVICE_STOP_LISTENER_STATS,
     SERVICE_STOP_LOG_OBJECTS,
 )
 from homeassistant.components.profiler.const import DOMAIN
 from homeassistant.const import CONF_SCAN_INTERVAL, CONF_TYPE
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_call_later
 import homeassistant.util.dt as dt_util
 
 from tests.common import MockConfigEntry, async_fire_time_changed
@@ -186,11 +191,72 @@ async def test_log_scheduled(hass, caplog):
 
     assert hass.services.has_service(DOMAIN, SERVICE_LOG_EVENT_LOOP_SCHEDULED)
 
+    async_call_later(hass, 60, callback(lambda _: None))
     await hass.services.async_call(DOMAIN, SERVICE_LOG_EVENT_LOOP_SCHEDULED, {})
     await hass.async_block_till_done()
 
     assert "Scheduled" in caplog.text
+    assert "Scheduled at" in caplog.text
     caplog.clear()
 
     assert await hass.config_entries.async_unload(entry.entry_id)
     await hass.async_block_till_done()
+
+
+async def test_listener_stats(hass, hass_ws_client):
+    """Test we can time the event listeners."""
+    entry = MockConfigEntry(domain=DOMAIN, title="Profiler")
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    client = await hass_ws_client(hass)
+    await client.send_json({"id": 1, "type": "profiler/listener_stats"})
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["result"] == {"running": False}
+    assert hass.states.get("sensor.profiler_listener_calls").state == "unknown"
+
+    @callback
+    def _listener(event):
+        """Handle the test event."""
+
+    hass.bus.async_listen("test_event", _listener)
+
+    await hass.services.async_call(
+        DOMAIN, SERVICE_START_LISTENER_STATS, {CONF_SAMPLE_INTERVAL: 2}, blocking=True
+    )
+    for _ in range(10):
+        hass.bus.async_fire("test_event")
+    await hass.async_block_till_done()
+
+    await client.send_json({"id": 2, "type": "profiler/listener_stats"})
+    response = await client.receive_json()
+    assert response["success"]
+    result = response["result"]
+    assert result["running"] is True
+    assert result["sample_interval"] == 2
+    listener = next(
+        listener
+        for listener in result["listeners"]
+        if listener["listener"].endswith("test_listener_stats.<locals>._listener")
+    )
+    assert listener["calls"] == 5
+    assert listener["integration"] == "tests"
+    assert listener["p99_ms"] >= 0
+    assert result["integrations"]["tests"]["calls"] == 5
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=31))
+    await hass.async_block_till_done()
+    assert int(hass.states.get("sensor.profiler_listener_calls").state) >= 5
+
+    await hass.services.async_call(
+        DOMAIN, SERVICE_STOP_LISTENER_STATS, {}, blocking=True
+    )
+    await client.send_json({"id": 3, "type": "profiler/listener_stats"})
+    response = await client.receive_json()
+    assert response["result"] == {"running": False}
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
@@ -17,6 +17,7 @@ from homeassistant.components.recorder.models import (
     RecorderRuns,
     StateAttributes,
     States,
+    StatesMeta,
     process_timestamp,
 )
 from homeassistant.components.recorder.util import session_scope
@@ -61,15 +62,18 @@ def _add_db_entries(
                     event_data="{}",
                     origin="LOCAL",
                     time_fired=point,
+                    time_fired_ts=point.timestamp(),
                 )
             )
             session.add(
                 States(
-                    entity_id=entity_id,
+                    states_meta_rel=StatesMeta(entity_id=entity_id),
                     state="on",
                     attributes='{"name":"the light"}',
                     last_changed=point,
                     last_updated=point,
+                    last_changed_ts=point.timestamp(),
+                    last_updated_ts=point.timestamp(),
                     event_id=1001 + idx,
                     attributes_id=1002 + idx,
                 )
@@ -394,6 +398,34 @@ def test_get_significant_states_minimal_response(hass_recorder):
     assert states == hist
 
 
+@pytest.mark.parametrize("minimal_response", [False, True])
+@pytest.mark.parametrize("entity_ids", [None, ["media_player.test"]])
+def test_stream_significant_states(hass_recorder, minimal_response, entity_ids):
+    """Test streaming yields the same states as get_significant_states."""
+    hass = hass_recorder()
+    zero, four, _ = record_states(hass)
+    expected = history.get_significant_states(
+        hass, zero, four, entity_ids, minimal_response=minimal_response
+    )
+
+    with patch.object(history, "STREAM_BATCH_SIZE", 2), session_scope(
+        hass=hass
+    ) as session:
+        streamed = list(
+            history.stream_significant_states_with_session(
+                hass,
+                session,
+                zero,
+                four,
+                entity_ids,
+                minimal_response=minimal_response,
+            )
+        )
+
+    assert [entity_id for entity_id, _ in streamed] == sorted(expected)
+    assert dict(streamed) == expected
+
+
 def test_get_significant_states_with_initial(hass_recorder):
     """Test that only significant states are returned.
 
@@ -774,3 +806,48 @@ async def test_get_states_query_during_migration_to_schema_25_multiple_entities(
         )
         assert hist[0].attributes == {"name": "the light"}
         assert hist[1].attributes == {"name": "the light"}
+
+
+def test_get_significant_states_columns(hass_recorder):
+    """Test columnar states skip repeated states and can be parsed as floats."""
+    hass = hass_recorder()
+    start = dt_util.utcnow()
+    times = []
+    for state in ("1.5", "1.5", "unavailable", "2", "nan"):
+        hass.states.set("sensor.power", state, {"changed": len(times)})
+        wait_recording_done(hass)
+        times.append(hass.states.get("sensor.power").last_changed.timestamp())
+    hass.states.set("sensor.other", "on")
+    wait_recording_done(hass)
+    other_changed = hass.states.get("sensor.other").last_changed.timestamp()
+    end = dt_util.utcnow() + timedelta(seconds=1)
+
+    with session_scope(hass=hass) as session:
+        columns = history.get_significant_states_columns_with_session(
+            hass, session, start, end
+        )
+        numeric_columns = history.get_significant_states_columns_with_session(
+            hass, session, start, end, ["sensor.power"], numeric=True
+        )
+
+    assert columns == {
+        "sensor.other": {"last_changed": [other_changed], "state": ["on"]},
+        "sensor.power": {
+            "last_changed": [times[0], times[2], times[3], times[4]],
+            "state": ["1.5", "unavailable", "2", "nan"],
+        },
+    }
+    assert numeric_columns == {
+        "sensor.power": {
+            "last_changed": [times[0], times[2], times[3], times[4]],
+            "state": [1.5, None, 2.0, None],
+        }
+    }
+
+    with session_scope(hass=hass) as session:
+        columns = history.get_significant_states_columns_with_session(
+            hass, session, end, end + timedelta(seconds=1), ["sensor.power"]
+        )
+    assert columns == {
+        "sensor.power": {"last_changed": [end.timestamp()], "state": ["nan"]}
+    }
@@ -16,6 +16,7 @@ from homeassistant.components import recorder
 from homeassistant.components.recorder import (
     CONF_AUTO_PURGE,
     CONF_AUTO_REPACK,
+    CONF_BATCHED_WRITES,
     CONF_COMMIT_INTERVAL,
     CONF_DB_URL,
     CONFIG_SCHEMA,
@@ -29,9 +30,11 @@ from homeassistant.components.recorder.models import (
     SCHEMA_VERSION,
     EventData,
     Events,
+    EventTypes,
     RecorderRuns,
     StateAttributes,
     States,
+    StatesMeta,
     StatisticsRuns,
     process_timestamp,
 )
@@ -83,6 +86,7 @@ def _default_recorder(hass):
         entity_filter=CONFIG_SCHEMA({DOMAIN: {}}),
         exclude_t=[],
         exclude_attributes_by_domain={},
+        batched_writes=False,
     )
 
 
@@ -215,6 +219,84 @@ async def test_saving_many_states(
         assert db_states[0].event_id is None
 
 
+async def test_saving_state_reuses_unchanged_shared_attrs(
+    hass: HomeAssistant, recorder_mock
+):
+    """Test attributes are only serialized again when they change."""
+    entity_id = "test.recorder"
+
+    with patch.object(
+        StateAttributes,
+        "shared_attrs_from_event",
+        wraps=StateAttributes.shared_attrs_from_event,
+    ) as shared_attrs_from_event:
+        hass.states.async_set(entity_id, "on", {"test_attr": 5})
+        hass.states.async_set(entity_id, "off", {"test_attr": 5})
+        hass.states.async_set(entity_id, "on", {"test_attr": 5})
+        await async_wait_recording_done(hass)
+        assert len(shared_attrs_from_event.mock_calls) == 1
+
+        hass.states.async_set(entity_id, "on", {"test_attr": 6})
+        await async_wait_recording_done(hass)
+        assert len(shared_attrs_from_event.mock_calls) == 2
+
+    with session_scope(hass=hass) as session:
+        attributes = [
+            db_state_attributes.to_native()
+            for _, db_state_attributes in session.query(States, StateAttributes)
+            .outerjoin(
+                StateAttributes,
+                States.attributes_id == StateAttributes.attributes_id,
+            )
+            .order_by(States.state_id)
+        ]
+    assert attributes == [
+        {"test_attr": 5},
+        {"test_attr": 5},
+        {"test_attr": 5},
+        {"test_attr": 6},
+    ]
+
+
+async def test_saving_states_and_events_share_lookup_rows(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test entity_ids and event types are stored once in their lookup tables."""
+    await async_setup_recorder_instance(hass)
+
+    for state in ("on", "off", "on"):
+        hass.states.async_set("test.recorder", state)
+        hass.bus.async_fire("test_event")
+        await async_wait_recording_done(hass)
+    hass.states.async_set("test.other", "on")
+    await async_wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        states_meta = session.query(StatesMeta).all()
+        assert sorted(meta.entity_id for meta in states_meta) == [
+            "test.other",
+            "test.recorder",
+        ]
+        assert (
+            session.query(EventTypes)
+            .filter(EventTypes.event_type == "test_event")
+            .count()
+            == 1
+        )
+        db_states = session.query(States).all()
+        assert len(db_states) == 4
+        assert all(db_state.entity_id is None for db_state in db_states)
+        assert len({db_state.metadata_id for db_state in db_states}) == 2
+        db_events = (
+            session.query(Events)
+            .join(EventTypes)
+            .filter(EventTypes.event_type == "test_event")
+            .all()
+        )
+        assert len(db_events) == 3
+        assert all(db_event.event_type is None for db_event in db_events)
+
+
 async def test_saving_state_with_intermixed_time_changes(
     hass: HomeAssistant, recorder_mock
 ):
@@ -375,7 +457,8 @@ def test_saving_event(hass, hass_recorder):
     with session_scope(hass=hass) as session:
         for select_event, event_data in (
             session.query(Events, EventData)
-            .filter_by(event_type=event_type)
+            .join(EventTypes)
+            .filter(EventTypes.event_type == event_type)
             .outerjoin(EventData, Events.data_id == EventData.data_id)
         ):
             select_event = cast(Events, select_event)
@@ -610,11 +693,11 @@ def test_saving_state_and_removing_entity(hass, hass_recorder):
     with session_scope(hass=hass) as session:
         states = list(session.query(States))
         assert len(states) == 3
-        assert states[0].entity_id == entity_id
+        assert states[0].states_meta_rel.entity_id == entity_id
         assert states[0].state == STATE_LOCKED
-        assert states[1].entity_id == entity_id
+        assert states[1].states_meta_rel.entity_id == entity_id
         assert states[1].state == STATE_UNLOCKED
-        assert states[2].entity_id == entity_id
+        assert states[2].states_meta_rel.entity_id == entity_id
         assert states[2].state is None
 
 
@@ -1014,10 +1097,10 @@ def test_saving_sets_old_state(hass_recorder):
         states = list(session.query(States))
         assert len(states) == 4
 
-        assert states[0].entity_id == "test.one"
-        assert states[1].entity_id == "test.two"
-        assert states[2].entity_id == "test.one"
-        assert states[3].entity_id == "test.two"
+        assert states[0].states_meta_rel.entity_id == "test.one"
+        assert states[1].states_meta_rel.entity_id == "test.two"
+        assert states[2].states_meta_rel.entity_id == "test.one"
+        assert states[3].states_meta_rel.entity_id == "test.two"
 
         assert states[0].old_state_id is None
         assert states[1].old_state_id is None
@@ -1041,8 +1124,8 @@ def test_saving_state_with_serializable_data(hass_recorder, caplog):
         states = list(session.query(States))
         assert len(states) == 2
 
-        assert states[0].entity_id == "test.two"
-        assert states[1].entity_id == "test.two"
+        assert states[0].states_meta_rel.entity_id == "test.two"
+        assert states[1].states_meta_rel.entity_id == "test.two"
         assert states[0].old_state_id is None
         assert states[1].old_state_id == states[0].state_id
 
@@ -1090,7 +1173,11 @@ def test_service_disable_events_not_recording(hass, hass_recorder):
     event = events[0]
 
     with session_scope(hass=hass) as session:
-        db_events = list(session.query(Events).filter_by(event_type=event_type))
+        db_events = list(
+            session.query(Events)
+            .join(EventTypes)
+            .filter(EventTypes.event_type == event_type)
+        )
         assert len(db_events) == 0
 
     assert hass.services.call(
@@ -1112,7 +1199,8 @@ def test_service_disable_events_not_recording(hass, hass_recorder):
     with session_scope(hass=hass) as session:
         for select_event, event_data in (
             session.query(Events, EventData)
-            .filter_by(event_type=event_type)
+            .join(EventTypes)
+            .filter(EventTypes.event_type == event_type)
             .outerjoin(EventData, Events.data_id == EventData.data_id)
         ):
             select_event = cast(Events, select_event)
@@ -1302,7 +1390,11 @@ def test_entity_id_filter(hass_recorder):
         wait_recording_done(hass)
 
         with session_scope(hass=hass) as session:
-            db_events = list(session.query(Events).filter_by(event_type="hello"))
+            db_events = list(
+                session.query(Events)
+                .join(EventTypes)
+                .filter(EventTypes.event_type == "hello")
+            )
             assert len(db_events) == idx + 1, data
 
     for data in (
@@ -1313,7 +1405,11 @@ def test_entity_id_filter(hass_recorder):
         wait_recording_done(hass)
 
         with session_scope(hass=hass) as session:
-            db_events = list(session.query(Events).filter_by(event_type="hello"))
+            db_events = list(
+                session.query(Events)
+                .join(EventTypes)
+                .filter(EventTypes.event_type == "hello")
+            )
             # Keep referring idx + 1, as no new events are being added
             assert len(db_events) == idx + 1, data
 
@@ -1346,14 +1442,22 @@ async def test_database_lock_and_unlock(
         await asyncio.wait_for(asyncio.shield(task), timeout=1)
 
     with session_scope(hass=hass) as session:
-        db_events = list(session.query(Events).filter_by(event_type=event_type))
+        db_events = list(
+            session.query(Events)
+            .join(EventTypes)
+            .filter(EventTypes.event_type == event_type)
+        )
         assert len(db_events) == 0
 
     assert instance.unlock_database()
 
     await task
     with session_scope(hass=hass) as session:
-        db_events = list(session.query(Events).filter_by(event_type=event_type))
+        db_events = list(
+            session.query(Events)
+            .join(EventTypes)
+            .filter(EventTypes.event_type == event_type)
+        )
         assert len(db_events) == 1
 
 
@@ -1385,7 +1489,11 @@ async def test_database_lock_and_overflow(
         await async_wait_recording_done(hass)
 
         with session_scope(hass=hass) as session:
-            db_events = list(session.query(Events).filter_by(event_type=event_type))
+            db_events = list(
+                session.query(Events)
+                .join(EventTypes)
+                .filter(EventTypes.event_type == event_type)
+            )
             assert len(db_events) == 1
 
         assert not instance.unlock_database()
@@ -1485,7 +1593,8 @@ def test_deduplication_event_data_inside_commit_interval(hass_recorder, caplog):
     with session_scope(hass=hass) as session:
         events = list(
             session.query(Events)
-            .filter(Events.event_type == "this_event")
+            .join(EventTypes)
+            .filter(EventTypes.event_type == "this_event")
             .outerjoin(EventData, (Events.data_id == EventData.data_id))
         )
         assert len(events) == 20
@@ -1520,7 +1629,8 @@ def test_deduplication_state_attributes_inside_commit_interval(hass_recorder, ca
     with session_scope(hass=hass) as session:
         states = list(
             session.query(States)
-            .filter(States.entity_id == entity_id)
+            .join(StatesMeta)
+            .filter(StatesMeta.entity_id == entity_id)
             .outerjoin(
                 StateAttributes, (States.attributes_id == StateAttributes.attributes_id)
             )
@@ -1529,3 +1639,132 @@ def test_deduplication_state_attributes_inside_commit_interval(hass_recorder, ca
         first_attributes_id = states[0].attributes_id
         last_attributes_id = states[-1].attributes_id
         assert first_attributes_id == last_attributes_id
+
+
+def test_batched_writes_sets_old_state(hass_recorder):
+    """Test batched writes link old states inside and across commits."""
+    hass = hass_recorder({CONF_COMMIT_INTERVAL: 1, CONF_BATCHED_WRITES: True})
+    assert get_instance(hass)._bulk_inserter is not None
+
+    hass.states.set("test.one", "on", {"attr": 1})
+    hass.states.set("test.two", "on", {})
+    hass.states.set("test.one", "off", {"attr": 1})
+    wait_recording_done(hass)
+    hass.states.set("test.one", "on", {"attr": 2})
+    hass.states.set("test.two", "off", {})
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        states = list(session.query(States).order_by(States.state_id))
+        assert len(states) == 5
+
+        assert [state.states_meta_rel.entity_id for state in states] == [
+            "test.one",
+            "test.two",
+            "test.one",
+            "test.one",
+            "test.two",
+        ]
+        assert [state.state for state in states] == ["on", "on", "off", "on", "off"]
+
+        assert states[0].old_state_id is None
+        assert states[1].old_state_id is None
+        assert states[2].old_state_id == states[0].state_id
+        assert states[3].old_state_id == states[2].state_id
+        assert states[4].old_state_id == states[1].state_id
+
+        assert states[0].attributes_id == states[2].attributes_id
+        assert states[0].attributes_id != states[3].attributes_id
+        attributes = {
+            attributes.attributes_id: attributes.to_native()
+            for attributes in session.query(StateAttributes)
+        }
+        assert attributes[states[0].attributes_id] == {"attr": 1}
+        assert attributes[states[3].attributes_id] == {"attr": 2}
+        assert attributes[states[1].attributes_id] == {}
+
+
+def test_batched_writes_events_and_removed_entity(hass_recorder):
+    """Test batched writes save events and removed entities."""
+    hass = hass_recorder({CONF_COMMIT_INTERVAL: 1, CONF_BATCHED_WRITES: True})
+
+    for _ in range(3):
+        hass.bus.fire("this_event", {"de": "dupe"})
+    hass.bus.fire("empty_event")
+    hass.states.set("lock.mine", STATE_LOCKED)
+    hass.states.remove("lock.mine")
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        events = list(
+            session.query(Events, EventData)
+            .join(EventTypes)
+            .filter(EventTypes.event_type.in_(["this_event", "empty_event"]))
+            .outerjoin(EventData, Events.data_id == EventData.data_id)
+            .order_by(Events.event_id)
+        )
+        assert len(events) == 4
+        for event, event_data in events[:3]:
+            assert event.data_id == events[0][0].data_id
+            assert event_data.to_native() == {"de": "dupe"}
+        assert events[3][0].data_id is None
+
+        states = list(session.query(States).order_by(States.state_id))
+        assert len(states) == 2
+        assert states[0].state == STATE_LOCKED
+        assert states[1].state is None
+        assert states[1].old_state_id == states[0].state_id
+
+    assert "lock.mine" not in get_instance(hass)._old_states
+
+
+async def test_read_session_uses_read_engine(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT, tmp_path
+):
+    """Test read only queries use a separate engine and executor for sqlite files."""
+    config = {
+        recorder.CONF_COMMIT_INTERVAL: 0,
+        recorder.CONF_DB_URL: "sqlite:///" + str(tmp_path / "pytest.db"),
+    }
+    await async_setup_recorder_instance(hass, config)
+    await hass.async_block_till_done()
+
+    instance: Recorder = hass.data[DATA_INSTANCE]
+    assert instance.read_engine is not None
+    assert instance.read_engine is not instance.engine
+
+    hass.states.async_set("sensor.reader", "on")
+    await async_wait_recording_done(hass)
+
+    def _read_states():
+        with session_scope(hass=hass, read_only=True) as session:
+            assert session.get_bind() is instance.read_engine
+            states = list(
+                session.query(States.state)
+                .join(StatesMeta)
+                .filter(StatesMeta.entity_id == "sensor.reader")
+            )
+        return threading.current_thread().name, states
+
+    thread_name, states = await instance.async_add_read_executor_job(_read_states)
+    assert thread_name.startswith(recorder.const.DB_READER_PREFIX)
+    assert [state.state for state in states] == ["on"]
+
+
+async def test_read_session_falls_back_without_read_engine(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test read only queries use the recorder engine for in memory databases."""
+    await async_setup_recorder_instance(hass)
+    await hass.async_block_till_done()
+
+    instance: Recorder = hass.data[DATA_INSTANCE]
+    assert instance.read_engine is None
+
+    def _read_bind():
+        with session_scope(hass=hass, read_only=True) as session:
+            return threading.current_thread().name, session.get_bind()
+
+    thread_name, bind = await instance.async_add_read_executor_job(_read_bind)
+    assert thread_name.startswith(recorder.const.DB_WORKER_PREFIX)
+    assert bind is instance.engine
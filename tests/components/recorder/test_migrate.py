@@ -26,6 +26,7 @@ from homeassistant.components.recorder.models import (
     SCHEMA_VERSION,
     RecorderRuns,
     States,
+    StatesMeta,
 )
 from homeassistant.components.recorder.util import session_scope
 import homeassistant.util.dt as dt_util
@@ -39,7 +40,9 @@ def _get_native_states(hass, entity_id):
     with session_scope(hass=hass) as session:
         return [
             state.to_native()
-            for state in session.query(States).filter(States.entity_id == entity_id)
+            for state in session.query(States)
+            .join(StatesMeta)
+            .filter(StatesMeta.entity_id == entity_id)
         ]
 
 
@@ -388,6 +391,35 @@ def test_forgiving_add_index():
         migration._create_index(instance.get_session, "states", "ix_states_context_id")
 
 
+def test_migrate_columns_to_timestamp():
+    """Test the epoch timestamp columns are backfilled from the datetime columns."""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    models.Base.metadata.create_all(engine)
+    point = datetime.datetime(2022, 5, 10, 12, 30, 15, 123456, tzinfo=dt_util.UTC)
+    later = point + datetime.timedelta(minutes=1)
+    with Session(engine) as session:
+        session.add(models.Events(event_type="test", time_fired=point))
+        session.add(
+            States(entity_id="sensor.one", last_changed=point, last_updated=later)
+        )
+        session.add(
+            States(entity_id="sensor.two", last_changed=later, last_updated=later)
+        )
+        session.commit()
+
+    with patch.object(migration, "MIGRATION_CHUNK_SIZE", 1):
+        migration._migrate_columns_to_timestamp(lambda: Session(engine), engine)
+
+    with Session(engine) as session:
+        event = session.query(models.Events).one()
+        assert event.time_fired_ts == point.timestamp()
+        states = session.query(States).order_by(States.state_id).all()
+        assert states[0].last_changed_ts == point.timestamp()
+        assert states[0].last_updated_ts == later.timestamp()
+        assert states[1].last_changed_ts == later.timestamp()
+        assert states[1].last_updated_ts == later.timestamp()
+
+
 @pytest.mark.parametrize(
     "exception_type", [OperationalError, ProgrammingError, InternalError]
 )
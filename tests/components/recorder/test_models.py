@@ -10,10 +10,13 @@ from homeassistant.components.recorder.models import (
     Base,
     EventData,
     Events,
+    EventTypes,
     LazyState,
     RecorderRuns,
     StateAttributes,
     States,
+    StatesMeta,
+    process_datetime_to_timestamp,
     process_timestamp,
     process_timestamp_to_utc_isoformat,
 )
@@ -28,6 +31,7 @@ def test_from_event_to_db_event():
     event = ha.Event("test_event", {"some_data": 15})
     db_event = Events.from_event(event)
     db_event.event_data = EventData.from_event(event).shared_data
+    db_event.event_type_rel = EventTypes(event_type=event.event_type)
     assert event == db_event.to_native()
 
 
@@ -39,7 +43,9 @@ def test_from_event_to_db_state():
         {"entity_id": "sensor.temperature", "old_state": None, "new_state": state},
         context=state.context,
     )
-    assert state == States.from_event(event).to_native()
+    db_state = States.from_event(event)
+    db_state.states_meta_rel = StatesMeta(entity_id=state.entity_id)
+    assert state == db_state.to_native()
 
 
 def test_from_event_to_db_state_attributes():
@@ -75,7 +81,8 @@ def test_from_event_to_delete_state():
     )
     db_state = States.from_event(event)
 
-    assert db_state.entity_id == "sensor.temperature"
+    # The entity_id is stored in the states_meta table
+    assert db_state.entity_id is None
     assert db_state.state == ""
     assert db_state.last_changed == event.time_fired
     assert db_state.last_updated == event.time_fired
@@ -113,35 +120,39 @@ def test_entity_ids():
 
     session.add(
         States(
-            entity_id="sensor.temperature",
+            states_meta_rel=StatesMeta(entity_id="sensor.temperature"),
             state="20",
             last_changed=before_run,
             last_updated=before_run,
+            last_updated_ts=before_run.timestamp(),
         )
     )
     session.add(
         States(
-            entity_id="sensor.sound",
+            states_meta_rel=StatesMeta(entity_id="sensor.sound"),
             state="10",
             last_changed=after_run,
             last_updated=after_run,
+            last_updated_ts=after_run.timestamp(),
         )
     )
 
     session.add(
         States(
-            entity_id="sensor.humidity",
+            states_meta_rel=StatesMeta(entity_id="sensor.humidity"),
             state="76",
             last_changed=in_run,
             last_updated=in_run,
+            last_updated_ts=in_run.timestamp(),
         )
     )
     session.add(
         States(
-            entity_id="sensor.lux",
+            states_meta_rel=StatesMeta(entity_id="sensor.lux"),
             state="5",
             last_changed=in_run3,
             last_updated=in_run3,
+            last_updated_ts=in_run3.timestamp(),
         )
     )
 
@@ -190,6 +201,18 @@ async def test_process_timestamp():
     assert process_timestamp(None) is None
 
 
+async def test_process_datetime_to_timestamp():
+    """Test processing a database datetime to epoch seconds."""
+    datetime_with_tzinfo = datetime(2016, 7, 9, 11, 0, 0, tzinfo=dt.UTC)
+    datetime_without_tzinfo = datetime(2016, 7, 9, 11, 0, 0)
+    est = dt_util.get_time_zone("US/Eastern")
+    datetime_est_timezone = datetime(2016, 7, 9, 11, 0, 0, tzinfo=est)
+
+    assert process_datetime_to_timestamp(datetime_with_tzinfo) == 1468062000.0
+    assert process_datetime_to_timestamp(datetime_without_tzinfo) == 1468062000.0
+    assert process_datetime_to_timestamp(datetime_est_timezone) == 1468076400.0
+
+
 async def test_process_timestamp_to_utc_isoformat():
     """Test processing time stamp to UTC isoformat."""
     datetime_with_tzinfo = datetime(2016, 7, 9, 11, 0, 0, tzinfo=dt.UTC)
@@ -233,10 +256,13 @@ async def test_event_to_db_model():
     )
     db_event = Events.from_event(event)
     db_event.event_data = EventData.from_event(event).shared_data
+    db_event.event_type_rel = EventTypes(event_type=event.event_type)
     native = db_event.to_native()
     assert native == event
 
-    native = Events.from_event(event).to_native()
+    db_event = Events.from_event(event)
+    db_event.event_type_rel = EventTypes(event_type=event.event_type)
+    native = db_event.to_native()
     event.data = {}
     assert native == event
 
@@ -268,8 +294,8 @@ async def test_lazy_state_handles_different_last_updated_and_last_changed(caplog
         entity_id="sensor.valid",
         state="off",
         shared_attrs='{"shared":true}',
-        last_updated=now,
-        last_changed=now - timedelta(seconds=60),
+        last_updated_ts=now.timestamp(),
+        last_changed_ts=(now - timedelta(seconds=60)).timestamp(),
     )
     lstate = LazyState(row)
     assert lstate.as_dict() == {
@@ -279,8 +305,8 @@ async def test_lazy_state_handles_different_last_updated_and_last_changed(caplog
         "last_updated": "2021-06-12T03:04:01.000323+00:00",
         "state": "off",
     }
-    assert lstate.last_updated == row.last_updated
-    assert lstate.last_changed == row.last_changed
+    assert lstate.last_updated == now
+    assert lstate.last_changed == now - timedelta(seconds=60)
     assert lstate.as_dict() == {
         "attributes": {"shared": True},
         "entity_id": "sensor.valid",
@@ -297,8 +323,8 @@ async def test_lazy_state_handles_same_last_updated_and_last_changed(caplog):
         entity_id="sensor.valid",
         state="off",
         shared_attrs='{"shared":true}',
-        last_updated=now,
-        last_changed=now,
+        last_updated_ts=now.timestamp(),
+        last_changed_ts=now.timestamp(),
     )
     lstate = LazyState(row)
     assert lstate.as_dict() == {
@@ -308,8 +334,8 @@ async def test_lazy_state_handles_same_last_updated_and_last_changed(caplog):
         "last_updated": "2021-06-12T03:04:01.000323+00:00",
         "state": "off",
     }
-    assert lstate.last_updated == row.last_updated
-    assert lstate.last_changed == row.last_changed
+    assert lstate.last_updated == now
+    assert lstate.last_changed == now
     assert lstate.as_dict() == {
         "attributes": {"shared": True},
         "entity_id": "sensor.valid",
@@ -333,3 +359,28 @@ async def test_lazy_state_handles_same_last_updated_and_last_changed(caplog):
         "last_updated": "2020-06-12T03:04:01.000323+00:00",
         "state": "off",
     }
+
+
+async def test_lazy_state_last_updated_timestamp():
+    """Test the LazyState last_updated_timestamp."""
+    now = datetime(2021, 6, 12, 3, 4, 1, 323, tzinfo=dt_util.UTC)
+    row = PropertyMock(
+        entity_id="sensor.valid",
+        state="off",
+        shared_attrs="{}",
+        last_updated_ts=now.timestamp(),
+        last_changed_ts=(now - timedelta(seconds=60)).timestamp(),
+    )
+    lstate = LazyState(row)
+    assert lstate.last_updated_timestamp == now.timestamp()
+    lstate.last_updated = now + timedelta(seconds=5)
+    assert lstate.last_updated_timestamp == (now + timedelta(seconds=5)).timestamp()
+
+    row = PropertyMock(
+        entity_id="sensor.valid",
+        state="off",
+        shared_attrs="{}",
+        last_updated_ts=None,
+        last_changed_ts=now.timestamp(),
+    )
+    assert LazyState(row).last_updated_timestamp == now.timestamp()
@@ -1,7 +1,9 @@
 """Test data purging."""
+from collections import Counter
 from datetime import datetime, timedelta
 import json
 import sqlite3
+from typing import Any
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -9,16 +11,24 @@ from sqlalchemy.exc import DatabaseError, OperationalError
 from sqlalchemy.orm.session import Session
 
 from homeassistant.components import recorder
-from homeassistant.components.recorder.const import MAX_ROWS_TO_PURGE, SupportedDialect
+from homeassistant.components.recorder.const import (
+    MAX_ROWS_TO_PURGE,
+    PURGE_PROGRESS_SAVE_DELAY,
+    PURGE_PROGRESS_STORAGE_KEY,
+    PURGE_PROGRESS_STORAGE_VERSION,
+    SupportedDialect,
+)
 from homeassistant.components.recorder.models import (
     Events,
+    EventTypes,
     RecorderRuns,
     StateAttributes,
     States,
+    StatesMeta,
     StatisticsRuns,
     StatisticsShortTerm,
 )
-from homeassistant.components.recorder.purge import purge_old_data
+from homeassistant.components.recorder.purge import PurgeProgress, purge_old_data
 from homeassistant.components.recorder.services import (
     SERVICE_PURGE,
     SERVICE_PURGE_ENTITIES,
@@ -36,7 +46,7 @@ from .common import (
     async_wait_recording_done,
 )
 
-from tests.common import SetupRecorderInstanceT
+from tests.common import SetupRecorderInstanceT, async_fire_time_changed
 
 
 @pytest.fixture(name="use_sqlite")
@@ -69,7 +79,11 @@ async def test_purge_old_states(
         assert states[5].old_state_id == states[4].state_id
         assert state_attributes.count() == 3
 
-        events = session.query(Events).filter(Events.event_type == "state_changed")
+        events = (
+            session.query(Events)
+            .join(EventTypes)
+            .filter(EventTypes.event_type == "state_changed")
+        )
         assert events.count() == 0
         assert "test.recorder2" in instance._old_states
 
@@ -113,7 +127,11 @@ async def test_purge_old_states(
         assert states[0].old_state_id is None
         assert states[5].old_state_id == states[4].state_id
 
-        events = session.query(Events).filter(Events.event_type == "state_changed")
+        events = (
+            session.query(Events)
+            .join(EventTypes)
+            .filter(EventTypes.event_type == "state_changed")
+        )
         assert events.count() == 0
         assert "test.recorder2" in instance._old_states
 
@@ -217,7 +235,11 @@ async def test_purge_old_events(
     await _add_test_events(hass)
 
     with session_scope(hass=hass) as session:
-        events = session.query(Events).filter(Events.event_type.like("EVENT_TEST%"))
+        events = (
+            session.query(Events)
+            .join(EventTypes)
+            .filter(EventTypes.event_type.like("EVENT_TEST%"))
+        )
         assert events.count() == 6
 
         purge_before = dt_util.utcnow() - timedelta(days=4)
@@ -317,7 +339,11 @@ async def test_purge_method(
         states = session.query(States)
         assert states.count() == 6
 
-        events = session.query(Events).filter(Events.event_type.like("EVENT_TEST%"))
+        events = (
+            session.query(Events)
+            .join(EventTypes)
+            .filter(EventTypes.event_type.like("EVENT_TEST%"))
+        )
         assert events.count() == 6
 
         statistics = session.query(StatisticsShortTerm)
@@ -348,7 +374,11 @@ async def test_purge_method(
 
     with session_scope(hass=hass) as session:
         states = session.query(States)
-        events = session.query(Events).filter(Events.event_type.like("EVENT_TEST%"))
+        events = (
+            session.query(Events)
+            .join(EventTypes)
+            .filter(EventTypes.event_type.like("EVENT_TEST%"))
+        )
         statistics = session.query(StatisticsShortTerm)
 
         # only purged old states, events and statistics
@@ -365,7 +395,11 @@ async def test_purge_method(
 
     with session_scope(hass=hass) as session:
         states = session.query(States)
-        events = session.query(Events).filter(Events.event_type.like("EVENT_TEST%"))
+        events = (
+            session.query(Events)
+            .join(EventTypes)
+            .filter(EventTypes.event_type.like("EVENT_TEST%"))
+        )
         statistics = session.query(StatisticsShortTerm)
         recorder_runs = session.query(RecorderRuns)
         statistics_runs = session.query(StatisticsRuns)
@@ -397,6 +431,118 @@ async def test_purge_method(
     assert "Vacuuming SQL DB to free space" in caplog.text
 
 
+async def test_purge_progress(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: SetupRecorderInstanceT,
+    hass_storage: dict[str, Any],
+):
+    """Test the progress of a purge is tracked per batch and saved until it finishes."""
+    instance = await async_setup_recorder_instance(hass)
+    await _add_test_states(hass)
+    assert instance.purge_progress is None
+
+    purge_before = dt_util.utcnow() - timedelta(days=4)
+    rows_deleted = Counter()
+    assert (
+        purge_old_data(instance, purge_before, repack=False, rows_deleted=rows_deleted)
+        is False
+    )
+    progress = PurgeProgress(purge_before, False, False)
+    instance.purge_progress = progress.with_batch(rows_deleted, False)
+    assert progress.batches == 0
+    assert instance.purge_progress.batches == 1
+    assert instance.purge_progress.finished is None
+    assert instance.purge_progress.rows_deleted == {
+        "states": 4,
+        "state_attributes": 2,
+    }
+
+    instance.async_save_purge_progress()
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=PURGE_PROGRESS_SAVE_DELAY)
+    )
+    await hass.async_block_till_done()
+    assert hass_storage[PURGE_PROGRESS_STORAGE_KEY]["data"] == (
+        instance.purge_progress.as_dict()
+    )
+
+    await hass.services.async_call(
+        recorder.DOMAIN, SERVICE_PURGE, {"keep_days": 4}, blocking=True
+    )
+    await async_recorder_block_till_done(hass)
+    await async_wait_purge_done(hass)
+
+    progress = instance.purge_progress
+    assert progress.finished is not None
+    assert progress.batches == 1
+    assert progress.rows_deleted == {}
+
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=PURGE_PROGRESS_SAVE_DELAY)
+    )
+    await hass.async_block_till_done()
+    assert hass_storage[PURGE_PROGRESS_STORAGE_KEY]["data"] is None
+
+
+async def test_purge_progress_not_counted_when_rolled_back(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: SetupRecorderInstanceT,
+):
+    """Test rows of a batch which fails are not added to the rows deleted."""
+    instance = await async_setup_recorder_instance(hass)
+    await _add_test_states(hass)
+
+    mysql_exception = OperationalError("statement", {}, [])
+    mysql_exception.orig = MagicMock(args=(1205, "retryable"))
+
+    purge_before = dt_util.utcnow() - timedelta(days=4)
+    rows_deleted = Counter()
+    with patch("homeassistant.components.recorder.util.time.sleep"), patch(
+        "homeassistant.components.recorder.purge._select_unused_attributes_ids",
+        side_effect=mysql_exception,
+    ), patch.object(instance.engine.dialect, "name", "mysql"):
+        assert (
+            purge_old_data(
+                instance, purge_before, repack=False, rows_deleted=rows_deleted
+            )
+            is False
+        )
+    assert rows_deleted == {}
+
+    assert (
+        purge_old_data(instance, purge_before, repack=False, rows_deleted=rows_deleted)
+        is False
+    )
+    assert rows_deleted == {"states": 4, "state_attributes": 2}
+
+
+async def test_purge_resumes_after_restart(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: SetupRecorderInstanceT,
+    hass_storage: dict[str, Any],
+):
+    """Test an unfinished purge is queued again when the recorder starts."""
+    purge_before = dt_util.utcnow() - timedelta(days=4)
+    saved_progress = PurgeProgress(
+        purge_before, False, False, batches=3, rows_deleted=Counter(states=2994)
+    )
+    hass_storage[PURGE_PROGRESS_STORAGE_KEY] = {
+        "version": PURGE_PROGRESS_STORAGE_VERSION,
+        "key": PURGE_PROGRESS_STORAGE_KEY,
+        "data": saved_progress.as_dict(),
+    }
+
+    instance = await async_setup_recorder_instance(hass)
+    await async_recorder_block_till_done(hass)
+    await async_wait_purge_done(hass)
+
+    progress = instance.purge_progress
+    assert progress.purge_before == purge_before
+    assert progress.finished is not None
+    assert progress.batches == 4
+    assert progress.rows_deleted == {"states": 2994}
+
+
 @pytest.mark.parametrize("use_sqlite", (True, False), indirect=True)
 async def test_purge_edge_case(
     hass: HomeAssistant,
@@ -410,7 +556,7 @@ async def test_purge_edge_case(
             session.add(
                 Events(
                     event_id=1001,
-                    event_type="EVENT_TEST_PURGE",
+                    event_type_rel=_get_event_type(session, "EVENT_TEST_PURGE"),
                     event_data="{}",
                     origin="LOCAL",
                     time_fired=timestamp,
@@ -418,7 +564,7 @@ async def test_purge_edge_case(
             )
             session.add(
                 States(
-                    entity_id="test.recorder2",
+                    states_meta_rel=_get_states_meta(session, "test.recorder2"),
                     state="purgeme",
                     attributes="{}",
                     last_changed=timestamp,
@@ -449,7 +595,11 @@ async def test_purge_edge_case(
         state_attributes = session.query(StateAttributes)
         assert state_attributes.count() == 1
 
-        events = session.query(Events).filter(Events.event_type == "EVENT_TEST_PURGE")
+        events = (
+            session.query(Events)
+            .join(EventTypes)
+            .filter(EventTypes.event_type == "EVENT_TEST_PURGE")
+        )
         assert events.count() == 1
 
     await hass.services.async_call(recorder.DOMAIN, SERVICE_PURGE, service_data)
@@ -461,7 +611,11 @@ async def test_purge_edge_case(
     with session_scope(hass=hass) as session:
         states = session.query(States)
         assert states.count() == 0
-        events = session.query(Events).filter(Events.event_type == "EVENT_TEST_PURGE")
+        events = (
+            session.query(Events)
+            .join(EventTypes)
+            .filter(EventTypes.event_type == "EVENT_TEST_PURGE")
+        )
         assert events.count() == 0
 
 
@@ -479,7 +633,7 @@ async def test_purge_cutoff_date(
             session.add(
                 Events(
                     event_id=1000,
-                    event_type="KEEP",
+                    event_type_rel=_get_event_type(session, "KEEP"),
                     event_data="{}",
                     origin="LOCAL",
                     time_fired=timestamp_keep,
@@ -487,7 +641,7 @@ async def test_purge_cutoff_date(
             )
             session.add(
                 States(
-                    entity_id="test.cutoff",
+                    states_meta_rel=_get_states_meta(session, "test.cutoff"),
                     state="keep",
                     attributes="{}",
                     last_changed=timestamp_keep,
@@ -507,7 +661,7 @@ async def test_purge_cutoff_date(
                 session.add(
                     Events(
                         event_id=1000 + row,
-                        event_type="PURGE",
+                        event_type_rel=_get_event_type(session, "PURGE"),
                         event_data="{}",
                         origin="LOCAL",
                         time_fired=timestamp_purge,
@@ -515,7 +669,7 @@ async def test_purge_cutoff_date(
                 )
                 session.add(
                     States(
-                        entity_id="test.cutoff",
+                        states_meta_rel=_get_states_meta(session, "test.cutoff"),
                         state="purge",
                         attributes="{}",
                         last_changed=timestamp_purge,
@@ -556,8 +710,13 @@ async def test_purge_cutoff_date(
             .count()
             == 1
         )
-        assert events.filter(Events.event_type == "PURGE").count() == rows - 1
-        assert events.filter(Events.event_type == "KEEP").count() == 1
+        assert (
+            events.join(EventTypes).filter(EventTypes.event_type == "PURGE").count()
+            == rows - 1
+        )
+        assert (
+            events.join(EventTypes).filter(EventTypes.event_type == "KEEP").count() == 1
+        )
 
     instance.queue_task(PurgeTask(cutoff, repack=False, apply_filter=False))
     await hass.async_block_till_done()
@@ -586,8 +745,13 @@ async def test_purge_cutoff_date(
             .count()
             == 1
         )
-        assert events.filter(Events.event_type == "PURGE").count() == 0
-        assert events.filter(Events.event_type == "KEEP").count() == 1
+        assert (
+            events.join(EventTypes).filter(EventTypes.event_type == "PURGE").count()
+            == 0
+        )
+        assert (
+            events.join(EventTypes).filter(EventTypes.event_type == "KEEP").count() == 1
+        )
 
     # Make sure we can purge everything
     instance.queue_task(PurgeTask(dt_util.utcnow(), repack=False, apply_filter=False))
@@ -640,7 +804,7 @@ async def test_purge_filtered_states(
             timestamp = dt_util.utcnow() - timedelta(days=1)
             session.add(
                 States(
-                    entity_id="sensor.excluded",
+                    states_meta_rel=_get_states_meta(session, "sensor.excluded"),
                     state="purgeme",
                     attributes="{}",
                     last_changed=timestamp,
@@ -666,7 +830,7 @@ async def test_purge_filtered_states(
                 ),
             )
             state_1 = States(
-                entity_id="sensor.linked_old_state_id",
+                states_meta_rel=_get_states_meta(session, "sensor.linked_old_state_id"),
                 state="keep",
                 attributes="{}",
                 last_changed=timestamp,
@@ -676,7 +840,7 @@ async def test_purge_filtered_states(
             )
             timestamp = dt_util.utcnow() - timedelta(days=4)
             state_2 = States(
-                entity_id="sensor.linked_old_state_id",
+                states_meta_rel=_get_states_meta(session, "sensor.linked_old_state_id"),
                 state="keep",
                 attributes="{}",
                 last_changed=timestamp,
@@ -685,7 +849,7 @@ async def test_purge_filtered_states(
                 state_attributes=state_attrs,
             )
             state_3 = States(
-                entity_id="sensor.linked_old_state_id",
+                states_meta_rel=_get_states_meta(session, "sensor.linked_old_state_id"),
                 state="keep",
                 attributes="{}",
                 last_changed=timestamp,
@@ -698,7 +862,7 @@ async def test_purge_filtered_states(
             session.add(
                 Events(
                     event_id=100,
-                    event_type="EVENT_KEEP",
+                    event_type_rel=_get_event_type(session, "EVENT_KEEP"),
                     event_data="{}",
                     origin="LOCAL",
                     time_fired=timestamp,
@@ -712,10 +876,16 @@ async def test_purge_filtered_states(
         states = session.query(States)
         assert states.count() == 74
 
-        events_state_changed = session.query(Events).filter(
-            Events.event_type == EVENT_STATE_CHANGED
+        events_state_changed = (
+            session.query(Events)
+            .join(EventTypes)
+            .filter(EventTypes.event_type == EVENT_STATE_CHANGED)
+        )
+        events_keep = (
+            session.query(Events)
+            .join(EventTypes)
+            .filter(EventTypes.event_type == "EVENT_KEEP")
         )
-        events_keep = session.query(Events).filter(Events.event_type == "EVENT_KEEP")
         assert events_state_changed.count() == 70
         assert events_keep.count() == 1
 
@@ -729,11 +899,17 @@ async def test_purge_filtered_states(
     with session_scope(hass=hass) as session:
         states = session.query(States)
         assert states.count() == 74
-        events_state_changed = session.query(Events).filter(
-            Events.event_type == EVENT_STATE_CHANGED
+        events_state_changed = (
+            session.query(Events)
+            .join(EventTypes)
+            .filter(EventTypes.event_type == EVENT_STATE_CHANGED)
         )
         assert events_state_changed.count() == 70
-        events_keep = session.query(Events).filter(Events.event_type == "EVENT_KEEP")
+        events_keep = (
+            session.query(Events)
+            .join(EventTypes)
+            .filter(EventTypes.event_type == "EVENT_KEEP")
+        )
         assert events_keep.count() == 1
 
     # Test with 'apply_filter' = True
@@ -750,15 +926,23 @@ async def test_purge_filtered_states(
     with session_scope(hass=hass) as session:
         states = session.query(States)
         assert states.count() == 13
-        events_state_changed = session.query(Events).filter(
-            Events.event_type == EVENT_STATE_CHANGED
+        events_state_changed = (
+            session.query(Events)
+            .join(EventTypes)
+            .filter(EventTypes.event_type == EVENT_STATE_CHANGED)
         )
         assert events_state_changed.count() == 10
-        events_keep = session.query(Events).filter(Events.event_type == "EVENT_KEEP")
+        events_keep = (
+            session.query(Events)
+            .join(EventTypes)
+            .filter(EventTypes.event_type == "EVENT_KEEP")
+        )
         assert events_keep.count() == 1
 
-        states_sensor_excluded = session.query(States).filter(
-            States.entity_id == "sensor.excluded"
+        states_sensor_excluded = (
+            session.query(States)
+            .join(StatesMeta)
+            .filter(StatesMeta.entity_id == "sensor.excluded")
         )
         assert states_sensor_excluded.count() == 0
 
@@ -843,6 +1027,8 @@ async def test_purge_filtered_states_to_empty(
         state_attributes = session.query(StateAttributes)
         assert states.count() == 0
         assert state_attributes.count() == 0
+    assert instance.purge_progress.rows_deleted["states"] == 60
+    assert instance.purge_progress.rows_deleted["state_attributes"] == 60
 
     # Do it again to make sure nothing changes
     # Why do we do this? Should we check the end result?
@@ -870,7 +1056,7 @@ async def test_purge_without_state_attributes_filtered_states_to_empty(
             event_id = 1021
             session.add(
                 States(
-                    entity_id="sensor.old_format",
+                    states_meta_rel=_get_states_meta(session, "sensor.old_format"),
                     state=STATE_ON,
                     attributes=json.dumps({"old": "not_using_state_attributes"}),
                     last_changed=timestamp,
@@ -882,7 +1068,7 @@ async def test_purge_without_state_attributes_filtered_states_to_empty(
             session.add(
                 Events(
                     event_id=event_id,
-                    event_type=EVENT_STATE_CHANGED,
+                    event_type_rel=_get_event_type(session, EVENT_STATE_CHANGED),
                     event_data="{}",
                     origin="LOCAL",
                     time_fired=timestamp,
@@ -934,7 +1120,7 @@ async def test_purge_filtered_events(
                     session.add(
                         Events(
                             event_id=event_id * days,
-                            event_type="EVENT_PURGE",
+                            event_type_rel=_get_event_type(session, "EVENT_PURGE"),
                             event_data="{}",
                             origin="LOCAL",
                             time_fired=timestamp,
@@ -956,9 +1142,15 @@ async def test_purge_filtered_events(
     _add_db_entries(hass)
 
     with session_scope(hass=hass) as session:
-        events_purge = session.query(Events).filter(Events.event_type == "EVENT_PURGE")
-        events_keep = session.query(Events).filter(
-            Events.event_type == EVENT_STATE_CHANGED
+        events_purge = (
+            session.query(Events)
+            .join(EventTypes)
+            .filter(EventTypes.event_type == "EVENT_PURGE")
+        )
+        events_keep = (
+            session.query(Events)
+            .join(EventTypes)
+            .filter(EventTypes.event_type == EVENT_STATE_CHANGED)
         )
         states = session.query(States)
 
@@ -974,9 +1166,15 @@ async def test_purge_filtered_events(
     await async_wait_purge_done(hass)
 
     with session_scope(hass=hass) as session:
-        events_purge = session.query(Events).filter(Events.event_type == "EVENT_PURGE")
-        events_keep = session.query(Events).filter(
-            Events.event_type == EVENT_STATE_CHANGED
+        events_purge = (
+            session.query(Events)
+            .join(EventTypes)
+            .filter(EventTypes.event_type == "EVENT_PURGE")
+        )
+        events_keep = (
+            session.query(Events)
+            .join(EventTypes)
+            .filter(EventTypes.event_type == EVENT_STATE_CHANGED)
         )
         states = session.query(States)
         assert events_purge.count() == 60
@@ -995,9 +1193,15 @@ async def test_purge_filtered_events(
     await async_wait_purge_done(hass)
 
     with session_scope(hass=hass) as session:
-        events_purge = session.query(Events).filter(Events.event_type == "EVENT_PURGE")
-        events_keep = session.query(Events).filter(
-            Events.event_type == EVENT_STATE_CHANGED
+        events_purge = (
+            session.query(Events)
+            .join(EventTypes)
+            .filter(EventTypes.event_type == "EVENT_PURGE")
+        )
+        events_keep = (
+            session.query(Events)
+            .join(EventTypes)
+            .filter(EventTypes.event_type == EVENT_STATE_CHANGED)
         )
         states = session.query(States)
         assert events_purge.count() == 0
@@ -1034,7 +1238,7 @@ async def test_purge_filtered_events_state_changed(
                 session.add(
                     Events(
                         event_id=event_id,
-                        event_type="EVENT_KEEP",
+                        event_type_rel=_get_event_type(session, "EVENT_KEEP"),
                         event_data="{}",
                         origin="LOCAL",
                         time_fired=timestamp,
@@ -1043,7 +1247,7 @@ async def test_purge_filtered_events_state_changed(
             # Add states with linked old_state_ids that need to be handled
             timestamp = dt_util.utcnow() - timedelta(days=0)
             state_1 = States(
-                entity_id="sensor.linked_old_state_id",
+                states_meta_rel=_get_states_meta(session, "sensor.linked_old_state_id"),
                 state="keep",
                 attributes="{}",
                 last_changed=timestamp,
@@ -1052,7 +1256,7 @@ async def test_purge_filtered_events_state_changed(
             )
             timestamp = dt_util.utcnow() - timedelta(days=4)
             state_2 = States(
-                entity_id="sensor.linked_old_state_id",
+                states_meta_rel=_get_states_meta(session, "sensor.linked_old_state_id"),
                 state="keep",
                 attributes="{}",
                 last_changed=timestamp,
@@ -1060,7 +1264,7 @@ async def test_purge_filtered_events_state_changed(
                 old_state_id=2,
             )
             state_3 = States(
-                entity_id="sensor.linked_old_state_id",
+                states_meta_rel=_get_states_meta(session, "sensor.linked_old_state_id"),
                 state="keep",
                 attributes="{}",
                 last_changed=timestamp,
@@ -1073,9 +1277,15 @@ async def test_purge_filtered_events_state_changed(
     _add_db_entries(hass)
 
     with session_scope(hass=hass) as session:
-        events_keep = session.query(Events).filter(Events.event_type == "EVENT_KEEP")
-        events_purge = session.query(Events).filter(
-            Events.event_type == EVENT_STATE_CHANGED
+        events_keep = (
+            session.query(Events)
+            .join(EventTypes)
+            .filter(EventTypes.event_type == "EVENT_KEEP")
+        )
+        events_purge = (
+            session.query(Events)
+            .join(EventTypes)
+            .filter(EventTypes.event_type == EVENT_STATE_CHANGED)
         )
         states = session.query(States)
 
@@ -1093,9 +1303,15 @@ async def test_purge_filtered_events_state_changed(
     await async_wait_purge_done(hass)
 
     with session_scope(hass=hass) as session:
-        events_keep = session.query(Events).filter(Events.event_type == "EVENT_KEEP")
-        events_purge = session.query(Events).filter(
-            Events.event_type == EVENT_STATE_CHANGED
+        events_keep = (
+            session.query(Events)
+            .join(EventTypes)
+            .filter(EventTypes.event_type == "EVENT_KEEP")
+        )
+        events_purge = (
+            session.query(Events)
+            .join(EventTypes)
+            .filter(EventTypes.event_type == EVENT_STATE_CHANGED)
         )
         states = session.query(States)
 
@@ -1188,8 +1404,10 @@ async def test_purge_entities(
         states = session.query(States)
         assert states.count() == 10
 
-        states_sensor_kept = session.query(States).filter(
-            States.entity_id == "sensor.keep"
+        states_sensor_kept = (
+            session.query(States)
+            .join(StatesMeta)
+            .filter(StatesMeta.entity_id == "sensor.keep")
         )
         assert states_sensor_kept.count() == 10
 
@@ -1218,8 +1436,10 @@ async def test_purge_entities(
         states = session.query(States)
         assert states.count() == 10
 
-        states_sensor_kept = session.query(States).filter(
-            States.entity_id == "sensor.keep"
+        states_sensor_kept = (
+            session.query(States)
+            .join(StatesMeta)
+            .filter(StatesMeta.entity_id == "sensor.keep")
         )
         assert states_sensor_kept.count() == 10
 
@@ -1295,7 +1515,7 @@ async def _add_test_events(hass: HomeAssistant):
 
             session.add(
                 Events(
-                    event_type=event_type,
+                    event_type_rel=_get_event_type(session, event_type),
                     event_data=json.dumps(event_data),
                     origin="LOCAL",
                     time_fired=timestamp,
@@ -1398,7 +1618,7 @@ def _add_state_and_state_changed_event(
     session.add(state_attrs)
     session.add(
         States(
-            entity_id=entity_id,
+            states_meta_rel=_get_states_meta(session, entity_id),
             state=state,
             attributes=None,
             last_changed=timestamp,
@@ -1410,9 +1630,31 @@ def _add_state_and_state_changed_event(
     session.add(
         Events(
             event_id=event_id,
-            event_type=EVENT_STATE_CHANGED,
+            event_type_rel=_get_event_type(session, EVENT_STATE_CHANGED),
             event_data="{}",
             origin="LOCAL",
             time_fired=timestamp,
         )
     )
+
+
+def _get_event_type(session: Session, event_type: str) -> EventTypes:
+    """Return the shared EventTypes row for an event type."""
+    event_types: dict[str, EventTypes] = session.info.setdefault("event_types", {})
+    if event_type not in event_types:
+        with session.no_autoflush:
+            event_types[event_type] = session.query(EventTypes).filter(
+                EventTypes.event_type == event_type
+            ).one_or_none() or EventTypes(event_type=event_type)
+    return event_types[event_type]
+
+
+def _get_states_meta(session: Session, entity_id: str) -> StatesMeta:
+    """Return the shared StatesMeta row for an entity_id."""
+    states_meta: dict[str, StatesMeta] = session.info.setdefault("states_meta", {})
+    if entity_id not in states_meta:
+        with session.no_autoflush:
+            states_meta[entity_id] = session.query(StatesMeta).filter(
+                StatesMeta.entity_id == entity_id
+            ).one_or_none() or StatesMeta(entity_id=entity_id)
+    return states_meta[entity_id]
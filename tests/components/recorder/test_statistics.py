@@ -22,6 +22,7 @@ from homeassistant.components.recorder.statistics import (
     get_metadata,
     list_statistic_ids,
     statistics_during_period,
+    statistics_during_period_columns,
 )
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.const import TEMP_CELSIUS
@@ -732,6 +733,83 @@ def test_monthly_statistics(hass_recorder, caplog, timezone):
     dt_util.set_default_time_zone(dt_util.get_time_zone("UTC"))
 
 
+@pytest.mark.parametrize("timezone", ["America/Regina", "Europe/Vienna", "UTC"])
+@pytest.mark.parametrize("period", ["hour", "day", "month"])
+@pytest.mark.freeze_time("2021-08-01 00:00:00+00:00")
+def test_statistics_during_period_columns(hass_recorder, timezone, period):
+    """Test reducing statistics to columns matches reducing them in Python."""
+    dt_util.set_default_time_zone(dt_util.get_time_zone(timezone))
+
+    hass = hass_recorder()
+    wait_recording_done(hass)
+
+    first = dt_util.as_utc(dt_util.parse_datetime("2021-09-29 00:00:00"))
+    external_statistics = [
+        {
+            "start": first + timedelta(hours=hour),
+            "last_reset": None,
+            "mean": hour,
+            "min": hour - 1,
+            "max": hour + 1,
+            "state": hour,
+            "sum": hour * 2,
+        }
+        for hour in range(96)
+    ]
+    for statistic_id in ("test:temperature", "test:energy"):
+        external_metadata = {
+            "has_mean": True,
+            "has_sum": True,
+            "name": None,
+            "source": "test",
+            "statistic_id": statistic_id,
+            "unit_of_measurement": "kWh",
+        }
+        async_add_external_statistics(hass, external_metadata, external_statistics)
+    wait_recording_done(hass)
+
+    statistic_ids = ["test:temperature", "test:energy"]
+    end = first + timedelta(hours=90)
+    stats = statistics_during_period(hass, first, end, statistic_ids, period=period)
+    columns = statistics_during_period_columns(hass, first, end, statistic_ids, period)
+    assert columns.keys() == stats.keys()
+    for statistic_id, stat_list in stats.items():
+        assert columns[statistic_id] == {
+            "start": [
+                dt_util.parse_datetime(stat["start"]).timestamp() for stat in stat_list
+            ],
+            "end": [
+                dt_util.parse_datetime(stat["end"]).timestamp() for stat in stat_list
+            ],
+            "mean": [approx(stat["mean"]) for stat in stat_list],
+            "min": [approx(stat["min"]) for stat in stat_list],
+            "max": [approx(stat["max"]) for stat in stat_list],
+            "last_reset": [None for stat in stat_list],
+            "state": [approx(stat["state"]) for stat in stat_list],
+            "sum": [approx(stat["sum"]) for stat in stat_list],
+        }
+
+    # Reducing a few periods per query gives the same result
+    with patch.object(statistics, "MAX_PERIODS_PER_QUERY", 1):
+        assert (
+            statistics_during_period_columns(hass, first, end, statistic_ids, period)
+            == columns
+        )
+
+    columns = statistics_during_period_columns(
+        hass, first, end, ["test:energy"], period, types=["sum"]
+    )
+    assert list(columns) == ["test:energy"]
+    assert list(columns["test:energy"]) == ["start", "end", "sum"]
+
+    assert (
+        statistics_during_period_columns(hass, first, end, ["test:unknown"], period)
+        == {}
+    )
+
+    dt_util.set_default_time_zone(dt_util.get_time_zone("UTC"))
+
+
 def test_delete_duplicates_no_duplicates(hass_recorder, caplog):
     """Test removal of duplicated statistics."""
     hass = hass_recorder()
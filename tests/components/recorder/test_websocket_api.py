@@ -274,6 +274,31 @@ async def test_recorder_info(hass, hass_ws_client, recorder_mock):
     }
 
 
+async def test_purge_progress(hass, hass_ws_client, recorder_mock):
+    """Test getting the progress of the last purge."""
+    client = await hass_ws_client()
+
+    await client.send_json({"id": 1, "type": "recorder/purge_progress"})
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["result"] is None
+
+    await hass.services.async_call(
+        recorder.DOMAIN, "purge", {"keep_days": 1, "repack": False}, blocking=True
+    )
+    await async_wait_recording_done(hass)
+
+    await client.send_json({"id": 2, "type": "recorder/purge_progress"})
+    response = await client.receive_json()
+    assert response["success"]
+    result = response["result"]
+    assert result["batches"] == 1
+    assert result["finished"] is not None
+    assert result["repack"] is False
+    assert result["apply_filter"] is False
+    assert result["rows_deleted"] == {}
+
+
 async def test_recorder_info_no_recorder(hass, hass_ws_client):
     """Test getting recorder status when recorder is not present."""
     client = await hass_ws_client()
@@ -19,9 +19,11 @@ from homeassistant.components.recorder.statistics import (
     get_metadata,
     list_statistic_ids,
     statistics_during_period,
+    validate_statistics,
 )
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.const import STATE_UNAVAILABLE
+from homeassistant.core import State
 from homeassistant.setup import async_setup_component, setup_component
 import homeassistant.util.dt as dt_util
 from homeassistant.util.unit_system import IMPERIAL_SYSTEM, METRIC_SYSTEM
@@ -66,6 +68,10 @@ GAS_SENSOR_ATTRIBUTES = {
     "state_class": "total",
     "unit_of_measurement": "m³",
 }
+DOWNSAMPLED_HISTORY_CONFIG = {
+    "history_downsample_after": {"hours": 1},
+    "history_downsample_numeric_sensors": True,
+}
 
 
 @pytest.fixture(autouse=True)
@@ -78,6 +84,16 @@ def set_time_zone():
     dt_util.set_default_time_zone(dt_util.get_time_zone("UTC"))
 
 
+@pytest.fixture(params=[True, False], ids=["numpy", "without_numpy"])
+def numpy_installed(request):
+    """Compile statistics with and without numpy installed."""
+    if request.param:
+        yield
+        return
+    with patch("homeassistant.components.sensor.recorder._numpy", return_value=None):
+        yield
+
+
 @pytest.mark.parametrize(
     "device_class,unit,native_unit,mean,min,max",
     [
@@ -95,6 +111,7 @@ def set_time_zone():
         ("temperature", "°F", "°C", -10.52731, -23.33333, -1.111111),
     ],
 )
+@pytest.mark.usefixtures("numpy_installed")
 def test_compile_hourly_statistics(
     hass_recorder, caplog, device_class, unit, native_unit, mean, min, max
 ):
@@ -211,7 +228,184 @@ def test_compile_hourly_statistics_purged_state_changes(
     assert "Error while processing event StatisticsTask" not in caplog.text
 
 
+def test_compile_hourly_statistics_numeric_without_state_class(hass_recorder, caplog):
+    """Test statistics are compiled for numeric sensors when history is downsampled."""
+    zero = dt_util.utcnow()
+    hass = hass_recorder(DOWNSAMPLED_HISTORY_CONFIG)
+    setup_component(hass, "sensor", {})
+    wait_recording_done(hass)  # Wait for the sensor recorder platform to be added
+    attributes = {"unit_of_measurement": "W"}
+    four, states = record_states(hass, zero, "sensor.test1", attributes)
+    _, _states = record_states(hass, zero, "sensor.test2", {})
+    states = {**states, **_states}
+    _, _states = record_states(hass, zero, "sensor.test3", {}, seq=["a", "b", "c"])
+    states = {**states, **_states}
+    hist = history.get_significant_states(hass, zero, four)
+    assert dict(states) == dict(hist)
+
+    do_adhoc_statistics(hass, start=zero)
+    wait_recording_done(hass)
+    statistic_ids = list_statistic_ids(hass)
+    assert statistic_ids == [
+        {
+            "statistic_id": "sensor.test1",
+            "has_mean": True,
+            "has_sum": False,
+            "name": None,
+            "source": "recorder",
+            "unit_of_measurement": "W",
+        },
+        {
+            "statistic_id": "sensor.test2",
+            "has_mean": True,
+            "has_sum": False,
+            "name": None,
+            "source": "recorder",
+            "unit_of_measurement": None,
+        },
+    ]
+    stats = statistics_during_period(hass, zero, period="5minute")
+    assert stats["sensor.test1"] == [
+        {
+            "statistic_id": "sensor.test1",
+            "start": process_timestamp_to_utc_isoformat(zero),
+            "end": process_timestamp_to_utc_isoformat(zero + timedelta(minutes=5)),
+            "mean": approx(13.05084745762712),
+            "min": approx(-10.0),
+            "max": approx(30.0),
+            "last_reset": None,
+            "state": None,
+            "sum": None,
+        }
+    ]
+    assert "Error while processing event StatisticsTask" not in caplog.text
+
+
+def test_downsampled_history(hass_recorder):
+    """Test history of long periods is served from statistics."""
+    zero = dt_util.utcnow()
+    hass = hass_recorder(DOWNSAMPLED_HISTORY_CONFIG)
+    setup_component(hass, "sensor", {})
+    wait_recording_done(hass)  # Wait for the sensor recorder platform to be added
+    four, states = record_states(
+        hass, zero, "sensor.test1", {"unit_of_measurement": "W"}
+    )
+    _, _states = record_states(hass, zero, "sensor.test2", {}, seq=["a", "b", "c"])
+    states = {**states, **_states}
+
+    do_adhoc_statistics(hass, start=zero)
+    wait_recording_done(hass)
+
+    # Short periods are served from the states
+    hist = history.get_significant_states(
+        hass, zero, four, entity_ids=["sensor.test1", "sensor.test2"]
+    )
+    assert dict(states) == dict(hist)
+
+    # Long periods are served from the statistics where available
+    end = zero + timedelta(hours=2)
+    hist = history.get_significant_states(
+        hass, zero, end, entity_ids=["sensor.test1", "sensor.test2"]
+    )
+    assert list(hist) == ["sensor.test1", "sensor.test2"]
+    assert hist["sensor.test2"] == states["sensor.test2"]
+    assert len(hist["sensor.test1"]) == 1
+    state = hist["sensor.test1"][0]
+    assert float(state.state) == approx(13.05084745762712)
+    assert state.last_changed == zero
+    assert state.attributes == {
+        "unit_of_measurement": "W",
+        "min": approx(-10.0),
+        "max": approx(30.0),
+    }
+
+    # The attributes of the current state are copied
+    current_state = State(
+        "sensor.test1", "30", {"friendly_name": "Power", "unit_of_measurement": "W"}
+    )
+    hist = history.get_significant_states(
+        hass,
+        zero,
+        end,
+        entity_ids=["sensor.test1"],
+        current_states={"sensor.test1": current_state},
+    )
+    assert hist["sensor.test1"][0].attributes == {
+        "friendly_name": "Power",
+        "unit_of_measurement": "W",
+        "min": approx(-10.0),
+        "max": approx(30.0),
+    }
+
+    # States recorded after the last compiled statistics are appended
+    later = zero + timedelta(minutes=10)
+    with patch(
+        "homeassistant.components.recorder.core.dt_util.utcnow", return_value=later
+    ):
+        hass.states.set("sensor.test1", "40", {"unit_of_measurement": "W"})
+        wait_recording_done(hass)
+    hist = history.get_significant_states(
+        hass, zero, end, entity_ids=["sensor.test1"], minimal_response=True
+    )
+    assert [state.state for state in hist["sensor.test1"]] == [
+        "13.05084745762712",
+        "40",
+    ]
+    assert hist["sensor.test1"][1].last_changed == later
+
+    # The whole period is served from the states for the statistics compiler
+    with session_scope(hass=hass) as session:
+        hist = history.get_full_significant_states_with_session(
+            hass, session, zero, end, entity_ids=["sensor.test1"]
+        )
+    assert [state.state for state in hist["sensor.test1"]] == ["-10", "15", "30", "40"]
+
+
+def test_numeric_sensor_statistics_not_compiled_by_default(hass_recorder):
+    """Test numeric sensors without state class need to be opted in to."""
+    zero = dt_util.utcnow()
+    hass = hass_recorder({"history_downsample_after": {"hours": 1}})
+    setup_component(hass, "sensor", {})
+    wait_recording_done(hass)  # Wait for the sensor recorder platform to be added
+    record_states(hass, zero, "sensor.test1", {"unit_of_measurement": "W"})
+
+    do_adhoc_statistics(hass, start=zero)
+    wait_recording_done(hass)
+    assert list_statistic_ids(hass) == []
+    assert hass.data[DATA_INSTANCE].numeric_sensor_statistic_ids == set()
+
+
+def test_numeric_sensor_statistics_cleared_when_turned_off(hass_recorder):
+    """Test statistics of numeric sensors are cleared when they're no longer compiled."""
+    zero = dt_util.utcnow()
+    hass = hass_recorder(DOWNSAMPLED_HISTORY_CONFIG)
+    instance = hass.data[DATA_INSTANCE]
+    setup_component(hass, "sensor", {})
+    wait_recording_done(hass)  # Wait for the sensor recorder platform to be added
+    record_states(hass, zero, "sensor.test1", {"unit_of_measurement": "W"})
+    record_states(hass, zero, "sensor.test2", POWER_SENSOR_ATTRIBUTES)
+
+    do_adhoc_statistics(hass, start=zero)
+    wait_recording_done(hass)
+    assert instance.numeric_sensor_statistic_ids == {"sensor.test1"}
+    statistic_ids = [item["statistic_id"] for item in list_statistic_ids(hass)]
+    assert statistic_ids == ["sensor.test1", "sensor.test2"]
+
+    # Their statistics are not reported as invalid until they're cleared
+    instance.history_downsample_numeric_sensors = False
+    assert validate_statistics(hass) == {}
+
+    # The recorder clears them when it's started
+    hass.add_job(instance._async_clear_numeric_sensor_statistics)
+    hass.block_till_done()
+    wait_recording_done(hass)
+    assert instance.numeric_sensor_statistic_ids == set()
+    statistic_ids = [item["statistic_id"] for item in list_statistic_ids(hass)]
+    assert statistic_ids == ["sensor.test2"]
+
+
 @pytest.mark.parametrize("attributes", [TEMPERATURE_SENSOR_ATTRIBUTES])
+@pytest.mark.usefixtures("numpy_installed")
 def test_compile_hourly_statistics_unsupported(hass_recorder, caplog, attributes):
     """Test compiling hourly statistics for unsupported sensor."""
     zero = dt_util.utcnow()
@@ -788,6 +982,7 @@ def test_compile_hourly_sum_statistics_nan_inf_state(
         ("energy", "kWh", "kWh", 1),
     ],
 )
+@pytest.mark.usefixtures("numpy_installed")
 def test_compile_hourly_sum_statistics_negative_state(
     hass_recorder,
     caplog,
@@ -982,6 +1177,7 @@ def test_compile_hourly_sum_statistics_total_no_reset(
         ("gas", "ft³", "m³", 0.0283168466),
     ],
 )
+@pytest.mark.usefixtures("numpy_installed")
 def test_compile_hourly_sum_statistics_total_increasing(
     hass_recorder, caplog, device_class, unit, native_unit, factor
 ):
@@ -1074,6 +1270,7 @@ def test_compile_hourly_sum_statistics_total_increasing(
     "device_class,unit,native_unit,factor",
     [("energy", "kWh", "kWh", 1)],
 )
+@pytest.mark.usefixtures("numpy_installed")
 def test_compile_hourly_sum_statistics_total_increasing_small_dip(
     hass_recorder, caplog, device_class, unit, native_unit, factor
 ):
@@ -1172,6 +1369,7 @@ def test_compile_hourly_sum_statistics_total_increasing_small_dip(
     assert "Error while processing event StatisticsTask" not in caplog.text
 
 
+@pytest.mark.usefixtures("numpy_installed")
 def test_compile_hourly_energy_statistics_unsupported(hass_recorder, caplog):
     """Test compiling hourly statistics."""
     period0 = dt_util.utcnow()
@@ -1042,6 +1042,68 @@ async def test_subscribe_unsubscribe_entities_specific_entities(
     }
 
 
+async def test_subscribe_entities_resume(hass, websocket_client):
+    """Test resuming a subscription only sends the missed changes."""
+    hass.states.async_set("light.kitchen", "off")
+
+    await websocket_client.send_json({"id": 7, "type": "subscribe_entities"})
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    assert msg["result"]["resumed"] is False
+    journal_id = msg["result"]["journal_id"]
+    msg = await websocket_client.receive_json()
+    assert "light.kitchen" in msg["event"]["a"]
+
+    hass.states.async_set("light.kitchen", "on")
+    msg = await websocket_client.receive_json()
+    sequence = msg["sequence"]
+
+    await websocket_client.send_json(
+        {"id": 8, "type": "unsubscribe_events", "subscription": 7}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+
+    hass.states.async_set("light.kitchen", "off")
+    hass.states.async_set("light.hallway", "on")
+
+    await websocket_client.send_json(
+        {
+            "id": 9,
+            "type": "subscribe_entities",
+            "resume": {"journal_id": journal_id, "sequence": sequence},
+        }
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 9
+    assert msg["result"] == {
+        "journal_id": journal_id,
+        "sequence": sequence + 2,
+        "resumed": True,
+    }
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 9
+    assert msg["sequence"] == sequence + 1
+    assert msg["event"]["c"]["light.kitchen"]["+"]["s"] == "off"
+    msg = await websocket_client.receive_json()
+    assert msg["sequence"] == sequence + 2
+    assert "light.hallway" in msg["event"]["a"]
+
+    await websocket_client.send_json(
+        {
+            "id": 10,
+            "type": "subscribe_entities",
+            "resume": {"journal_id": "unknown", "sequence": sequence},
+        }
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 10
+    assert msg["result"]["resumed"] is False
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 10
+    assert set(msg["event"]["a"]) == {"light.kitchen", "light.hallway"}
+
+
 async def test_render_template_renders_template(hass, websocket_client):
     """Test simple template is rendered and updated."""
     hass.states.async_set("light.test", "on")
@@ -0,0 +1,194 @@
+"""Test the fan out of state changes to subscribe_entities subscriptions."""
+from datetime import timedelta
+import logging
+from unittest.mock import Mock, patch
+
+from homeassistant.components import websocket_api
+from homeassistant.components.websocket_api import messages
+from homeassistant.components.websocket_api.const import ENTITY_JOURNAL_RETENTION
+from homeassistant.components.websocket_api.entity_subscriptions import (
+    async_get_entity_subscriptions,
+)
+from homeassistant.const import EVENT_STATE_CHANGED
+import homeassistant.util.dt as dt_util
+
+from tests.common import MockUser, async_fire_time_changed
+
+
+def _connection(user):
+    """Return a connection collecting the messages it sends."""
+    send_messages = []
+    connection = websocket_api.ActiveConnection(
+        logging.getLogger(__name__), None, send_messages.append, user, Mock()
+    )
+    return connection, send_messages
+
+
+async def test_single_listener_for_all_subscriptions(hass):
+    """Test all subscriptions share one listener and one serialized diff."""
+    subscriptions = async_get_entity_subscriptions(hass)
+    assert async_get_entity_subscriptions(hass) is subscriptions
+    listeners = hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0)
+
+    owner = MockUser(is_owner=True)
+    conn_all, sent_all = _connection(owner)
+    conn_filtered, sent_filtered = _connection(owner)
+    unsubs = [
+        subscriptions.async_subscribe(conn_all, 1, set()),
+        subscriptions.async_subscribe(conn_all, 2, set()),
+        subscriptions.async_subscribe(conn_filtered, 3, {"light.kitchen"}),
+    ]
+    assert hass.bus.async_listeners()[EVENT_STATE_CHANGED] == listeners + 1
+
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("light.living_room", "on")
+    assert [message.split(",", 1)[0] for message in sent_all] == [
+        '{"id":1',
+        '{"id":2',
+        '{"id":1',
+        '{"id":2',
+    ]
+    assert sent_all[0].split(",", 1)[1] == sent_all[1].split(",", 1)[1]
+    assert len(sent_filtered) == 1
+    assert sent_filtered[0].startswith('{"id":3,')
+    assert '"light.kitchen"' in sent_filtered[0]
+
+    for unsub in unsubs:
+        unsub()
+    assert subscriptions._all == {}
+    assert subscriptions._by_entity_id == {}
+
+    hass.states.async_set("light.kitchen", "off")
+    assert len(sent_all) == 4
+    assert len(sent_filtered) == 1
+    assert subscriptions.sequence == 3
+
+    # Changes are journaled for a while after the last subscription ended
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=ENTITY_JOURNAL_RETENTION)
+    )
+    await hass.async_block_till_done()
+    assert hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0) == listeners
+    assert not subscriptions.async_can_resume(subscriptions.journal_id, 0)
+
+
+async def test_changes_serialized_when_sent(hass):
+    """Test changes are only serialized once they are sent or replayed."""
+    subscriptions = async_get_entity_subscriptions(hass)
+    connection, sent = _connection(MockUser(is_owner=True))
+    unsub = subscriptions.async_subscribe(connection, 1, {"light.kitchen"})
+
+    with patch.object(
+        messages,
+        "state_diff_message_template",
+        wraps=messages.state_diff_message_template,
+    ) as serialize:
+        hass.states.async_set("light.hallway", "on")
+        assert serialize.call_count == 0
+        hass.states.async_set("light.kitchen", "on")
+        assert serialize.call_count == 1
+        assert len(sent) == 1
+
+        connection, sent = _connection(MockUser(is_owner=True))
+        subscriptions.async_replay(connection, 2, set(), 0)
+        assert serialize.call_count == 2
+        assert len(sent) == 2
+        assert '"light.hallway"' in sent[0]
+        assert '"light.kitchen"' in sent[1]
+
+    unsub()
+
+
+async def test_unsubscribe_twice(hass):
+    """Test a subscription can be unsubscribed more than once."""
+    subscriptions = async_get_entity_subscriptions(hass)
+    connection, _ = _connection(MockUser(is_owner=True))
+    unsub = subscriptions.async_subscribe(connection, 1, {"light.kitchen"})
+    unsub_other = subscriptions.async_subscribe(connection, 2, {"light.kitchen"})
+
+    unsub()
+    unsub()
+    assert list(subscriptions._by_entity_id) == ["light.kitchen"]
+    unsub_other()
+    unsub()
+    assert subscriptions._by_entity_id == {}
+
+
+async def test_permissions_are_checked(hass):
+    """Test changes are only sent to subscriptions that may read the entity."""
+    subscriptions = async_get_entity_subscriptions(hass)
+    user = MockUser()
+    user.mock_policy({"entities": {"entity_ids": {"light.permitted": True}}})
+    conn_user, sent_user = _connection(user)
+    conn_owner, sent_owner = _connection(MockUser(is_owner=True))
+    unsubs = [
+        subscriptions.async_subscribe(conn_user, 1, set()),
+        subscriptions.async_subscribe(conn_user, 2, {"light.not_permitted"}),
+        subscriptions.async_subscribe(conn_owner, 3, set()),
+    ]
+
+    hass.states.async_set("light.permitted", "on")
+    hass.states.async_set("light.not_permitted", "on")
+    assert len(sent_user) == 1
+    assert sent_user[0].startswith('{"id":1,')
+    assert '"light.permitted"' in sent_user[0]
+    assert len(sent_owner) == 2
+
+    for unsub in unsubs:
+        unsub()
+
+
+async def test_resume(hass):
+    """Test resuming replays the journaled changes after a sequence."""
+    subscriptions = async_get_entity_subscriptions(hass)
+    user = MockUser()
+    user.mock_policy(
+        {"entities": {"entity_ids": {"light.kitchen": True, "light.hallway": True}}}
+    )
+    connection, sent = _connection(user)
+    unsub = subscriptions.async_subscribe(connection, 1, set())
+    journal_id = subscriptions.journal_id
+
+    hass.states.async_set("light.kitchen", "on")
+    unsub()
+    hass.states.async_set("light.kitchen", "off")
+    hass.states.async_set("light.not_permitted", "on")
+    hass.states.async_set("light.hallway", "on")
+    assert len(sent) == 1
+    assert sent[0].endswith(',"sequence":1}')
+
+    assert not subscriptions.async_can_resume("other", 1)
+    assert not subscriptions.async_can_resume(journal_id, 5)
+    assert subscriptions.async_can_resume(journal_id, 4)
+    assert subscriptions.async_can_resume(journal_id, 1)
+
+    connection, sent = _connection(user)
+    subscriptions.async_subscribe(connection, 2, set())
+    assert subscriptions.journal_id == journal_id
+    subscriptions.async_replay(connection, 2, set(), 1)
+    assert len(sent) == 2
+    assert sent[0].startswith('{"id":2,')
+    assert sent[0].endswith(',"sequence":2}')
+    assert sent[1].endswith(',"sequence":4}')
+
+    connection, sent = _connection(user)
+    subscriptions.async_subscribe(connection, 3, {"light.hallway"})
+    subscriptions.async_replay(connection, 3, {"light.hallway"}, 0)
+    assert len(sent) == 1
+    assert '"light.hallway"' in sent[0]
+
+
+async def test_resume_after_journal_overflow(hass):
+    """Test resuming fails once the missed changes are no longer journaled."""
+    with patch(
+        "homeassistant.components.websocket_api.entity_subscriptions.ENTITY_JOURNAL_SIZE",
+        2,
+    ):
+        subscriptions = async_get_entity_subscriptions(hass)
+    connection, _ = _connection(MockUser(is_owner=True))
+    subscriptions.async_subscribe(connection, 1, set())
+    for state in ("on", "off", "on"):
+        hass.states.async_set("light.kitchen", state)
+
+    assert not subscriptions.async_can_resume(subscriptions.journal_id, 0)
+    assert subscriptions.async_can_resume(subscriptions.journal_id, 1)
@@ -1,12 +1,24 @@
 """Test Websocket API http module."""
 import asyncio
 from datetime import timedelta
-from unittest.mock import patch
+import logging
+from unittest.mock import MagicMock, patch
 
 from aiohttp import ServerDisconnectedError, WSMsgType, web
+from aiohttp.http_websocket import WebSocketWriter
 import pytest
 
 from homeassistant.components.websocket_api import const, http
+from homeassistant.components.websocket_api.auth import (
+    TYPE_AUTH,
+    TYPE_AUTH_OK,
+    TYPE_AUTH_REQUIRED,
+)
+from homeassistant.components.websocket_api.compression import (
+    WebSocketCompression,
+    can_tune_compression,
+)
+from homeassistant.setup import async_setup_component
 from homeassistant.util.dt import utcnow
 
 from tests.common import async_fire_time_changed
@@ -93,3 +105,156 @@ async def test_prepare_fail(hass, hass_ws_client, caplog):
         await hass_ws_client(hass)
 
     assert "Timeout preparing request" in caplog.text
+
+
+async def test_coalesce_messages(hass, websocket_client):
+    """Test queued messages are sent as one frame once the client supports it."""
+    await websocket_client.send_json(
+        {"id": 5, "type": "subscribe_events", "event_type": "test_event"}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+
+    for idx in range(3):
+        hass.bus.async_fire("test_event", {"idx": idx})
+    for idx in range(3):
+        msg = await websocket_client.receive_json()
+        assert msg["event"]["data"] == {"idx": idx}
+
+    await websocket_client.send_json(
+        {
+            "id": 6,
+            "type": "supported_features",
+            "features": {const.FEATURE_COALESCE_MESSAGES: 1},
+        }
+    )
+    msg = await websocket_client.receive_json()
+    assert msg == {"id": 6, "type": const.TYPE_RESULT, "success": True, "result": None}
+
+    for idx in range(3):
+        hass.bus.async_fire("test_event", {"idx": idx})
+    msgs = await websocket_client.receive_json()
+    assert [msg["event"]["data"] for msg in msgs] == [
+        {"idx": 0},
+        {"idx": 1},
+        {"idx": 2},
+    ]
+
+    # A single queued message is not wrapped
+    await websocket_client.send_json({"id": 7, "type": "ping"})
+    msg = await websocket_client.receive_json()
+    assert msg == {"id": 7, "type": "pong"}
+
+
+async def test_compression(
+    hass, aiohttp_client, hass_access_token, socket_enabled, caplog
+):
+    """Test messages are compressed when the client supports it."""
+    orig_handler = http.WebSocketHandler
+    instance = None
+
+    def instantiate_handler(*args):
+        nonlocal instance
+        instance = orig_handler(*args)
+        return instance
+
+    assert await async_setup_component(hass, "websocket_api", {})
+    client = await aiohttp_client(hass.http.app)
+    with patch(
+        "homeassistant.components.websocket_api.http.WebSocketHandler",
+        instantiate_handler,
+    ):
+        websocket = await client.ws_connect(const.URL, compress=15)
+    auth_required = await websocket.receive_json()
+    assert auth_required["type"] == TYPE_AUTH_REQUIRED
+    await websocket.send_json({"type": TYPE_AUTH, "access_token": hass_access_token})
+    auth_ok = await websocket.receive_json()
+    assert auth_ok["type"] == TYPE_AUTH_OK
+
+    compression = instance._compression
+    assert compression.window_bits == const.COMPRESS_WINDOW_BITS
+
+    await websocket.send_json({"id": 5, "type": "ping"})
+    assert await websocket.receive_json() == {"id": 5, "type": "pong"}
+    assert compression.messages == 3
+    # The pong is below the threshold
+    assert compression.compressed_messages == 2
+
+    for idx in range(50):
+        hass.states.async_set(f"light.kitchen_{idx}", "on", {"brightness": idx})
+    await websocket.send_json({"id": 6, "type": "get_states"})
+    msg = await websocket.receive_json()
+    assert len(msg["result"]) == 50
+    stats = compression.as_dict()
+    assert stats["messages"] == 4
+    assert stats["ratio"] > 5
+    assert stats["compress_time_ms"] > 0
+
+    caplog.set_level(logging.DEBUG, "homeassistant.components.websocket_api")
+    await websocket.close()
+    await hass.async_block_till_done()
+    assert "Compression statistics" in caplog.text
+
+
+async def test_compression_aiohttp_writer(hass):
+    """Test the private attributes of aiohttp's writer the compression relies on.
+
+    If this fails after updating aiohttp, websockets fall back to the
+    default compression of aiohttp until the tuning is adapted.
+    """
+    transport = MagicMock()
+    transport.is_closing.return_value = False
+    writer = WebSocketWriter(MagicMock(), transport, compress=15)
+    assert writer._compressobj is None
+    assert writer.compress == 15
+    wsock = MagicMock(_writer=writer, compress=15)
+    assert can_tune_compression(wsock)
+
+    compression = WebSocketCompression(wsock)
+    assert writer._compressobj is compression
+    await writer.send("a" * 200)
+    assert compression.raw_bytes == 200
+    assert 0 < compression.compressed_bytes < 200
+    assert transport.write.called
+
+
+async def test_compression_not_tuned(
+    hass, aiohttp_client, hass_access_token, socket_enabled
+):
+    """Test aiohttp's compression is used if the writer can't be tuned."""
+    orig_handler = http.WebSocketHandler
+    instance = None
+
+    def instantiate_handler(*args):
+        nonlocal instance
+        instance = orig_handler(*args)
+        return instance
+
+    assert await async_setup_component(hass, "websocket_api", {})
+    client = await aiohttp_client(hass.http.app)
+    with patch(
+        "homeassistant.components.websocket_api.http.WebSocketHandler",
+        instantiate_handler,
+    ), patch(
+        "homeassistant.components.websocket_api.http.can_tune_compression",
+        return_value=False,
+    ):
+        websocket = await client.ws_connect(const.URL, compress=15)
+        auth_required = await websocket.receive_json()
+    assert auth_required["type"] == TYPE_AUTH_REQUIRED
+    await websocket.send_json({"type": TYPE_AUTH, "access_token": hass_access_token})
+    auth_ok = await websocket.receive_json()
+    assert auth_ok["type"] == TYPE_AUTH_OK
+
+    assert instance._compression is None
+    assert websocket.compress == 15
+    await websocket.send_json({"id": 5, "type": "ping"})
+    assert await websocket.receive_json() == {"id": 5, "type": "pong"}
+    await websocket.close()
+
+
+async def test_no_compression(hass, websocket_client):
+    """Test messages are not compressed when the client does not support it."""
+    await websocket_client.send_json({"id": 5, "type": "ping"})
+    assert await websocket_client.receive_json() == {"id": 5, "type": "pong"}
+    assert not websocket_client.compress
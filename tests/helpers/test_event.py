@@ -21,6 +21,7 @@ from homeassistant.helpers.event import (
     TrackTemplate,
     TrackTemplateResult,
     async_call_later,
+    async_scheduled_point_in_time_jobs,
     async_track_point_in_time,
     async_track_point_in_utc_time,
     async_track_same_state,
@@ -122,6 +123,66 @@ async def test_track_point_in_time_drift_rearm(hass):
     assert len(specific_runs) == 1
 
 
+async def test_track_point_in_time_coalesces_timers(hass, caplog):
+    """Test listeners due at the same time share one event loop timer."""
+    runs = []
+    point_in_time = dt_util.utcnow() + timedelta(seconds=10)
+    scheduled_handles = len(hass.loop._scheduled)
+
+    for idx in range(3):
+        async_track_point_in_utc_time(
+            hass, callback(lambda x, idx=idx: runs.append(idx)), point_in_time
+        )
+    unsub = async_track_point_in_utc_time(
+        hass, callback(lambda x: runs.append("cancelled")), point_in_time
+    )
+    async_track_point_in_utc_time(
+        hass,
+        callback(lambda x: runs.append("later")),
+        point_in_time + timedelta(seconds=5),
+    )
+
+    @callback
+    def raises(now):
+        raise ValueError
+
+    async_track_point_in_utc_time(hass, raises, point_in_time)
+    assert len(hass.loop._scheduled) == scheduled_handles + 1
+
+    unsub()
+    assert len(async_scheduled_point_in_time_jobs(hass)) == 5
+
+    async_fire_time_changed(hass, point_in_time + timedelta(seconds=1))
+    await hass.async_block_till_done()
+    assert runs == [0, 1, 2]
+    assert "Error running job" in caplog.text
+
+    async_fire_time_changed(hass, point_in_time + timedelta(seconds=6))
+    await hass.async_block_till_done()
+    assert runs == [0, 1, 2, "later"]
+    assert async_scheduled_point_in_time_jobs(hass) == []
+
+
+async def test_track_point_in_time_cancelled_by_job_of_same_batch(hass):
+    """Test a listener cancelled by a listener of the same batch does not run."""
+    runs = []
+    point_in_time = dt_util.utcnow() + timedelta(seconds=10)
+
+    @callback
+    def cancel_b(now):
+        runs.append("a")
+        unsub_b()
+
+    async_track_point_in_utc_time(hass, cancel_b, point_in_time)
+    unsub_b = async_track_point_in_utc_time(
+        hass, callback(lambda x: runs.append("b")), point_in_time
+    )
+
+    async_fire_time_changed(hass, point_in_time + timedelta(seconds=1))
+    await hass.async_block_till_done()
+    assert runs == ["a"]
+
+
 async def test_track_state_change_from_to_state_match(hass):
     """Test track_state_change with from and to state matchers."""
     from_and_to_state_runs = []
@@ -1,11 +1,23 @@
 """Test Home Assistant remote methods and classes."""
+from collections import namedtuple
 import datetime
+from functools import partial
+import json
 
 import pytest
 
 from homeassistant import core
-from homeassistant.helpers.json import ExtendedJSONEncoder, JSONEncoder
+from homeassistant.helpers.json import (
+    ExtendedJSONEncoder,
+    JSONEncoder,
+    json_bytes,
+    json_bytes_indented,
+    json_dumps,
+)
 from homeassistant.util import dt as dt_util
+from homeassistant.util.read_only_dict import ReadOnlyDict
+
+COMPACT_JSON_DUMP = partial(json.dumps, cls=JSONEncoder, separators=(",", ":"))
 
 
 @pytest.mark.parametrize("encoder", (JSONEncoder, ExtendedJSONEncoder))
@@ -64,3 +76,78 @@ def test_extended_json_encoder(hass):
     # Default method falls back to repr(o)
     o = object()
     assert ha_json_enc.default(o) == {"__type": str(type(o)), "repr": repr(o)}
+
+
+def test_json_dumps_matches_json_encoder():
+    """Test the fast serializer output is identical to the JSONEncoder."""
+    now = dt_util.utcnow()
+    state = core.State(
+        "light.kitchen",
+        "on",
+        {"brightness": 255, "rgb_color": (255, 128, 0), "friendly_name": "Kitchen"},
+        last_changed=now - datetime.timedelta(minutes=5),
+        last_updated=now,
+        context=core.Context(id="abc", user_id="user"),
+    )
+    point = namedtuple("Point", ["x", "y"])
+    data = {
+        "id": 5,
+        "type": "result",
+        "success": True,
+        "result": [state, state.as_dict()],
+        "time": now,
+        "naive": datetime.datetime(2022, 5, 4, 12, 30),
+        "set": {"milk"},
+        "read_only": ReadOnlyDict({"a": [1, 2.5, None, False]}),
+        "int_keys": {1: "one", 2: "two"},
+        "point": point(1, 2),
+        "escaped": 'quote " backslash \\ tab \t',
+    }
+
+    assert json_dumps(data) == COMPACT_JSON_DUMP(data)
+    assert json_bytes(data) == COMPACT_JSON_DUMP(data).encode()
+
+
+def test_json_dumps_escapes_non_ascii():
+    """Test non-ASCII characters are escaped as by the JSONEncoder."""
+    data = {"name": "Küche 😀", "unit": "°C", "ascii": "plain"}
+    assert json_dumps(data) == COMPACT_JSON_DUMP(data)
+    assert json_bytes_indented(data) == json.dumps(data, indent=4).encode()
+
+
+@pytest.mark.parametrize("value", (float("NaN"), float("inf"), float("-inf")))
+def test_json_dumps_rejects_non_finite_floats(value):
+    """Test NaN and Infinity are rejected as by the JSONEncoder."""
+    assert json_dumps({"value": None}) == '{"value":null}'
+    with pytest.raises(ValueError):
+        json_dumps({"value": None, "nested": [{"value": value}]})
+    with pytest.raises(TypeError):
+        json_dumps({"value": object()})
+
+
+def test_json_bytes_indented_matches_json_encoder():
+    """Test the indented serializer output is identical to the JSONEncoder."""
+    now = dt_util.utcnow()
+    data = {
+        "time": now,
+        "set": {"milk"},
+        "items": [1, 2.5, None, False, {"empty": {}, "list": []}],
+        "int_keys": {1: "one"},
+        "nan": float("NaN"),
+    }
+    expected = json.dumps(data, cls=JSONEncoder, indent=4).encode()
+    assert json_bytes_indented(data) == expected
+    del data["nan"]
+    expected = json.dumps(data, cls=JSONEncoder, indent=4).encode()
+    assert json_bytes_indented(data) == expected
+
+
+def test_json_dumps_big_integers():
+    """Test integers beyond 64 bits fall back to the JSONEncoder."""
+    data = {"value": 2**64, "name": "Küche"}
+    assert json_dumps(data) == COMPACT_JSON_DUMP(data)
+    assert json_bytes(data) == json_dumps(data).encode()
+    assert json_bytes_indented(data) == json.dumps(data, indent=4).encode()
+
+    with pytest.raises(TypeError):
+        json_dumps({"value": 2**64, "other": object()})
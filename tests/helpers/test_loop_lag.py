@@ -0,0 +1,119 @@
+"""Test the loop lag monitor."""
+import asyncio
+import time
+from traceback import FrameSummary, StackSummary
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.helpers import loop_lag
+from homeassistant.setup import async_setup_component
+
+from tests.common import get_system_health_info
+
+
+async def test_record_lag():
+    """Test the lag histogram."""
+    monitor = loop_lag.LoopLagMonitor(None)
+    assert monitor.async_as_dict()["mean_lag_ms"] == 0.0
+
+    for lag in (0.001, 0.005, 0.02, 0.3, 10):
+        monitor.async_record_lag(lag)
+
+    stats = monitor.async_as_dict()
+    assert stats["checks"] == 5
+    assert stats["max_lag_ms"] == 10000
+    assert stats["histogram"] == {
+        "<=5ms": 2,
+        "<=10ms": 0,
+        "<=50ms": 1,
+        "<=100ms": 0,
+        "<=250ms": 0,
+        "<=500ms": 1,
+        "<=1000ms": 0,
+        "<=5000ms": 0,
+        ">5000ms": 1,
+    }
+
+
+async def test_slow_callback_attribution(hass, caplog):
+    """Test slow callbacks are attributed to the integration in the stack."""
+    monitor = loop_lag.LoopLagMonitor(hass)
+    stack = StackSummary.from_list(
+        [
+            FrameSummary("/home/dev/homeassistant/core.py", 10, "run", line="run()"),
+            FrameSummary(
+                "/home/dev/homeassistant/components/hue/light.py",
+                23,
+                "update",
+                line="self.bridge.update()",
+            ),
+            FrameSummary("/home/dev/aiohue/bridge.py", 5, "update", line="sleep()"),
+        ]
+    )
+
+    monitor.async_record_slow_callback(stack, 0.5)
+    monitor.async_record_slow_callback(stack, 0.7)
+
+    stats = monitor.async_as_dict()
+    assert stats["integrations"] == {"hue": 2}
+    assert stats["slow_callbacks"][0]["lag_ms"] == 500
+    assert (
+        stats["slow_callbacks"][0]["frame"]
+        == "/home/dev/homeassistant/components/hue/light.py:23"
+    )
+    assert stats["slow_callbacks"][0]["stack"][-1] == (
+        "/home/dev/aiohue/bridge.py:5 in update"
+    )
+    assert caplog.text.count("Detected hue blocking the event loop") == 1
+
+    monitor.async_record_slow_callback(StackSummary.from_list(stack[:1]), 0.5)
+    assert monitor.async_as_dict()["integrations"] == {"hue": 2, "homeassistant": 1}
+
+    stats = monitor.async_as_dict("homeassistant")
+    assert stats["integrations"] == {"homeassistant": 1}
+    assert len(stats["slow_callbacks"]) == 1
+    stats = monitor.async_as_dict("zwave_js")
+    assert stats["integrations"] == {}
+    assert stats["slow_callbacks"] == []
+
+
+async def test_monitor_samples_blocking_callback(hass):
+    """Test the monitor measures lag and samples the blocking callback."""
+    monitor = loop_lag.LoopLagMonitor(hass, interval=0.01, threshold=0.05)
+    monitor.async_start()
+
+    await asyncio.sleep(0.05)
+    end = time.monotonic() + 0.3
+    while time.monotonic() < end:
+        pass
+    await asyncio.sleep(0.05)
+    await monitor.async_stop()
+
+    stats = monitor.async_as_dict()
+    assert stats["checks"] > 1
+    assert stats["max_lag_ms"] >= 250
+    slow_callback = stats["slow_callbacks"][0]
+    assert slow_callback["integration"] == "homeassistant"
+    assert slow_callback["frame"].startswith(__file__)
+
+
+async def test_setup_loop_lag_monitor(hass):
+    """Test the monitor is shared and stops with Home Assistant."""
+    assert loop_lag.async_get_loop_lag_monitor(hass) is None
+    monitor = loop_lag.async_setup_loop_lag_monitor(hass)
+    assert loop_lag.async_setup_loop_lag_monitor(hass) is monitor
+    assert loop_lag.async_get_loop_lag_monitor(hass) is monitor
+
+    monitor.async_record_lag(0.002)
+    monitor.async_record_slow_callback(
+        StackSummary.from_list([FrameSummary("/home/dev/x.py", 1, "run")]), 0.5
+    )
+    assert await async_setup_component(hass, "homeassistant", {})
+    assert await async_setup_component(hass, "system_health", {})
+    info = await get_system_health_info(hass, "homeassistant")
+    assert info["loop_lag_mean"] == "2.0 ms"
+    assert info["loop_lag_max"] == "2.0 ms"
+    assert info["loop_slow_callbacks"] == 1
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_STOP)
+    await hass.async_block_till_done()
+    assert monitor._thread is None
@@ -0,0 +1,121 @@
+"""Test the polling scheduler."""
+import asyncio
+from datetime import timedelta
+from unittest.mock import patch
+
+from homeassistant.helpers.polling import (
+    MAX_BACKOFF,
+    _next_poll,
+    async_get_polling_scheduler,
+)
+import homeassistant.util.dt as dt_util
+
+from tests.common import async_fire_time_changed
+
+
+def test_next_poll_is_aligned():
+    """Test polls are aligned to the interval and offset."""
+    now = dt_util.utc_from_timestamp(1000)
+    with patch("homeassistant.util.dt.utcnow", return_value=now):
+        assert _next_poll(30, 0).timestamp() == 1020
+        assert _next_poll(30, 3).timestamp() == 1023
+    with patch("homeassistant.util.dt.utcnow", return_value=now + timedelta(hours=1)):
+        assert _next_poll(30, 3).timestamp() == 4623
+
+
+async def test_pollers_share_groups(hass):
+    """Test pollers with the same interval and offset share a timer."""
+    scheduler = async_get_polling_scheduler(hass)
+    polls = []
+
+    async def poll(now):
+        polls.append(now)
+
+    unsubs = [
+        scheduler.async_add_poller("test", f"test {idx}", timedelta(seconds=20), poll)
+        for idx in range(20)
+    ]
+    offsets = {stats["offset"] for stats in scheduler.async_get_stats()}
+    assert len(offsets) > 1
+    assert all(0 <= offset < 5 for offset in offsets)
+    assert len(scheduler._groups) == len(offsets)
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=20))
+    await hass.async_block_till_done()
+    assert len(polls) == 20
+    assert all(stats["polls"] == 1 for stats in scheduler.async_get_stats("test"))
+    assert scheduler.async_get_stats("other") == []
+
+    for unsub in unsubs:
+        unsub()
+    assert scheduler._groups == {}
+    assert scheduler.async_get_stats() == []
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=40))
+    await hass.async_block_till_done()
+    assert len(polls) == 20
+
+
+async def test_poll_removed_group(hass):
+    """Test a group that is due after its last poller was removed is ignored."""
+    scheduler = async_get_polling_scheduler(hass)
+
+    async def poll(now):
+        """Poll nothing."""
+
+    unsub = scheduler.async_add_poller(
+        "test", "test", timedelta(seconds=20), poll, "entry_id"
+    )
+    assert scheduler.async_get_stats(config_entry_id="entry_id") != []
+    assert scheduler.async_get_stats(config_entry_id="other_entry_id") == []
+    (key,) = scheduler._groups
+    unsub()
+
+    scheduler._async_poll_group(key, dt_util.utcnow())
+    assert scheduler._groups == {}
+
+
+async def test_slow_poller_backs_off(hass, caplog):
+    """Test the interval of slow pollers is increased and restored."""
+    scheduler = async_get_polling_scheduler(hass)
+    release = asyncio.Event()
+
+    async def poll(now):
+        await release.wait()
+
+    unsub = scheduler.async_add_poller("test", "test", timedelta(seconds=1), poll)
+    (poller,) = scheduler._pollers
+
+    with patch("homeassistant.helpers.polling.time") as mock_time:
+        mock_time.monotonic.side_effect = [0, 10]
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=1))
+        await asyncio.sleep(0)
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=2))
+        await asyncio.sleep(0)
+        assert poller.stats.skipped == 1
+        assert poller.stats.backoff == 2
+        assert "Updating test took longer than the scheduled update interval" in (
+            caplog.text
+        )
+
+        release.set()
+        await hass.async_block_till_done()
+    assert poller.stats.backoff == 4
+    assert poller.stats.polls == 1
+
+    for backoff in (8, MAX_BACKOFF):
+        with patch("homeassistant.helpers.polling.time") as mock_time:
+            mock_time.monotonic.side_effect = [0, 100]
+            async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=10))
+            await hass.async_block_till_done()
+        assert poller.stats.backoff == backoff
+
+    with patch("homeassistant.helpers.polling.time") as mock_time:
+        mock_time.monotonic.side_effect = [0, 0.1]
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=10))
+        await hass.async_block_till_done()
+    assert poller.stats.backoff == MAX_BACKOFF // 2
+    assert poller.stats.max_duration == 100
+
+    unsub()
+    assert scheduler._groups == {}
@@ -29,6 +29,7 @@ from homeassistant.const import (
 )
 import homeassistant.core as ha
 from homeassistant.exceptions import (
+    HomeAssistantError,
     InvalidEntityFormatError,
     InvalidStateError,
     MaxLengthExceeded,
@@ -94,6 +95,28 @@ def test_async_add_hass_job_schedule_coroutinefunction(loop):
     assert len(hass.add_job.mock_calls) == 0
 
 
+async def test_async_add_hass_job_eager_start(hass):
+    """Test eagerly started coroutine functions only get a task if they suspend."""
+
+    async def job_that_returns():
+        return 1
+
+    async def job_that_suspends():
+        await asyncio.sleep(0)
+        return 2
+
+    pending_tasks = len(hass._pending_tasks)
+    future = hass.async_add_hass_job(ha.HassJob(job_that_returns), eager_start=True)
+    assert future.done()
+    assert await future == 1
+    assert len(hass._pending_tasks) == pending_tasks
+
+    task = hass.async_run_hass_job(ha.HassJob(job_that_suspends), eager_start=True)
+    assert isinstance(task, asyncio.Task)
+    assert len(hass._pending_tasks) == pending_tasks + 1
+    assert await task == 2
+
+
 def test_async_add_hass_job_schedule_partial_coroutinefunction(loop):
     """Test that we schedule partial coros and add jobs to the job pool."""
     hass = MagicMock(loop=MagicMock(wraps=loop))
@@ -460,6 +483,318 @@ async def test_eventbus_run_immediately(hass):
     unsub()
 
 
+async def test_eventbus_run_immediately_coroutine_function(hass):
+    """Test coroutine function listeners are started eagerly."""
+    calls = []
+    resume = asyncio.Event()
+
+    async def listener(event):
+        """Mock listener."""
+        calls.append(event.data["step"])
+        if event.data["step"] == "suspend":
+            await resume.wait()
+            calls.append("resumed")
+
+    @ha.callback
+    def key_func(event):
+        """Return the key of an event."""
+        return event.data["step"]
+
+    hass.bus.async_listen("test", listener, run_immediately=True)
+    hass.bus.async_listen_keyed(
+        "keyed", key_func, ["done"], listener, run_immediately=True
+    )
+
+    hass.bus.async_fire("test", {"step": "done"})
+    hass.bus.async_fire("keyed", {"step": "done"})
+    # No async_block_till_done here
+    assert calls == ["done", "done"]
+
+    pending_tasks = len(hass._pending_tasks)
+    hass.bus.async_fire("test", {"step": "suspend"})
+    assert calls == ["done", "done", "suspend"]
+    assert len(hass._pending_tasks) == pending_tasks + 1
+
+    resume.set()
+    await hass.async_block_till_done()
+    assert calls == ["done", "done", "suspend", "resumed"]
+
+    def executor_listener(event):
+        """Mock executor listener."""
+
+    with pytest.raises(HomeAssistantError):
+        hass.bus.async_listen("test", executor_listener, run_immediately=True)
+
+
+async def test_eventbus_run_immediately_coroutine_function_exception(hass, caplog):
+    """Test an exception of an eagerly started listener is logged."""
+
+    async def listener(event):
+        """Mock listener."""
+        raise ValueError("boom")
+
+    hass.bus.async_listen("test", listener, run_immediately=True)
+    hass.bus.async_fire("test")
+
+    assert "Error running job" in caplog.text
+    assert "ValueError: boom" in caplog.text
+
+
+async def test_eventbus_keyed_listener(hass):
+    """Test keyed listeners only run for their keys."""
+    calls = []
+    all_calls = []
+
+    @ha.callback
+    def key_func(event):
+        """Return the key of an event."""
+        return event.data.get("key")
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append(event)
+
+    @ha.callback
+    def all_listener(event):
+        """Mock match all listener."""
+        all_calls.append(event)
+
+    old_count = hass.bus.async_listeners().get("test", 0)
+    unsub = hass.bus.async_listen_keyed("test", key_func, ["a", "b"], listener)
+    unsub_all = hass.bus.async_listen_keyed("test", key_func, [MATCH_ALL], all_listener)
+
+    assert hass.bus.async_listeners()["test"] == old_count + 1
+    assert hass.bus.async_keyed_listeners("test") == {"a": 1, "b": 1, MATCH_ALL: 1}
+
+    hass.bus.async_fire("test", {"key": "a"})
+    hass.bus.async_fire("test", {"key": "b"})
+    hass.bus.async_fire("test", {"key": "c"})
+    hass.bus.async_fire("test", {})
+    await hass.async_block_till_done()
+
+    assert [event.data["key"] for event in calls] == ["a", "b"]
+    assert [event.data["key"] for event in all_calls] == ["a", "b", "c"]
+
+    unsub()
+    unsub_all()
+
+    assert hass.bus.async_listeners().get("test", 0) == old_count
+    assert hass.bus.async_keyed_listeners("test") == {}
+
+    hass.bus.async_fire("test", {"key": "a"})
+    await hass.async_block_till_done()
+    assert len(calls) == 2
+
+
+async def test_eventbus_keyed_listener_duplicate_keys(hass):
+    """Test a keyed listener runs once per event for duplicated keys."""
+    calls = []
+
+    @ha.callback
+    def key_func(event):
+        """Return the key of an event."""
+        return event.data["key"]
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append(event)
+
+    unsub = hass.bus.async_listen_keyed("test", key_func, ["a", "a"], listener)
+    unsub_all = hass.bus.async_listen_keyed(
+        "test", key_func, ["a", MATCH_ALL], listener, run_immediately=True
+    )
+    assert hass.bus.async_keyed_listeners("test") == {"a": 1, MATCH_ALL: 1}
+
+    hass.bus.async_fire("test", {"key": "a"})
+    await hass.async_block_till_done()
+    assert len(calls) == 2
+
+    unsub()
+    unsub_all()
+    assert hass.bus.async_keyed_listeners("test") == {}
+
+    with pytest.raises(HomeAssistantError):
+        hass.bus.async_listen_keyed(MATCH_ALL, key_func, ["a"], listener)
+
+
+async def test_eventbus_keyed_listener_added_after_fire(hass):
+    """Test keyed listeners are looked up when the event is dispatched."""
+    calls = []
+
+    @ha.callback
+    def key_func(event):
+        """Return the key of an event."""
+        return event.data["key"]
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append(("first", event))
+
+    @ha.callback
+    def late_listener(event):
+        """Mock listener added after the event was fired."""
+        calls.append(("late", event))
+
+    unsub = hass.bus.async_listen_keyed("test", key_func, ["a"], listener)
+    hass.bus.async_fire("test", {"key": "a"})
+    unsub_late = hass.bus.async_listen_keyed("test", key_func, ["a"], late_listener)
+    await hass.async_block_till_done()
+
+    assert [name for name, _ in calls] == ["first", "late"]
+
+    unsub()
+    unsub_late()
+
+
+async def test_eventbus_keyed_listener_removed_after_fire(hass):
+    """Test a keyed listener removed before its job runs is not called."""
+    calls = []
+
+    @ha.callback
+    def key_func(event):
+        """Return the key of an event."""
+        return event.data["key"]
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append(event)
+
+    unsub = hass.bus.async_listen_keyed("test", key_func, ["a"], listener)
+    hass.bus.async_fire("test", {"key": "a"})
+    unsub()
+    await hass.async_block_till_done()
+
+    assert calls == []
+
+
+async def test_eventbus_job_timer(hass):
+    """Test listeners of sampled events are timed."""
+    timed = []
+    resume = asyncio.Event()
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+
+    @ha.callback
+    def keyed_listener(event):
+        """Mock keyed listener."""
+
+    @ha.callback
+    def key_func(event):
+        """Return the key of an event."""
+        return "a"
+
+    async def coro_listener(event):
+        """Mock coroutine listener."""
+        await resume.wait()
+
+    async def immediate_coro_listener(event):
+        """Mock coroutine listener that does not suspend."""
+
+    def executor_listener(event):
+        """Mock executor listener, which is not timed."""
+
+    hass.bus.async_listen("test", listener)
+    hass.bus.async_listen("test", coro_listener)
+    hass.bus.async_listen("test", immediate_coro_listener, run_immediately=True)
+    hass.bus.async_listen("test", executor_listener)
+    hass.bus.async_listen_keyed("test", key_func, ["a"], keyed_listener)
+    hass.bus.async_set_job_timer(
+        lambda job, duration: timed.append((job.target, duration)), 2
+    )
+
+    for _ in range(4):
+        hass.bus.async_fire("test")
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    # Coroutine listeners are timed once their task is done
+    assert [target for target, _ in timed] == [
+        immediate_coro_listener,
+        immediate_coro_listener,
+        keyed_listener,
+        listener,
+        keyed_listener,
+        listener,
+    ]
+
+    resume.set()
+    await hass.async_block_till_done()
+
+    assert [target for target, _ in timed[6:]] == [coro_listener, coro_listener]
+    assert all(duration >= 0 for _, duration in timed)
+
+    hass.bus.async_set_job_timer(None)
+    hass.bus.async_fire("test")
+    await hass.async_block_till_done()
+    assert len(timed) == 8
+
+
+async def test_eventbus_keyed_listener_run_immediately(hass):
+    """Test keyed listeners can be called immediately."""
+    calls = []
+
+    @ha.callback
+    def key_func(event):
+        """Return the key of an event."""
+        return event.data["key"]
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append(event)
+
+    unsub = hass.bus.async_listen_keyed(
+        "test", key_func, ["a"], listener, run_immediately=True
+    )
+
+    hass.bus.async_fire("test", {"key": "a"})
+    # No async_block_till_done here
+    assert len(calls) == 1
+
+    unsub()
+
+
+async def test_eventbus_keyed_listener_requires_callback_key_func(hass):
+    """Test the key function of a keyed listener must be a callback."""
+
+    def key_func(event):
+        """Return the key of an event."""
+        return event.data["key"]
+
+    with pytest.raises(HomeAssistantError):
+        hass.bus.async_listen_keyed("test", key_func, ["a"], lambda event: None)
+
+
+async def test_eventbus_keyed_listener_key_func_error(hass, caplog):
+    """Test an exception in a key function is logged."""
+    calls = []
+
+    @ha.callback
+    def key_func(event):
+        """Raise an exception."""
+        raise ValueError
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append(event)
+
+    unsub = hass.bus.async_listen_keyed("test", key_func, ["a"], listener)
+    hass.bus.async_fire("test", {"key": "a"})
+    await hass.async_block_till_done()
+
+    assert len(calls) == 0
+    assert "Error in event key function" in caplog.text
+
+    unsub()
+
+
 async def test_eventbus_unsubscribe_listener(hass):
     """Test unsubscribe listener from returned function."""
     calls = []
@@ -612,6 +947,33 @@ def test_state_object_id():
     assert state.object_id == "hello"
 
 
+def test_state_shares_strings_and_attributes():
+    """Test states of the same entity share their strings and attributes."""
+    state = ha.State("".join(["domain.", "hello"]), "".join(["wor", "ld"]), {"a": 1})
+    state2 = ha.State(
+        "".join(["domain.", "hello"]), "".join(["wor", "ld"]), state.attributes
+    )
+
+    assert state.entity_id is state2.entity_id
+    assert state.state is state2.state
+    assert state.attributes is state2.attributes
+
+
+async def test_statemachine_shares_unchanged_attributes(hass):
+    """Test unchanged attributes are shared between states."""
+    hass.states.async_set("light.bowl", "on", {"brightness": 100})
+    state = hass.states.get("light.bowl")
+
+    hass.states.async_set("light.bowl", "off", {"brightness": 100})
+    state2 = hass.states.get("light.bowl")
+    assert state2.attributes is state.attributes
+
+    hass.states.async_set("light.bowl", "off", {"brightness": 50})
+    state3 = hass.states.get("light.bowl")
+    assert state3.attributes is not state2.attributes
+    assert state3.attributes == {"brightness": 50}
+
+
 def test_state_name_if_no_friendly_name_attr():
     """Test if there is no friendly name."""
     state = ha.State("domain.hello_world", "world")
@@ -694,6 +1056,54 @@ async def test_statemachine_entity_ids(hass):
     assert states == ["light.bowl", "switch.ac"]
 
 
+async def test_statemachine_snapshot(hass):
+    """Test snapshots are shared until the state machine changes."""
+    hass.states.async_set("light.kitchen", "on", {})
+    hass.states.async_set("switch.ac", "off", {})
+    hass.states.async_set("light.bowl", "on", {})
+
+    snapshot = hass.states.async_snapshot()
+    assert hass.states.async_snapshot() is snapshot
+    assert await hass.async_add_executor_job(hass.states.snapshot) is snapshot
+    assert len(snapshot) == 3
+    assert "switch.ac" in snapshot
+    assert snapshot.get("LIGHT.BOWL") is hass.states.get("light.bowl")
+    assert [state.entity_id for state in snapshot.all("switch")] == ["switch.ac"]
+    # Requesting a domain does not sort the states of all domains
+    assert snapshot._all is None
+    assert [state.entity_id for state in snapshot.all()] == [
+        "light.bowl",
+        "light.kitchen",
+        "switch.ac",
+    ]
+    assert snapshot.all("light") is snapshot.all("LIGHT")
+    assert snapshot.entity_ids("light") == ["light.bowl", "light.kitchen"]
+    assert snapshot.entity_ids(["switch", "sensor"]) == ["switch.ac"]
+    assert snapshot.entity_ids(["SWITCH"]) == ["switch.ac"]
+    assert snapshot.all("sensor") == ()
+
+    hass.states.async_set("light.bowl", "on", {})
+    assert hass.states.async_snapshot() is snapshot
+
+    hass.states.async_set("light.bowl", "off", {})
+    new_snapshot = hass.states.async_snapshot()
+    assert new_snapshot is not snapshot
+    assert new_snapshot.version > snapshot.version
+    assert snapshot.get("light.bowl").state == "on"
+    assert new_snapshot.get("light.bowl").state == "off"
+    # Only the states of the changed domain are collected again
+    assert new_snapshot.all("switch") is snapshot.all("switch")
+    assert new_snapshot.all("sensor") is snapshot.all("sensor")
+    assert [state.state for state in new_snapshot.all("light")] == ["off", "on"]
+
+    hass.states.async_remove("light.bowl")
+    assert "light.bowl" in new_snapshot
+    assert "light.bowl" not in hass.states.async_snapshot()
+
+    hass.states.async_set("sensor.temperature", "20", {})
+    assert hass.states.async_snapshot().entity_ids("sensor") == ["sensor.temperature"]
+
+
 async def test_statemachine_remove(hass):
     """Test remove method."""
     hass.states.async_set("light.bowl", "on", {})
@@ -757,6 +1167,95 @@ async def test_statemachine_force_update(hass):
     assert len(events) == 1
 
 
+async def test_statemachine_set_many(hass):
+    """Test setting multiple states at once."""
+    hass.states.async_set("light.bowl", "on", {})
+    hass.states.async_set("light.kitchen", "off", {})
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+    seen_states = []
+
+    @ha.callback
+    def listener(event):
+        """Record the states in the state machine when the event is fired."""
+        seen_states.append(
+            (hass.states.get("light.bowl").state, hass.states.get("switch.ac").state)
+        )
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, listener, run_immediately=True)
+
+    context = ha.Context()
+    hass.states.async_set_many(
+        [
+            ("light.Bowl", "off", {"brightness": 0}),
+            ("light.kitchen", "off", None),
+            ("switch.ac", "on", None),
+        ],
+        context=context,
+    )
+    await hass.async_block_till_done()
+
+    assert [event.data["entity_id"] for event in events] == [
+        "light.bowl",
+        "switch.ac",
+    ]
+    assert seen_states == [("off", "on"), ("off", "on")]
+    assert all(event.context is context for event in events)
+    bowl = hass.states.get("light.bowl")
+    ac_state = hass.states.get("switch.ac")
+    assert bowl.attributes == {"brightness": 0}
+    assert bowl.last_updated == ac_state.last_updated == events[0].time_fired
+    assert events[0].data["old_state"].state == "on"
+    assert events[1].data["old_state"] is None
+
+
+async def test_statemachine_set_many_last_state_wins(hass):
+    """Test the last state wins when an entity is passed more than once."""
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+
+    hass.states.async_set_many(
+        [("light.bowl", "on", None), ("light.bowl", "off", None)]
+    )
+    await hass.async_block_till_done()
+
+    assert len(events) == 1
+    assert events[0].data["new_state"].state == "off"
+
+
+async def test_statemachine_set_many_unchanged(hass):
+    """Test setting unchanged states does not fire events."""
+    hass.states.async_set("light.bowl", "on", {})
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+
+    hass.states.async_set_many([("light.bowl", "on", None)])
+    await hass.async_block_till_done()
+    assert len(events) == 0
+
+    hass.states.async_set_many([("light.bowl", "on", None)], force_update=True)
+    await hass.async_block_till_done()
+    assert len(events) == 1
+
+
+async def test_statemachine_set_many_invalid_state(hass):
+    """Test an invalid state leaves the state machine untouched."""
+    hass.states.async_set("light.bowl", "on", {})
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+
+    with pytest.raises(InvalidStateError):
+        hass.states.async_set_many(
+            [
+                ("light.bowl", "off", None),
+                ("light.kitchen", "on", None),
+                ("light.invalid", "o" * 256, None),
+            ]
+        )
+    await hass.async_block_till_done()
+
+    assert len(events) == 0
+    assert hass.states.get("light.bowl").state == "on"
+    assert hass.states.get("light.kitchen") is None
+    assert hass.states.get("light.invalid") is None
+
+
 def test_service_call_repr():
     """Test ServiceCall repr."""
     call = ha.ServiceCall("homeassistant", "start")
@@ -280,3 +280,57 @@ async def test_callback_is_always_scheduled(hass):
         hasync.run_callback_threadsafe(hass.loop, callback)
 
     mock_call_soon_threadsafe.assert_called_once()
+
+
+async def test_eager_start_coroutine():
+    """Test coroutines only get a task once they suspend."""
+    loop = asyncio.get_running_loop()
+
+    async def returns():
+        return 1
+
+    async def raises():
+        raise ValueError
+
+    async def suspends(event):
+        await event.wait()
+        return 2
+
+    future = hasync.eager_start_coroutine(returns(), loop)
+    assert not isinstance(future, asyncio.Task)
+    assert future.result() == 1
+
+    future = hasync.eager_start_coroutine(raises(), loop)
+    assert future.done()
+    with pytest.raises(ValueError):
+        future.result()
+
+    event = asyncio.Event()
+    task = hasync.eager_start_coroutine(suspends(event), loop)
+    assert isinstance(task, asyncio.Task)
+    await asyncio.sleep(0)
+    assert not task.done()
+    event.set()
+    assert await task == 2
+
+
+async def test_eager_start_coroutine_cancel():
+    """Test cancelling the task of a suspended coroutine."""
+    loop = asyncio.get_running_loop()
+    cleaned_up = False
+
+    async def suspends():
+        nonlocal cleaned_up
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cleaned_up = True
+            await asyncio.sleep(0)
+            raise
+
+    task = hasync.eager_start_coroutine(suspends(), loop)
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert cleaned_up
@@ -26,6 +26,10 @@ TEST_BAD_SERIALIED = "THIS IS NOT JSON\n"
 TMP_DIR = None
 
 
+class CannotSerializeMe:
+    """Cannot serialize this."""
+
+
 @pytest.fixture(autouse=True)
 def setup_and_teardown():
     """Clean up after tests."""
@@ -74,12 +78,12 @@ def test_overwrite_and_reload(atomic_writes):
 def test_save_bad_data():
     """Test error from trying to save unserialisable data."""
     with pytest.raises(SerializationError) as excinfo:
-        save_json("test4", {"hello": set()})
+        save_json("test4", {"hello": CannotSerializeMe()})
 
-    assert (
-        "Failed to serialize to JSON: test4. Bad data at $.hello=set()(<class 'set'>"
-        in str(excinfo.value)
+    assert "Failed to serialize to JSON: test4. Bad data at $.hello=" in str(
+        excinfo.value
     )
+    assert "(<class 'tests.util.test_json.CannotSerializeMe'>" in str(excinfo.value)
 
 
 def test_load_bad_data():
@@ -91,6 +95,47 @@ def test_load_bad_data():
         load_json(fname)
 
 
+def test_load_nan_and_infinity():
+    """Test loading files with NaN and Infinity written by json.dumps."""
+    fname = _path_for("test6")
+    with open(fname, "w") as fh:
+        fh.write(dumps({"nan": float("NaN"), "inf": float("inf")}, indent=4))
+    data = load_json(fname)
+    assert math.isnan(data["nan"])
+    assert data["inf"] == float("inf")
+
+
+def test_save_matches_json_dumps():
+    """Test the storage format is unchanged."""
+    fname = _path_for("test8")
+    data = {
+        "name": "Küche 😀",
+        "items": [1, 2.5, None, True, {"empty": {}, "list": []}],
+        "nested": {"a": {"b": ["c"]}},
+    }
+    save_json(fname, data)
+    with open(fname, encoding="utf-8") as fh:
+        assert fh.read() == dumps(data, indent=4)
+
+
+def test_save_nan_and_infinity():
+    """Test NaN and Infinity are saved as json.dumps does."""
+    fname = _path_for("test9")
+    data = {"nan": float("NaN"), "inf": float("inf"), "none": None}
+    save_json(fname, data)
+    with open(fname, encoding="utf-8") as fh:
+        assert fh.read() == dumps(data, indent=4)
+    data = load_json(fname)
+    assert math.isnan(data["nan"])
+
+
+def test_save_and_load_big_integers():
+    """Test saving and loading integers beyond 64 bits."""
+    fname = _path_for("test7")
+    save_json(fname, {"value": 2**64})
+    assert load_json(fname) == {"value": 2**64}
+
+
 def test_custom_encoder():
     """Test serializing with a custom encoder."""
 